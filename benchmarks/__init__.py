@@ -0,0 +1,9 @@
+"""
+Замеры производительности gSceneTS.
+
+- harness - измерение времени (разогрев, повторы, медиана, p95) и сравнение с базовыми замерами
+- scene_generator - синтетические сцены от 100 до 50000 стен и регионов
+- scenarios - сценарии импорта, экспорта, перетаскивания, наведения, масштабирования,
+  изменения размера и очистки сцены
+- run_benchmarks - запуск из командной строки: python -m benchmarks
+"""
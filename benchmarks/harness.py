@@ -0,0 +1,198 @@
+"""
+Измерение времени выполнения сценариев и сравнение с базовыми результатами.
+
+Модуль не зависит от Qt: время измеряется через time.perf_counter,
+память - по резидентной памяти процесса, результаты хранятся в JSON-файле
+базовых замеров.
+"""
+
+import ctypes
+import gc
+import json
+import math
+import os
+import statistics
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+# Допустимое относительное замедление медианы по сравнению с базовым замером
+DEFAULT_TOLERANCE = 0.25
+# Замеры короче этого порога (секунды) не проверяются на регрессию: их разброс больше допуска
+MIN_COMPARABLE_TIME = 0.001
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Возвращает перцентиль с линейной интерполяцией между соседними значениями.
+
+    Args:
+        values: Непустой список значений
+        pct: Перцентиль от 0 до 100
+    """
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class BenchmarkResult:
+    """Результат замера одного сценария: время каждого повтора в секундах."""
+
+    __slots__ = ("name", "samples")
+
+    def __init__(self, name: str, samples: List[float]):
+        self.name = name
+        self.samples = samples
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def p95(self) -> float:
+        return percentile(self.samples, 95)
+
+    @property
+    def minimum(self) -> float:
+        return min(self.samples)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "median": self.median,
+            "p95": self.p95,
+            "min": self.minimum,
+            "repeats": len(self.samples),
+        }
+
+    def __repr__(self):
+        return (f"BenchmarkResult({self.name!r}, median={self.median * 1000:.2f} мс, "
+                f"p95={self.p95 * 1000:.2f} мс, repeats={len(self.samples)})")
+
+
+class MemoryResult:
+    """Результат замера памяти: именованные значения в байтах на объект."""
+
+    __slots__ = ("name", "values")
+
+    def __init__(self, name: str, values: Dict[str, float]):
+        self.name = name
+        self.values = values
+
+    def to_dict(self) -> Dict[str, float]:
+        return dict(self.values)
+
+    def __repr__(self):
+        return f"MemoryResult({self.name!r}, {self.values!r})"
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Возвращает резидентную память процесса в байтах (только Linux) или None."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def release_freed_memory():
+    """
+    Собирает мусор и возвращает освобожденную память кучи системе (glibc malloc_trim).
+
+    Иначе новые объекты занимают ранее освобожденную память и прирост
+    резидентной памяти оказывается меньше их реального размера.
+    """
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def run_benchmark(name: str, func: Callable[[], object], setup: Optional[Callable[[], object]] = None,
+                  teardown: Optional[Callable[[], object]] = None,
+                  warmup: int = 1, repeats: int = 5) -> BenchmarkResult:
+    """
+    Выполняет сценарий несколько раз и измеряет время каждого выполнения.
+
+    setup и teardown вызываются перед и после каждого выполнения (в том числе
+    разогревочного) и в замер не входят.
+
+    Args:
+        name: Имя сценария
+        func: Измеряемая функция
+        setup: Подготовка перед каждым выполнением
+        teardown: Очистка после каждого выполнения
+        warmup: Количество разогревочных выполнений без замера
+        repeats: Количество измеряемых выполнений
+
+    Returns:
+        BenchmarkResult: Время всех измеряемых выполнений
+    """
+    samples = []
+    for iteration in range(warmup + repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if teardown is not None:
+            teardown()
+        if iteration >= warmup:
+            samples.append(elapsed)
+    return BenchmarkResult(name, samples)
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    """Загружает базовые замеры из JSON-файла (пустой словарь, если файла нет)."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: List[Union[BenchmarkResult, MemoryResult]], baseline: Optional[Dict] = None):
+    """
+    Сохраняет результаты как базовые замеры.
+
+    Замеры сценариев, которых нет в results, берутся из baseline без изменений.
+    """
+    merged = dict(baseline or {})
+    for result in results:
+        merged[result.name] = result.to_dict()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(merged.items())), f, indent=4, ensure_ascii=False)
+        f.write("\n")
+
+
+def find_regressions(results: List[Union[BenchmarkResult, MemoryResult]], baseline: Dict[str, Dict[str, float]],
+                     tolerance: float = DEFAULT_TOLERANCE):
+    """
+    Сравнивает медианы результатов с базовыми замерами.
+
+    Замеры памяти (MemoryResult) только сохраняются и не проверяются:
+    резидентная память зависит от аллокатора и разбросана сильнее допуска.
+
+    Args:
+        results: Результаты текущего запуска
+        baseline: Базовые замеры {имя сценария: {"median": ...}}
+        tolerance: Допустимое относительное замедление (0.25 - на 25%)
+
+    Returns:
+        list: Кортежи (имя, текущая медиана, базовая медиана) для сценариев,
+            медиана которых превысила базовую больше чем на tolerance
+    """
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if not reference or not isinstance(result, BenchmarkResult):
+            continue
+        base_median = reference["median"]
+        if max(result.median, base_median) < MIN_COMPARABLE_TIME:
+            continue
+        if result.median > base_median * (1 + tolerance):
+            regressions.append((result.name, result.median, base_median))
+    return regressions
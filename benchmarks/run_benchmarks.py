@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Запуск замеров производительности и проверка регрессий.
+
+Примеры:
+    python -m benchmarks                              # размеры по умолчанию, сравнение с baselines.json
+    python -m benchmarks --sizes 100 50000 --scenarios import drag
+    python -m benchmarks --update-baseline            # сохранить результаты как базовые
+
+Код возврата 1 означает, что медиана хотя бы одного сценария превысила
+базовую больше чем на --tolerance.
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Замеры выполняются без окна: платформу можно переопределить переменной окружения
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.harness import (
+    DEFAULT_TOLERANCE, MemoryResult, run_benchmark, load_baseline, save_baseline, find_regressions
+)
+from benchmarks.scenarios import BenchmarkScene, SCENARIOS, MEMORY_SCENARIOS
+
+# Файл базовых замеров
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+# Количество объектов в сценах по умолчанию
+DEFAULT_SIZES = [100, 1000, 10000]
+# Доля регионов среди объектов сцены
+REGION_SHARE = 0.1
+
+
+def run_size(size, scenarios, warmup, repeats):
+    """
+    Выполняет сценарии на сцене из size объектов.
+
+    Returns:
+        list: BenchmarkResult и MemoryResult с именами вида "<сценарий>/<size>"
+    """
+    regions = int(size * REGION_SHARE)
+    scene = BenchmarkScene(size - regions, regions)
+    results = []
+    try:
+        for name in scenarios:
+            if name in MEMORY_SCENARIOS:
+                result = MemoryResult(f"{name}/{size}", MEMORY_SCENARIOS[name](scene))
+                results.append(result)
+                print(f"{result.name:<28} " + "   ".join(
+                    f"{key} {value:10.0f} байт" for key, value in result.values.items()))
+                continue
+            factory, needs_loaded_scene = SCENARIOS[name]
+            if needs_loaded_scene:
+                scene.load()
+            else:
+                scene.field_widget.clear_scene()
+            setup, run, teardown = factory(scene)
+            result = run_benchmark(f"{name}/{size}", run, setup, teardown, warmup=warmup, repeats=repeats)
+            results.append(result)
+            print(f"{result.name:<28} median {result.median * 1000:10.2f} мс   "
+                  f"p95 {result.p95 * 1000:10.2f} мс")
+    finally:
+        scene.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры производительности gSceneTS")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Количество объектов в сценах (от 100 до 50000)")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted([*SCENARIOS, *MEMORY_SCENARIOS]),
+                        default=[*SCENARIOS, *MEMORY_SCENARIOS],
+                        help="Сценарии для замера")
+    parser.add_argument("--warmup", type=int, default=1, help="Разогревочные выполнения")
+    parser.add_argument("--repeats", type=int, default=5, help="Измеряемые выполнения")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="JSON-файл базовых замеров")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Допустимое замедление медианы (0.25 - на 25%%)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Сохранить результаты как базовые вместо проверки")
+    args = parser.parse_args(argv)
+
+    # Отладочные сообщения искажают замеры
+    logging.getLogger().setLevel(logging.WARNING)
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    results = []
+    for size in args.sizes:
+        results.extend(run_size(size, args.scenarios, args.warmup, args.repeats))
+
+    baseline = load_baseline(args.baseline)
+    if args.update_baseline:
+        save_baseline(args.baseline, results, baseline)
+        print(f"Базовые замеры сохранены в {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for name, median, base_median in regressions:
+        print(f"РЕГРЕССИЯ {name}: {median * 1000:.2f} мс вместо {base_median * 1000:.2f} мс "
+              f"(+{(median / base_median - 1) * 100:.0f}%)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
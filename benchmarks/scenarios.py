@@ -0,0 +1,327 @@
+"""
+Сценарии замеров производительности FieldWidget на синтетических сценах.
+
+Каждый сценарий получает BenchmarkScene и возвращает тройку функций
+(setup, run, teardown) для harness.run_benchmark. Измеряется только run.
+Сценарии памяти (MEMORY_SCENARIOS) сами возвращают байты на объект.
+"""
+
+from itertools import cycle, islice
+
+from PyQt6.QtCore import QPointF, QLineF
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.harness import current_rss_bytes, release_freed_memory
+from benchmarks.scene_generator import generate_scene_model
+from utils import item_cache, paint_cache
+from utils.id_allocator import IdAllocator
+from utils.xml_handler import XMLHandler
+
+# Количество перемещений мыши в сценариях drag и hover
+MOUSE_MOVES = 50
+# Количество перерисовок в сценарии zoomed_out
+REPAINTS = 5
+# Количество шагов прокрутки и шаг в пикселях (как у колеса мыши) в сценарии pan
+PAN_STEPS = 20
+PAN_STEP = 40
+# Размер окна поля при замерах
+VIEW_WIDTH = 1200
+VIEW_HEIGHT = 800
+# Минимальное количество стен в замере памяти: на меньшем числе прирост
+# резидентной памяти сравним с размером страницы
+MEMORY_MIN_WALLS = 2000
+
+
+class BenchmarkScene:
+    """Поле с виджетом свойств и синтетическая сцена заданного размера."""
+
+    def __init__(self, walls, regions, seed=0):
+        # Импорт здесь, чтобы QApplication был создан до создания виджетов
+        from field_widget import FieldWidget
+        from properties_window import PropertiesWindow
+
+        self.model = generate_scene_model(walls, regions, seed)
+        self.handler = XMLHandler(scene_width=self.model.scene_width, scene_height=self.model.scene_height)
+        self.xml = self.handler.generate_model_xml(self.model)
+
+        self.properties_window = PropertiesWindow()
+        self.field_widget = FieldWidget(self.properties_window,
+                                        scene_width=self.model.scene_width,
+                                        scene_height=self.model.scene_height)
+        self.field_widget.resize(VIEW_WIDTH, VIEW_HEIGHT)
+
+    def load(self):
+        """Загружает сцену в поле одним пакетом."""
+        self.field_widget.load_scene(self.handler.parse_xml(self.xml))
+        QApplication.processEvents()
+
+    def object_positions(self, count):
+        """Возвращает до count позиций в координатах viewport над серединами стен."""
+        positions = []
+        for wall in self.model.walls.values():
+            center = QPointF((wall.x1 + wall.x2) / 2, (wall.y1 + wall.y2) / 2)
+            positions.append(self.field_widget.mapFromScene(center))
+            if len(positions) == count:
+                break
+        return positions
+
+    def close(self):
+        self.field_widget.clear_scene()
+        self.field_widget.close()
+        self.field_widget.deleteLater()
+        self.properties_window.deleteLater()
+        QApplication.processEvents()
+
+
+def scenario_import(scene):
+    """Разбор XML и загрузка сцены в пустое поле."""
+    def run():
+        scene.field_widget.load_scene(scene.handler.parse_xml(scene.xml))
+    return scene.field_widget.clear_scene, run, None
+
+
+def scenario_export(scene):
+    """Генерация XML по объектам сцены, как при сохранении файла."""
+    field_widget = scene.field_widget
+
+    def run():
+        scene.handler.generate_xml(field_widget.walls, field_widget.regions,
+                                   field_widget.robot_model, field_widget.start_position_model)
+    return None, run, None
+
+
+def scenario_drag(scene):
+    """Перетаскивание стены в режиме редактирования."""
+    field_widget = scene.field_widget
+    wall = field_widget.walls[0] if field_widget.walls else None
+    path = [field_widget.mapFromScene(QPointF(i % 40, i % 30)) for i in range(MOUSE_MOVES)]
+
+    def setup():
+        field_widget.set_edit_mode(True)
+        if wall is not None:
+            line = wall.line()
+            field_widget.dragging_item = wall
+            field_widget.grab_point = QPointF(0, 0)
+            field_widget.initial_line = QLineF(line)
+
+    def run():
+        for view_pos in path:
+            field_widget._process_mouse_move(view_pos)
+
+    def teardown():
+        field_widget.dragging_item = None
+        field_widget.set_edit_mode(False)
+    return setup, run, teardown
+
+
+def scenario_hover(scene):
+    """Перемещение курсора по объектам сцены без нажатия кнопок."""
+    field_widget = scene.field_widget
+    path = scene.object_positions(MOUSE_MOVES)
+
+    def run():
+        for view_pos in path:
+            field_widget._process_mouse_move(view_pos)
+    return None, run, None
+
+
+def scenario_hover_edit(scene):
+    """Перемещение курсора по стенам в режиме редактирования (подсветка и курсор над объектом)."""
+    field_widget = scene.field_widget
+    path = scene.object_positions(MOUSE_MOVES)
+
+    def setup():
+        field_widget.set_edit_mode(True)
+
+    def run():
+        for view_pos in path:
+            field_widget._process_mouse_move(view_pos)
+
+    def teardown():
+        field_widget.handle_hover_for_item(None, QPointF())
+        field_widget.set_edit_mode(False)
+    return setup, run, teardown
+
+
+def scenario_zoom(scene):
+    """Уменьшение масштаба с отрисовкой всего поля и возврат к исходному масштабу."""
+    field_widget = scene.field_widget
+
+    def run():
+        for _ in range(4):
+            field_widget.zoomOut()
+        field_widget.grab()
+        field_widget.resetScale()
+        field_widget.grab()
+    return None, run, None
+
+
+def scenario_zoomed_out(scene):
+    """Перерисовка всего поля при минимальном масштабе (упрощенная отрисовка, см. level_of_detail)."""
+    field_widget = scene.field_widget
+
+    def setup():
+        field_widget.scale_view(field_widget._min_scale)
+
+    def run():
+        for _ in range(REPAINTS):
+            field_widget.grab()
+    return setup, run, field_widget.resetScale
+
+
+def _pan(scene, edit_mode=False, adaptive_rendering=True):
+    """Прокрутка поля по диагонали с перерисовкой после каждого шага."""
+    field_widget = scene.field_widget
+    bars = (field_widget.horizontalScrollBar(), field_widget.verticalScrollBar())
+    start = [bar.value() for bar in bars]
+
+    def setup():
+        field_widget.set_edit_mode(edit_mode)
+        field_widget.set_adaptive_rendering(adaptive_rendering)
+
+    def run():
+        for step in range(1, PAN_STEPS + 1):
+            for bar, value in zip(bars, start):
+                bar.setValue(value + step * PAN_STEP)
+            field_widget.grab()
+
+    def teardown():
+        for bar, value in zip(bars, start):
+            bar.setValue(value)
+        field_widget.set_adaptive_rendering(True)
+        field_widget.finish_interaction()
+        field_widget.set_edit_mode(False)
+    return setup, run, teardown
+
+
+def scenario_pan(scene):
+    """Прокрутка поля в режиме наблюдателя (запеченный слой, см. static_layer)."""
+    return _pan(scene)
+
+
+def scenario_pan_edit(scene):
+    """Прокрутка поля в режиме редактирования с упрощенной отрисовкой во время прокрутки."""
+    return _pan(scene, edit_mode=True)
+
+
+def scenario_pan_edit_full_quality(scene):
+    """Прокрутка поля в режиме редактирования с полным качеством отрисовки (для сравнения с pan_edit)."""
+    return _pan(scene, edit_mode=True, adaptive_rendering=False)
+
+
+def _hover_repaint(scene, cached=True):
+    """Наведение на стены в режиме редактирования с перерисовкой поля после каждого перемещения."""
+    field_widget = scene.field_widget
+    path = scene.object_positions(REPAINTS * 2)
+    modes = item_cache.modes()
+
+    def setup():
+        field_widget.set_edit_mode(True)
+        if not cached:
+            field_widget.set_item_cache_modes(**{kind: "none" for kind in modes})
+        # Первая отрисовка заполняет кэш объектов
+        field_widget.grab()
+
+    def run():
+        for view_pos in path:
+            field_widget._process_mouse_move(view_pos)
+            field_widget.grab()
+
+    def teardown():
+        field_widget.handle_hover_for_item(None, QPointF())
+        field_widget.set_item_cache_modes(**modes)
+        field_widget.set_edit_mode(False)
+    return setup, run, teardown
+
+
+def scenario_hover_repaint(scene):
+    """Перерисовка поля при наведении с кэшированием отрисовки объектов (см. utils.item_cache)."""
+    return _hover_repaint(scene)
+
+
+def scenario_hover_repaint_uncached(scene):
+    """Перерисовка поля при наведении без кэширования (для сравнения с hover_repaint)."""
+    return _hover_repaint(scene, cached=False)
+
+
+def scenario_resize(scene):
+    """Увеличение размера сцены и возврат к исходному размеру."""
+    field_widget = scene.field_widget
+    width, height = scene.model.scene_width, scene.model.scene_height
+
+    def run():
+        field_widget.set_scene_size(width + 200, height + 200)
+        field_widget.set_scene_size(width, height)
+    return None, run, None
+
+
+def scenario_clear(scene):
+    """Очистка загруженной сцены."""
+    return scene.load, scene.field_widget.clear_scene, None
+
+
+def scenario_wall_memory(scene):
+    """
+    Память на стену режима items с общими паттернами, кистями и перьями
+    (utils.paint_cache) и с собственными копиями у каждой стены (кэш отключен).
+
+    Стены создаются по записям стен сцены (не меньше MEMORY_MIN_WALLS) вне поля.
+    Обе группы живут до конца замера, чтобы вторая не заняла память,
+    освобожденную первой.
+
+    Returns:
+        dict: Байты на стену {"shared": ..., "per_wall": ...}; пустой,
+            если резидентная память процесса недоступна
+    """
+    from wall import Wall
+
+    records = list(islice(cycle(scene.model.walls.values()), max(len(scene.model.walls), MEMORY_MIN_WALLS)))
+    id_allocator = IdAllocator("w")
+
+    def create_walls(records):
+        return [Wall(QPointF(record.x1, record.y1), QPointF(record.x2, record.y2), width=record.width,
+                     render_mode=Wall.RENDER_MODE_ITEMS, id_allocator=id_allocator)
+                for record in records]
+
+    def measure():
+        release_freed_memory()
+        before = current_rss_bytes()
+        walls = create_walls(records)
+        return walls, (current_rss_bytes() - before) / len(walls)
+
+    if current_rss_bytes() is None or not records:
+        return {}
+    # Первая стена заполняет кэш
+    warmup = create_walls(records[:1])
+    shared_walls, shared = measure()
+    paint_cache.set_enabled(False)
+    try:
+        per_wall_walls, per_wall = measure()
+    finally:
+        paint_cache.set_enabled(True)
+    del warmup, shared_walls, per_wall_walls
+    return {"shared": shared, "per_wall": per_wall}
+
+
+# Сценарии: имя -> (фабрика, нужно ли загрузить сцену перед замером)
+SCENARIOS = {
+    "import": (scenario_import, False),
+    "export": (scenario_export, True),
+    "drag": (scenario_drag, True),
+    "hover": (scenario_hover, True),
+    "hover_edit": (scenario_hover_edit, True),
+    "zoom": (scenario_zoom, True),
+    "zoomed_out": (scenario_zoomed_out, True),
+    "pan": (scenario_pan, True),
+    "pan_edit": (scenario_pan_edit, True),
+    "pan_edit_full_quality": (scenario_pan_edit_full_quality, True),
+    "hover_repaint": (scenario_hover_repaint, True),
+    "hover_repaint_uncached": (scenario_hover_repaint_uncached, True),
+    "resize": (scenario_resize, True),
+    "clear": (scenario_clear, False),
+}
+
+# Сценарии памяти: имя -> функция, возвращающая байты на объект
+MEMORY_SCENARIOS = {
+    "wall_memory": scenario_wall_memory,
+}
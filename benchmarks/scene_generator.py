@@ -0,0 +1,83 @@
+"""
+Генератор синтетических сцен для замеров производительности.
+
+Сцена делится на квадратные ячейки, в каждую попадает один объект (стена или
+регион) со случайными размерами, поэтому объекты не пересекаются друг с другом
+и не выходят за границы сцены при любом их количестве. Результат - модель
+сцены без Qt, которую можно записать в XML или загрузить в FieldWidget.
+"""
+
+import math
+import random
+
+from utils import geometry
+from utils.scene_model import SceneModel, WallRecord, RegionRecord, RobotRecord, StartPositionRecord
+from utils.xml_handler import XMLHandler
+
+# Сторона ячейки, в которой размещается один объект
+CELL_SIZE = 60
+# Отступ объекта от границ ячейки (не меньше половины толщины стены)
+CELL_MARGIN = 10
+# Минимальные размеры сцены
+MIN_SCENE_WIDTH = 1300
+MIN_SCENE_HEIGHT = 1000
+
+
+def generate_scene_model(walls: int = 100, regions: int = 0, seed: int = 0) -> SceneModel:
+    """
+    Создает сцену с заданным количеством стен и регионов.
+
+    Робот и стартовая позиция занимают ячейку в левом верхнем углу. Первая
+    строка и первый столбец ячеек остаются пустыми: place_robot сравнивает
+    расстояние до прямых, на которых лежат стены, а не до отрезков. Остальные
+    ячейки в случайном порядке получают стены и регионы.
+
+    Args:
+        walls: Количество стен
+        regions: Количество регионов
+        seed: Начальное значение генератора случайных чисел
+
+    Returns:
+        SceneModel: Модель сцены
+    """
+    rng = random.Random(seed)
+    cells_per_side = math.ceil(math.sqrt(walls + regions)) + 1
+    side = cells_per_side * CELL_SIZE
+    width = max(MIN_SCENE_WIDTH, side)
+    height = max(MIN_SCENE_HEIGHT, side)
+    left, top = -width // 2, -height // 2
+
+    model = SceneModel(width, height)
+    model.robot = RobotRecord(left + CELL_MARGIN, top + CELL_MARGIN, 0, "benchmark")
+    half_robot = geometry.ROBOT_SIZE // 2
+    model.start_position = StartPositionRecord(left + CELL_MARGIN + half_robot,
+                                               top + CELL_MARGIN + half_robot, 0)
+
+    kinds = ["w"] * walls + ["r"] * regions
+    rng.shuffle(kinds)
+    inner = CELL_SIZE - 2 * CELL_MARGIN
+    for index, kind in enumerate(kinds):
+        row, column = divmod(index, cells_per_side - 1)
+        row, column = row + 1, column + 1
+        x0 = left + column * CELL_SIZE + CELL_MARGIN
+        y0 = top + row * CELL_SIZE + CELL_MARGIN
+        if kind == "w":
+            wall_id = f"w{len(model.walls) + 1}"
+            if rng.random() < 0.5:
+                y = y0 + rng.randint(0, inner)
+                model.set_wall(WallRecord(wall_id, x0, y, x0 + rng.randint(inner // 2, inner), y))
+            else:
+                x = x0 + rng.randint(0, inner)
+                model.set_wall(WallRecord(wall_id, x, y0, x, y0 + rng.randint(inner // 2, inner)))
+        else:
+            region_id = f"r{len(model.regions) + 1}"
+            model.set_region(RegionRecord(region_id, x0, y0,
+                                          rng.randint(inner // 2, inner), rng.randint(inner // 2, inner)))
+    return model
+
+
+def generate_scene_xml(walls: int = 100, regions: int = 0, seed: int = 0) -> str:
+    """Создает сцену (см. generate_scene_model) и возвращает её XML."""
+    model = generate_scene_model(walls, regions, seed)
+    handler = XMLHandler(scene_width=model.scene_width, scene_height=model.scene_height)
+    return handler.generate_model_xml(model)
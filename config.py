@@ -2,9 +2,12 @@
 Файл конфигурации приложения.
 Хранит настройки и константы, которые могут быть изменены пользователем.
 """
+import atexit
 import json
 import os
 import logging
+import tempfile
+import threading
 
 # Настройка логгера
 logger = logging.getLogger(__name__)
@@ -17,6 +20,10 @@ class Config:
     # Путь к файлу конфигурации (относительно корня проекта)
     CONFIG_FILE = "app_config.json"
     
+    # Задержка перед записью изменений на диск (секунды): изменения,
+    # сделанные за это время, записываются одним сохранением
+    SAVE_DELAY = 0.5
+    
     # Параметры по умолчанию
     DEFAULT_CONFIG = {
         "app": {
@@ -33,11 +40,39 @@ class Config:
         },
         "grid": {
             "size": 50,
-            "snap_to_grid": True
+            "snap_to_grid": True,
+            "render_mode": "background",  # 'background' (drawBackground) или 'items' (линии-элементы сцены)
+            "tile_cache": True  # кэшировать плитки сетки для каждого масштаба
         },
         "scene": {
             "default_width": 1300,
             "default_height": 900
+        },
+        "walls": {
+            "render_mode": "lightweight"  # 'lightweight' (один элемент на стену) или 'items' (дочерние элементы)
+        },
+        "interaction": {
+            "panel_update_rate": 20,  # частота обновления координат и окна свойств при перемещении мыши (Гц)
+            "undo_limit": 500  # максимальное количество действий в истории отмены
+        },
+        "rendering": {
+            # Пороги уровня детализации (1.0 - масштаб 1:1, 0 - без упрощения):
+            "lod_walls": 0.75,  # ниже порога стены рисуются без кирпичного паттерна
+            "lod_details": 0.75,  # ниже порога не рисуются маркеры и обводки при наведении
+            "lod_regions": 0.75,  # ниже порога регионы рисуются прямоугольником без сглаживания
+            "static_layer_cache": True,  # в режиме наблюдателя стены и регионы рисуются из кэша плиток
+            "adaptive_quality": True,  # без сглаживания во время прокрутки, масштабирования и перетаскивания
+            "interaction_idle_ms": 150,  # пауза, после которой возвращается полное качество (мс)
+            # Кэширование отрисовки по видам объектов: 'none', 'device' (в координатах экрана)
+            # или 'item' (в координатах объекта)
+            "cache_walls": "device",
+            "cache_regions": "none",
+            "cache_robot": "item",
+            "cache_start_position": "device"
+        },
+        "logging": {
+            "level": "WARNING",  # 'DEBUG', 'INFO', 'WARNING' или 'ERROR'
+            "log_dir": None  # директория для лог-файла; None - только консоль
         }
     }
     
@@ -48,7 +83,13 @@ class Config:
         if cls._instance is None:
             cls._instance = super(Config, cls).__new__(cls)
             cls._instance._config = cls.DEFAULT_CONFIG.copy()
+            cls._instance._lock = threading.RLock()  # защищает _config и состояние сохранения
+            cls._instance._write_lock = threading.Lock()  # упорядочивает записи файла
+            cls._instance._dirty = False
+            cls._instance._save_timer = None
             cls._instance._load_config()
+            # Несохраненные изменения записываются при завершении приложения
+            atexit.register(cls._instance.flush)
         return cls._instance
     
     def _load_config(self):
@@ -77,13 +118,73 @@ class Config:
                     default[key] = value
     
     def _save_config(self):
-        """Сохраняет текущую конфигурацию в файл"""
-        try:
-            with open(self.CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, indent=4, ensure_ascii=False)
-            logger.info("Конфигурация успешно сохранена в файл")
-        except Exception as e:
-            logger.error(f"Ошибка при сохранении конфигурации: {e}")
+        """
+        Сохраняет текущую конфигурацию в файл.
+        
+        Данные записываются во временный файл рядом с файлом конфигурации,
+        который затем атомарно заменяет его, поэтому сбой во время записи
+        не оставляет поврежденный файл.
+        
+        Returns:
+            bool: True, если конфигурация сохранена
+        """
+        with self._write_lock:
+            with self._lock:
+                self._dirty = False
+                content = json.dumps(self._config, indent=4, ensure_ascii=False)
+            
+            config_dir = os.path.dirname(os.path.abspath(self.CONFIG_FILE))
+            temp_path = None
+            try:
+                fd, temp_path = tempfile.mkstemp(prefix=".app_config.", suffix=".tmp", dir=config_dir)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.CONFIG_FILE)
+                logger.info("Конфигурация успешно сохранена в файл")
+                return True
+            except Exception as e:
+                logger.error(f"Ошибка при сохранении конфигурации: {e}")
+                if temp_path and os.path.exists(temp_path):
+                    os.remove(temp_path)
+                with self._lock:
+                    self._dirty = True
+                return False
+    
+    def _schedule_save(self):
+        """
+        Помечает конфигурацию измененной и откладывает запись на SAVE_DELAY секунд.
+        
+        Запись выполняется в фоновом потоке таймера, а не в потоке интерфейса;
+        новое изменение до истечения задержки переносит запись.
+        """
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def is_dirty(self):
+        """Возвращает True, если есть изменения, еще не записанные на диск"""
+        return self._dirty
+    
+    def flush(self):
+        """
+        Немедленно записывает несохраненные изменения на диск.
+        
+        Returns:
+            bool: True, если изменений не было или они успешно сохранены
+        """
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return True
+        return self._save_config()
     
     def get(self, section, key=None):
         """
@@ -109,7 +210,9 @@ class Config:
     
     def set(self, section, key, value):
         """
-        Устанавливает значение настройки и сохраняет конфигурацию.
+        Устанавливает значение настройки.
+        
+        Конфигурация сохраняется на диск с задержкой SAVE_DELAY (см. flush).
         
         Args:
             section (str): Раздел настроек
@@ -119,11 +222,30 @@ class Config:
         Returns:
             bool: True, если значение успешно установлено
         """
-        if section not in self._config:
-            self._config[section] = {}
+        return self.update({section: {key: value}})
+    
+    def update(self, values):
+        """
+        Устанавливает несколько настроек за одно сохранение.
+        
+        Args:
+            values (dict): Словарь {раздел: {ключ: значение}}
+            
+        Returns:
+            bool: True, если значения успешно установлены
+        """
+        changed = False
+        with self._lock:
+            for section, section_values in values.items():
+                current = self._config.setdefault(section, {})
+                for key, value in section_values.items():
+                    if key not in current or current[key] != value:
+                        current[key] = value
+                        changed = True
         
-        self._config[section][key] = value
-        self._save_config()
+        # Запись на диск нужна только если что-то изменилось
+        if changed:
+            self._schedule_save()
         return True
     
     def get_all(self):
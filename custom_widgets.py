@@ -3,7 +3,7 @@ from PyQt6.QtWidgets import (
     QGraphicsOpacityEffect, QLabel, QColorDialog, QSpinBox, QApplication
 )
 from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, pyqtSignal, pyqtProperty, QSize
-from PyQt6.QtGui import QColor, QPainter, QPainterPath, QIcon
+from PyQt6.QtGui import QColor, QPainter, QPainterPath, QIcon, QPalette
 from styles import AppStyles
 
 import logging
@@ -39,12 +39,14 @@ class EditableLineEdit(QWidget):
         
         # Кнопка подтверждения (галочка)
         self.confirm_button = FlatRoundButton(self)
+        self.confirm_button.setProperty("styleRole", "confirm")
         self.confirm_button.setText("✓")
         self.confirm_button.clicked.connect(self._confirm_changes)
         self.layout.addWidget(self.confirm_button)
         
         # Кнопка отмены (крестик)
         self.cancel_button = FlatRoundButton(self)
+        self.cancel_button.setProperty("styleRole", "cancel")
         self.cancel_button.setText("✕")
         self.cancel_button.clicked.connect(self._cancel_changes)
         self.layout.addWidget(self.cancel_button)
@@ -86,8 +88,8 @@ class EditableLineEdit(QWidget):
         hover_bg = f"rgba({int(colors['primary'][1:3], 16)}, {int(colors['primary'][3:5], 16)}, {int(colors['primary'][5:7], 16)}, 0.1)"
         focus_bg = f"rgba({int(colors['primary'][1:3], 16)}, {int(colors['primary'][3:5], 16)}, {int(colors['primary'][5:7], 16)}, 0.2)"
         
-        # Стиль для текстового поля
-        self.text_field.setStyleSheet(f"""
+        # Стиль для текстового поля (в окне свойств его задает общий стиль окна)
+        AppStyles.apply_widget_style(self.text_field, f"""
             QLineEdit {{
                 background-color: {colors['secondary_dark']};
                 color: {colors['text']};
@@ -106,34 +108,14 @@ class EditableLineEdit(QWidget):
             }}
         """)
         
-        # Стиль для кнопки подтверждения
-        confirm_color = colors['success']
-        confirm_hover_border = "white"
-        self.confirm_button.setStyleSheet(f"""
-            background-color: {confirm_color};
-            color: {colors['text_highlight']};
-            border-radius: 4px;
-            min-width: 24px;
-            min-height: 18px;
-            border: 0px solid {confirm_hover_border};
-        """)
-        
-        # Стиль для кнопки отмены
-        cancel_color = colors['error']
-        cancel_hover_border = "white"
-        self.cancel_button.setStyleSheet(f"""
-            background-color: {cancel_color};
-            color: {colors['text_highlight']};
-            border-radius: 4px;
-            min-width: 24px;
-            min-height: 18px;
-            border: 0px solid {cancel_hover_border};
-        """)
+        # Кнопки подтверждения и отмены
+        AppStyles.apply_widget_style(self.confirm_button, AppStyles.get_confirm_button_style(is_dark_theme))
+        AppStyles.apply_widget_style(self.cancel_button, AppStyles.get_cancel_button_style(is_dark_theme))
         
     def set_theme(self, is_dark_theme=True):
         """Устанавливает тему для виджета"""
-        if self._is_dark_theme != is_dark_theme:
-            self.update_styles(is_dark_theme)
+        # Повторная установка того же стиля пропускается в AppStyles.apply_widget_style
+        self.update_styles(is_dark_theme)
     
     def text(self):
         """Возвращает текущий текст в поле ввода."""
@@ -349,33 +331,26 @@ class FlatRoundButton(QPushButton):
         path = QPainterPath()
         path.addRoundedRect(1, 1, self.width()-2, self.height()-2, 4, 4)
         
-        # Заливаем фон
-        if self.styleSheet():
-            # Получаем базовый цвет фона
-            try:
-                color_str = self.styleSheet().split("background-color:")[1].split(";")[0].strip()
-                bg_color = QColor(color_str)
-                
-                # Для эффекта наведения
-                if self._is_hovered and self._border_width > 0:
-                    # Настраиваем перо для рисования границы
-                    pen = painter.pen()
-                    pen.setWidth(self._border_width)
-                    pen.setColor(self._border_color)
-                    painter.setPen(pen)
-                    
-                    # Рисуем границу
-                    border_path = QPainterPath()
-                    border_path.addRoundedRect(1, 1, self.width()-2, self.height()-2, 4, 4)
-                    painter.drawPath(border_path)
-                else:
-                    painter.setPen(Qt.PenStyle.NoPen)
-                
-                # Заливка основным цветом
-                painter.fillPath(path, bg_color)
-            except Exception:
-                # В случае ошибки разбора styleSheet используем заливку по умолчанию
-                painter.fillPath(path, QColor("#333333"))
+        # Цвет фона задает стиль кнопки (собственный или общий стиль окна) через палитру
+        bg_color = self.palette().color(QPalette.ColorRole.Button)
+        
+        # Для эффекта наведения
+        if self._is_hovered and self._border_width > 0:
+            # Настраиваем перо для рисования границы
+            pen = painter.pen()
+            pen.setWidth(self._border_width)
+            pen.setColor(self._border_color)
+            painter.setPen(pen)
+            
+            # Рисуем границу
+            border_path = QPainterPath()
+            border_path.addRoundedRect(1, 1, self.width()-2, self.height()-2, 4, 4)
+            painter.drawPath(border_path)
+        else:
+            painter.setPen(Qt.PenStyle.NoPen)
+        
+        # Заливка основным цветом
+        painter.fillPath(path, bg_color)
         
         # Рисуем текст
         painter.setPen(Qt.GlobalColor.white)
@@ -555,6 +530,7 @@ class ColorPickerButton(QPushButton):
         super().__init__(parent)
         self._color = color
         self._is_dark_theme = is_dark_theme
+        self.setProperty("styleRole", "color_picker")
         self.setFixedSize(30, 30)
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         self.clicked.connect(self.show_color_dialog)
@@ -566,20 +542,10 @@ class ColorPickerButton(QPushButton):
         qcolor = QColor(self._color)
         qcolor_str = qcolor.name(QColor.NameFormat.HexArgb)
         
-        # Получаем цвет границы в зависимости от темы
-        border_color = AppStyles.BORDER_COLOR if self._is_dark_theme else AppStyles.LIGHT_BORDER_COLOR
-        hover_border = "#BBBBBB" if self._is_dark_theme else "#555555"
-        
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {qcolor_str};
-                border: 1px solid {border_color};
-                border-radius: 4px;
-            }}
-            QPushButton:hover {{
-                border: 2px solid {hover_border};
-            }}
-        """)
+        # Рамку по теме в главном окне задает общий стиль окна
+        color_style = f"QPushButton {{ background-color: {qcolor_str}; }}"
+        AppStyles.apply_widget_style(
+            self, color_style + AppStyles.get_color_picker_style(self._is_dark_theme), color_style)
         
     def show_color_dialog(self):
         """Показывает диалог выбора цвета с поддержкой прозрачности"""
@@ -609,9 +575,8 @@ class ColorPickerButton(QPushButton):
             
     def set_theme(self, is_dark_theme):
         """Устанавливает тему для виджета"""
-        if self._is_dark_theme != is_dark_theme:
-            self._is_dark_theme = is_dark_theme
-            self.update_style()
+        self._is_dark_theme = is_dark_theme
+        self.update_style()
 
 
 class CustomSpinBox(QSpinBox):
@@ -10,17 +10,38 @@ from robot import Robot
 from wall import Wall
 from region import Region
 from start_position import StartPosition
+from static_layer import StaticLayerItem
+from highlight_overlay import HighlightOverlay
 from styles import AppStyles
 from hover_highlight import HoverHighlightMixin
+from utils.spatial_index import SegmentGridIndex
+from utils.id_allocator import IdAllocator
+from utils import geometry, level_of_detail, item_cache
+from utils.scene_model import SceneModel, WallRecord, RegionRecord, RobotRecord, StartPositionRecord
+from utils.undo_stack import UndoStack, StateChange, RenameChange, DEFAULT_UNDO_LIMIT
 
 import logging
-from math import sqrt, sin, cos, atan2, degrees, radians, pi
+from contextlib import contextmanager
+from math import sqrt, sin, cos, atan2, degrees, radians, pi, ceil
 from collections import defaultdict
+from itertools import count
+import time
 
 # Настройка логгера
-logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Длительность одной порции при порционной загрузке сцены (мс) - примерно один кадр
+SCENE_LOAD_TIME_SLICE_MS = 16
+# Количество объектов, вставляемых между проверками времени
+SCENE_LOAD_BATCH_SIZE = 64
+# Частота обновления экрана, если ее не удалось определить (Гц)
+DEFAULT_REFRESH_RATE = 60
+# Команды отмены, затрагивающие не меньше объектов, применяются при отключенном индексе сцены
+UNDO_BULK_SIZE = 64
+# Пауза в прокрутке, масштабировании и перетаскивании, после которой возвращается
+# полное качество отрисовки (мс)
+INTERACTION_IDLE_MS = 150
+
 class FieldWidget(QGraphicsView):
     # Сигнал для передачи координат мыши
     mouse_coords_updated = pyqtSignal(float, float)
@@ -34,8 +55,24 @@ class FieldWidget(QGraphicsView):
     properties_updated = pyqtSignal(object)
     # Сигнал изменения режима привязки к сетке
     grid_snap_changed = pyqtSignal(bool)
-
-    def __init__(self, properties_window, scene_width=1300, scene_height=800, grid_size=50):
+    # Сигнал завершения пакетной загрузки сцены (передает итоги load_scene)
+    scene_loaded = pyqtSignal(object)
+    # Сигнал хода порционной загрузки сцены (обработано объектов, всего объектов)
+    scene_load_progress = pyqtSignal(int, int)
+    # Сигнал отмены порционной загрузки сцены (передает итоги на момент отмены)
+    scene_load_cancelled = pyqtSignal(object)
+    # Сигнал ошибки порционной загрузки сцены (передает текст ошибки)
+    scene_load_failed = pyqtSignal(str)
+
+    # Режимы отрисовки сетки
+    GRID_MODE_BACKGROUND = "background"  # сетка рисуется в drawBackground, только видимая часть
+    GRID_MODE_ITEMS = "items"  # каждая линия сетки - отдельный QGraphicsLineItem
+
+    def __init__(self, properties_window, scene_width=1300, scene_height=800, grid_size=50,
+                 grid_mode=GRID_MODE_BACKGROUND, grid_tile_cache=True,
+                 wall_render_mode=Wall.RENDER_MODE_LIGHTWEIGHT, panel_update_rate=20,
+                 undo_limit=DEFAULT_UNDO_LIMIT, lod_thresholds=None, static_layer_cache=True,
+                 adaptive_rendering=True, interaction_idle_ms=INTERACTION_IDLE_MS, item_cache_modes=None):
         super().__init__()
         self.properties_window = properties_window
 
@@ -44,12 +81,21 @@ class FieldWidget(QGraphicsView):
         self.item_deselected.connect(self.properties_window.clear_properties)
         self.properties_updated.connect(self.properties_window.update_properties)
 
+        # Во время прокрутки, масштабирования и перетаскивания поле рисуется
+        # упрощенно, полное качество возвращается после паузы (см. _note_interaction)
+        self.adaptive_rendering = adaptive_rendering
+        self._interacting = False
+        self._interaction_timer = QTimer(self)
+        self._interaction_timer.setSingleShot(True)
+        self._interaction_timer.setInterval(interaction_idle_ms)
+        self._interaction_timer.timeout.connect(self.finish_interaction)
+
         self.setScene(QGraphicsScene(self))
         self.setRenderHint(QPainter.RenderHint.Antialiasing)
         self.setMouseTracking(True)
         
         # Применяем стиль из styles.py
-        self.setStyleSheet(AppStyles.get_scene_style(True))
+        AppStyles.apply_widget_style(self, AppStyles.get_scene_style(True))
         
         # Белый фон для сцены
         self.scene().setBackgroundBrush(QBrush(QColor("white")))
@@ -74,25 +120,87 @@ class FieldWidget(QGraphicsView):
         self.scene().addItem(self.axes_layer)
         self.scene().addItem(self.objects_layer)
         
+        # Общие обводки наведения и выделения: переносятся на нужный объект (см. HighlightOverlay)
+        self.hover_overlay = HighlightOverlay(hover=True, z_value=15)
+        self.selection_overlay = HighlightOverlay(hover=False, z_value=20)
+        
         self.grid_size = grid_size  # размер графической сетки из конфигурации
+        self.grid_mode = grid_mode  # режим отрисовки сетки
+        self.grid_tile_cache_enabled = grid_tile_cache  # кэширование плиток сетки для режима background
+        self._grid_pen = QPen(Qt.GlobalColor.lightGray, 1, Qt.PenStyle.DotLine)
+        self._grid_tile_cache = {}  # (размер плитки в пикселях, devicePixelRatio) -> QPixmap
         self.snap_to_grid_enabled = True  # Привязка к сетке включена по умолчанию
 
         self.drawing_mode = None
         self.edit_mode = False
         self.selected_item = None
-        self.selected_marker = None
+        self.selected_marker = None  # (стена, "start" | "end") при перетаскивании конца стены
+        self.wall_render_mode = wall_render_mode  # режим отрисовки новых стен
+        # Пороги упрощенной отрисовки при мелком масштабе (общие для всех сцен)
+        if lod_thresholds:
+            level_of_detail.configure(**lod_thresholds)
+        # Режимы кэширования отрисовки объектов по видам (общие для всех сцен)
+        if item_cache_modes:
+            item_cache.configure(**item_cache_modes)
         
         self.temp_wall = None
         self.wall_start = None  # Начальная точка стены
 
         self.region_start = None  # Начальная точка региона
         self.temp_region = None  # Временный прямоугольник для отрисовки региона
+        self._hovered_item = None  # Объект под курсором с подсветкой при наведении
+        
+        # Перемещения мыши объединяются и обрабатываются один раз за кадр
+        self._pending_move_pos = None
+        self._move_timer = QTimer(self)
+        self._move_timer.setSingleShot(True)
+        self._move_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._move_timer.timeout.connect(self.flush_pending_mouse_move)
+        
+        # Координаты мыши и окно свойств обновляются не чаще panel_update_rate раз в секунду
+        self._panel_update_interval = 1 / panel_update_rate if panel_update_rate > 0 else 0
+        self._last_panel_update = 0.0
+        self._pending_coords = None
+        self._pending_properties_item = None
+        self._panel_timer = QTimer(self)
+        self._panel_timer.setSingleShot(True)
+        self._panel_timer.timeout.connect(self.flush_panel_updates)
         
         # Состояния объектов
         self.walls = []
         self.regions = []
+        # Модель сцены без Qt, которую виджет поддерживает в актуальном состоянии
+        self.scene_model = SceneModel(scene_width, scene_height)
+        # Пространственный индекс стен для быстрых проверок пересечения с роботом
+        self.wall_index = SegmentGridIndex(cell_size=2 * grid_size)
+        # Индекс регионов по ограничивающим прямоугольникам для поиска объекта под курсором
+        self.region_index = SegmentGridIndex(cell_size=2 * grid_size)
+        # Порядок добавления стен и регионов: среди равных по Z выше тот, что добавлен позже
+        self._stacking_order = {}
+        self._stacking_counter = count()
+        # Распределители ID стен и регионов этой сцены
+        self.wall_ids = IdAllocator("w")
+        self.region_ids = IdAllocator("r")
+        # Состояние порционной загрузки сцены (None, если загрузка не идет)
+        self._scene_load = None
+        self._suspended_index_method = None
+        self._scene_load_timer = QTimer(self)
+        self._scene_load_timer.setInterval(0)
+        self._scene_load_timer.timeout.connect(self._load_scene_chunk)
         self.robot_model = None
         self.start_position_model = None  
+        # История правок для отмены и повтора
+        self.undo_stack = UndoStack(undo_limit)
+        # Запеченный слой стен и регионов для режима наблюдателя: слой лежит между
+        # осями и объектами, а сами стены и регионы в этом режиме скрыты
+        self.static_layer_enabled = static_layer_cache
+        self.static_layer = StaticLayerItem(self._static_items_in_rect, self._scene_revision)
+        self.static_layer.setZValue(1.5)
+        self.static_layer.hide()
+        self.scene().addItem(self.static_layer)
+        self._live_static_items = set()  # выделенные и подсвеченные объекты, которые рисуются сами
+        self._drag_record = None  # (объект, состояние) в начале перетаскивания
+        self._undo_lookup = None  # {тип: {ID: объект}} на время применения команды отмены
         self.dragging_robot = False
         self.robot_offset = QPointF()
         self.scene_width = scene_width  # размеры сцены из конфигурации
@@ -111,27 +219,156 @@ class FieldWidget(QGraphicsView):
         self.draw_axes()
         self.init_robot(QPointF(0, 0))  # Робот по умолчанию в (0, 0)
         self.init_start_position(QPointF(25, 25))  # Стартовая позиция по умолчанию
+        # Робот и стартовая позиция - одиночки и могли быть созданы с другими режимами кэширования
+        self._apply_item_cache_modes()
         
         # Устанавливаем размер сцены
         self.scene().setSceneRect(-self.scene_width/2, -self.scene_height/2, self.scene_width, self.scene_height)
+        self._update_static_layer_bounds()
+        self._update_static_layer_mode()
 
     # отрисовка сетки
     def draw_grid(self):
+        if self.grid_mode != self.GRID_MODE_ITEMS:
+            # Сетка рисуется в drawBackground, достаточно перерисовать фон
+            self.invalidate_grid()
+            return
+
         for x in range(-self.scene_width // 2, self.scene_width // 2, self.grid_size):
             line = QGraphicsLineItem(x, -self.scene_height // 2, x, self.scene_height // 2)
-            line.setPen(QPen(Qt.GlobalColor.lightGray, 1, Qt.PenStyle.DotLine))
+            line.setPen(self._grid_pen)
             line.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, False)
             line.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
             self.grid_layer.addToGroup(line)
-            logger.debug(f"Added grid line at x={x}")
 
         for y in range(-self.scene_height // 2, self.scene_height // 2, self.grid_size):
             line = QGraphicsLineItem(-self.scene_width // 2, y, self.scene_width // 2, y)
-            line.setPen(QPen(Qt.GlobalColor.lightGray, 1, Qt.PenStyle.DotLine))
+            line.setPen(self._grid_pen)
             line.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, False)
             line.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
             self.grid_layer.addToGroup(line)
-            logger.debug(f"Added grid line at y={y}")
+        logger.debug("Added %s grid lines", len(self.grid_layer.childItems()))
+
+    def set_grid_mode(self, mode):
+        """
+        Переключает режим отрисовки сетки.
+        
+        Args:
+            mode: GRID_MODE_BACKGROUND или GRID_MODE_ITEMS
+        """
+        if mode not in (self.GRID_MODE_BACKGROUND, self.GRID_MODE_ITEMS):
+            raise ValueError(f"Неизвестный режим отрисовки сетки: {mode}")
+        if mode == self.grid_mode:
+            return
+        self.grid_mode = mode
+        self._clear_grid_items()
+        self.draw_grid()
+        self.invalidate_grid()
+
+    def invalidate_grid(self):
+        """Сбрасывает кэш плиток сетки и запрашивает перерисовку фона."""
+        self._grid_tile_cache.clear()
+        self.resetCachedContent()
+        if self.scene():
+            self.scene().invalidate(self.scene().sceneRect(), QGraphicsScene.SceneLayer.BackgroundLayer)
+
+    def _clear_grid_items(self):
+        """Удаляет элементы сетки режима GRID_MODE_ITEMS со сцены."""
+        for item in self.grid_layer.childItems():
+            self.grid_layer.removeFromGroup(item)
+            self.scene().removeItem(item)
+
+    def drawBackground(self, painter, rect):
+        """Рисует фон сцены и, в режиме GRID_MODE_BACKGROUND, видимую часть сетки."""
+        super().drawBackground(painter, rect)
+        if self.grid_mode != self.GRID_MODE_BACKGROUND or self.grid_size <= 0:
+            return
+
+        # Сетка занимает [-w//2, w//2) x [-h//2, h//2), как и в режиме GRID_MODE_ITEMS
+        left = -self.scene_width // 2
+        top = -self.scene_height // 2
+        grid_rect = QRectF(left, top, self.scene_width // 2 - left, self.scene_height // 2 - top)
+        visible = rect.intersected(grid_rect)
+        if visible.isEmpty():
+            return
+
+        if self.grid_tile_cache_enabled and self._draw_grid_tiles(painter, visible, QPointF(left, top)):
+            return
+        self._draw_grid_lines(painter, visible, grid_rect)
+
+    def _draw_grid_lines(self, painter, visible, grid_rect):
+        """Рисует только те линии сетки, которые попадают в видимую область."""
+        size = self.grid_size
+        left, top = grid_rect.left(), grid_rect.top()
+
+        first_x = left + ceil((visible.left() - left) / size) * size
+        first_y = top + ceil((visible.top() - top) / size) * size
+        lines = []
+        x = first_x
+        while x <= visible.right() and x < grid_rect.right():
+            lines.append(QLineF(x, grid_rect.top(), x, grid_rect.bottom()))
+            x += size
+        y = first_y
+        while y <= visible.bottom() and y < grid_rect.bottom():
+            lines.append(QLineF(grid_rect.left(), y, grid_rect.right(), y))
+            y += size
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        painter.setPen(self._grid_pen)
+        painter.drawLines(lines)
+        painter.restore()
+
+    def _draw_grid_tiles(self, painter, visible, origin):
+        """
+        Заполняет видимую область плитками сетки, закэшированными для текущего масштаба.
+        
+        Returns:
+            bool: False, если плитку нельзя использовать (нецелый размер клетки в пикселях)
+        """
+        transform = painter.worldTransform()
+        scale = transform.m11()
+        if transform.isRotating() or scale <= 0 or abs(transform.m22() - scale) > 1e-9:
+            return False
+        tile_size = self.grid_size * scale
+        if tile_size < 1 or abs(tile_size - round(tile_size)) > 1e-6:
+            return False
+        tile_size = int(round(tile_size))
+
+        tile = self._grid_tile(tile_size, scale, painter.device().devicePixelRatioF())
+        device_rect = transform.mapRect(visible)
+        device_origin = transform.map(origin)
+        offset = QPointF((device_rect.left() - device_origin.x()) % tile_size,
+                         (device_rect.top() - device_origin.y()) % tile_size)
+
+        painter.save()
+        painter.resetTransform()
+        painter.drawTiledPixmap(device_rect, tile, offset)
+        painter.restore()
+        return True
+
+    def _grid_tile(self, tile_size, scale, device_pixel_ratio):
+        """Возвращает (и кэширует) плитку одной клетки сетки с линиями по левому и верхнему краю."""
+        key = (tile_size, device_pixel_ratio)
+        tile = self._grid_tile_cache.get(key)
+        if tile is not None:
+            return tile
+
+        tile = QPixmap(int(round(tile_size * device_pixel_ratio)), int(round(tile_size * device_pixel_ratio)))
+        tile.setDevicePixelRatio(device_pixel_ratio)
+        tile.fill(Qt.GlobalColor.transparent)
+        tile_painter = QPainter(tile)
+        pen = QPen(self._grid_pen)
+        pen.setWidthF(self._grid_pen.widthF() * scale)
+        tile_painter.setPen(pen)
+        half = pen.widthF() / 2
+        tile_painter.drawLine(QLineF(half, 0, half, tile_size))
+        tile_painter.drawLine(QLineF(0, half, tile_size, half))
+        tile_painter.end()
+
+        self._grid_tile_cache[key] = tile
+        logger.debug("Grid tile cached: size=%spx, dpr=%s", tile_size, device_pixel_ratio)
+        return tile
     # отрисовка осей
     def draw_axes(self):
         logger.debug("Drawing axes...")
@@ -214,41 +451,68 @@ class FieldWidget(QGraphicsView):
     def select_item(self, item):
         """Выделяет объект"""
         # Проверяем, не выделяем ли тот же объект
-        logger.debug(f"Selecting item: {item}, а был выделен {self.selected_item}")
+        logger.debug("Selecting item: %s, а был выделен %s", item, self.selected_item)
         if item == self.selected_item:
-            logger.debug(f"Item {item} is already selected, skipping")
+            logger.debug("Item %s is already selected, skipping", item)
             return
         
         if self.selected_item:
             self.deselect_item()
 
         if isinstance(item, (Wall, Robot, Region, StartPosition)):
-            logger.debug(f"Selecting item: {item}")
+            logger.debug("Selecting item: %s", item)
             self.selected_item = item
             
             # Если это объект с поддержкой HoverHighlightMixin, отключаем hover_highlight
             if isinstance(item, HoverHighlightMixin) and item._is_hovered:
-                logger.debug(f"Disabling hover highlight for selected item")
-                item.set_hover_highlight(False)
+                logger.debug("Disabling hover highlight for selected item")
+                self._set_hover_highlight(item, False)
                 
             # Активируем выделение объекта
-            self.selected_item.set_highlight(True)
+            self._set_selection_highlight(self.selected_item, True)
+            self._refresh_live_items()
             self.item_selected.emit(item)
             
     def deselect_item(self):
         """Снимает выделение с объекта."""
         if self.selected_item:
-            logger.debug(f"Deselecting item: {self.selected_item}")
+            logger.debug("Deselecting item: %s", self.selected_item)
             if isinstance(self.selected_item, (Wall, Robot, Region, StartPosition)):
-                self.selected_item.set_highlight(False)
+                self._set_selection_highlight(self.selected_item, False)
                 
                 # Восстанавливаем подсветку при наведении, если мышь всё ещё над объектом
                 if isinstance(self.selected_item, HoverHighlightMixin) and self.selected_item._is_hovered:
-                    logger.debug(f"Restoring hover highlight after deselection")
-                    self.selected_item.set_hover_highlight(True)
+                    logger.debug("Restoring hover highlight after deselection")
+                    self._set_hover_highlight(self.selected_item, True)
                 
             self.selected_item = None
+            self._refresh_live_items()
             self.item_deselected.emit()
+
+    def _set_hover_highlight(self, item, enabled):
+        """Показывает или скрывает подсветку при наведении на объекте item."""
+        item.set_hover_highlight(enabled)
+        self._show_overlay(self.hover_overlay, item, enabled)
+
+    def _set_selection_highlight(self, item, enabled):
+        """Включает или выключает выделение объекта item."""
+        item.set_highlight(enabled)
+        self._show_overlay(self.selection_overlay, item, enabled)
+
+    def _show_overlay(self, overlay, item, enabled):
+        """Переносит общую обводку overlay на объект item или снимает ее с него."""
+        if item.paints_own_highlight:
+            return
+        if enabled:
+            overlay.attach(item)
+        elif overlay.target() is item:
+            overlay.detach()
+
+    def _release_overlays(self, item):
+        """Снимает общие обводки с объекта перед его удалением со сцены."""
+        for overlay in (self.hover_overlay, self.selection_overlay):
+            if overlay.target() is item:
+                overlay.detach()
     
     def wall_intersects_robot(self, x1, y1, x2, y2, thickness=None):
         """
@@ -265,21 +529,17 @@ class FieldWidget(QGraphicsView):
         if not self.robot_model: 
             return False
             
-        robot_rect = self.robot_model.boundingRect()
+        bounds = self.robot_model.boundingRect()
+        pos = self.robot_model.pos()
         # Учитываем позицию робота при проверке пересечения
-        robot_rect.translate(self.robot_model.pos())
-        
-        # Линия стены
-        wall_line = QLineF(QPointF(x1, y1), QPointF(x2, y2))
+        robot_rect = geometry.Rect(pos.x() + bounds.x(), pos.y() + bounds.y(), bounds.width(), bounds.height())
         
-        # Если толщина не указана, получаем её из временной стены
+        # Если толщина не указана, используем толщину стены по умолчанию
         if thickness is None:
-            # Создаем временную стену для определения толщины линии
-            temp_wall = Wall(QPointF(x1, y1), QPointF(x2, y2), is_temp=True)
-            thickness = temp_wall.stroke_width
+            thickness = geometry.DEFAULT_WALL_WIDTH
         
         # Проверяем пересечение линии стены с прямоугольником робота с учетом толщины
-        return self.line_with_thickness_intersects_rect(wall_line, robot_rect, thickness)
+        return geometry.thick_segment_intersects_rect(x1, y1, x2, y2, robot_rect, thickness)
     
     def line_intersects_rect(self, line, rect):
         """
@@ -288,23 +548,10 @@ class FieldWidget(QGraphicsView):
         :param rect: Прямоугольник (QRectF).
         :return: True, если линия пересекает прямоугольник, иначе False.
         """
-        # Получаем стороны прямоугольника
-        top = QLineF(rect.topLeft(), rect.topRight())
-        right = QLineF(rect.topRight(), rect.bottomRight())
-        bottom = QLineF(rect.bottomLeft(), rect.bottomRight())
-        left = QLineF(rect.topLeft(), rect.bottomLeft())
-
-        # Проверяем пересечение линии с каждой стороной прямоугольника
-        for side in [top, right, bottom, left]:
-            intersection_type, intersection_point = line.intersects(side)
-            if intersection_type == QLineF.IntersectionType.BoundedIntersection:
-                return True  # Линия пересекает прямоугольник
-
-        # Проверяем, находится ли один из концов линии внутри прямоугольника
-        if rect.contains(line.p1()) or rect.contains(line.p2()):
-            return True
-
-        return False  # Линия не пересекает прямоугольник
+        return geometry.segment_intersects_rect(
+            line.x1(), line.y1(), line.x2(), line.y2(),
+            geometry.Rect(rect.x(), rect.y(), rect.width(), rect.height())
+        )
 
     def add_wall(self, p1, p2, wall_id=None):
         """
@@ -318,42 +565,45 @@ class FieldWidget(QGraphicsView):
         Returns:
             Wall: Добавленная стена или None, если добавление не удалось
         """
-        logger.debug(f"Добавление стены: {p1} - {p2}, id={wall_id}")
+        logger.debug("Добавление стены: %s - %s, id=%s", p1, p2, wall_id)
         
-        # Создаем новую стену сначала для получения толщины
-        temp_wall = Wall(p1, p2, wall_id=None, is_temp=True)
-        
-        # Проверяем пересечение с роботом, передавая толщину стены
-        if self.wall_intersects_robot(p1.x(), p1.y(), p2.x(), p2.y(), thickness=temp_wall.stroke_width):
+        # Проверяем пересечение с роботом, передавая толщину стены по умолчанию
+        if self.wall_intersects_robot(p1.x(), p1.y(), p2.x(), p2.y(), thickness=geometry.DEFAULT_WALL_WIDTH):
             logger.warning("Стена пересекается с роботом - отмена добавления")
             return None
             
-        # Создаем новую стену для добавления на сцену
-        wall = Wall(p1, p2, wall_id)
-        wall_id = wall.id  # Сохраняем ID для возможной очистки
-        
         # Проверяем, находится ли стена в пределах сцены
-        if not self.check_object_within_scene(wall):
+        if not geometry.segment_within_bounds(p1.x(), p1.y(), p2.x(), p2.y(), self.scene_width, self.scene_height):
             logger.warning("Стена выходит за границы сцены - отмена добавления")
-            # Очищаем ID, так как стена не будет добавлена
-            Wall._existing_ids.remove(wall_id)
             return None
             
-        # Добавляем стену на сцену
-        self.objects_layer.addToGroup(wall)
-        self.walls.append(wall)
-        
-        # Настраиваем обработку событий для стены
-        wall.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
-        wall.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
+        # Создаем новую стену и добавляем ее на сцену
+        wall = self._create_wall(p1, p2, wall_id)
+        self._push_item_change(wall, None, "Добавление стены")
         
-        logger.debug(f"Стена успешно добавлена с id={wall.id}")
+        logger.debug("Стена успешно добавлена с id=%s", wall.id)
         
         # Автоматически выделяем созданную стену
         self.select_item(wall)         
 
         return wall
         
+    def _create_wall(self, p1, p2, wall_id=None, width=geometry.DEFAULT_WALL_WIDTH):
+        """
+        Создает стену и добавляет ее на сцену без проверок и выделения.
+        
+        Returns:
+            Wall: Созданная стена
+        """
+        wall = Wall(p1, p2, wall_id, width=width, render_mode=self.wall_render_mode,
+                    id_allocator=self.wall_ids)
+        wall.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
+        wall.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
+        self._add_static_item(wall)
+        self.walls.append(wall)
+        self.index_wall(wall)
+        return wall
+        
     def add_region(self, rect_or_points, region_id=None, color=None):
         """
         Добавляет новый регион на сцену.
@@ -366,7 +616,14 @@ class FieldWidget(QGraphicsView):
         Returns:
             Region: Добавленный регион или None, если добавление не удалось
         """
-        logger.debug(f"Добавление региона: {rect_or_points}, id={region_id}, color={color}")
+        logger.debug("Добавление региона: %s, id=%s, color=%s", rect_or_points, region_id, color)
+        
+        # Проверяем, находится ли регион в пределах сцены, до создания объекта
+        if isinstance(rect_or_points, (QRectF, list)):
+            bounds = self._region_bounds(rect_or_points)
+            if bounds is not None and not geometry.rect_within_bounds(bounds, self.scene_width, self.scene_height):
+                logger.warning("Регион выходит за границы сцены - отмена добавления")
+                return None
         
         # Проверяем, что за тип передан
         if isinstance(rect_or_points, QRectF):
@@ -386,53 +643,62 @@ class FieldWidget(QGraphicsView):
             ]
             
             # Создаем новый регион
-            region = Region(points, region_id, color=color if color else "#800000ff")
+            region = Region(points, region_id, color=color if color else "#800000ff",
+                            id_allocator=self.region_ids)
             
             # Устанавливаем позицию региона
             region.setPos(x, y)
         elif isinstance(rect_or_points, list):
             # Список точек напрямую передается в конструктор Region
-            region = Region(rect_or_points, region_id, color=color if color else "#800000ff")
+            region = Region(rect_or_points, region_id, color=color if color else "#800000ff",
+                            id_allocator=self.region_ids)
         else:
             logger.error(f"Неподдерживаемый тип для создания региона: {type(rect_or_points)}")
             return None
-        
-        # Проверяем, находится ли регион в пределах сцены
-        if not self.check_object_within_scene(region):
-            logger.warning("Регион выходит за границы сцены - отмена добавления")
-            
-            # Освобождаем ID региона, если он был создан
-            try:
-                if region.id in Region._existing_ids:
-                    Region._existing_ids.remove(region.id)
-                    logger.debug(f"Освободили ID {region.id} неудачно созданного региона")
-            except Exception as e:
-                logger.debug(f"Ошибка при освобождении ID: {e}")
-                
-            return None
             
         # Добавляем регион на сцену через слой объектов
-        self.objects_layer.addToGroup(region)
+        self._add_static_item(region)
         
         # Сохраняем ссылку на регион в списке для быстрого доступа
         self.regions.append(region)
+        self.sync_region_record(region)
         
         # Настраиваем обработку событий для региона
         region.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
         region.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
+        self._push_item_change(region, None, "Добавление региона")
         
-        logger.debug(f"Регион успешно добавлен с id={region.id}")
+        logger.debug("Регион успешно добавлен с id=%s", region.id)
         
         # Автоматически выделяем созданный регион
         self.select_item(region) 
 
         return region
 
+    @staticmethod
+    def _region_bounds(rect_or_points):
+        """
+        Возвращает ограничивающий прямоугольник будущего региона.
+        
+        Args:
+            rect_or_points: Прямоугольник (QRectF) или список точек (QPointF)
+            
+        Returns:
+            geometry.Rect: Ограничивающий прямоугольник или None, если точек недостаточно
+        """
+        if isinstance(rect_or_points, QRectF):
+            return geometry.Rect(rect_or_points.x(), rect_or_points.y(),
+                                 rect_or_points.width(), rect_or_points.height())
+        if len(rect_or_points) < 3:
+            return None
+        xs = [point.x() for point in rect_or_points]
+        ys = [point.y() for point in rect_or_points]
+        return geometry.Rect(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+
     def init_robot(self, pos):
-        logger.debug(f"Setting robot position to {pos}")
+        logger.debug("Setting robot position to %s", pos)
         # Проверяем, находится ли робот в пределах сцены
-        temp_robot = Robot(pos)
-        if not self.check_object_within_scene(temp_robot):
+        if not geometry.robot_within_bounds(pos.x(), pos.y(), self.scene_width, self.scene_height):
             logger.warning(f"Robot position {pos} is out of bounds - using default position (0, 0)")
             pos = QPointF(0, 0)
             
@@ -441,6 +707,8 @@ class FieldWidget(QGraphicsView):
             self.scene().removeItem(self.robot_model)
         self.robot_model = Robot(pos)
         self.objects_layer.addToGroup(self.robot_model)
+        self.update_robot_render_scale()
+        self.scene_model.robot = RobotRecord(pos.x(), pos.y())
     
     def init_start_position(self, pos, direction=0):
         """
@@ -450,12 +718,13 @@ class FieldWidget(QGraphicsView):
             pos: Позиция стартовой позиции (QPointF)
             direction: Начальное направление стартовой позиции
         """
-        logger.debug(f"Setting start position to {pos}, direction: {direction}")
+        logger.debug("Setting start position to %s, direction: %s", pos, direction)
         if self.start_position_model is not None:
             logger.debug("Removing existing start position from scene")
             self.scene().removeItem(self.start_position_model)
         self.start_position_model = StartPosition(pos, direction)
         self.objects_layer.addToGroup(self.start_position_model)
+        self.scene_model.start_position = StartPositionRecord(pos.x(), pos.y(), direction)
 
     def set_drawing_mode(self, mode):
         # Если меняем режим рисования, снимаем выделение с текущего объекта
@@ -464,12 +733,144 @@ class FieldWidget(QGraphicsView):
                 self.deselect_item()
         
         self.drawing_mode = mode
+        self._update_static_layer_mode()
 
     def set_edit_mode(self, enabled):
         self.edit_mode = enabled
+        self._update_static_layer_mode()
+
+    def is_observer_mode(self):
+        """Возвращает True в режиме наблюдателя (не рисование и не редактирование)."""
+        return self.drawing_mode is None and not self.edit_mode
+
+    def set_static_layer_enabled(self, enabled):
+        """Включает или выключает запеченный слой стен и регионов в режиме наблюдателя."""
+        self.static_layer_enabled = enabled
+        self._update_static_layer_mode()
+
+    def _update_static_layer_mode(self):
+        """
+        Переключает отрисовку стен и регионов между запеченным слоем и элементами сцены.
+        
+        В режиме наблюдателя объекты не меняются от действий мыши, поэтому они
+        скрываются, а их изображение рисует static_layer из кэша плиток. Выделенный
+        и подсвеченный объекты остаются видимыми (см. _refresh_live_items).
+        """
+        baked = self.static_layer_enabled and self.is_observer_mode()
+        if baked == self.static_layer.isVisible():
+            return
+        for item in self.walls + self.regions:
+            item.setVisible(not baked)
+        self._live_static_items = set()
+        self.static_layer.setVisible(baked)
+        if baked:
+            self._refresh_live_items()
+        else:
+            # Плитки не нужны вне режима наблюдателя
+            self.static_layer.invalidate()
+        logger.debug("Static layer %s", "enabled" if baked else "disabled")
+
+    def _update_static_layer_bounds(self):
+        """Растягивает запеченный слой на сцену с запасом на маркеры и обводки."""
+        margin = 2 * geometry.DEFAULT_WALL_WIDTH
+        self.static_layer.set_bounds(self.scene().sceneRect().adjusted(-margin, -margin, margin, margin))
+
+    def _add_static_item(self, item):
+        """Добавляет стену или регион в слой объектов (скрытым, если включен запеченный слой)."""
+        self.objects_layer.addToGroup(item)
+        if self.static_layer.isVisible():
+            item.hide()
+
+    def _static_items_in_rect(self, rect):
+        """Возвращает стены и регионы для запекания в прямоугольнике сцены: сначала регионы, затем стены."""
+        live = self._live_static_items
+        regions = [region for region in self.regions
+                   if region not in live and region.sceneBoundingRect().intersects(rect)]
+        # Индекс хранит тело стены, а маркеры и обводки выходят за него - расширяем запрос
+        query = rect.adjusted(-2 * geometry.DEFAULT_WALL_WIDTH, -2 * geometry.DEFAULT_WALL_WIDTH,
+                              2 * geometry.DEFAULT_WALL_WIDTH, 2 * geometry.DEFAULT_WALL_WIDTH)
+        walls = [wall for wall in self.wall_index.query_rect(query.left(), query.top(), query.right(), query.bottom())
+                 if wall not in live and wall.sceneBoundingRect().intersects(rect)]
+        return regions + walls
+
+    def _scene_revision(self):
+        """Возвращает ревизию модели сцены для сброса плиток запеченного слоя."""
+        return self.scene_model.revision
+
+    @staticmethod
+    def _topmost_at(item, pos):
+        """Возвращает верхний видимый элемент из item и его потомков, форма которого содержит точку сцены pos."""
+        for child in reversed(item.childItems()):
+            if child.isVisible():
+                hit = FieldWidget._topmost_at(child, pos)
+                if hit is not None:
+                    return hit
+        return item if item.contains(item.mapFromScene(pos)) else None
+
+    def _item_at(self, pos):
+        """
+        Возвращает верхний элемент сцены под точкой pos.
+        
+        Робот и стартовая позиция проверяются напрямую, а стены и регионы - только
+        кандидаты из пространственных индексов, поэтому поиск не зависит от числа
+        объектов (scene().itemAt перебирает всех потомков слоя объектов).
+        При включенном запеченном слое скрытые им стены и регионы тоже находятся.
+        """
+        for item in (self.robot_model, self.start_position_model):
+            if item is not None and item.isVisible():
+                hit = self._topmost_at(item, pos)
+                if hit is not None:
+                    return hit
+        baked = self.static_layer.isVisible()
+        x, y = pos.x(), pos.y()
+        # Индекс хранит тело стены, а маркеры и обводки выходят за него - расширяем запрос
+        margin = 2 * geometry.DEFAULT_WALL_WIDTH
+        walls = self.wall_index.query_rect(x - margin, y - margin, x + margin, y + margin)
+        regions = self.region_index.query_rect(x, y, x, y)
+        # Выделенный объект мог быть добавлен на сцену в обход add_wall/add_region
+        # и не попасть в индекс - тогда он проверяется последним в своей группе
+        if isinstance(self.selected_item, Wall):
+            walls.add(self.selected_item)
+        elif isinstance(self.selected_item, Region):
+            regions.add(self.selected_item)
+        order = self._stacking_order
+        # Стены лежат в слое объектов выше регионов
+        for candidates in (walls, regions):
+            for item in sorted(candidates, key=lambda item: order.get(item, -1), reverse=True):
+                if item.isVisible():
+                    hit = self._topmost_at(item, pos)
+                elif baked and item.contains(item.mapFromScene(pos)):
+                    hit = item
+                else:
+                    hit = None
+                if hit is not None:
+                    return hit
+        return None
+
+    def _refresh_live_items(self):
+        """
+        Показывает выделенный и подсвеченный объекты поверх запеченного слоя.
+        
+        Такие объекты исключаются из плиток, чтобы их подсветка рисовалась
+        элементами сцены; затронутые плитки перерисовываются.
+        """
+        if not self.static_layer.isVisible():
+            return
+        live = {item for item in (self.selected_item, self._hovered_item) if isinstance(item, (Wall, Region))}
+        if live == self._live_static_items:
+            return
+        for item in live ^ self._live_static_items:
+            item.setVisible(item in live)
+            self.static_layer.invalidate_rect(item.sceneBoundingRect())
+        self._live_static_items = live
+
+    def _scene_objects_changed(self):
+        """Запрашивает перерисовку запеченного слоя после изменения стен или регионов."""
+        if self.static_layer.isVisible():
+            self.static_layer.update()
 
     def set_scene_size(self, width, height):
-        logger.debug(f"Setting scene size to width={width}, height={height}")
+        logger.debug("Setting scene size to width=%s, height=%s", width, height)
 
         # Проверка, влезают ли объекты
         if not self.check_objects_within_bounds(width, height):
@@ -485,9 +886,7 @@ class FieldWidget(QGraphicsView):
             return
 
         # Убираем старую сетку со сцены
-        for item in self.grid_layer.childItems():
-            self.grid_layer.removeFromGroup(item)
-            self.scene().removeItem(item)  # Удаляем элементы из сцены
+        self._clear_grid_items()
 
         # Убираем старые оси координат со сцены
         for item in self.axes_layer.childItems():
@@ -497,7 +896,9 @@ class FieldWidget(QGraphicsView):
         # Обновляем размеры сцены
         self.scene_width = width
         self.scene_height = height
-        logger.debug(f"Updated scene dimensions: width={self.scene_width}, height={self.scene_height}")
+        self.scene_model.scene_width = width
+        self.scene_model.scene_height = height
+        logger.debug("Updated scene dimensions: width=%s, height=%s", self.scene_width, self.scene_height)
 
         logger.debug("Drawing grid and axes...")
         self.draw_grid()
@@ -505,12 +906,13 @@ class FieldWidget(QGraphicsView):
         
         # Обновляем размер сцены
         self.scene().setSceneRect(-self.scene_width/2, -self.scene_height/2, self.scene_width, self.scene_height)
+        self._update_static_layer_bounds()
 
         # Обновляем видимость скроллбаров после изменения размера сцены
         self.update_scrollbars_visibility()
 
         logger.debug("Scene size updated successfully.") 
-        logger.debug(f"Scene size set to: {width}x{height}")
+        logger.debug("Scene size set to: %sx%s", width, height)
 
     def update_scrollbars_visibility(self):
         """Обновляет видимость скроллбаров в зависимости от размера сцены и текущего масштаба"""
@@ -522,9 +924,7 @@ class FieldWidget(QGraphicsView):
     def redraw_grid(self):
         """Перерисовывает сетку и оси"""
         # Убираем старую сетку со сцены
-        for item in self.grid_layer.childItems():
-            self.grid_layer.removeFromGroup(item)
-            self.scene().removeItem(item)  # Удаляем элементы из сцены
+        self._clear_grid_items()
 
         # Убираем старые оси координат со сцены
         for item in self.axes_layer.childItems():
@@ -579,73 +979,45 @@ class FieldWidget(QGraphicsView):
         if isinstance(item, Wall):
             # Для стены проверяем обе точки линии
             line = item.line()
-            return (
-                -scene_width / 2 <= line.x1() <= scene_width / 2 and
-                -scene_height / 2 <= line.y1() <= scene_height / 2 and
-                -scene_width / 2 <= line.x2() <= scene_width / 2 and
-                -scene_height / 2 <= line.y2() <= scene_height / 2
+            return geometry.segment_within_bounds(
+                line.x1(), line.y1(), line.x2(), line.y2(), scene_width, scene_height
             )
         
         # Проверяем, является ли элемент регионом
         elif isinstance(item, Region):
-            # Для региона проверяем его ограничивающий прямоугольник
+            # Для региона проверяем, что все углы ограничивающего прямоугольника находятся в пределах сцены
             rect = item.boundingRect()
             pos = item.pos()
-            
-            # Проверяем, что все углы прямоугольника находятся в пределах сцены
-            top_left = QPointF(pos.x() + rect.x(), pos.y() + rect.y())
-            top_right = QPointF(pos.x() + rect.x() + rect.width(), pos.y() + rect.y())
-            bottom_left = QPointF(pos.x() + rect.x(), pos.y() + rect.y() + rect.height())
-            bottom_right = QPointF(pos.x() + rect.x() + rect.width(), pos.y() + rect.y() + rect.height())
-            
-            # Проверяем, что все углы прямоугольника находятся в пределах сцены
-            return (
-                -scene_width / 2 <= top_left.x() <= scene_width / 2 and
-                -scene_height / 2 <= top_left.y() <= scene_height / 2 and
-                -scene_width / 2 <= top_right.x() <= scene_width / 2 and
-                -scene_height / 2 <= top_right.y() <= scene_height / 2 and
-                -scene_width / 2 <= bottom_left.x() <= scene_width / 2 and
-                -scene_height / 2 <= bottom_left.y() <= scene_height / 2 and
-                -scene_width / 2 <= bottom_right.x() <= scene_width / 2 and
-                -scene_height / 2 <= bottom_right.y() <= scene_height / 2
+            return geometry.rect_within_bounds(
+                geometry.Rect(pos.x() + rect.x(), pos.y() + rect.y(), rect.width(), rect.height()),
+                scene_width, scene_height
             )
         
         elif isinstance(item, Robot):
-            # Для робота проверяем его позицию и размеры
-            # Размер робота фиксирован - 50x50 пикселей
+            # Для робота проверяем его позицию и фиксированный размер 50x50 пикселей,
+            # а не размеры boundingRect
             pos = item.pos()
-            logger.debug(f"Checking robot position: pos=({pos.x()}, {pos.y()})")
-            logger.debug(f"Scene bounds: x=({-scene_width/2}, {scene_width/2}), y=({-scene_height/2}, {scene_height/2})")
-            
-            # Проверяем, что робот полностью находится в пределах сцены
-            # с учетом его размеров (50x50 пикселей)
-            # Используем точные размеры робота, а не размеры boundingRect
-            return (
-                -scene_width / 2 <= pos.x() and pos.x() + 50 <= scene_width / 2 and
-                -scene_height / 2 <= pos.y() and pos.y() + 50 <= scene_height / 2
-            )
+            logger.debug("Checking robot position: pos=(%s, %s)", pos.x(), pos.y())
+            return geometry.robot_within_bounds(pos.x(), pos.y(), scene_width, scene_height)
             
         elif isinstance(item, StartPosition):
-            # Для стартовой позиции проверяем центр, т.к. крест довольно компактный
+            # Для стартовой позиции проверяем центр с отступом, т.к. крест довольно компактный
             pos = item.pos()
-            logger.debug(f"Checking start position: pos=({pos.x()}, {pos.y()})")
-            
-            # Проверяем, что стартовая позиция находится в пределах сцены
-            # Добавляем отступ 25 пикселей 
-            return (
-                -scene_width / 2 + 25 <= pos.x() <= scene_width / 2 - 25 and
-                -scene_height / 2 + 25 <= pos.y() <= scene_height / 2 - 25
-            )
+            logger.debug("Checking start position: pos=(%s, %s)", pos.x(), pos.y())
+            return geometry.start_position_within_bounds(pos.x(), pos.y(), scene_width, scene_height)
         
         return False
     
     def mousePressEvent(self, event):
+        # Применяем отложенное перемещение до обработки нажатия
+        self.flush_pending_mouse_move()
+        
         posOriginal = self.mapToScene(event.pos()) # оригинальные координаты
         pos = self.snap_to_grid(posOriginal) # координаты с привязкой к сетке
 
-        item = self.scene().itemAt(posOriginal, self.transform())
+        item = self._item_at(posOriginal)
         parent_item = item.parentItem() if item else None
-        logger.debug(f"CLICK: position={posOriginal}, item={type(item)}, parent={type(parent_item) if parent_item else None}")
+        logger.debug("CLICK: position=%s, item=%s, parent=%s", posOriginal, type(item), type(parent_item) if parent_item else None)
         
         if event.button() == Qt.MouseButton.LeftButton:
             
@@ -663,27 +1035,27 @@ class FieldWidget(QGraphicsView):
                     item = parent_item
                 
                 # Добавляем отладочную информацию
-                logger.debug(f"Mouse press on item: {item}, parent: {parent_item}")
+                logger.debug("Mouse press on item: %s, parent: %s", item, parent_item)
                 
                 # Проверяем, является ли объект или его родитель поддерживаемым типом
                 if self.is_supported_item(item):
                     target_item = item
-                    logger.debug(f"Clicked directly on supported item: {target_item}")
+                    logger.debug("Clicked directly on supported item: %s", target_item)
                     self.select_item(target_item)
                 elif parent_item and self.is_supported_item(parent_item):
                     # Если кликнули на дочерний элемент поддерживаемого объекта (например, обводку)
                     target_item = parent_item
-                    logger.debug(f"Clicked on child of supported item: {target_item}")
+                    logger.debug("Clicked on child of supported item: %s", target_item)
                     self.select_item(target_item)
                 elif parent_item and parent_item == self.selected_item:
                     # Если кликнули на дочерний элемент выделенного объекта
                     target_item = parent_item
-                    logger.debug(f"Clicked on child of selected item: {target_item}")
+                    logger.debug("Clicked on child of selected item: %s", target_item)
                 else:
                     # Клик по другому объекту, не являющемуся выделяемым
                     # Не будем снимать выделение при клике на объекты вне сцены
                     if item.scene() == self.scene():
-                        logger.debug(f"Clicked on non-selectable item: {item}")
+                        logger.debug("Clicked on non-selectable item: %s", item)
                         self.deselect_item()
             else:
                 # Клик по пустому месту
@@ -692,52 +1064,41 @@ class FieldWidget(QGraphicsView):
 
             # Обработка перемещения объектов в режиме редактирования
             if self.edit_mode:
-                if item and hasattr(item, 'data') and item.data(0) == "wall_marker":  # Проверяем свойство
-                    self.selected_marker = item
-                    self.dragging_item = None  # Сбрасываем перетаскиваемый объект
-                    return
-                elif item and hasattr(item, 'data') and item.data(0) == "its_wall":
-                    # Получаем родительский объект (Wall)
-                    if parent_item and isinstance(parent_item, Wall):
-                        self.dragging_item = parent_item
-                        # Сохраняем точку захвата
-                        self.grab_point = pos
-                        # Сохраняем начальные координаты стены
-                        line = self.dragging_item.line()
-                        self.initial_line = QLineF(line.x1(), line.y1(), line.x2(), line.y2())
+                # Стена или любой её дочерний элемент: маркер конца или тело определяем по геометрии
+                wall = item if isinstance(item, Wall) else (parent_item if isinstance(parent_item, Wall) else None)
+                if wall:
+                    end = wall.marker_at(posOriginal)
+                    if end:
+                        self.selected_marker = (wall, end)
+                        self.dragging_item = None  # Сбрасываем перетаскиваемый объект
+                        self._begin_drag_record(wall)
                         return
+                    # Для стены сохраняем точку захвата и начальные координаты
+                    self.dragging_item = wall
+                    self.grab_point = pos
+                    line = wall.line()
+                    self.initial_line = QLineF(line.x1(), line.y1(), line.x2(), line.y2())
+                    self._begin_drag_record(wall)
+                    return
                 elif item and hasattr(item, 'data') and item.data(0) == "hover_highlight":
                     # Получаем родительский объект для hover_highlight
-                    if parent_item and isinstance(parent_item, Wall):
-                        # Для стены сохраняем точку захвата и начальные координаты
-                        self.dragging_item = parent_item
-                        self.grab_point = pos
-                        line = self.dragging_item.line()
-                        self.initial_line = QLineF(line.x1(), line.y1(), line.x2(), line.y2())
-                        return
-                    elif parent_item and isinstance(parent_item, (Robot, Region, StartPosition)):
+                    if parent_item and isinstance(parent_item, (Robot, Region, StartPosition)):
                         # Для других объектов
                         self.dragging_item = parent_item
                         self.drag_offset = pos - self.dragging_item.pos()
+                        self._begin_drag_record(parent_item)
                         return
-                elif item and (isinstance(item, (Robot, Region, StartPosition, Wall))):
-                    # Если кликнули непосредственно на объект
+                elif item and (isinstance(item, (Robot, Region, StartPosition))):
+                    # Если кликнули непосредственно на объект с позицией
                     self.dragging_item = item
-                    
-                    # Разная логика для разных типов объектов
-                    if isinstance(item, Wall):
-                        # Для стены сохраняем точку захвата и начальные координаты
-                        self.grab_point = pos
-                        line = self.dragging_item.line()
-                        self.initial_line = QLineF(line.x1(), line.y1(), line.x2(), line.y2())
-                    else:
-                        # Для объектов с позицией (Robot, Region, StartPosition)
-                        self.drag_offset = pos - self.dragging_item.pos()
+                    self.drag_offset = pos - self.dragging_item.pos()
+                    self._begin_drag_record(item)
                     return
                 elif parent_item and isinstance(parent_item, (Robot, Region, StartPosition)):
                     # Если кликнули на дочерний элемент
                     self.dragging_item = parent_item
                     self.drag_offset = pos - self.dragging_item.pos()
+                    self._begin_drag_record(parent_item)
                     return
 
             # Обработка рисования стен и регионов
@@ -755,7 +1116,7 @@ class FieldWidget(QGraphicsView):
                 if self.region_start is None:
                     # Первый клик: устанавливаем начальную точку
                     self.region_start = pos
-                    logger.debug(f"Region start: {self.region_start}")
+                    logger.debug("Region start: %s", self.region_start)
                 else:
                     # Второй клик: создаем регион
                     self.add_region(QRectF(self.region_start, pos).normalized())
@@ -765,14 +1126,85 @@ class FieldWidget(QGraphicsView):
                         self.temp_region = None
     
     def mouseMoveEvent(self, event):
-        posOriginal = self.mapToScene(event.pos()) # оригинальные координаты
+        # Запоминаем только последнюю позицию: все события за кадр обрабатываются один раз
+        self._pending_move_pos = event.pos()
+        if not self._move_timer.isActive():
+            self._move_timer.start(self._frame_interval_ms())
+            
+        # Перетаскивание виджет обрабатывает сам, остальное сразу получает сцена
+        if not (self.edit_mode and (getattr(self, 'dragging_item', None) or self.selected_marker)):
+            super().mouseMoveEvent(event)
+            
+    def flush_pending_mouse_move(self):
+        """Обрабатывает последнее отложенное перемещение мыши, если оно есть."""
+        self._move_timer.stop()
+        view_pos = self._pending_move_pos
+        if view_pos is None:
+            return
+        self._pending_move_pos = None
+        self._process_mouse_move(view_pos)
+        
+    def _frame_interval_ms(self):
+        """Возвращает длительность кадра по частоте обновления экрана."""
+        screen = self.screen()
+        refresh_rate = screen.refreshRate() if screen else 0
+        if refresh_rate <= 0:
+            refresh_rate = DEFAULT_REFRESH_RATE
+        return max(1, int(1000 / refresh_rate))
+        
+    def _schedule_panel_update(self, coords=None, item=None):
+        """
+        Откладывает обновление координат мыши и окна свойств.
+        
+        Обновления применяются не чаще panel_update_rate раз в секунду;
+        из нескольких отложенных обновлений применяется только последнее.
+        
+        Args:
+            coords: Координаты мыши в сцене (x, y)
+            item: Объект, свойства которого нужно обновить
+        """
+        if coords is not None:
+            self._pending_coords = coords
+        if item is not None:
+            self._pending_properties_item = item
+            
+        remaining = self._last_panel_update + self._panel_update_interval - time.perf_counter()
+        if remaining <= 0:
+            self.flush_panel_updates()
+        elif not self._panel_timer.isActive():
+            self._panel_timer.start(max(1, int(remaining * 1000)))
+            
+    def flush_panel_updates(self):
+        """Применяет отложенные обновления координат мыши и окна свойств."""
+        self._panel_timer.stop()
+        self._last_panel_update = time.perf_counter()
+        
+        coords, self._pending_coords = self._pending_coords, None
+        item, self._pending_properties_item = self._pending_properties_item, None
+        if coords is not None:
+            self.mouse_coords_updated.emit(*coords)
+        if item is not None:
+            self.properties_window.update_properties(item)
+            
+    def _process_mouse_move(self, view_pos):
+        """
+        Обрабатывает перемещение мыши в позицию view_pos (координаты viewport).
+        
+        Вызывается не чаще одного раза за кадр с последней позицией курсора.
+        """
+        posOriginal = self.mapToScene(view_pos) # оригинальные координаты
         pos = self.snap_to_grid(posOriginal) # координаты с привязкой к сетке
         
-        # Отправляем сигнал с координатами        
-        self.mouse_coords_updated.emit(posOriginal.x(), posOriginal.y())
+        # Отправляем координаты (с ограничением частоты)
+        self._schedule_panel_update(coords=(posOriginal.x(), posOriginal.y()))
+        
+        # Перетаскивание и рисование объекта - взаимодействие с упрощенной отрисовкой
+        if (getattr(self, 'dragging_item', None) or self.dragging_robot or self.selected_marker
+                or self.temp_wall or self.temp_region):
+            self._note_interaction()
         
         # Проверяем, находится ли курсор над выделяемым объектом
-        item = self.scene().itemAt(posOriginal, self.transform())
+        item = self._item_at(posOriginal)
         
         # Обработка наведения для объектов с HoverHighlightMixin
         self.handle_hover_for_item(item, posOriginal)
@@ -821,7 +1253,7 @@ class FieldWidget(QGraphicsView):
                 self.setCursor(Qt.CursorShape.ArrowCursor)
         
         if self.edit_mode and hasattr(self, 'dragging_item') and self.dragging_item:
-            logger.debug(f"Dragging {self.dragging_item}")            
+            logger.debug("Dragging %s", self.dragging_item)            
             if isinstance(self.dragging_item, (Robot, Region)):
                 # Вычисляем новую позицию
                 new_pos = pos - self.drag_offset
@@ -830,58 +1262,42 @@ class FieldWidget(QGraphicsView):
                 if isinstance(self.dragging_item, Robot):
                     # Проверяем пересечение со стенами
                     if self.robot_intersects_walls(new_pos):
-                        logger.debug(f"Robot would intersect with walls")
+                        logger.debug("Robot would intersect with walls")
                         # Не обновляем позицию робота, если он пересекается со стенами
                         return
                         
                     # Проверяем границы сцены
-                    temp_robot = Robot(new_pos)
-                    if not self.check_object_within_scene(temp_robot):
-                        logger.debug(f"Robot would be out of bounds")
+                    if not geometry.robot_within_bounds(new_pos.x(), new_pos.y(), self.scene_width, self.scene_height):
+                        logger.debug("Robot would be out of bounds")
                         return
                     # Устанавливаем позицию реального робота только если проверка пройдена
                     self.dragging_item.setPos(new_pos)
+                    self._update_robot_record(x=new_pos.x(), y=new_pos.y())
                     # Сохраняем текущую позицию как последнюю допустимую
                     self.last_valid_robot_pos = new_pos
                     # Обновляем свойства в окне свойств в режиме реального времени
-                    self.properties_window.update_properties(self.dragging_item)
+                    self._schedule_panel_update(item=self.dragging_item)
                 elif isinstance(self.dragging_item, Region):                        
-                    # Создаем временный путь для проверки границ региона
-                    path = self.dragging_item.path()
-                    bounds = path.boundingRect()
+                    # Границы региона в новой позиции
+                    bounds = self.dragging_item.path().boundingRect()
                     
-                    # Создаем временный регион для проверки
-                    temp_points = [
-                        QPointF(new_pos.x() + bounds.x(), new_pos.y() + bounds.y()), 
-                        QPointF(new_pos.x() + bounds.x() + bounds.width(), new_pos.y() + bounds.y()),
-                        QPointF(new_pos.x() + bounds.x() + bounds.width(), new_pos.y() + bounds.y() + bounds.height()),
-                        QPointF(new_pos.x() + bounds.x(), new_pos.y() + bounds.y() + bounds.height())
-                    ]
-                    
-                    # Создаем временный регион используя специальный метод
-                    temp_region = Region.create_temp_region(temp_points)
-                    temp_region_id = temp_region.id
-                    
-                    logger.debug(f"Current region: pos=({self.dragging_item.pos().x()}, {self.dragging_item.pos().y()}), bounds=({bounds.x()}, {bounds.y()}, {bounds.width()}, {bounds.height()})")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Current region: pos=(%s, %s), bounds=(%s, %s, %s, %s)", self.dragging_item.pos().x(), self.dragging_item.pos().y(), bounds.x(), bounds.y(), bounds.width(), bounds.height())
                     
                     # Проверяем границы
-                    within_scene = self.check_object_within_scene(temp_region)
-                    
-                    # Освобождаем ID временного региона
-                    try:
-                        if temp_region_id in Region._existing_ids:
-                            Region._existing_ids.remove(temp_region_id)
-                            logger.debug(f"Освободили временный ID {temp_region_id}")
-                    except Exception as e:
-                        logger.debug(f"Ошибка при освобождении ID временного региона: {e}")
+                    within_scene = geometry.rect_within_bounds(
+                        geometry.Rect(new_pos.x() + bounds.x(), new_pos.y() + bounds.y(), bounds.width(), bounds.height()),
+                        self.scene_width, self.scene_height
+                    )
                     
                     if not within_scene:
-                        logger.debug(f"ERR region would be out of bounds")
+                        logger.debug("ERR region would be out of bounds")
                         return
                 
                     self.dragging_item.setPos(new_pos)
+                    self.sync_region_record(self.dragging_item)
                     # Обновляем свойства в окне свойств в режиме реального времени
-                    self.properties_window.update_properties(self.dragging_item)
+                    self._schedule_panel_update(item=self.dragging_item)
             elif isinstance(self.dragging_item, StartPosition):
                 # Для стартовой позиции используем половинный шаг сетки
                 if self.snap_to_grid_enabled:
@@ -891,18 +1307,19 @@ class FieldWidget(QGraphicsView):
                 else:
                     new_pos = posOriginal - self.drag_offset
                 
-                # Создаем временную стартовую позицию для проверки
-                temp_start = StartPosition(new_pos)
-                if not self.check_object_within_scene(temp_start):
-                    logger.debug(f"ERR start position would be out of bounds")
+                # Проверяем границы сцены для новой позиции
+                if not geometry.start_position_within_bounds(new_pos.x(), new_pos.y(), self.scene_width, self.scene_height):
+                    logger.debug("ERR start position would be out of bounds")
                     # Ограничиваем позицию в пределах сцены
-                    x = max(min(new_pos.x(), self.scene_width/2 - 25), -self.scene_width/2 + 25)
-                    y = max(min(new_pos.y(), self.scene_height/2 - 25), -self.scene_height/2 + 25)
+                    margin = geometry.START_POSITION_MARGIN
+                    x = max(min(new_pos.x(), self.scene_width/2 - margin), -self.scene_width/2 + margin)
+                    y = max(min(new_pos.y(), self.scene_height/2 - margin), -self.scene_height/2 + margin)
                     new_pos = QPointF(x, y)
                 
                 # Обновляем позицию и свойства
                 self.dragging_item.setPos(new_pos)
-                self.properties_window.update_properties(self.dragging_item)
+                self._update_start_position_record(x=new_pos.x(), y=new_pos.y())
+                self._schedule_panel_update(item=self.dragging_item)
             elif isinstance(self.dragging_item, Wall):
                 # Вычисляем смещение относительно точки захвата
                 dx = pos.x() - self.grab_point.x()
@@ -911,40 +1328,35 @@ class FieldWidget(QGraphicsView):
                 new_pos_y1 = self.initial_line.y1() + dy
                 new_pos_x2 = self.initial_line.x2() + dx
                 new_pos_y2 = self.initial_line.y2() + dy
-                logger.debug(f"to: {new_pos_x1, new_pos_y1, new_pos_x2, new_pos_y2}")
-                
-                # Создаем временную стену для проверки границ
-                temp_wall = Wall(QPointF(new_pos_x1, new_pos_y1), QPointF(new_pos_x2, new_pos_y2), is_temp=True)
-                temp_wall_id = temp_wall.id
+                logger.debug("to: (%s, %s, %s, %s)", new_pos_x1, new_pos_y1, new_pos_x2, new_pos_y2)
                 
                 # Обновляем саму линию стены, смещая обе точки, если нет пересечения с роботом
-                if not self.wall_intersects_robot(new_pos_x1, new_pos_y1, new_pos_x2, new_pos_y2, thickness=self.dragging_item.stroke_width) and self.check_object_within_scene(temp_wall):
+                # и стена остается в пределах сцены
+                if (not self.wall_intersects_robot(new_pos_x1, new_pos_y1, new_pos_x2, new_pos_y2, thickness=self.dragging_item.stroke_width) and
+                        geometry.segment_within_bounds(new_pos_x1, new_pos_y1, new_pos_x2, new_pos_y2, self.scene_width, self.scene_height)):
                     with self.dragging_item.updating():
                         self.dragging_item.setLine(new_pos_x1, new_pos_y1, new_pos_x2, new_pos_y2)
-                    self.properties_window.update_properties(self.dragging_item)
-                    
-                # Очищаем временный ID
-                Wall.cleanup_temp_id(temp_wall_id)
+                    self._schedule_panel_update(item=self.dragging_item)
             return
         elif self.edit_mode and self.selected_marker:            
-            wall = self.selected_marker.parentItem()
-            if self.selected_marker == wall.start_marker:
-                logger.debug(f"Moving wall start marker to {pos}")
+            wall, end = self.selected_marker
+            if end == "start":
+                logger.debug("Moving wall start marker to %s", pos)
                 if self.wall_intersects_robot(pos.x(), pos.y(), wall.line().x2(), wall.line().y2(), thickness=wall.stroke_width):
-                    logger.debug(f"ERR robot intersects")
+                    logger.debug("ERR robot intersects")
                     return 
                 else:
                     with wall.updating():
                         wall.setLine(pos.x(), pos.y(), wall.line().x2(), wall.line().y2())
-                    self.properties_window.update_properties(wall)  # Обновляем свойства
+                    self._schedule_panel_update(item=wall)  # Обновляем свойства
             else:
                 if self.wall_intersects_robot(wall.line().x1(), wall.line().y1(), pos.x(), pos.y(), thickness=wall.stroke_width):
-                    logger.debug(f"ERR robot intersects")
+                    logger.debug("ERR robot intersects")
                     return 
                 else:                    
                     with wall.updating():
                         wall.setLine(wall.line().x1(), wall.line().y1(), pos.x(), pos.y())
-                    self.properties_window.update_properties(wall)  # Обновляем свойства
+                    self._schedule_panel_update(item=wall)  # Обновляем свойства
             return
 
         if self.drawing_mode == "wall" and self.wall_start:
@@ -962,11 +1374,12 @@ class FieldWidget(QGraphicsView):
             self.temp_region = QGraphicsRectItem(rect)
             self.temp_region.setPen(QPen(Qt.GlobalColor.gray, 2, Qt.PenStyle.DashLine))
             self.temp_region.setBrush(QBrush(Qt.GlobalColor.transparent))
-            self.scene().addItem(self.temp_region)   
-
-        super().mouseMoveEvent(event)    
+            self.scene().addItem(self.temp_region)
 
     def mouseReleaseEvent(self, event):
+        # Применяем отложенное перемещение до обработки отпускания
+        self.flush_pending_mouse_move()
+        
         # После отпускания кнопки мыши возвращаем стандартный курсор, если не над объектом
         self.setCursor(Qt.CursorShape.ArrowCursor)
             
@@ -979,7 +1392,7 @@ class FieldWidget(QGraphicsView):
                 if isinstance(self.dragging_item, Robot):
                     # Проверяем пересечение со стенами
                     if self.robot_intersects_walls(self.dragging_item.pos()):
-                        logger.debug(f"Robot intersects with walls, resetting position")
+                        logger.debug("Robot intersects with walls, resetting position")
                         # Возвращаем робота в последнюю допустимую позицию
                         if hasattr(self, 'last_valid_robot_pos'):
                             self.dragging_item.setPos(self.last_valid_robot_pos)
@@ -988,7 +1401,7 @@ class FieldWidget(QGraphicsView):
                             self.dragging_item.setPos(0, 0)
                     # Проверка на выход за границы сцены
                     elif not self.check_object_within_scene(self.dragging_item):
-                        logger.debug(f"Robot is out of bounds, resetting position")
+                        logger.debug("Robot is out of bounds, resetting position")
                         # Возвращаем робота в последнюю допустимую позицию
                         if hasattr(self, 'last_valid_robot_pos'):
                             self.dragging_item.setPos(self.last_valid_robot_pos)
@@ -998,11 +1411,19 @@ class FieldWidget(QGraphicsView):
                     else:
                         # Сохраняем текущую позицию как последнюю допустимую
                         self.last_valid_robot_pos = self.dragging_item.pos()
-                
+
+                    # Позиция могла быть возвращена к последней допустимой
+                    robot_pos = self.dragging_item.pos()
+                    self._update_robot_record(x=robot_pos.x(), y=robot_pos.y())
+
                 # Обновляем свойства в окне свойств после завершения перетаскивания
-                logger.debug(f"Updating properties after dragging for: {self.dragging_item}")
+                logger.debug("Updating properties after dragging for: %s", self.dragging_item)
+                self._pending_properties_item = None
                 self.properties_window.update_properties(self.dragging_item)
                 self.dragging_item = None  # Сбрасываем перетаскиваемый объект
+            
+            # Все перемещения за время перетаскивания записываются одной командой
+            self._end_drag_record()
 
         super().mouseReleaseEvent(event)
 
@@ -1017,13 +1438,13 @@ class FieldWidget(QGraphicsView):
             bool: True, если обновление прошло успешно, False в противном случае
         """    
 
-        logger.debug(f"Updating robot position to {x}, {y}")
+        logger.debug("Updating robot position to %s, %s", x, y)
         if self.robot_model:
             new_pos = QPointF(x, y)
             
             # Проверяем пересечение со стенами
             if self.robot_intersects_walls(new_pos):
-                logger.debug(f"Robot would intersect with walls, canceling update")
+                logger.debug("Robot would intersect with walls, canceling update")
                 # Показываем предупреждение о пересечении со стенами
                 QMessageBox.warning(
                     None,
@@ -1035,11 +1456,8 @@ class FieldWidget(QGraphicsView):
                 self.properties_updated.emit(self.robot_model)
                 return False
             
-            # Создаем временного робота для проверки границ
-            temp_robot = Robot(new_pos)
-            
             # Проверяем, находится ли робот в пределах сцены
-            if not self.check_object_within_scene(temp_robot):
+            if not geometry.robot_within_bounds(new_pos.x(), new_pos.y(), self.scene_width, self.scene_height):
                 logger.warning(f"Robot position update to ({x}, {y}) rejected - would be out of scene bounds")
                 # Показываем предупреждение о выходе за границы сцены
                 QMessageBox.warning(
@@ -1053,9 +1471,12 @@ class FieldWidget(QGraphicsView):
                 return False
             
             # Устанавливаем новую позицию только если все проверки пройдены
+            before = self._item_state(self.robot_model)
             self.robot_model.setPos(new_pos)
+            self._update_robot_record(x=x, y=y)
             # Сохраняем как последнюю допустимую позицию
             self.last_valid_robot_pos = new_pos
+            self._push_item_change(self.robot_model, before, "Перемещение робота", merge_key="position")
             return True
         return False
     
@@ -1070,7 +1491,10 @@ class FieldWidget(QGraphicsView):
             bool: True, если обновление прошло успешно, False в противном случае
         """
         if self.robot_model:
+            before = self._item_state(self.robot_model)
             self.robot_model.set_direction(direction)
+            self._update_robot_record(direction=direction)
+            self._push_item_change(self.robot_model, before, "Поворот робота", merge_key="direction")
             return True
         return False
     
@@ -1089,7 +1513,7 @@ class FieldWidget(QGraphicsView):
             # Используем метод set_id для установки нового ID
             result = self.robot_model.set_id(new_id)
             if result:
-                logger.debug(f"Robot ID changed from {old_id} to {new_id}")
+                logger.debug("Robot ID changed from %s to %s", old_id, new_id)
                 # Обновляем свойства объекта с новым ID
                 self.properties_updated.emit(self.robot_model)
                 return True
@@ -1115,30 +1539,27 @@ class FieldWidget(QGraphicsView):
             bool: True, если обновление прошло успешно, False в противном случае
         """
         if self.robot_model:
+            before = self._item_state(self.robot_model)
             self.robot_model.set_name(name)
-            logger.debug(f"Robot name changed to {name}")
+            self._update_robot_record(name=name)
+            self._push_item_change(self.robot_model, before, "Изменение имени робота", merge_key="name")
+            logger.debug("Robot name changed to %s", name)
             return True
         return False
     
     def update_wall_point1(self, x1, y1):
         """Обновляет первую точку стены."""
-        logger.debug(f"Updating wall point1 to {x1}, {y1}")
+        logger.debug("Updating wall point1 to %s, %s", x1, y1)
         if self.selected_item and isinstance(self.selected_item, Wall):
             # Получаем координаты второй точки
             line = self.selected_item.line()
             x2, y2 = line.x2(), line.y2()
             
-            # Создаем временную стену для проверки пересечения с роботом
-            temp_wall = Wall(QPointF(x1, y1), QPointF(x2, y2), is_temp=True)
-            thickness = self.stroke_width
-            temp_wall_id = temp_wall.id
+            thickness = self.selected_item.stroke_width
             
             # Проверяем пересечение с роботом, передавая координаты и толщину
             if self.wall_intersects_robot(x1, y1, x2, y2, thickness=thickness):
-                # Очищаем временный ID
-                Wall.cleanup_temp_id(temp_wall_id)
-                
-                logger.debug(f"Wall would intersect with robot, canceling update")
+                logger.debug("Wall would intersect with robot, canceling update")
                 # Показываем предупреждение о пересечении с роботом
                 QMessageBox.warning(
                     None,
@@ -1150,10 +1571,7 @@ class FieldWidget(QGraphicsView):
                 self.properties_updated.emit(self.selected_item)
                 return False
             
-            if not self.check_object_within_scene(temp_wall):
-                # Очищаем временный ID
-                Wall.cleanup_temp_id(temp_wall_id)
-                
+            if not geometry.segment_within_bounds(x1, y1, x2, y2, self.scene_width, self.scene_height):
                 logger.warning(f"Wall point1 update to ({x1}, {y1}) rejected - would be out of scene bounds")
                 # Показываем предупреждение о выходе за границы сцены
                 QMessageBox.warning(
@@ -1166,34 +1584,27 @@ class FieldWidget(QGraphicsView):
                 self.properties_updated.emit(self.selected_item)
                 return False
             
-            # Очищаем временный ID
-            Wall.cleanup_temp_id(temp_wall_id)
-                
             # Если все проверки пройдены, обновляем стену
+            before = self._item_state(self.selected_item)
             with self.selected_item.updating():
                 self.selected_item.setLine(x1, y1, x2, y2)
+            self._push_item_change(self.selected_item, before, "Перемещение конца стены", merge_key="point1")
             return True
         return False
     
     def update_wall_point2(self, x2, y2):
         """Обновляет вторую точку стены."""
-        logger.debug(f"Updating wall point2 to {x2}, {y2}")
+        logger.debug("Updating wall point2 to %s, %s", x2, y2)
         if self.selected_item and isinstance(self.selected_item, Wall):
             # Получаем координаты первой точки
             line = self.selected_item.line()
             x1, y1 = line.x1(), line.y1()
             
-            # Создаем временную стену для проверки пересечения с роботом
-            temp_wall = Wall(QPointF(x1, y1), QPointF(x2, y2), is_temp=True)
             thickness = self.selected_item.stroke_width
-            temp_wall_id = temp_wall.id
             
             # Проверяем пересечение с роботом, передавая координаты и толщину
             if self.wall_intersects_robot(x1, y1, x2, y2, thickness=thickness):
-                # Очищаем временный ID
-                Wall.cleanup_temp_id(temp_wall_id)
-                
-                logger.debug(f"Wall would intersect with robot, canceling update")
+                logger.debug("Wall would intersect with robot, canceling update")
                 # Показываем предупреждение о пересечении с роботом
                 QMessageBox.warning(
                     None,
@@ -1205,10 +1616,7 @@ class FieldWidget(QGraphicsView):
                 self.properties_updated.emit(self.selected_item)
                 return False
             
-            if not self.check_object_within_scene(temp_wall):
-                # Очищаем временный ID
-                Wall.cleanup_temp_id(temp_wall_id)
-                
+            if not geometry.segment_within_bounds(x1, y1, x2, y2, self.scene_width, self.scene_height):
                 logger.warning(f"Wall point2 update to ({x2}, {y2}) rejected - would be out of scene bounds")
                 # Показываем предупреждение о выходе за границы сцены
                 QMessageBox.warning(
@@ -1221,20 +1629,21 @@ class FieldWidget(QGraphicsView):
                 self.properties_updated.emit(self.selected_item)
                 return False
             
-            # Очищаем временный ID
-            Wall.cleanup_temp_id(temp_wall_id)
-                
             # Если все проверки пройдены, обновляем стену
+            before = self._item_state(self.selected_item)
             with self.selected_item.updating():
                 self.selected_item.setLine(x1, y1, x2, y2)
+            self._push_item_change(self.selected_item, before, "Перемещение конца стены", merge_key="point2")
             return True
         return False
     
     def update_wall_size(self, width):
         """Обновляет размер стены."""
-        logger.debug(f"Updating wall size to {width}")
+        logger.debug("Updating wall size to %s", width)
         if self.selected_item and isinstance(self.selected_item, Wall):
-            self.selected_item.set_stroke_width(width)            
+            before = self._item_state(self.selected_item)
+            self.selected_item.set_stroke_width(width)
+            self._push_item_change(self.selected_item, before, "Изменение толщины стены", merge_key="width")
             return True
         return False
     
@@ -1244,18 +1653,9 @@ class FieldWidget(QGraphicsView):
             # Получаем boundingRect из пути региона
             path_rect = self.selected_item.path().boundingRect()
             
-            # Создаем точки для временного региона
-            points = [
-                QPointF(x + path_rect.x(), y + path_rect.y()),
-                QPointF(x + path_rect.x() + path_rect.width(), y + path_rect.y()),
-                QPointF(x + path_rect.x() + path_rect.width(), y + path_rect.y() + path_rect.height()),
-                QPointF(x + path_rect.x(), y + path_rect.y() + path_rect.height())
-            ]
-            
-            # Создаем временный регион для проверки границ сцены
-            temp_region = Region.create_temp_region(points)
-            
-            if not self.check_object_within_scene(temp_region):
+            # Проверяем границы сцены для региона в новой позиции
+            new_rect = geometry.Rect(x + path_rect.x(), y + path_rect.y(), path_rect.width(), path_rect.height())
+            if not geometry.rect_within_bounds(new_rect, self.scene_width, self.scene_height):
                 logger.warning(f"Region position update to ({x}, {y}) rejected - would be out of scene bounds")
                 # Показываем предупреждение о выходе за границы сцены
                 QMessageBox.warning(
@@ -1268,15 +1668,11 @@ class FieldWidget(QGraphicsView):
                 self.properties_updated.emit(self.selected_item)
                 return False
             
-            # Освобождаем ID временного региона
-            try:
-                if temp_region.id in Region._existing_ids:
-                    Region._existing_ids.remove(temp_region.id)
-            except Exception as e:
-                logger.debug(f"Ошибка при освобождении ID временного региона: {e}")
-            
             # Если проверка пройдена, обновляем позицию
+            before = self._item_state(self.selected_item)
             self.selected_item.setPos(x, y)
+            self.sync_region_record(self.selected_item)
+            self._push_item_change(self.selected_item, before, "Перемещение региона", merge_key="position")
             return True
         return False
     
@@ -1289,40 +1685,19 @@ class FieldWidget(QGraphicsView):
         if not hasattr(self, '_showing_warning_dialog'):
             self._showing_warning_dialog = False
         
-        logger.debug(f"===== НАЧАЛО update_region_size: width={width}, height={height} =====")
-        
-        # Получаем текущие координаты (позицию) региона
-        pos = self.selected_item.pos()
-        x = pos.x()
-        y = pos.y()
+        logger.debug("===== НАЧАЛО update_region_size: width=%s, height=%s =====", width, height)
         
-        # Сохраняем текущий ID и цвет
-        current_id = self.selected_item.id
-        current_color = self.selected_item.color
-        
-        # Создаем временный регион для проверки границ
-        temp_points = [
-            QPointF(0, 0),
-            QPointF(width, 0),
-            QPointF(width, height),
-            QPointF(0, height)
-        ]
-        
-        # Создаем временный регион используя специальный метод
-        temp_region = Region.create_temp_region(temp_points)
-        temp_region_id = temp_region.id
-        temp_region.setPos(x, y)
-        
-        # Проверяем границы
-        within_scene = self.check_object_within_scene(temp_region)
+        # Левый верхний угол региона в координатах сцены остается на месте
+        region = self.selected_item
+        before = self._item_state(region)
+        x, y = before[0], before[1]
+        if (width, height) == (before[2], before[3]):
+            return
         
-        # Освобождаем ID временного региона
-        try:
-            if temp_region_id in Region._existing_ids:
-                Region._existing_ids.remove(temp_region_id)
-                logger.debug(f"Освободили временный ID {temp_region_id}")
-        except Exception as e:
-            logger.debug(f"Ошибка при освобождении ID временного региона: {e}")
+        # Проверяем границы региона с новыми размерами (без создания объектов)
+        within_scene = geometry.rect_within_bounds(
+            geometry.Rect(x, y, width, height), self.scene_width, self.scene_height
+        )
         
         # Если новый регион выходит за границы сцены, показываем ошибку и не меняем размер
         if not within_scene:
@@ -1360,49 +1735,24 @@ class FieldWidget(QGraphicsView):
             self.properties_window.region_width.blockSignals(False)
             self.properties_window.region_height.blockSignals(False)
             
-            logger.debug(f"===== КОНЕЦ update_region_size (выход за границы) =====")
+            logger.debug("===== КОНЕЦ update_region_size (выход за границы) =====")
             return
         
-        # Освобождаем ID региона перед его удалением
-        try:
-            logging.debug(f"Освобождаем ID {current_id} из Region._existing_ids")
-            Region._existing_ids.remove(current_id)
-        except Exception as e:
-            logger.debug(f"Ошибка при освобождении ID: {e}")
-        
-        # Удаляем старый регион из списка и сцены
-        self.regions.remove(self.selected_item)
-        self.scene().removeItem(self.selected_item)
-        
-        # Создаем новый регион с теми же ID и цветом, используя (0,0) как базовую точку
-        new_points = [
-            QPointF(0, 0),
-            QPointF(width, 0),
-            QPointF(width, height),
-            QPointF(0, height)
-        ]
-        
-        # Создаем новый регион с теми же ID и цветом
-        new_region = Region(new_points, region_id=current_id, color=current_color)
-        
-        # Устанавливаем позицию региона
-        new_region.setPos(x, y)
-        
-        # Добавляем новый регион на сцену
-        self.objects_layer.addToGroup(new_region)
-        self.regions.append(new_region)
-        
-        # Обновляем выбранный элемент
-        self.selected_item = new_region
-        self.item_selected.emit(new_region)
+        # Меняем геометрию того же объекта: ID, выделение и окно свойств остаются прежними
+        region.set_rect(x, y, width, height)
+        self.sync_region_record(region)
+        self._push_item_change(region, before, "Изменение размера региона", merge_key="size")
         
-        logger.debug(f"Регион обновлен с id={current_id}, позиция=({x}, {y}), размер=({width}, {height})")
-        logger.debug(f"===== КОНЕЦ update_region_size (успешно) =====")
+        logger.debug("Регион обновлен с id=%s, позиция=(%s, %s), размер=(%s, %s)", region.id, x, y, width, height)
+        logger.debug("===== КОНЕЦ update_region_size (успешно) =====")
     
     def update_region_color(self, color):
         """Обновляет цвет региона."""
         if self.selected_item and isinstance(self.selected_item, Region):
+            before = self._item_state(self.selected_item)
             self.selected_item.set_color(color)
+            self.sync_region_record(self.selected_item)
+            self._push_item_change(self.selected_item, before, "Изменение цвета региона", merge_key="color")
             return True
         return False
 
@@ -1411,12 +1761,13 @@ class FieldWidget(QGraphicsView):
         if self.snap_to_grid_enabled != enabled:
             self.snap_to_grid_enabled = enabled
             # Эмитируем сигнал об изменении режима привязки к сетке
-            logger.debug(f"Изменение режима привязки к сетке: {enabled}")
+            logger.debug("Изменение режима привязки к сетке: %s", enabled)
             self.grid_snap_changed.emit(enabled)
     
     def set_grid_size(self, size):
         """Устанавливает размер сетки."""
         self.grid_size = size
+        self.invalidate_grid()
 
     def update_wall_id(self, new_id):
         """Обновляет ID выбранной стены."""
@@ -1425,7 +1776,9 @@ class FieldWidget(QGraphicsView):
             # Используем метод set_id для установки нового ID
             result = self.selected_item.set_id(new_id)
             if result:
-                logger.debug(f"Wall ID changed from {old_id} to {new_id}")
+                self.scene_model.rename_wall(old_id, self.selected_item.id)
+                self.undo_stack.push(RenameChange("wall", old_id, self.selected_item.id, "Изменение ID стены"))
+                logger.debug("Wall ID changed from %s to %s", old_id, new_id)
                 # Обновляем свойства объекта с новым ID
                 self.properties_updated.emit(self.selected_item)
                 return True
@@ -1450,7 +1803,9 @@ class FieldWidget(QGraphicsView):
             # Используем метод set_id класса Region для установки ID
             result = self.selected_item.set_id(new_id)
             if result:
-                logger.debug(f"Region ID changed from {old_id} to {new_id}")
+                self.scene_model.rename_region(old_id, self.selected_item.id)
+                self.undo_stack.push(RenameChange("region", old_id, self.selected_item.id, "Изменение ID региона"))
+                logger.debug("Region ID changed from %s to %s", old_id, new_id)
                 # Обновляем свойства объекта с новым ID
                 self.properties_updated.emit(self.selected_item)
                 return True
@@ -1470,10 +1825,63 @@ class FieldWidget(QGraphicsView):
 
     def set_theme(self, is_dark_theme=True):
         """Устанавливает тему для сцены"""
-        self.setStyleSheet(AppStyles.get_scene_style(is_dark_theme))
+        AppStyles.apply_widget_style(self, AppStyles.get_scene_style(is_dark_theme))
+
+    def set_adaptive_rendering(self, enabled):
+        """Включает или выключает упрощенную отрисовку во время прокрутки, масштабирования и перетаскивания."""
+        self.adaptive_rendering = enabled
+        if not enabled:
+            self.finish_interaction()
+
+    def is_interacting(self):
+        """Возвращает True, пока поле рисуется в упрощенном режиме взаимодействия."""
+        return self._interacting
+
+    def _note_interaction(self):
+        """
+        Отмечает шаг прокрутки, масштабирования или перетаскивания.
+        
+        На время взаимодействия отключается сглаживание, viewport обновляется одним
+        ограничивающим прямоугольником изменений, а QGraphicsView не сохраняет
+        состояние painter для каждого объекта и не расширяет области перерисовки
+        под сглаживание. Полное качество возвращается finish_interaction после
+        паузы в interaction_idle_ms.
+        """
+        if not self.adaptive_rendering:
+            return
+        if not self._interacting:
+            self._interacting = True
+            self._apply_render_quality(False)
+        self._interaction_timer.start()
+
+    def finish_interaction(self):
+        """Возвращает полное качество отрисовки и перерисовывает поле."""
+        self._interaction_timer.stop()
+        if not self._interacting:
+            return
+        self._interacting = False
+        self._apply_render_quality(True)
+        self.viewport().update()
+
+    def _apply_render_quality(self, full):
+        """Переключает настройки отрисовки QGraphicsView между полным и быстрым режимами."""
+        self.setRenderHint(QPainter.RenderHint.Antialiasing, full)
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate if full
+                                   else QGraphicsView.ViewportUpdateMode.BoundingRectViewportUpdate)
+        # Все объекты поля сами задают перо и кисть и восстанавливают прочие изменения painter
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontSavePainterState, not full)
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing, not full)
+
+    def scrollContentsBy(self, dx, dy):
+        self._note_interaction()
+        super().scrollContentsBy(dx, dy)
 
     def wheelEvent(self, event):
         """Обработка события колесика мыши для масштабирования и прокрутки"""
+        # Отложенное перемещение относится к текущему масштабу
+        self.flush_pending_mouse_move()
+        self._note_interaction()
+        
         # Проверяем, зажата ли клавиша Ctrl
         is_ctrl_pressed = event.modifiers() & Qt.KeyboardModifier.ControlModifier
         
@@ -1510,7 +1918,7 @@ class FieldWidget(QGraphicsView):
             self.update_scrollbars_visibility()
             
             # Сообщаем об изменении масштаба
-            logger.debug(f"Scale changed to: {self._scale_factor}")
+            logger.debug("Scale changed to: %s", self._scale_factor)
             
             # Подавляем стандартную обработку события
             event.accept()
@@ -1536,10 +1944,44 @@ class FieldWidget(QGraphicsView):
         # Применяем новый масштаб
         self.setTransform(QTransform().scale(self._scale_factor, self._scale_factor))
         
+        # Перерисовываем робота с четкостью, соответствующей новому масштабу
+        self.update_robot_render_scale()
+        # Кэш в координатах объекта рассчитан на масштаб - перестраиваем его (робот перестраивается сам)
+        modes = item_cache.modes()
+        if "item" in (modes["walls"], modes["regions"], modes["start_position"]):
+            self._apply_item_cache_modes()
+        
         # Обновляем видимость скроллбаров
         self.update_scrollbars_visibility()
         
-        logger.debug(f"View scaled to: {self._scale_factor}")
+        logger.debug("View scaled to: %s", self._scale_factor)
+
+    def set_item_cache_modes(self, **modes):
+        """
+        Задает режимы кэширования отрисовки (см. utils.item_cache) и применяет их ко всем объектам сцены.
+
+        Raises:
+            ValueError: Неизвестный вид объектов или режим
+        """
+        item_cache.configure(**modes)
+        self._apply_item_cache_modes()
+
+    def _apply_item_cache_modes(self):
+        """Применяет текущие режимы кэширования к стенам, регионам, роботу и стартовой позиции."""
+        scale = self._scale_factor * self.devicePixelRatioF()
+        for wall in self.walls:
+            wall.apply_cache_mode(scale)
+        for region in self.regions:
+            item_cache.apply(region, "regions", scale)
+        if isinstance(self.robot_model, Robot):
+            item_cache.apply(self.robot_model, "robot", self.robot_model._device_pixel_ratio)
+        if isinstance(self.start_position_model, StartPosition):
+            item_cache.apply(self.start_position_model, "start_position", scale)
+
+    def update_robot_render_scale(self):
+        """Передает роботу текущий масштаб с учетом devicePixelRatio экрана."""
+        if isinstance(self.robot_model, Robot):
+            self.robot_model.set_render_scale(self._scale_factor * self.devicePixelRatioF())
     
     def resetScale(self):
         """Сбрасывает масштаб к стандартному (1.0)"""
@@ -1549,44 +1991,330 @@ class FieldWidget(QGraphicsView):
     def zoomIn(self):
         """Увеличивает масштаб на один шаг"""
         self.scale_view(self._scale_factor + self._scale_step)
-        logger.debug(f"Zoomed in to: {self._scale_factor}")
+        logger.debug("Zoomed in to: %s", self._scale_factor)
     
     def zoomOut(self):
         """Уменьшает масштаб на один шаг"""
         self.scale_view(self._scale_factor - self._scale_step)
-        logger.debug(f"Zoomed out to: {self._scale_factor}")
+        logger.debug("Zoomed out to: %s", self._scale_factor)
     
     def currentScale(self):
         """Возвращает текущий масштаб"""
         return self._scale_factor
 
+    def index_wall(self, wall):
+        """Добавляет стену в пространственный индекс и подписывается на изменения её геометрии."""
+        wall.on_geometry_changed = self._on_wall_geometry_changed
+        self._stacking_order[wall] = next(self._stacking_counter)
+        self._on_wall_geometry_changed(wall)
+
+    def unindex_wall(self, wall):
+        """Удаляет стену из пространственного индекса и модели сцены."""
+        wall.on_geometry_changed = None
+        self.wall_index.remove(wall)
+        self._stacking_order.pop(wall, None)
+        self.scene_model.remove_wall(wall.id)
+
+    def _on_wall_geometry_changed(self, wall):
+        """Обновляет положение стены в пространственном индексе и модели сцены."""
+        line = wall.line()
+        self.wall_index.update(wall, line.x1(), line.y1(), line.x2(), line.y2(), wall.stroke_width / 2)
+        self.scene_model.set_wall(WallRecord(wall.id, line.x1(), line.y1(), line.x2(), line.y2(),
+                                             wall.stroke_width))
+        self._scene_objects_changed()
+
+    def sync_region_record(self, region):
+        """Обновляет запись региона в модели сцены по его текущему положению на сцене."""
+        rect = region.path().boundingRect()
+        pos = region.pos()
+        left, top = pos.x() + rect.x(), pos.y() + rect.y()
+        if region not in self.region_index:
+            self._stacking_order[region] = next(self._stacking_counter)
+        self.region_index.update(region, left, top, left + rect.width(), top + rect.height())
+        self.scene_model.set_region(RegionRecord(region.id, left, top,
+                                                 rect.width(), rect.height(), region.color))
+        self._scene_objects_changed()
+
+    def _update_robot_record(self, **fields):
+        """Обновляет поля записи робота в модели сцены."""
+        if self.scene_model.robot is not None:
+            for name, value in fields.items():
+                setattr(self.scene_model.robot, name, value)
+
+    def _update_start_position_record(self, **fields):
+        """Обновляет поля записи стартовой позиции в модели сцены."""
+        if self.scene_model.start_position is not None:
+            for name, value in fields.items():
+                setattr(self.scene_model.start_position, name, value)
+
     def delete_wall(self, wall):
         """Удаляет стену со сцены"""
         if wall in self.walls:
-            self.scene().removeItem(wall)
-            self.walls.remove(wall)
-            logger.debug(f"Удалена стена {wall.id}")
+            before = self._item_state(wall)
+            self._remove_wall(wall)
+            self.undo_stack.push(StateChange("wall", wall.id, before, None, "Удаление стены"))
+            logger.debug("Удалена стена %s", wall.id)
     
     def delete_region(self, region):
         """Удаляет регион со сцены"""
         if region in self.regions:
-            self.scene().removeItem(region)
-            self.regions.remove(region)
-            logger.debug(f"Удален регион {region.id}")
+            before = self._item_state(region)
+            self._remove_region(region)
+            self.undo_stack.push(StateChange("region", region.id, before, None, "Удаление региона"))
+            logger.debug("Удален регион %s", region.id)
+            
+    def _remove_wall(self, wall):
+        """Удаляет стену со сцены, индекса и модели и освобождает ее ID."""
+        if wall is self.selected_item:
+            self.deselect_item()
+        if wall is self._hovered_item:
+            self._hovered_item = None
+        self._release_overlays(wall)
+        self.unindex_wall(wall)
+        self.scene().removeItem(wall)
+        self.walls.remove(wall)
+        wall.release_id()
+        self._forget_item("wall", wall)
+        self._refresh_live_items()
+        self._scene_objects_changed()
+        
+    def _remove_region(self, region):
+        """Удаляет регион со сцены и модели и освобождает его ID."""
+        if region is self.selected_item:
+            self.deselect_item()
+        if region is self._hovered_item:
+            self._hovered_item = None
+        self._release_overlays(region)
+        region.remove_from_scene()
+        self.regions.remove(region)
+        self.region_index.remove(region)
+        self._stacking_order.pop(region, None)
+        self.scene_model.remove_region(region.id)
+        self._forget_item("region", region)
+        self._refresh_live_items()
+        self._scene_objects_changed()
             
     def delete_selected_item(self):
         """
         Удаляет выбранный элемент на сцене.
-        Временная заглушка.
+        
+        Удалить можно стену или регион; робот и стартовая позиция
+        не удаляются, с них только снимается выделение.
         """
-        logger.debug("Попытка удалить элемент (заглушка)")
-        if self.selected_item:
-            logger.debug(f"Тип выбранного элемента: {type(self.selected_item)}")
-            
-            # Заглушка для отладки - просто снимаем выделение
-            # TODO: реализовать полноценное удаление
+        if isinstance(self.selected_item, Wall):
+            self.delete_wall(self.selected_item)
+        elif isinstance(self.selected_item, Region):
+            self.delete_region(self.selected_item)
+        elif self.selected_item:
             self.deselect_item()
-            logger.debug("Снято выделение с объекта (заглушка)")
+
+    def _item_state(self, item):
+        """
+        Возвращает состояние объекта для стека отмены.
+        
+        Returns:
+            tuple: Стена - (x1, y1, x2, y2, толщина); регион - (x, y, ширина, высота, цвет)
+                в координатах сцены; робот - (x, y, направление, имя);
+                стартовая позиция - (x, y, направление)
+        """
+        if isinstance(item, Wall):
+            line = item.line()
+            return (line.x1(), line.y1(), line.x2(), line.y2(), item.stroke_width)
+        pos = item.pos()
+        if isinstance(item, Region):
+            rect = item.path().boundingRect()
+            return (pos.x() + rect.x(), pos.y() + rect.y(), rect.width(), rect.height(), item.color)
+        if isinstance(item, Robot):
+            return (pos.x(), pos.y(), item.direction, item.name)
+        return (pos.x(), pos.y(), item.direction())
+
+    @staticmethod
+    def _item_kind(item):
+        """Возвращает тип объекта для стека отмены."""
+        if isinstance(item, Wall):
+            return "wall"
+        if isinstance(item, Region):
+            return "region"
+        if isinstance(item, Robot):
+            return "robot"
+        return "start_position"
+
+    def _push_item_change(self, item, before, text, merge_key=None):
+        """
+        Записывает в стек отмены изменение объекта от состояния before до текущего.
+        
+        Args:
+            item: Объект после изменения
+            before: Состояние до изменения (None - объект был добавлен)
+            text: Описание действия
+            merge_key: Ключ объединения последовательных правок одного свойства
+        """
+        kind = self._item_kind(item)
+        item_id = item.id if kind in ("wall", "region") else None
+        self.undo_stack.push(StateChange(kind, item_id, before, self._item_state(item), text, merge_key))
+
+    def _begin_drag_record(self, item):
+        """Запоминает состояние объекта в начале перетаскивания."""
+        self._drag_record = (item, self._item_state(item))
+
+    def _end_drag_record(self):
+        """Записывает перетаскивание одной командой (если объект сдвинулся)."""
+        if self._drag_record is None:
+            return
+        item, before = self._drag_record
+        self._drag_record = None
+        if item.scene() is not None:
+            self._push_item_change(item, before, "Перемещение")
+
+    def undo(self):
+        """
+        Отменяет последнее действие.
+        
+        Returns:
+            bool: True, если действие было отменено
+        """
+        return self._apply_history(self.undo_stack.peek_undo(), self.undo_stack.undo)
+
+    def redo(self):
+        """
+        Повторяет последнее отмененное действие.
+        
+        Returns:
+            bool: True, если действие было повторено
+        """
+        return self._apply_history(self.undo_stack.peek_redo(), self.undo_stack.redo)
+
+    def _apply_history(self, command, apply):
+        """
+        Применяет команду стека отмены одним обновлением сцены.
+        
+        Перерисовка отключается на время применения; для больших команд
+        отключается и индекс сцены, который затем перестраивается один раз.
+        """
+        if command is None or self._drag_record is not None:
+            return False
+        bulk = len(command) >= UNDO_BULK_SIZE
+        if bulk:
+            self._suspend_scene_index(updates_enabled=False)
+        else:
+            self.viewport().setUpdatesEnabled(False)
+        self._undo_lookup = {}
+        try:
+            apply(self)
+        finally:
+            self._undo_lookup = None
+            if bulk:
+                self._resume_scene_index()
+            else:
+                self.viewport().setUpdatesEnabled(True)
+            self.viewport().update()
+        logger.debug("Применена команда истории: %s (объектов: %s)", command.text, len(command))
+        if self.selected_item is not None:
+            self.properties_updated.emit(self.selected_item)
+        return True
+
+    def _find_item(self, kind, item_id):
+        """Возвращает стену или регион по ID (None, если объекта нет)."""
+        items = self.walls if kind == "wall" else self.regions
+        if self._undo_lookup is None:
+            return next((item for item in items if item.id == item_id), None)
+        # Во время применения команды словарь ID строится один раз на тип объектов
+        lookup = self._undo_lookup.get(kind)
+        if lookup is None:
+            lookup = self._undo_lookup[kind] = {item.id: item for item in items}
+        return lookup.get(item_id)
+
+    def _remember_item(self, kind, item):
+        """Добавляет объект в словарь ID, если команда отмены применяется."""
+        if self._undo_lookup is not None and kind in self._undo_lookup:
+            self._undo_lookup[kind][item.id] = item
+
+    def _forget_item(self, kind, item):
+        """Удаляет объект из словаря ID, если команда отмены применяется."""
+        if self._undo_lookup is not None and kind in self._undo_lookup:
+            self._undo_lookup[kind].pop(item.id, None)
+
+    def apply_item_state(self, kind, item_id, state):
+        """
+        Приводит объект к состоянию из стека отмены.
+        
+        Args:
+            kind: 'wall', 'region', 'robot' или 'start_position'
+            item_id: ID стены или региона
+            state: Состояние (см. _item_state); None - объект удаляется
+        """
+        if kind == "wall":
+            self._apply_wall_state(item_id, state)
+        elif kind == "region":
+            self._apply_region_state(item_id, state)
+        elif kind == "robot":
+            if self.robot_model is not None and state is not None:
+                x, y, direction, name = state
+                self.robot_model.setPos(x, y)
+                self.robot_model.set_direction(direction)
+                self.robot_model.set_name(name)
+                self.last_valid_robot_pos = QPointF(x, y)
+                self._update_robot_record(x=x, y=y, direction=direction, name=name)
+        elif kind == "start_position":
+            if self.start_position_model is not None and state is not None:
+                x, y, direction = state
+                self.start_position_model.setPos(x, y)
+                self.start_position_model.set_direction(direction)
+                self._update_start_position_record(x=x, y=y, direction=direction)
+
+    def _apply_wall_state(self, wall_id, state):
+        wall = self._find_item("wall", wall_id)
+        if state is None:
+            if wall is not None:
+                self._remove_wall(wall)
+            return
+        x1, y1, x2, y2, width = state
+        if wall is None:
+            wall = self._create_wall(QPointF(x1, y1), QPointF(x2, y2), wall_id, width)
+            self._remember_item("wall", wall)
+            return
+        if wall.stroke_width != width:
+            wall.set_stroke_width(width)
+        with wall.updating():
+            wall.setLine(x1, y1, x2, y2)
+
+    def _apply_region_state(self, region_id, state):
+        region = self._find_item("region", region_id)
+        if state is None:
+            if region is not None:
+                self._remove_region(region)
+            return
+        x, y, width, height, color = state
+        if region is None:
+            region = Region([QPointF(0, 0), QPointF(width, 0), QPointF(width, height), QPointF(0, height)],
+                            region_id, color, id_allocator=self.region_ids)
+            region.setPos(x, y)
+            self._add_static_item(region)
+            self.regions.append(region)
+            self._remember_item("region", region)
+        else:
+            rect = region.path().boundingRect()
+            if (rect.width(), rect.height()) != (width, height):
+                region.set_rect(x, y, width, height)
+            else:
+                region.setPos(x - rect.x(), y - rect.y())
+            if region.color != color:
+                region.set_color(color)
+        self.sync_region_record(region)
+
+    def apply_item_rename(self, kind, old_id, new_id):
+        """Меняет ID стены или региона при отмене и повторе."""
+        item = self._find_item(kind, old_id)
+        if item is None or not item.set_id(new_id):
+            logger.warning(f"Не удалось изменить ID {old_id} на {new_id} при отмене действия")
+            return
+        if kind == "wall":
+            self.scene_model.rename_wall(old_id, item.id)
+        else:
+            self.scene_model.rename_region(old_id, item.id)
+        if self._undo_lookup is not None and kind in self._undo_lookup:
+            self._undo_lookup[kind].pop(old_id, None)
+            self._undo_lookup[kind][item.id] = item
 
     def clear_scene(self):
         """
@@ -1594,17 +2322,32 @@ class FieldWidget(QGraphicsView):
         """
         logger.debug("Clearing scene...")
         
+        # Прерываем порционную загрузку, иначе она продолжит добавлять объекты
+        self.cancel_scene_load()
+        
+        # Общие обводки не должны удаляться вместе с объектами
+        self.hover_overlay.detach()
+        self.selection_overlay.detach()
+        
         # Удаляем все стены
         for wall in self.walls[:]:
-            logger.debug(f"Removing wall {wall}")
+            logger.debug("Removing wall %s", wall)
+            wall.on_geometry_changed = None
             self.scene().removeItem(wall)
             self.walls.remove(wall)
+        self.wall_index.clear()
         
         # Удаляем все регионы
         for region in self.regions[:]:
-            logger.debug(f"Removing region {region}")
+            logger.debug("Removing region %s", region)
             region.remove_from_scene()
             self.regions.remove(region)
+        self.region_index.clear()
+        self._stacking_order.clear()
+        
+        # Новая сцена нумерует стены и регионы заново
+        self.wall_ids.clear()
+        self.region_ids.clear()
         
         # Удаляем робота
         if self.robot_model:
@@ -1622,14 +2365,22 @@ class FieldWidget(QGraphicsView):
             # Освобождаем экземпляр стартовой позиции
             StartPosition.reset_instance()
         
+        self.scene_model.clear()
+        self._live_static_items = set()
+        self._scene_objects_changed()
+        # История правок относится к прежней сцене
+        self.undo_stack.clear()
+        self._drag_record = None
+        self._hovered_item = None
+        self._pending_move_pos = None
+        self._pending_properties_item = None
+        
         # Сбрасываем режим рисования
         self.drawing_mode = None
         self.selected_item = None
         
         # Очищаем другие выделенные элементы
-        if self.selected_marker:
-            self.scene().removeItem(self.selected_marker)
-            self.selected_marker = None
+        self.selected_marker = None
         
         # Отправляем сигнал о том, что не выделено ни одного элемента
         self.item_deselected.emit()
@@ -1645,6 +2396,316 @@ class FieldWidget(QGraphicsView):
         
         logger.debug("Scene cleared successfully")
 
+    def load_scene(self, data, clear=True):
+        """
+        Загружает объекты сцены одним пакетом.
+        
+        В отличие от add_wall и place_region, стены и регионы проверяются одним
+        проходом по числовым данным без создания временных объектов, вставляются
+        без выделения и при отключенном индексировании сцены, а по окончании
+        испускается один сигнал scene_loaded.
+        
+        Args:
+            data: Данные сцены в формате XMLHandler.parse_xml
+                (ключи walls, regions, robot, start_position)
+            clear: Очистить сцену перед загрузкой. Если False, робот и стартовая
+                позиция из данных добавляются, только если их еще нет на сцене
+                
+        Returns:
+            dict: Количество добавленных объектов (walls, regions)
+                и признаки добавления робота и стартовой позиции (robot, start_position)
+        """
+        self.cancel_scene_load()
+        if clear:
+            self.clear_scene()
+            
+        walls_data = self._accepted_walls(data.get("walls") or [])
+        regions_data = self._accepted_regions(data.get("regions") or [])
+        
+        # Отключаем индекс сцены и перерисовку на время вставки: индекс
+        # перестраивается один раз при восстановлении метода индексирования
+        self._suspend_scene_index(updates_enabled=False)
+        try:
+            self._insert_walls(walls_data)
+            self._insert_regions(regions_data)
+        finally:
+            self._resume_scene_index()
+            
+        return self._finish_scene_load(data, clear, len(walls_data), len(regions_data))
+    
+    def load_scene_chunked(self, data, clear=True, time_slice_ms=SCENE_LOAD_TIME_SLICE_MS):
+        """
+        Загружает объекты сцены порциями по таймеру, не блокируя интерфейс.
+        
+        За один тик таймера вставляется столько стен и регионов, сколько успевает
+        за time_slice_ms, после чего управление возвращается в цикл событий, и
+        окно продолжает перерисовываться. После каждого тика испускается
+        scene_load_progress, по окончании - scene_loaded с итогами как у load_scene.
+        Загрузку можно прервать через cancel_scene_load.
+        
+        Args:
+            data: Данные сцены в формате XMLHandler.parse_xml
+            clear: Очистить сцену перед загрузкой (см. load_scene)
+            time_slice_ms: Длительность одной порции в миллисекундах
+            
+        Returns:
+            int: Общее количество стен и регионов для загрузки
+        """
+        self.cancel_scene_load()
+        if clear:
+            self.clear_scene()
+            
+        self._scene_load = {
+            "data": data,
+            "clear": clear,
+            "walls": data.get("walls") or [],
+            "regions": data.get("regions") or [],
+            "position": 0,
+            "walls_added": 0,
+            "regions_added": 0,
+            "time_slice": time_slice_ms / 1000,
+        }
+        # Перерисовку не отключаем - пользователь должен видеть ход загрузки
+        self._suspend_scene_index(updates_enabled=True)
+        self._scene_load_timer.start()
+        
+        total = len(self._scene_load["walls"]) + len(self._scene_load["regions"])
+        logger.debug("Начата порционная загрузка сцены: %s объектов", total)
+        return total
+    
+    def is_loading_scene(self):
+        """Возвращает True, если идет порционная загрузка сцены."""
+        return self._scene_load is not None
+    
+    def cancel_scene_load(self):
+        """
+        Прерывает порционную загрузку сцены.
+        
+        Уже вставленные объекты остаются на сцене. Испускается сигнал
+        scene_load_cancelled с итогами на момент отмены.
+        
+        Returns:
+            bool: True, если загрузка была прервана, False если она не шла
+        """
+        if self._scene_load is None:
+            return False
+            
+        state = self._scene_load
+        self._scene_load = None
+        self._scene_load_timer.stop()
+        self._resume_scene_index()
+        self.viewport().update()
+        
+        summary = {
+            "walls": state["walls_added"],
+            "regions": state["regions_added"],
+            "robot": False,
+            "start_position": False,
+        }
+        logger.debug("Загрузка сцены прервана: %s", summary)
+        self.scene_load_cancelled.emit(summary)
+        return True
+    
+    def _load_scene_chunk(self):
+        """Вставляет очередную порцию объектов при порционной загрузке сцены."""
+        state = self._scene_load
+        if state is None:
+            self._scene_load_timer.stop()
+            return
+            
+        try:
+            self._insert_scene_chunk(state)
+        except Exception as e:
+            # Исключение, вышедшее из слота таймера, PyQt6 превращает в аварийное
+            # завершение процесса; прерываем загрузку и восстанавливаем индекс сцены
+            logger.error(f"Ошибка при загрузке сцены: {e}", exc_info=True)
+            if not self.cancel_scene_load():
+                self._resume_scene_index()
+            self.scene_load_failed.emit(str(e))
+            
+    def _insert_scene_chunk(self, state):
+        """
+        Вставляет порцию объектов, укладываясь в отведенное время,
+        и завершает загрузку после вставки последней порции.
+        
+        Args:
+            state: Состояние порционной загрузки (self._scene_load)
+        """
+        walls_data = state["walls"]
+        regions_data = state["regions"]
+        total = len(walls_data) + len(regions_data)
+        deadline = time.perf_counter() + state["time_slice"]
+        
+        # Проверяем время не после каждого объекта, а после небольшого пакета;
+        # за тик вставляется хотя бы один пакет, даже если порция уже исчерпана
+        while state["position"] < total:
+            position = state["position"]
+            if position < len(walls_data):
+                batch = walls_data[position:position + SCENE_LOAD_BATCH_SIZE]
+                accepted = self._accepted_walls(batch)
+                self._insert_walls(accepted)
+                state["walls_added"] += len(accepted)
+            else:
+                start = position - len(walls_data)
+                batch = regions_data[start:start + SCENE_LOAD_BATCH_SIZE]
+                accepted = self._accepted_regions(batch)
+                self._insert_regions(accepted)
+                state["regions_added"] += len(accepted)
+            state["position"] += len(batch)
+            if time.perf_counter() >= deadline:
+                break
+            
+        self.scene_load_progress.emit(state["position"], total)
+        
+        if state["position"] >= total:
+            self._scene_load = None
+            self._scene_load_timer.stop()
+            self._resume_scene_index()
+            self._finish_scene_load(state["data"], state["clear"],
+                                    state["walls_added"], state["regions_added"])
+    
+    def _suspend_scene_index(self, updates_enabled):
+        """
+        Отключает индексирование сцены на время массовой вставки объектов.
+        
+        Args:
+            updates_enabled: Оставить ли включенной перерисовку viewport
+        """
+        scene = self.scene()
+        if self._suspended_index_method is None:
+            self._suspended_index_method = scene.itemIndexMethod()
+        scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+        self.viewport().setUpdatesEnabled(updates_enabled)
+        
+    def _resume_scene_index(self):
+        """Восстанавливает индексирование сцены и перерисовку viewport."""
+        if self._suspended_index_method is not None:
+            self.scene().setItemIndexMethod(self._suspended_index_method)
+            self._suspended_index_method = None
+        self.viewport().setUpdatesEnabled(True)
+        
+    def _insert_walls(self, walls_data):
+        """
+        Вставляет на сцену уже проверенные стены.
+        
+        Args:
+            walls_data: Список словарей стен с ключами id, begin, end
+        """
+        # ID резервируются одним проходом: занятые и повторяющиеся заменяются новыми
+        wall_ids = self.wall_ids.reserve_many(wall_data["id"] for wall_data in walls_data)
+        for wall_data, wall_id in zip(walls_data, wall_ids):
+            self._create_wall(QPointF(*wall_data["begin"]), QPointF(*wall_data["end"]), wall_id)
+            
+    def _insert_regions(self, regions_data):
+        """
+        Вставляет на сцену уже проверенные регионы.
+        
+        Args:
+            regions_data: Список словарей регионов с ключами id, rect, color
+        """
+        region_ids = self.region_ids.reserve_many(region_data["id"] for region_data in regions_data)
+        for region_data, region_id in zip(regions_data, region_ids):
+            rect = region_data["rect"]
+            points = [rect.topLeft(), rect.topRight(), rect.bottomRight(), rect.bottomLeft()]
+            region = Region(points, region_id, region_data["color"] or "#800000ff",
+                            id_allocator=self.region_ids)
+            self._add_static_item(region)
+            self.regions.append(region)
+            self.sync_region_record(region)
+            
+    def _finish_scene_load(self, data, clear, walls_added, regions_added):
+        """
+        Завершает загрузку сцены: размещает робота и стартовую позицию
+        и испускает сигнал scene_loaded.
+        
+        Returns:
+            dict: Итоги загрузки (см. load_scene)
+        """
+        # Робот и стартовая позиция - одиночные объекты, для них используются обычные проверки
+        robot_added = False
+        robot_data = data.get("robot")
+        if robot_data and (clear or not self.robot_model):
+            # Игнорируем robot_id, так как для робота используется фиксированный ID
+            robot_added = self.place_robot(
+                position=robot_data["position"],
+                name=robot_data.get("name", ""),
+                direction=robot_data.get("direction", 0)
+            ) is not None
+            if not robot_added:
+                logger.warning(f"Не удалось добавить робота: {robot_data}")
+                
+        start_position_added = False
+        start_position_data = data.get("start_position")
+        if start_position_data and (clear or not self.start_position_model):
+            start_position_added = self.place_start_position(
+                position=QPointF(start_position_data["x"], start_position_data["y"]),
+                direction=start_position_data.get("direction", 0)
+            ) is not None
+            if not start_position_added:
+                logger.warning(f"Не удалось добавить стартовую позицию: {start_position_data}")
+        
+        self.viewport().update()
+        # Загруженные объекты нельзя согласованно отменить по частям
+        self.undo_stack.clear()
+        
+        summary = {
+            "walls": walls_added,
+            "regions": regions_added,
+            "robot": robot_added,
+            "start_position": start_position_added,
+        }
+        logger.debug("Сцена загружена: %s", summary)
+        self.scene_loaded.emit(summary)
+        return summary
+        
+    def _accepted_regions(self, regions_data):
+        """
+        Отбирает регионы, которые помещаются в границы сцены.
+        
+        Args:
+            regions_data: Список словарей регионов с ключами id, rect, color
+            
+        Returns:
+            list: Регионы, прошедшие проверку
+        """
+        accepted = [
+            region_data for region_data in regions_data
+            if geometry.rect_within_bounds(self._region_bounds(region_data["rect"]),
+                                           self.scene_width, self.scene_height)
+        ]
+        if len(accepted) != len(regions_data):
+            logger.warning(f"Пропущено регионов при загрузке: {len(regions_data) - len(accepted)}")
+        return accepted
+        
+    def _accepted_walls(self, walls_data):
+        """
+        Отбирает стены, которые можно добавить на сцену.
+        
+        Проверяются границы сцены и пересечение с роботом, если он уже на сцене.
+        
+        Args:
+            walls_data: Список словарей стен с ключами id, begin, end
+            
+        Returns:
+            list: Стены, прошедшие проверку
+        """
+        robot_rect = None
+        if self.robot_model:
+            bounds = self.robot_model.boundingRect()
+            pos = self.robot_model.pos()
+            robot_rect = geometry.Rect(pos.x() + bounds.x(), pos.y() + bounds.y(), bounds.width(), bounds.height())
+            
+        accepted = [
+            wall_data for wall_data in walls_data
+            if geometry.segment_within_bounds(*wall_data["begin"], *wall_data["end"],
+                                              self.scene_width, self.scene_height)
+            and (robot_rect is None or not geometry.thick_segment_intersects_rect(
+                *wall_data["begin"], *wall_data["end"], robot_rect, geometry.DEFAULT_WALL_WIDTH))
+        ]
+        if len(accepted) != len(walls_data):
+            logger.warning(f"Пропущено стен при загрузке: {len(walls_data) - len(accepted)}")
+        return accepted
+    
     def place_robot(self, position, robot_id=None, name="", direction=0):
         """
         Размещает робота на сцене в указанной позиции.
@@ -1658,7 +2719,7 @@ class FieldWidget(QGraphicsView):
         Returns:
             Robot: Модель робота или None, если размещение не удалось
         """
-        logger.debug(f"Размещение робота в позиции: {position}, name={name}, direction={direction}")
+        logger.debug("Размещение робота в позиции: %s, name=%s, direction=%s", position, name, direction)
         
         # Проверяем, не пересекается ли позиция робота со стенами
         for wall in self.walls:
@@ -1672,13 +2733,8 @@ class FieldWidget(QGraphicsView):
                 return None
         
         # Проверяем, находится ли робот в пределах сцены
-        # Создаем временного робота для проверки границ
-        temp_robot = Robot(position, name=name, direction=direction)
-        if not self.check_object_within_scene(temp_robot):
+        if not geometry.robot_within_bounds(position.x(), position.y(), self.scene_width, self.scene_height):
             logger.warning("Робот выходит за границы сцены - отмена размещения")
-            # Сбрасываем экземпляр, т.к. его не удалось разместить
-            Robot.reset_instance()
-            self.robot_model = None
             return None
             
         # Если у нас уже есть робот на сцене, удаляем его
@@ -1687,9 +2743,11 @@ class FieldWidget(QGraphicsView):
             
         # Создаем нового робота (или получаем существующий экземпляр)
         self.robot_model = Robot(position, name=name, direction=direction)
+        self.scene_model.robot = RobotRecord(position.x(), position.y(), direction, name)
             
         # Добавляем робота на сцену
         self.scene().addItem(self.robot_model)
+        self.update_robot_render_scale()
         
         # Настраиваем обработку событий для робота
         self.robot_model.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
@@ -1698,7 +2756,7 @@ class FieldWidget(QGraphicsView):
         # Сохраняем текущую позицию как последнюю допустимую
         self.last_valid_robot_pos = position
         
-        logger.debug(f"Робот успешно размещен в позиции {position}, id={self.robot_model.id}")
+        logger.debug("Робот успешно размещен в позиции %s, id=%s", position, self.robot_model.id)
         return self.robot_model
         
     def distance_to_line(self, point, line):
@@ -1739,7 +2797,7 @@ class FieldWidget(QGraphicsView):
         Returns:
             Объект Region или None, если размещение не удалось
         """
-        logger.debug(f"Placing region with id={region_id}, color={color}")
+        logger.debug("Placing region with id=%s, color=%s", region_id, color)
         
         # Проверяем, что у нас достаточно точек для формирования региона
         if not points or len(points) < 3:
@@ -1747,15 +2805,16 @@ class FieldWidget(QGraphicsView):
             return None
         
         # Создаем регион
-        region = Region(points, region_id, color)
+        region = Region(points, region_id, color, id_allocator=self.region_ids)
         
         # Добавляем регион на сцену через слой объектов
-        self.objects_layer.addToGroup(region)
+        self._add_static_item(region)
         
         # Сохраняем ссылку на регион
         self.regions.append(region)
+        self.sync_region_record(region)
         
-        logger.debug(f"Region placed successfully with id={region.id}")
+        logger.debug("Region placed successfully with id=%s", region.id)
         return region
 
     def update_start_position(self, x, y):
@@ -1775,9 +2834,8 @@ class FieldWidget(QGraphicsView):
                 pos = self.snap_to_half_grid(QPointF(x, y))
                 x, y = pos.x(), pos.y()
             
-            # Создаем временный объект для проверки границ сцены
-            temp_start = StartPosition(QPointF(x, y))
-            if not self.check_object_within_scene(temp_start):
+            # Проверяем границы сцены для новой позиции
+            if not geometry.start_position_within_bounds(x, y, self.scene_width, self.scene_height):
                 logger.warning(f"Start position update to ({x}, {y}) rejected - would be out of scene bounds")
                 # Показываем предупреждение о выходе за границы сцены
                 QMessageBox.warning(
@@ -1791,7 +2849,11 @@ class FieldWidget(QGraphicsView):
                 return False
             
             # Если проверка пройдена, обновляем позицию
+            before = self._item_state(self.start_position_model)
             self.start_position_model.setPos(x, y)
+            self._update_start_position_record(x=x, y=y)
+            self._push_item_change(self.start_position_model, before, "Перемещение стартовой позиции",
+                                   merge_key="position")
             return True
             
         return False
@@ -1807,7 +2869,11 @@ class FieldWidget(QGraphicsView):
             bool: True, если обновление прошло успешно, False в противном случае
         """
         if self.start_position_model:
+            before = self._item_state(self.start_position_model)
             self.start_position_model.set_direction(direction)
+            self._update_start_position_record(direction=direction)
+            self._push_item_change(self.start_position_model, before, "Поворот стартовой позиции",
+                                   merge_key="direction")
             return True
         return False
 
@@ -1822,14 +2888,9 @@ class FieldWidget(QGraphicsView):
         Returns:
             StartPosition: Объект стартовой позиции, если размещение успешно, None в противном случае
         """
-        # Создаем временный объект для проверки границ сцены
-        temp_start = StartPosition(position, direction)
-        
-        if not self.check_object_within_scene(temp_start):
+        # Проверяем границы сцены до изменения существующей стартовой позиции
+        if not geometry.start_position_within_bounds(position.x(), position.y(), self.scene_width, self.scene_height):
             logger.warning("Стартовая позиция выходит за границы сцены - отмена размещения")
-            # Сбрасываем экземпляр, т.к. его не удалось разместить
-            StartPosition.reset_instance()
-            self.start_position_model = None
             return None
             
         # Если у нас уже есть стартовая позиция на сцене, удаляем ее
@@ -1838,6 +2899,7 @@ class FieldWidget(QGraphicsView):
             
         # Создаем новую стартовую позицию (или получаем существующий экземпляр)
         self.start_position_model = StartPosition(position, direction)
+        self.scene_model.start_position = StartPositionRecord(position.x(), position.y(), direction)
             
         # Добавляем стартовую позицию на сцену
         self.scene().addItem(self.start_position_model)
@@ -1846,7 +2908,7 @@ class FieldWidget(QGraphicsView):
         self.start_position_model.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
         self.start_position_model.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, True)
         
-        logger.debug(f"Стартовая позиция успешно размещена в позиции {position}, direction={direction}")
+        logger.debug("Стартовая позиция успешно размещена в позиции %s, direction=%s", position, direction)
         
         return self.start_position_model
 
@@ -1919,21 +2981,24 @@ class FieldWidget(QGraphicsView):
         elif item and item.parentItem() and isinstance(item.parentItem(), HoverHighlightMixin):
             target_item = item.parentItem()
             
-        # Для всех зарегистрированных объектов с поддержкой наведения
-        for obj in [obj for obj in self.objects_layer.childItems() if isinstance(obj, HoverHighlightMixin)]:
-            # Если объект под курсором, обрабатываем наведение
-            if obj == target_item:
-                if not obj._is_hovered:
-                    logger.debug(f"Hover enter for {obj} at {pos}")
-                    obj._is_hovered = True
-                    # Показываем подсветку при наведении только если объект не выделен
-                    if obj != self.selected_item:
-                        obj.set_hover_highlight(True)
-            # Иначе убираем подсветку, если она была
-            elif obj._is_hovered:
-                logger.debug(f"Hover leave for {obj}")
-                obj._is_hovered = False
-                obj.set_hover_highlight(False)
+        # Стоимость не зависит от числа объектов: меняется только объект под курсором
+        hovered_item = self._hovered_item
+        if target_item is hovered_item:
+            return
+            
+        if hovered_item is not None and hovered_item._is_hovered:
+            logger.debug("Hover leave for %s", hovered_item)
+            hovered_item._is_hovered = False
+            self._set_hover_highlight(hovered_item, False)
+            
+        self._hovered_item = target_item
+        self._refresh_live_items()
+        if target_item is not None and not target_item._is_hovered:
+            logger.debug("Hover enter for %s at %s", target_item, pos)
+            target_item._is_hovered = True
+            # Показываем подсветку при наведении только если объект не выделен
+            if target_item != self.selected_item:
+                self._set_hover_highlight(target_item, True)
                 
     def line_with_thickness_intersects_rect(self, line, rect, thickness):
         """
@@ -1947,26 +3012,20 @@ class FieldWidget(QGraphicsView):
         Returns:
             bool: True, если линия с учетом толщины пересекает прямоугольник, иначе False
         """
-        # Проверяем сначала обычное пересечение
-        if self.line_intersects_rect(line, rect):
-            return True
-            
-        # Если обычное пересечение не обнаружено, проверяем с учетом толщины
-        # Для этого создаем увеличенный прямоугольник с учетом половины толщины линии
-        inflated_rect = QRectF(
-            rect.x() - thickness / 2,
-            rect.y() - thickness / 2,
-            rect.width() + thickness,
-            rect.height() + thickness
+        return geometry.thick_segment_intersects_rect(
+            line.x1(), line.y1(), line.x2(), line.y2(),
+            geometry.Rect(rect.x(), rect.y(), rect.width(), rect.height()),
+            thickness
         )
-        
-        # Проверяем пересечение с увеличенным прямоугольником
-        return self.line_intersects_rect(line, inflated_rect)
 
     def robot_intersects_walls(self, robot_pos):
         """
         Проверяет, пересекается ли робот со стенами в указанной позиции.
         
+        Кандидаты для точной проверки берутся из пространственного индекса,
+        поэтому стоимость проверки зависит от числа стен рядом с роботом,
+        а не от общего числа стен на сцене.
+        
         Args:
             robot_pos: Позиция робота (QPointF) - верхний левый угол
             
@@ -1976,27 +3035,20 @@ class FieldWidget(QGraphicsView):
         if not self.robot_model:
             return False
             
-        # Размер робота - 50x50 пикселей
-        robot_size = 50
+        # Прямоугольник робота - 50x50 пикселей
+        robot_rect = geometry.robot_rect(robot_pos.x(), robot_pos.y())
         
-        # Создаем прямоугольник робота
-        robot_rect = QRectF(
-            robot_pos.x(), 
-            robot_pos.y(),
-            robot_size, 
-            robot_size
+        # Выбираем стены, чьи ограничивающие прямоугольники (с учетом толщины) задевают робота
+        candidates = self.wall_index.query_rect(
+            robot_rect.left, robot_rect.top, robot_rect.right, robot_rect.bottom
         )
         
-        # Проверяем пересечение с каждой стеной
-        for wall in self.walls:
+        # Проверяем пересечение с каждой стеной-кандидатом с учетом её толщины
+        for wall in candidates:
             line = wall.line()
-            
-            # Получаем толщину стены из атрибута stroke_width
-            thickness = wall.stroke_width
-            
-            # Проверяем пересечение линии стены с прямоугольником робота, учитывая толщину
-            if self.line_with_thickness_intersects_rect(line, robot_rect, thickness):
-                logger.debug(f"Robot intersects with wall {wall.id}")
+            if geometry.thick_segment_intersects_rect(
+                    line.x1(), line.y1(), line.x2(), line.y2(), robot_rect, wall.stroke_width):
+                logger.debug("Robot intersects with wall %s", wall.id)
                 return True
                 
         return False
@@ -0,0 +1,89 @@
+from PyQt6.QtWidgets import QGraphicsItem
+from PyQt6.QtGui import QPainterPath, QTransform
+from PyQt6.QtCore import Qt, QRectF
+from utils import level_of_detail, paint_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class HighlightOverlay(QGraphicsItem):
+    """
+    Общая обводка при наведении или выделении для всех объектов поля.
+
+    FieldWidget владеет двумя такими элементами (наведение и выделение) и
+    переносит их на нужный объект через attach. Обводка становится дочерним
+    элементом цели, поэтому следует за её перемещением и поворотом сама;
+    после изменения формы цель вызывает refresh_highlight_overlays. Форму
+    обводки задает цель (highlight_outline), перо выделения - selection_pen.
+
+    Args:
+        hover: True - пунктирная обводка при наведении (не рисуется при мелком
+            масштабе, см. utils.level_of_detail), False - обводка выделения
+        z_value: Z-координата обводки среди дочерних элементов цели
+    """
+
+    def __init__(self, hover, z_value):
+        super().__init__()
+        self.hover = hover
+        self._target = None
+        self._rect = QRectF()
+        self._pen = paint_cache.pen("#3399FF", 2, Qt.PenStyle.DashLine) if hover else None
+        self.setZValue(z_value)
+        if hover:
+            self.setData(0, "hover_highlight")
+        self.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+        self.setAcceptHoverEvents(False)
+        self.hide()
+
+    def target(self):
+        """Объект, на котором сейчас показана обводка (или None)."""
+        return self._target
+
+    def outline_rect(self):
+        """Прямоугольник обводки в координатах оверлея."""
+        return QRectF(self._rect)
+
+    def attach(self, item):
+        """Показывает обводку на объекте item."""
+        if item is not self._target:
+            self.setParentItem(item)
+            self._target = item
+        self.refresh()
+        self.show()
+
+    def detach(self):
+        """Скрывает обводку и отвязывает ее от объекта."""
+        if self._target is None:
+            return
+        self.hide()
+        self.setParentItem(None)
+        if self.scene() is not None:
+            self.scene().removeItem(self)
+        self._target = None
+
+    def refresh(self):
+        """Пересчитывает форму обводки по текущей форме цели."""
+        if self._target is None:
+            return
+        rect, transform = self._target.highlight_outline()
+        self.prepareGeometryChange()
+        self._rect = QRectF(rect)
+        if not self.hover:
+            self._pen = self._target.selection_pen()
+        self.setTransform(transform if transform is not None else QTransform())
+
+    def boundingRect(self):
+        margin = self._pen.widthF() / 2 if self._pen is not None else 0
+        return self._rect.adjusted(-margin, -margin, margin, margin)
+
+    def shape(self):
+        # Пустая форма: обводка не перехватывает itemAt и события мыши
+        return QPainterPath()
+
+    def paint(self, painter, option, widget=None):
+        if self.hover and level_of_detail.simplified(painter, "details"):
+            return
+        painter.setPen(self._pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRect(self._rect)
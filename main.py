@@ -1,8 +1,23 @@
 import sys
 from PyQt6.QtWidgets import QApplication
+from config import config
 from main_window import MainWindow
+from utils.logging_utils import configure_logging
 
-if __name__ == '__main__':
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    
+    # Пакетная обработка сцен без графического интерфейса
+    if argv and argv[0] == "batch":
+        from utils.batch_cli import main as batch_main
+        sys.exit(batch_main(argv[1:]))
+    
+    # Логирование настраивается один раз при запуске, а не при импорте модулей
+    configure_logging(config.get("logging", "level"), config.get("logging", "log_dir"))
+    
     app = QApplication(sys.argv)
     window = MainWindow()
     sys.exit(app.exec())
+
+if __name__ == '__main__':
+    main()
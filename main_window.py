@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import (
     QMainWindow, QToolBar, QToolButton, QPushButton, QLineEdit, QWidget, QHBoxLayout, QVBoxLayout, QLabel,
-    QCheckBox, QSpacerItem, QSizePolicy, QFileDialog, QDockWidget, QSpinBox, QDoubleSpinBox, QButtonGroup, QStatusBar, QFrame, QMessageBox
+    QCheckBox, QSpacerItem, QSizePolicy, QFileDialog, QDockWidget, QSpinBox, QDoubleSpinBox, QButtonGroup, QStatusBar, QFrame, QMessageBox,
+    QProgressDialog
 )
 from PyQt6.QtGui import QIcon, QAction
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QPointF
@@ -14,12 +15,12 @@ from config import config
 from utils.transparent_scrollbar import apply_scrollbars_to_graphics_view
 from utils.keyboard_shortcuts import AppShortcutsManager
 from utils.xml_handler import XMLHandler, XMLValidationError  # Импортируем новый обработчик XML
+from utils.xml_parse_thread import XMLParseThread
 import os
 import sys
 from __init__ import __version__  # Импортируем версию из корневого модуля
 
 # Настройка логгера
-logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 class MainWindow(QMainWindow):
@@ -34,6 +35,30 @@ class MainWindow(QMainWindow):
         self.scene_height = config.get("scene", "default_height")
         self.grid_size = config.get("grid", "size")
         self.snap_to_grid_default = config.get("grid", "snap_to_grid")
+        self.grid_render_mode = config.get("grid", "render_mode")
+        self.grid_tile_cache = config.get("grid", "tile_cache")
+        self.wall_render_mode = config.get("walls", "render_mode")
+        self.panel_update_rate = config.get("interaction", "panel_update_rate")
+        self.undo_limit = config.get("interaction", "undo_limit")
+        self.lod_thresholds = {
+            "walls": config.get("rendering", "lod_walls"),
+            "details": config.get("rendering", "lod_details"),
+            "regions": config.get("rendering", "lod_regions"),
+        }
+        self.static_layer_cache = config.get("rendering", "static_layer_cache")
+        self.adaptive_quality = config.get("rendering", "adaptive_quality")
+        self.interaction_idle_ms = config.get("rendering", "interaction_idle_ms")
+        self.item_cache_modes = {
+            "walls": config.get("rendering", "cache_walls"),
+            "regions": config.get("rendering", "cache_regions"),
+            "robot": config.get("rendering", "cache_robot"),
+            "start_position": config.get("rendering", "cache_start_position"),
+        }
+        
+        # Состояние импорта XML (фоновый поток разбора и окно прогресса)
+        self._import_thread = None
+        self._import_progress = None
+        self._import_clear = True
         
         # Определяем текущую тему
         self.is_dark_theme = config.get("appearance", "theme") == "dark"
@@ -52,7 +77,7 @@ class MainWindow(QMainWindow):
         
         # Создаем виджет для отображения координат
         self.coords_label = QLabel("X: 0, Y: 0", self)
-        self.coords_label.setStyleSheet(AppStyles.get_coords_label_style(self.is_dark_theme))
+        self.coords_label.setProperty("styleRole", "coords")
         coords_layout.addWidget(self.coords_label)
         
         # Добавляем растягивающий элемент, чтобы переключатель был справа
@@ -60,7 +85,7 @@ class MainWindow(QMainWindow):
         
         # Создаем переключатель темы
         self.theme_switch = QPushButton("🌙" if not self.is_dark_theme else "☀️", self)
-        self.theme_switch.setStyleSheet(AppStyles.get_theme_switch_style(self.is_dark_theme))
+        self.theme_switch.setProperty("styleRole", "theme_switch")
         self.theme_switch.setCursor(Qt.CursorShape.PointingHandCursor)
         self.theme_switch.clicked.connect(self.toggle_theme)
         self.theme_switch.setToolTip("Переключить тему")
@@ -83,9 +108,7 @@ class MainWindow(QMainWindow):
             )
         self.properties_dock = QDockWidget("Свойства", self)
         self.properties_dock.setWidget(self.properties_window)
-        self.properties_dock.setStyleSheet(
-            AppStyles.DARK_PROPERTIES_WINDOW if self.is_dark_theme else AppStyles.LIGHT_PROPERTIES_WINDOW
-        )
+        self.properties_dock.setObjectName(AppStyles.PROPERTIES_DOCK_NAME)
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.properties_dock)
         self.properties_dock.show()  # Явно показываем dock-виджет
         logger.debug(f"Dock-виджет свойств создан, видимость: {self.properties_dock.isVisible()}")
@@ -99,7 +122,18 @@ class MainWindow(QMainWindow):
         self.field_widget = FieldWidget(self.properties_window, 
                                         scene_width=self.scene_width, 
                                         scene_height=self.scene_height,
-                                        grid_size=self.grid_size)
+                                        grid_size=self.grid_size,
+                                        grid_mode=self.grid_render_mode,
+                                        grid_tile_cache=self.grid_tile_cache,
+                                        wall_render_mode=self.wall_render_mode,
+                                        panel_update_rate=self.panel_update_rate,
+                                        undo_limit=self.undo_limit,
+                                        lod_thresholds=self.lod_thresholds,
+                                        static_layer_cache=self.static_layer_cache,
+                                        adaptive_rendering=self.adaptive_quality,
+                                        interaction_idle_ms=self.interaction_idle_ms,
+                                        item_cache_modes=self.item_cache_modes)
+        self.field_widget.setProperty("styleRole", "scene")
 
         # Явно подключаем field_widget к properties_window
         if hasattr(self.properties_window, 'connect_to_field_widget'):
@@ -161,7 +195,7 @@ class MainWindow(QMainWindow):
         snap_to_grid_layout.setContentsMargins(10, 0, 0, 0)  # Добавляем отступ слева
         
         self.snap_to_grid_checkbox = QCheckBox("Привязаться к сетке", self)
-        self.snap_to_grid_checkbox.setStyleSheet(AppStyles.DARK_CHECKBOX_STYLE if self.is_dark_theme else AppStyles.LIGHT_CHECKBOX_STYLE)
+        self.snap_to_grid_checkbox.setProperty("styleRole", "checkbox")
         self.snap_to_grid_checkbox.setChecked(self.field_widget.snap_to_grid_enabled)
         self.snap_to_grid_checkbox.stateChanged.connect(self.toggle_snap_to_grid)
         self.snap_to_grid_checkbox.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -191,7 +225,7 @@ class MainWindow(QMainWindow):
         
         # Кнопка для генерации XML
         generate_button = QPushButton("Сгенерировать XML")
-        generate_button.setStyleSheet(AppStyles.get_accent_button_style(self.is_dark_theme))
+        generate_button.setProperty("styleRole", "accent")
         generate_button.clicked.connect(self.generate_xml)
         generate_button.setCursor(Qt.CursorShape.PointingHandCursor)
         self.toolbar.addWidget(generate_button)
@@ -212,6 +246,10 @@ class MainWindow(QMainWindow):
         # Создаем меню приложения
         self.create_menubar()
         
+        # Виджеты, созданные до встраивания в окно, установили собственные стили;
+        # внутри окна их заменяет общий стиль окна
+        self.apply_theme()
+        
         logger.debug("Главное окно инициализировано")
     
     def setup_cursors(self):
@@ -270,7 +308,7 @@ class MainWindow(QMainWindow):
 
         # Лейбл "Размер сцены"
         self.size_label = QLabel("Размер сцены")
-        self.size_label.setStyleSheet(AppStyles.get_mode_label_style(self.is_dark_theme))
+        self.size_label.setProperty("styleRole", "heading")
         size_layout.addWidget(self.size_label)
 
         # Виджет для лейблов полей ввода
@@ -312,7 +350,7 @@ class MainWindow(QMainWindow):
         
         # Кнопка для применения изменений   
         self.apply_button = QPushButton("Применить", self)
-        self.apply_button.setStyleSheet(AppStyles.get_accent_button_style(self.is_dark_theme))
+        self.apply_button.setProperty("styleRole", "accent")
         self.apply_button.setCursor(Qt.CursorShape.PointingHandCursor)
         self.apply_button.clicked.connect(self.apply_size_changes)
         size_layout.addWidget(self.apply_button)
@@ -338,7 +376,7 @@ class MainWindow(QMainWindow):
         
         # Заголовок "Масштаб"
         self.scale_label = QLabel("Масштаб")
-        self.scale_label.setStyleSheet(AppStyles.get_mode_label_style(self.is_dark_theme))
+        self.scale_label.setProperty("styleRole", "heading")
         scale_layout.addWidget(self.scale_label)
         
         # Контейнер для кнопок масштабирования
@@ -353,7 +391,7 @@ class MainWindow(QMainWindow):
         self.zoom_out_button.setText("-")
         self.zoom_out_button.setToolTip("Уменьшить (или Ctrl+колесико мыши вниз)")
         self.zoom_out_button.clicked.connect(self.field_widget.zoomOut)
-        self.zoom_out_button.setStyleSheet(AppStyles.get_scale_button_style(self.is_dark_theme))
+        self.zoom_out_button.setProperty("styleRole", "scale")
         scale_buttons_layout.addWidget(self.zoom_out_button)
         
         # Поле для отображения текущего масштаба
@@ -363,7 +401,7 @@ class MainWindow(QMainWindow):
         self.scale_display.setText("1.0")
         self.scale_display.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.scale_display.setToolTip("Для изменения масштаба используйте Ctrl+колесико мыши")
-        self.scale_display.setStyleSheet(AppStyles.get_scale_display_style(self.is_dark_theme))
+        self.scale_display.setProperty("styleRole", "scale_display")
         scale_buttons_layout.addWidget(self.scale_display)
         
         # Кнопка увеличения масштаба
@@ -371,7 +409,7 @@ class MainWindow(QMainWindow):
         self.zoom_in_button.setText("+")
         self.zoom_in_button.setToolTip("Увеличить (или Ctrl+колесико мыши вверх)")
         self.zoom_in_button.clicked.connect(self.field_widget.zoomIn)
-        self.zoom_in_button.setStyleSheet(AppStyles.get_scale_button_style(self.is_dark_theme))
+        self.zoom_in_button.setProperty("styleRole", "scale")
         scale_buttons_layout.addWidget(self.zoom_in_button)
         
         # Кнопка сброса масштаба
@@ -379,7 +417,7 @@ class MainWindow(QMainWindow):
         self.reset_zoom_button.setText("1:1")
         self.reset_zoom_button.setToolTip("Сбросить масштаб")
         self.reset_zoom_button.clicked.connect(self.field_widget.resetScale)
-        self.reset_zoom_button.setStyleSheet(AppStyles.get_scale_button_style(self.is_dark_theme))
+        self.reset_zoom_button.setProperty("styleRole", "scale")
         scale_buttons_layout.addWidget(self.reset_zoom_button)
         
         scale_layout.addWidget(scale_buttons)
@@ -442,7 +480,7 @@ class MainWindow(QMainWindow):
         
         # Заголовок "Режим"
         self.mode_label = QLabel("Режим")
-        self.mode_label.setStyleSheet(AppStyles.get_mode_label_style(self.is_dark_theme))
+        self.mode_label.setProperty("styleRole", "heading")
         mode_layout.addWidget(self.mode_label)
         
         # Группа кнопок для переключения режимов
@@ -452,7 +490,7 @@ class MainWindow(QMainWindow):
         self.observer_button = QPushButton("Наблюдатель")
         self.observer_button.setCheckable(True)
         self.observer_button.setChecked(True)  # Выбран по умолчанию
-        self.observer_button.setStyleSheet(self.get_mode_button_style())
+        self.observer_button.setProperty("styleRole", "mode")
         self.observer_button.clicked.connect(lambda: self.set_mode("observer"))
         self.observer_button.setCursor(Qt.CursorShape.PointingHandCursor)
         mode_layout.addWidget(self.observer_button)
@@ -461,7 +499,7 @@ class MainWindow(QMainWindow):
         # Кнопка режима редактирования
         self.edit_button = QPushButton("Редактирование")
         self.edit_button.setCheckable(True)
-        self.edit_button.setStyleSheet(self.get_mode_button_style())
+        self.edit_button.setProperty("styleRole", "mode")
         self.edit_button.clicked.connect(lambda: self.set_mode("edit"))
         self.edit_button.setCursor(Qt.CursorShape.PointingHandCursor)
         mode_layout.addWidget(self.edit_button)
@@ -470,7 +508,7 @@ class MainWindow(QMainWindow):
         # Кнопка режима рисования
         self.drawing_button = QPushButton("Рисование")
         self.drawing_button.setCheckable(True)
-        self.drawing_button.setStyleSheet(self.get_mode_button_style())
+        self.drawing_button.setProperty("styleRole", "mode")
         self.drawing_button.clicked.connect(lambda: self.set_mode("drawing"))
         self.drawing_button.setCursor(Qt.CursorShape.PointingHandCursor)
         mode_layout.addWidget(self.drawing_button)
@@ -491,7 +529,7 @@ class MainWindow(QMainWindow):
         
         # Заголовок "Рисовать"
         self.drawing_label = QLabel("Рисовать")
-        self.drawing_label.setStyleSheet(AppStyles.get_mode_label_style(self.is_dark_theme))
+        self.drawing_label.setProperty("styleRole", "heading")
         drawing_layout.addWidget(self.drawing_label)
         
         # Группа кнопок для инструментов рисования
@@ -500,7 +538,7 @@ class MainWindow(QMainWindow):
         # Кнопка для рисования стен
         self.wall_button = QPushButton("Стена")
         self.wall_button.setCheckable(True)
-        self.wall_button.setStyleSheet(self.get_tool_button_style())
+        self.wall_button.setProperty("styleRole", "tool")
         self.wall_button.clicked.connect(lambda: self.set_drawing_type("wall"))
         self.wall_button.setEnabled(False)
         self.wall_button.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -510,7 +548,7 @@ class MainWindow(QMainWindow):
         # Кнопка для рисования регионов
         self.region_button = QPushButton("Регион")
         self.region_button.setCheckable(True)
-        self.region_button.setStyleSheet(self.get_tool_button_style())
+        self.region_button.setProperty("styleRole", "tool")
         self.region_button.clicked.connect(lambda: self.set_drawing_type("region"))
         self.region_button.setEnabled(False)
         self.region_button.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -595,19 +633,24 @@ class MainWindow(QMainWindow):
             scene_height = self.field_widget.scene_height
             xml_handler = XMLHandler(scene_width=scene_width, scene_height=scene_height)
             
-            # Генерируем XML с валидацией
-            formatted_xml = xml_handler.generate_xml(
-                walls=self.field_widget.walls,
-                regions=self.field_widget.regions,
-                robot_model=self.field_widget.robot_model,
-                start_position=self.field_widget.start_position_model
-            )
-
-            # Записываем форматированный XML в файл
+            # Записываем форматированный XML в файл по мере генерации
             file_name, _ = QFileDialog.getSaveFileName(self, "Save XML File", "", "XML Files (*.xml)")
             if file_name:
-                with open(file_name, "w", encoding="utf-8") as file:
-                    file.write(formatted_xml)
+                # Пишем во временный файл, чтобы ошибка валидации не испортила существующий
+                temp_file_name = f"{file_name}.tmp"
+                try:
+                    with open(temp_file_name, "w", encoding="utf-8") as file:
+                        xml_handler.write_xml(
+                            file,
+                            walls=self.field_widget.walls,
+                            regions=self.field_widget.regions,
+                            robot_model=self.field_widget.robot_model,
+                            start_position=self.field_widget.start_position_model
+                        )
+                    os.replace(temp_file_name, file_name)
+                finally:
+                    if os.path.exists(temp_file_name):
+                        os.remove(temp_file_name)
 
                 QMessageBox.information(self, "Успех", "XML файл успешно сгенерирован.")
         
@@ -619,168 +662,66 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Ошибка", f"Произошла ошибка: {e}")
 
     def apply_theme(self):
-        """Применяет текущую тему к приложению"""
-        if self.is_dark_theme:
-            # Темная тема
-            self.setStyleSheet(AppStyles.DARK_MAIN_WINDOW)
-            if hasattr(self, 'properties_window'):
-                if hasattr(self.properties_window, 'set_theme'):
-                    self.properties_window.set_theme(True)
-                else:
-                    self.properties_window.setStyleSheet(AppStyles.DARK_PROPERTIES_WINDOW)
-            # Применяем тему к полю сцены
-            if hasattr(self, 'field_widget') and hasattr(self.field_widget, 'set_theme'):
-                self.field_widget.set_theme(True)
-            # Применяем стиль к QDockWidget
-            if hasattr(self, 'properties_dock'):
-                self.properties_dock.setStyleSheet(AppStyles.DARK_PROPERTIES_WINDOW)
-            if hasattr(self, 'coords_label'):
-                self.coords_label.setStyleSheet(AppStyles.DARK_COORDS_LABEL)
-            if hasattr(self, 'theme_switch'):
-                self.theme_switch.setStyleSheet(AppStyles.get_theme_switch_style(True))
-                self.theme_switch.setText("☀️")  # Солнце для переключения на светлую тему
-            
-            # Обновляем стиль чекбокса
-            if hasattr(self, 'snap_to_grid_checkbox'):
-                self.snap_to_grid_checkbox.setStyleSheet(AppStyles.DARK_CHECKBOX_STYLE)
-            
-            # Обновляем стили заголовков и кнопок режимов
-            if hasattr(self, 'observer_button'):
-                self.observer_button.setStyleSheet(self.get_mode_button_style())
-                self.drawing_button.setStyleSheet(self.get_mode_button_style())
-                self.edit_button.setStyleSheet(self.get_mode_button_style())
-            
-            # Обновляем стили заголовков
-            if hasattr(self, 'mode_label'):
-                self.mode_label.setStyleSheet(AppStyles.get_mode_label_style(True))
-                self.scale_label.setStyleSheet(AppStyles.get_mode_label_style(True))
-                self.size_label.setStyleSheet(AppStyles.get_mode_label_style(True))
-            
-            # Обновляем стили кнопок инструментов
-            if hasattr(self, 'wall_button'):
-                self.wall_button.setStyleSheet(self.get_tool_button_style())
-                self.region_button.setStyleSheet(self.get_tool_button_style())
-                
-            # Обновляем стиль заголовка инструментов
-            if hasattr(self, 'drawing_label'):
-                self.drawing_label.setStyleSheet(AppStyles.get_mode_label_style(True))
-                
-            # Обновляем стили кнопок масштабирования
-            if hasattr(self, 'zoom_in_button'):
-                self.zoom_in_button.setStyleSheet(AppStyles.get_scale_button_style(True))
-                self.zoom_out_button.setStyleSheet(AppStyles.get_scale_button_style(True))
-                self.reset_zoom_button.setStyleSheet(AppStyles.get_scale_button_style(True))
-                self.scale_display.setStyleSheet(AppStyles.get_scale_display_style(True))
-                
-            # Обновляем стиль кнопки горячих клавиш
-            for btn in self.findChildren(QPushButton):
-                if btn.text() == "Горячие клавиши":
-                    btn.setStyleSheet(AppStyles.get_accent_button_style(True))
-                    
-            # Рекурсивно применяем тему ко всем виджетам с методом set_theme
-            self._apply_theme_recursively(self, True)
-        else:
-            # Светлая тема
-            self.setStyleSheet(AppStyles.LIGHT_MAIN_WINDOW)
-            if hasattr(self, 'properties_window'):
-                if hasattr(self.properties_window, 'set_theme'):
-                    self.properties_window.set_theme(False)
-                else:
-                    self.properties_window.setStyleSheet(AppStyles.LIGHT_PROPERTIES_WINDOW)
-            # Применяем тему к полю сцены
-            if hasattr(self, 'field_widget') and hasattr(self.field_widget, 'set_theme'):
-                self.field_widget.set_theme(False)
-            # Применяем стиль к QDockWidget
-            if hasattr(self, 'properties_dock'):
-                self.properties_dock.setStyleSheet(AppStyles.LIGHT_PROPERTIES_WINDOW)
-            if hasattr(self, 'coords_label'):
-                self.coords_label.setStyleSheet(AppStyles.LIGHT_COORDS_LABEL)
+        """
+        Применяет текущую тему к приложению.
+        
+        Оформление окна задает общий стиль приложения (AppStyles.get_application_style),
+        правила которого выбираются динамическим свойством theme окна. Смена темы
+        меняет свойство и перепроверяет стиль всех виджетов за один проход Qt;
+        set_theme вызывается только у виджетов, которые строят стили сами.
+        """
+        dark = self.is_dark_theme
+        
+        # Перерисовка выполняется один раз в конце
+        self.setUpdatesEnabled(False)
+        try:
+            self.setProperty("theme", "dark" if dark else "light")
             if hasattr(self, 'theme_switch'):
-                self.theme_switch.setStyleSheet(AppStyles.get_theme_switch_style(False))
-                self.theme_switch.setText("🌙")  # Луна для переключения на темную тему
-            
-            # Обновляем стиль чекбокса
-            if hasattr(self, 'snap_to_grid_checkbox'):
-                self.snap_to_grid_checkbox.setStyleSheet(AppStyles.LIGHT_CHECKBOX_STYLE)
-            
-            # Обновляем стили заголовков и кнопок режимов
-            if hasattr(self, 'observer_button'):
-                self.observer_button.setStyleSheet(self.get_mode_button_style())
-                self.drawing_button.setStyleSheet(self.get_mode_button_style())
-                self.edit_button.setStyleSheet(self.get_mode_button_style())
-            
-            # Обновляем стили заголовков
-            if hasattr(self, 'mode_label'):
-                self.mode_label.setStyleSheet(AppStyles.get_mode_label_style(False))
-                self.scale_label.setStyleSheet(AppStyles.get_mode_label_style(False))
-                self.size_label.setStyleSheet(AppStyles.get_mode_label_style(False))
-            
-            # Обновляем стили кнопок инструментов
-            if hasattr(self, 'wall_button'):
-                self.wall_button.setStyleSheet(self.get_tool_button_style())
-                self.region_button.setStyleSheet(self.get_tool_button_style())
-                
-            # Обновляем стиль заголовка инструментов
-            if hasattr(self, 'drawing_label'):
-                self.drawing_label.setStyleSheet(AppStyles.get_mode_label_style(False))
-                
-            # Обновляем стили кнопок масштабирования
-            if hasattr(self, 'zoom_in_button'):
-                self.zoom_in_button.setStyleSheet(AppStyles.get_scale_button_style(False))
-                self.zoom_out_button.setStyleSheet(AppStyles.get_scale_button_style(False))
-                self.reset_zoom_button.setStyleSheet(AppStyles.get_scale_button_style(False))
-                self.scale_display.setStyleSheet(AppStyles.get_scale_display_style(False))
-                
-            # Обновляем стиль кнопки горячих клавиш
-            for btn in self.findChildren(QPushButton):
-                if btn.text() == "Горячие клавиши":
-                    btn.setStyleSheet(AppStyles.get_accent_button_style(False))
-                    
-            # Рекурсивно применяем тему ко всем виджетам с методом set_theme
-            self._apply_theme_recursively(self, False)
+                # Солнце для переключения на светлую тему, луна - на темную
+                self.theme_switch.setText("☀️" if dark else "🌙")
+            # Виджеты снимают собственные стили до установки стиля окна
+            self._apply_theme_to_widgets(dark)
+            # Установка стиля (даже того же самого) перепроверяет стиль окна и всех его виджетов
+            self.setStyleSheet(AppStyles.get_application_style())
+        finally:
+            self.setUpdatesEnabled(True)
             
         # Сохраняем состояние темы в конфиг
         config.set("appearance", "dark_theme", str(self.is_dark_theme))
         
-    def _apply_theme_recursively(self, widget, is_dark_theme):
+    def _apply_theme_to_widgets(self, is_dark_theme):
         """
-        Рекурсивно применяет тему ко всем дочерним виджетам с поддержкой метода set_theme.
+        Передает тему виджетам со своими стилями (метод set_theme).
+        
+        Виджеты, вложенные в уже получивший тему виджет, пропускаются:
+        тему им передает владелец (например, окно свойств - своим полям ввода).
         
         Args:
-            widget: Виджет, к которому и его дочерним элементам нужно применить тему
             is_dark_theme: True для темной темы, False для светлой
         """
-        # Список типов виджетов, которые не нужно обрабатывать для оптимизации
-        ignored_widget_types = ["QComboBox", "QSpinBox", "QProgressBar", "QScrollBar", 
-                               "QSlider", "QToolBar", "QTabBar", "QStatusBar", "QMenu"]
-        
-        # Проверяем тип виджета
-        widget_type = widget.metaObject().className()
-        if widget_type in ignored_widget_types:
-            return
-            
-        try:
-            # Если виджет имеет метод set_theme, вызываем его
-            if hasattr(widget, 'set_theme') and callable(widget.set_theme):
-                widget.set_theme(is_dark_theme)
-                return  # Нет необходимости обрабатывать дочерние элементы, так как виджет сам должен это сделать
-        except Exception as e:
-            # В случае ошибки логируем ее, но продолжаем обработку
-            logger.error(f"Ошибка при установке темы для виджета {widget}: {e}")
-        
-        # Рекурсивно применяем тему ко всем дочерним виджетам, но только непосредственным потомкам
-        # Получаем все непосредственные дочерние виджеты
-        for child in widget.children():
-            if isinstance(child, QWidget):
-                self._apply_theme_recursively(child, is_dark_theme)
+        themed = []
+        # findChildren возвращает родителей раньше их потомков
+        for widget in self.findChildren(QWidget):
+            set_theme = getattr(widget, 'set_theme', None)
+            if not callable(set_theme) or any(owner.isAncestorOf(widget) for owner in themed):
+                continue
+            try:
+                set_theme(is_dark_theme)
+            except Exception as e:
+                # В случае ошибки логируем ее, но продолжаем обработку
+                logger.error(f"Ошибка при установке темы для виджета {widget}: {e}")
+            themed.append(widget)
 
     def toggle_theme(self):
         """Переключает тему между светлой и темной"""
         self.is_dark_theme = not self.is_dark_theme
         
-        # Сохраняем настройку в конфиг
-        config.set("appearance", "theme", "dark" if self.is_dark_theme else "light")
-        config.set("appearance", "theme_name", "Темный стиль" if self.is_dark_theme else "Светлый стиль")
+        # Сохраняем настройку в конфиг (одной записью)
+        config.update({"appearance": {
+            "theme": "dark" if self.is_dark_theme else "light",
+            "theme_name": "Темный стиль" if self.is_dark_theme else "Светлый стиль",
+            "dark_theme": str(self.is_dark_theme),
+        }})
         
         # Применяем тему
         self.apply_theme()
@@ -806,11 +747,11 @@ class MainWindow(QMainWindow):
         self.toolbar.addWidget(separator_container)
         
         # Кнопка для отображения списка горячих клавиш
-        shortcuts_button = QPushButton("Горячие клавиши")
-        shortcuts_button.setStyleSheet(AppStyles.get_accent_button_style(self.is_dark_theme))
-        shortcuts_button.clicked.connect(self.shortcuts_manager.show_shortcuts_dialog)
-        shortcuts_button.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.toolbar.addWidget(shortcuts_button)
+        self.shortcuts_button = QPushButton("Горячие клавиши")
+        self.shortcuts_button.setProperty("styleRole", "accent")
+        self.shortcuts_button.clicked.connect(self.shortcuts_manager.show_shortcuts_dialog)
+        self.shortcuts_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.toolbar.addWidget(self.shortcuts_button)
 
     def create_menubar(self):
         """Создает меню приложения"""
@@ -870,115 +811,132 @@ class MainWindow(QMainWindow):
         )
 
     def import_xml(self):
-        """Импортирует XML-файл и загружает его содержимое в сцену"""
-        try:
-            # Просим пользователя выбрать XML-файл
-            file_name, _ = QFileDialog.getOpenFileName(self, "Открыть XML файл", "", "XML Files (*.xml)")
-            if not file_name:
-                return  # Пользователь отменил выбор
-            
-            # Считываем содержимое файла
-            with open(file_name, 'r', encoding='utf-8') as f:
-                xml_content = f.read()
-            
-            # Спрашиваем пользователя, нужно ли очистить текущую сцену
-            should_clear = QMessageBox.question(
-                self, 
-                "Импорт XML", 
-                "Очистить текущую сцену перед загрузкой новых данных?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                QMessageBox.StandardButton.Yes
-            ) == QMessageBox.StandardButton.Yes
+        """
+        Импортирует XML-файл в сцену.
+        
+        Файл читается и проверяется в фоновом потоке, а объекты добавляются
+        на сцену порциями, поэтому окно не зависает на больших файлах.
+        Ход импорта показывается в окне прогресса, импорт можно отменить.
+        """
+        if self._import_progress is not None:
+            return  # Импорт уже идет
             
-            # Если не нужно очищать сцену, загружаем XML без очистки
-            # (наш метод load_xml всегда очищает сцену, поэтому обрабатываем здесь)
-            if not should_clear:
-                # Создаем экземпляр XMLHandler с текущими размерами сцены
-                scene_width = self.field_widget.scene_width
-                scene_height = self.field_widget.scene_height
-                xml_handler = XMLHandler(scene_width=scene_width, scene_height=scene_height)
-                
-                # Загружаем и парсим XML-файл
-                scene_data = xml_handler.parse_xml(xml_content)
-                
-                # Обновляем размеры сцены, если они определены в XML
-                if "scene_width" in scene_data and "scene_height" in scene_data:
-                    self.field_widget.set_scene_size(scene_data["scene_width"], scene_data["scene_height"])
-                
-                # Добавляем стены из XML
-                walls_added = 0
-                for wall_data in scene_data["walls"]:
-                    begin_point = QPointF(wall_data["begin"][0], wall_data["begin"][1])
-                    end_point = QPointF(wall_data["end"][0], wall_data["end"][1])
-                    wall = self.field_widget.add_wall(
-                        p1=begin_point,
-                        p2=end_point,
-                        wall_id=wall_data["id"]
-                    )
-                    if wall:
-                        walls_added += 1
-                
-                # Добавляем регионы из XML
-                regions_added = 0
-                for region_data in scene_data["regions"]:
-                    rect = region_data["rect"]
-                    # Создаем список точек из QRectF для Region
-                    points = [
-                        QPointF(rect.topLeft()),
-                        QPointF(rect.topRight()),
-                        QPointF(rect.bottomRight()),
-                        QPointF(rect.bottomLeft())
-                    ]
-                    region = self.field_widget.place_region(
-                        points=points,
-                        region_id=region_data["id"],
-                        color=region_data["color"]
-                    )
-                    if region:
-                        regions_added += 1
-                
-                # Добавляем робота из XML, если он есть и на сцене нет робота
-                robot_added = False
-                if scene_data["robot"] and not self.field_widget.robot_model:
-                    # Игнорируем robot_id, так как для робота используется фиксированный ID
-                    robot = self.field_widget.place_robot(
-                        position=scene_data["robot"]["position"],
-                        name=scene_data["robot"].get("name", ""),
-                        direction=scene_data["robot"].get("direction", 0)
-                    )
-                    if robot:
-                        robot_added = True
-                
-                # Обновляем сцену
-                self.field_widget.update()
-                
-                # Информируем пользователя об успешном импорте
-                QMessageBox.information(
-                    self, 
-                    "Импорт завершен", 
-                    f"Импорт успешно завершен:\n"
-                    f"- Добавлено стен: {walls_added}\n"
-                    f"- Добавлено регионов: {regions_added}\n"
-                    f"- {'Робот добавлен' if robot_added else 'Робот уже был на сцене или не найден в файле'}"
-                )
-            else:
-                # Загружаем XML с очисткой сцены
-                success = self.load_xml(xml_content)
-                
-                if success:
-                    # Информируем пользователя об успешном импорте
-                    QMessageBox.information(
-                        self, 
-                        "Импорт завершен", 
-                        "Импорт XML-файла успешно завершен."
-                    )
+        # Просим пользователя выбрать XML-файл
+        file_name, _ = QFileDialog.getOpenFileName(self, "Открыть XML файл", "", "XML Files (*.xml)")
+        if not file_name:
+            return  # Пользователь отменил выбор
+        
+        # Спрашиваем пользователя, нужно ли очистить текущую сцену
+        self._import_clear = QMessageBox.question(
+            self, 
+            "Импорт XML", 
+            "Очистить текущую сцену перед загрузкой новых данных?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        ) == QMessageBox.StandardButton.Yes
+        
+        self._import_progress = QProgressDialog("Чтение XML-файла...", "Отмена", 0, 0, self)
+        self._import_progress.setWindowTitle("Импорт XML")
+        self._import_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self._import_progress.setMinimumDuration(0)
+        self._import_progress.canceled.connect(self._cancel_xml_import)
+        
+        # Разбираем файл с текущими размерами сцены в фоновом потоке
+        self._import_thread = XMLParseThread(file_name, self.field_widget.scene_width,
+                                             self.field_widget.scene_height, self)
+        self._import_thread.parsed.connect(self._on_xml_parsed)
+        self._import_thread.failed.connect(self._on_xml_parse_failed)
+        self._import_thread.finished.connect(self._import_thread.deleteLater)
+        self._import_thread.start()
+        self._import_progress.show()
+        
+    def _on_xml_parsed(self, scene_data):
+        """Начинает порционную загрузку разобранной сцены."""
+        if self.sender() is not self._import_thread:
+            return  # Результат отмененного импорта
+        self._import_thread = None
+        
+        try:
+            # Обновляем размеры сцены, если они определены в XML
+            if "scene_width" in scene_data and "scene_height" in scene_data:
+                self.field_widget.set_scene_size(scene_data["scene_width"], scene_data["scene_height"])
             
-        except XMLValidationError as e:
-            logger.error(f"Ошибка валидации XML: {e}")
-            QMessageBox.warning(self, "Ошибка валидации", f"Ошибка при проверке XML: {e}")
+            total = self.field_widget.load_scene_chunked(scene_data, clear=self._import_clear)
         except Exception as e:
+            self._close_import_progress()
             logger.error(f"Ошибка импорта: {e}", exc_info=True)
             QMessageBox.critical(self, "Ошибка", f"Произошла ошибка при импорте XML: {e}")
+            return
+            
+        self._import_progress.setLabelText("Добавление объектов на сцену...")
+        self._import_progress.setRange(0, max(total, 1))
+        
+    def _on_xml_parse_failed(self, message):
+        """Сообщает об ошибке чтения или валидации XML-файла."""
+        if self.sender() is not self._import_thread:
+            return  # Результат отмененного импорта
+        self._import_thread = None
+        self._report_import_failure("Ошибка валидации", f"Ошибка при проверке XML: {message}")
+        
+    def _on_scene_load_failed(self, message):
+        """Сообщает об ошибке при добавлении объектов на сцену."""
+        if self._import_progress is None:
+            return  # Сцена загружалась не через импорт
+        self._report_import_failure("Ошибка импорта", f"Ошибка при добавлении объектов на сцену: {message}")
+        
+    def _report_import_failure(self, title, text):
+        """Закрывает окно прогресса и сообщает об ошибке импорта."""
+        self._close_import_progress()
+        QMessageBox.warning(self, title, text)
+        
+    def _on_scene_load_progress(self, done, total):
+        """Обновляет окно прогресса импорта."""
+        if self._import_progress is not None:
+            self._import_progress.setValue(done)
+            
+    def _on_scene_loaded(self, summary):
+        """Завершает импорт и сообщает пользователю итоги."""
+        if self._import_progress is None:
+            return  # Сцена загружена не через импорт
+        self._close_import_progress()
+        
+        if self._import_clear:
+            QMessageBox.information(
+                self, 
+                "Импорт завершен", 
+                "Импорт XML-файла успешно завершен."
+            )
+        else:
+            QMessageBox.information(
+                self, 
+                "Импорт завершен", 
+                f"Импорт успешно завершен:\n"
+                f"- Добавлено стен: {summary['walls']}\n"
+                f"- Добавлено регионов: {summary['regions']}\n"
+                f"- {'Робот добавлен' if summary['robot'] else 'Робот уже был на сцене или не найден в файле'}"
+            )
+            
+    def _cancel_xml_import(self):
+        """Отменяет импорт: фоновый разбор или порционную загрузку."""
+        if self._import_progress is None:
+            return
+        self._close_import_progress()
+        
+        if self._import_thread is not None:
+            # Поток нельзя прервать посреди разбора - его результат будет отброшен
+            self._import_thread.requestInterruption()
+            self._import_thread = None
+        else:
+            self.field_widget.cancel_scene_load()
+        logger.info("Импорт XML отменен пользователем")
+        
+    def _close_import_progress(self):
+        """Закрывает окно прогресса импорта."""
+        progress = self._import_progress
+        # Сбрасываем ссылку до закрытия: закрытие окна испускает canceled
+        self._import_progress = None
+        progress.close()
+        progress.deleteLater()
 
     def load_xml(self, xml_content):
         """
@@ -1003,61 +961,8 @@ class MainWindow(QMainWindow):
             if "scene_width" in scene_data and "scene_height" in scene_data:
                 self.field_widget.set_scene_size(scene_data["scene_width"], scene_data["scene_height"])
             
-            # Очищаем сцену перед загрузкой новых данных
-            self.field_widget.clear_scene()
-            
-            # Добавляем стены из XML
-            for wall_data in scene_data["walls"]:
-                begin_point = QPointF(wall_data["begin"][0], wall_data["begin"][1])
-                end_point = QPointF(wall_data["end"][0], wall_data["end"][1])
-                wall = self.field_widget.add_wall(
-                    p1=begin_point,
-                    p2=end_point,
-                    wall_id=wall_data["id"]
-                )
-                if not wall:
-                    logger.warning(f"Не удалось добавить стену: {wall_data}")
-            
-            # Добавляем регионы из XML
-            for region_data in scene_data["regions"]:
-                rect = region_data["rect"]
-                # Создаем список точек из QRectF для Region
-                points = [
-                    QPointF(rect.topLeft()),
-                    QPointF(rect.topRight()),
-                    QPointF(rect.bottomRight()),
-                    QPointF(rect.bottomLeft())
-                ]
-                region = self.field_widget.place_region(
-                    points=points,
-                    region_id=region_data["id"],
-                    color=region_data["color"]
-                )
-                if not region:
-                    logger.warning(f"Не удалось добавить регион: {region_data}")
-            
-            # Добавляем робота из XML, если он есть
-            if scene_data["robot"]:
-                # Игнорируем robot_id, так как для робота используется фиксированный ID
-                robot = self.field_widget.place_robot(
-                    position=scene_data["robot"]["position"],
-                    name=scene_data["robot"].get("name", ""),
-                    direction=scene_data["robot"].get("direction", 0)
-                )
-                if not robot:
-                    logger.warning(f"Не удалось добавить робота: {scene_data['robot']}")
-                    
-                # Добавляем стартовую позицию из XML, если она есть
-                if "start_position" in scene_data:
-                    start_position = self.field_widget.place_start_position(
-                        position=QPointF(scene_data["start_position"]["x"], scene_data["start_position"]["y"]),
-                        direction=scene_data["start_position"].get("direction", 0)
-                    )
-                    if not start_position:
-                        logger.warning(f"Не удалось добавить стартовую позицию: {scene_data['start_position']}")
-                    
-            # Обновляем сцену
-            self.field_widget.update()
+            # Очищаем сцену и загружаем новые данные одним пакетом
+            self.field_widget.load_scene(scene_data, clear=True)
             
             return True
             
@@ -1091,4 +996,9 @@ class MainWindow(QMainWindow):
         self.properties_window.start_position_direction_changed.connect(self.field_widget.update_start_position_direction)
         
         # Подключаем сигналы изменения координат мыши
-        self.field_widget.mouse_coords_updated.connect(self.update_coords_label)
\ No newline at end of file
+        self.field_widget.mouse_coords_updated.connect(self.update_coords_label)
+        
+        # Подключаем сигналы загрузки сцены для отображения хода импорта
+        self.field_widget.scene_load_progress.connect(self._on_scene_load_progress)
+        self.field_widget.scene_load_failed.connect(self._on_scene_load_failed)
+        self.field_widget.scene_loaded.connect(self._on_scene_loaded)
\ No newline at end of file
@@ -74,10 +74,8 @@ class BasePropertiesWidget(QGroupBox):
             is_dark_theme: True для темной темы, False для светлой
         """
         self.is_dark_theme = is_dark_theme
-        if is_dark_theme:
-            self.setStyleSheet(AppStyles.DARK_PROPERTIES_WINDOW)
-        else:
-            self.setStyleSheet(AppStyles.LIGHT_PROPERTIES_WINDOW)
+        AppStyles.apply_widget_style(
+            self, AppStyles.DARK_PROPERTIES_WINDOW if is_dark_theme else AppStyles.LIGHT_PROPERTIES_WINDOW)
         
     def apply_field_style(self, widget):
         """
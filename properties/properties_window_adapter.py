@@ -15,6 +15,7 @@ from robot import Robot
 from wall import Wall
 from region import Region
 from start_position import StartPosition
+from styles import AppStyles
 
 logger = logging.getLogger(__name__)
 
@@ -150,12 +151,9 @@ class PropertiesWindow(QWidget):
         self.properties_manager.set_theme(is_dark_theme)
         
         # Применяем тему к пустой метке
-        if is_dark_theme:
-            self.empty_label.setStyleSheet("color: #ffffff;")
-            self.setStyleSheet("background-color: #2d2d2d;")
-        else:
-            self.empty_label.setStyleSheet("color: #333333;")
-            self.setStyleSheet("background-color: #f5f5f5;")
+        AppStyles.apply_widget_style(self.empty_label, "color: #ffffff;" if is_dark_theme else "color: #333333;")
+        AppStyles.apply_widget_style(
+            self, "background-color: #2d2d2d;" if is_dark_theme else "background-color: #f5f5f5;")
         
     def setup_cursors(self):
         """Устанавливает курсоры для всех элементов интерфейса в окне свойств."""
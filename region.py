@@ -4,44 +4,25 @@ from PyQt6.QtGui import QPainterPath, QPen, QBrush, QColor, QPainter, QTransform
 from PyQt6.QtCore import Qt, QRectF, QPointF
 from contextlib import contextmanager
 from hover_highlight import HoverHighlightMixin
+from utils import level_of_detail, item_cache
+from utils.id_allocator import IdAllocator
 
 logger = logging.getLogger(__name__)
 
 class Region(QGraphicsPathItem, HoverHighlightMixin):
-    _next_id = 1  # Статический счетчик для генерации ID
-    _existing_ids = set()  # Множество для отслеживания существующих ID
+    # Распределитель ID для регионов, созданных вне сцены (сцена передает свой)
+    default_id_allocator = IdAllocator("r")
     
-    @staticmethod
-    def create_temp_region(points, color="#800000ff"):
-        """
-        Создает временный регион для проверки границ без увеличения счетчика next_id.
-        
-        Args:
-            points: Список точек региона (QPointF)
-            color: Цвет заливки региона в HEX-формате с альфа-каналом
-            
-        Returns:
-            Region: Временный экземпляр региона
-        """
-        # Сохраняем текущее значение счетчика
-        current_next_id = Region._next_id
-        
-        # Создаем временный регион с временным ID
-        temp_region = Region(points, region_id=f"temp_{current_next_id}", color=color)
-        
-        # Восстанавливаем счетчик
-        Region._next_id = current_next_id
-        
-        return temp_region
-    
-    def __init__(self, points, region_id=None, color="#800000ff"):
+    def __init__(self, points, region_id=None, color="#800000ff", id_allocator=None):
         """
         Инициализация региона с заданными точками и ID.
         
         Args:
             points: Список точек региона (QPointF)
-            region_id: ID региона (если None, будет сгенерирован автоматически)
+            region_id: ID региона (если None, будет сгенерирован автоматически;
+                число n или строка 'n' преобразуются в 'r<n>')
             color: Цвет заливки региона в HEX-формате с альфа-каналом
+            id_allocator: Распределитель ID сцены (если None - Region.default_id_allocator)
         """
         super().__init__()
         HoverHighlightMixin.__init__(self)
@@ -55,56 +36,9 @@ class Region(QGraphicsPathItem, HoverHighlightMixin):
             path.closeSubpath()
         self.setPath(path)
         
-        # Проверяем, является ли это временным регионом
-        is_temp = isinstance(region_id, str) and region_id.startswith('temp_')
-        
-        # Генерация или проверка ID
-        if region_id is None:
-            # Автоматически генерируем ID
-            self._id = f"r{Region._next_id}"
-            Region._next_id += 1
-        else:
-            # Используем предоставленный ID
-            try:
-                # Обрабатываем временный ID
-                if is_temp:
-                    self._id = region_id
-                else:
-                    if isinstance(region_id, str):
-                        if region_id.startswith('r'):
-                            num_id = int(region_id[1:])
-                            self._id = region_id  # Используем оригинальный ID с префиксом
-                        else:
-                            num_id = int(region_id)
-                            self._id = f"r{num_id}"  # Добавляем префикс
-                    elif isinstance(region_id, int):
-                        num_id = region_id
-                        self._id = f"r{num_id}"  # Добавляем префикс
-                    else:
-                        raise ValueError(f"Неподдерживаемый тип ID: {type(region_id)}")
-                    
-                    # Проверяем, что ID положительный
-                    if num_id <= 0:
-                        logger.warning(f"Отрицательный или нулевой ID '{region_id}', будет сгенерирован новый")
-                        self._id = f"r{Region._next_id}"
-                        Region._next_id += 1
-                    else:
-                        # Проверяем уникальность ID
-                        if self._id in Region._existing_ids:
-                            logger.warning(f"ID '{self._id}' уже используется, будет сгенерирован новый")
-                            self._id = f"r{Region._next_id}"
-                            Region._next_id += 1
-                        else:
-                            # Обновляем счетчик, если заданный ID больше текущего
-                            if not is_temp and num_id >= Region._next_id:
-                                Region._next_id = num_id + 1
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Некорректный ID '{region_id}': {e}, будет сгенерирован новый")
-                self._id = f"r{Region._next_id}"
-                Region._next_id += 1
-        
-        # Добавляем ID в множество существующих
-        Region._existing_ids.add(self._id)
+        # Занятый или некорректный region_id заменяется новым
+        self.id_allocator = id_allocator if id_allocator is not None else Region.default_id_allocator
+        self._id = self.id_allocator.acquire(region_id)
         
         # Настройка внешнего вида региона
         self.color = color
@@ -119,10 +53,9 @@ class Region(QGraphicsPathItem, HoverHighlightMixin):
         
         # Инициализация подсветки при наведении после настройки всех атрибутов
         self.init_hover_highlight()
+        item_cache.apply(self, "regions")
         
-        # Записываем в лог только для не-временных регионов
-        if not is_temp:
-            logger.debug(f"Регион создан с id={self.id}")
+        logger.debug("Регион создан с id=%s", self.id)
     
     @contextmanager
     def updating(self):
@@ -151,24 +84,47 @@ class Region(QGraphicsPathItem, HoverHighlightMixin):
         """Устанавливает цвет заливки региона."""
         self.color = color
         self.update_appearance()
-    
+
+    def set_rect(self, x, y, width, height):
+        """
+        Меняет положение и размеры региона на месте, без пересоздания объекта.
+
+        Путь строится от (0, 0), левый верхний угол задается позицией региона.
+
+        Args:
+            x, y: Левый верхний угол в координатах сцены
+            width, height: Размеры региона
+        """
+        path = QPainterPath()
+        path.addRect(0, 0, width, height)
+        # setPath сам вызывает prepareGeometryChange, индекс сцены обновляется один раз
+        self.setPath(path)
+        self.setPos(x, y)
+        self.refresh_highlight_overlays()
+
+    def paint(self, painter, option, widget=None):
+        """Рисует регион; при мелком масштабе - прямоугольником без сглаживания."""
+        if not level_of_detail.simplified(painter, "regions"):
+            super().paint(painter, option, widget)
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        painter.setPen(self.pen())
+        painter.setBrush(self.brush())
+        painter.drawRect(self.path().boundingRect())
+        painter.restore()
+
     def set_highlight(self, enabled):
-        """Включает/выключает подсветку региона."""
-        if enabled:
-            # Создаем новое перо для подсветки с ярким зеленым цветом
-            highlight_pen = QPen(QColor("#00FF00"), 2)
-            self.setPen(highlight_pen)
-            # Устанавливаем флаг перемещения
-            self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, True)
-        else:
-            # Возвращаем оригинальное перо (без контура)
-            self.setPen(QPen(Qt.PenStyle.NoPen))
-            # Снимаем флаг перемещения
-            self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
+        """
+        Включает/выключает выделение региона.
+
+        Обводку показывает общий оверлей поля, регион только становится перемещаемым.
+        """
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, enabled)
     
     def set_id(self, new_id):
         """Устанавливает новый ID региона, если он уникален."""
-        logger.debug(f"Attempting to set region ID from '{self.id}' to '{new_id}'")
+        logger.debug("Attempting to set region ID from '%s' to '%s'", self.id, new_id)
         
         # Преобразуем ID в строку
         if isinstance(new_id, str):
@@ -181,38 +137,26 @@ class Region(QGraphicsPathItem, HoverHighlightMixin):
         
         # Проверяем, что ID изменился
         if new_id_str == self._id:
-            logger.debug(f"New ID is the same as current ID, no change needed")
+            logger.debug("New ID is the same as current ID, no change needed")
             return True
         
-        # Проверяем уникальность ID
-        if new_id_str in Region._existing_ids:
+        # Проверяем уникальность ID и заменяем его в распределителе
+        if not self.id_allocator.rename(self._id, new_id_str):
             logger.warning(f"ID '{new_id_str}' already used by another region")
             return False
         
-        # Обновляем ID
-        Region._existing_ids.remove(self._id)
         old_id = self._id
         self._id = new_id_str
-        Region._existing_ids.add(self._id)
-        
-        # Обновляем счетчик, если ID имеет формат "r<number>" и число больше текущего
-        if new_id_str.startswith('r'):
-            try:
-                num_id = int(new_id_str[1:])
-                if num_id >= Region._next_id:
-                    Region._next_id = num_id + 1
-            except ValueError:
-                # Если ID не имеет формат "r<number>", не обновляем счетчик
-                pass
-            
-        logger.debug(f"Region ID changed from {old_id} to {self._id}")
+        logger.debug("Region ID changed from %s to %s", old_id, self._id)
         return True
     
+    def release_id(self):
+        """Освобождает ID региона в распределителе (при удалении региона)."""
+        self.id_allocator.release(self._id)
+    
     def remove_from_scene(self):
         """Удаляет регион из сцены и освобождает его ID."""
-        # Удаляем ID из множества существующих
-        if self._id in Region._existing_ids:
-            Region._existing_ids.remove(self._id)
+        self.release_id()
         
         # Удаляем регион из сцены
         scene = self.scene()
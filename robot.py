@@ -1,9 +1,9 @@
 from PyQt6.QtWidgets import QGraphicsPixmapItem, QGraphicsRectItem, QGraphicsItem, QGraphicsEllipseItem, QMessageBox
 from PyQt6.QtGui import QPixmap, QPainter, QTransform, QPen, QBrush, QPainterPath, QColor
-from PyQt6.QtSvg import QSvgRenderer
 from PyQt6.QtCore import QRectF, Qt, QPointF, QSizeF
 import logging
 from hover_highlight import HoverHighlightMixin
+from utils import svg_cache, item_cache, paint_cache
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +12,9 @@ class Robot(QGraphicsPixmapItem, HoverHighlightMixin):
     _instance = None
     # Фиксированный ID для робота
     _id = "trikKitRobot"
+    # Изображение робота и его логический размер
+    SVG_PATH = "images/robot.svg"
+    SIZE = 50
     
     @classmethod
     def __new__(cls, *args, **kwargs):
@@ -38,8 +41,8 @@ class Robot(QGraphicsPixmapItem, HoverHighlightMixin):
             super().__init__()
             HoverHighlightMixin.__init__(self)
             
-            # Инициализация SVG-рендерера
-            self.renderer = QSvgRenderer()
+            # Отношение физических пикселей к логическим, в котором отрисован робот
+            self._device_pixel_ratio = 1.0
             
             # ID робота всегда "m1"
             self._id = "trikKitRobot"
@@ -48,9 +51,6 @@ class Robot(QGraphicsPixmapItem, HoverHighlightMixin):
             self.name = name
             self.direction = direction
             
-            # Настройка выделения
-            self.highlight_rect = None
-            
             # Обновление внешнего вида робота и настройка точки трансформации
             self.update_appearance()   
             
@@ -64,7 +64,7 @@ class Robot(QGraphicsPixmapItem, HoverHighlightMixin):
             # Помечаем, что экземпляр уже инициализирован
             self._is_initialized = True
             
-            logger.debug(f"Робот инициализирован с id={self.id}")
+            logger.debug("Робот инициализирован с id=%s", self.id)
         
         # Обновляем позицию при каждом вызове
         self.setPos(pos)
@@ -85,34 +85,9 @@ class Robot(QGraphicsPixmapItem, HoverHighlightMixin):
         """Возвращает ID робота в формате 'm<номер>'"""
         return self._id
         
-    def set_highlight(self, enabled):
-        """
-        Включает или выключает подсветку робота при выделении.
-        :param enabled: Если True, робот выделяется прямоугольником.
-        """
-        if enabled:
-            # Создаем прямоугольник для выделения
-            if not self.highlight_rect:
-                self.highlight_rect = QGraphicsRectItem(0, 0, 50, 50, self)
-                self.highlight_rect.setPen(QPen(Qt.GlobalColor.blue, 3))
-                self.highlight_rect.setBrush(QBrush(Qt.GlobalColor.transparent))
-                
-                # Устанавливаем точку трансформации для выделения, чтобы оно вращалось вокруг центра
-                self.highlight_rect.setTransformOriginPoint(25, 25)
-            
-            # Показываем выделение (оно уже будет вращаться вместе с роботом, так как оно его дочерний элемент)
-            self.highlight_rect.show()
-            
-            # Скрываем обводку при наведении, если она есть
-            self.set_hover_highlight(False)
-            
-        elif hasattr(self, 'highlight_rect') and self.highlight_rect:
-            # Скрываем прямоугольник выделения
-            self.highlight_rect.hide()
-            
-            # Если сейчас курсор наведен на объект, показываем обводку при наведении
-            if self._is_hovered:
-                self.set_hover_highlight(True)
+    def selection_pen(self):
+        """Перо обводки выделения робота."""
+        return paint_cache.pen(Qt.GlobalColor.blue, 3)
         
     def set_name(self, name):
         """
@@ -168,48 +143,56 @@ class Robot(QGraphicsPixmapItem, HoverHighlightMixin):
 
     def update_appearance(self):
         """Обновляет внешний вид робота в зависимости от направления."""
-        # Создаем пустой pixmap для начала
-        pixmap = QPixmap(50, 50)
-        pixmap.fill(Qt.GlobalColor.transparent)
-        
-        # Пытаемся загрузить SVG файл
-        if self.renderer.load("images/robot.svg"):  # Используем SVG
-            painter = QPainter(pixmap)
-            
-            # Рендерим SVG без применения поворота здесь
-            # (поворот будет применен через setRotation)
-            self.renderer.render(painter, QRectF(0, 0, 50, 50))
-            painter.end()
-        else:
-            # Если SVG/PNG не загрузился, рисуем синий квадрат
+        # SVG разбирается один раз за процесс, изображение берется из кэша
+        pixmap = svg_cache.pixmap(self.SVG_PATH, self.SIZE, self.SIZE, self._device_pixel_ratio)
+        if pixmap is None:
+            # Если SVG не загрузился, рисуем синий квадрат
             logger.debug("Изображение не загружено. Рисуем синий квадрат.")
-            painter = QPainter(pixmap)
-            
-            # Рисуем синий квадрат и диагонали без применения поворота
-            painter.setBrush(QBrush(Qt.GlobalColor.blue))
-            painter.setPen(QPen(Qt.GlobalColor.black, 1))
-            painter.drawRect(0, 0, 50, 50)
-            painter.drawLine(0, 0, 50, 50)
-            painter.drawLine(50, 0, 0, 50)
-            painter.end()
+            pixmap = self._default_pixmap(self._device_pixel_ratio)
         
         # Устанавливаем pixmap в любом случае
         self.setPixmap(pixmap)
+        # Кэш в координатах робота - с разрешением изображения
+        item_cache.apply(self, "robot", self._device_pixel_ratio)
         
         # Устанавливаем точку трансформации в центр изображения
         self.setTransformOriginPoint(25, 25)  # 50/2 = 25 (размер робота 50x50)
 
-    def draw_default_robot(self):
-        """Рисует синий квадрат с диагональными полосками."""
-        pixmap = QPixmap(50, 50)
+    def set_render_scale(self, scale):
+        """
+        Перерисовывает робота с четкостью, соответствующей масштабу представления.
+
+        Логический размер робота остается 50x50, меняется только разрешение
+        изображения. Повторные вызовы с тем же масштабом не делают ничего,
+        а ранее использованные масштабы берутся из кэша без обращения к диску.
+
+        Args:
+            scale: Масштаб представления с учетом devicePixelRatio экрана
+        """
+        scale = round(max(float(scale), 0.01), 2)
+        if scale == self._device_pixel_ratio:
+            return
+        self._device_pixel_ratio = scale
+        self.update_appearance()
+
+    @classmethod
+    def _default_pixmap(cls, device_pixel_ratio=1.0):
+        """Рисует синий квадрат с диагоналями (изображение робота по умолчанию)."""
+        size = cls.SIZE
+        pixmap = QPixmap(round(size * device_pixel_ratio), round(size * device_pixel_ratio))
         pixmap.fill(Qt.GlobalColor.transparent)
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
         painter = QPainter(pixmap)
         
-        # Рисуем синий квадрат и диагонали
+        # Рисуем синий квадрат и диагонали без применения поворота
         painter.setBrush(QBrush(Qt.GlobalColor.blue))
         painter.setPen(QPen(Qt.GlobalColor.black, 1))
-        painter.drawRect(0, 0, 50, 50)
-        painter.drawLine(0, 0, 50, 50)
-        painter.drawLine(50, 0, 0, 50)
+        painter.drawRect(0, 0, size, size)
+        painter.drawLine(0, 0, size, size)
+        painter.drawLine(size, 0, 0, size)
         painter.end()
-        self.setPixmap(pixmap)            
\ No newline at end of file
+        return pixmap
+
+    def draw_default_robot(self):
+        """Рисует синий квадрат с диагональными полосками."""
+        self.setPixmap(self._default_pixmap(self._device_pixel_ratio))
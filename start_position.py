@@ -3,6 +3,7 @@ from PyQt6.QtGui import QPainter, QPen, QBrush, QPainterPath, QColor
 from PyQt6.QtCore import QRectF, Qt, QPointF
 import logging
 from hover_highlight import HoverHighlightMixin
+from utils import item_cache, paint_cache
 
 logger = logging.getLogger(__name__)
 
@@ -47,9 +48,7 @@ class StartPosition(QGraphicsItem, HoverHighlightMixin):
             
             # Настройка отображения
             self.setZValue(500)  # Стартовая позиция отображается под роботом, но над другими объектами
-            
-            # Настройка выделения
-            self.highlight_rect = None
+            item_cache.apply(self, "start_position")
             
             # Инициализация подсветки при наведении после настройки всех атрибутов
             self.init_hover_highlight()
@@ -57,7 +56,7 @@ class StartPosition(QGraphicsItem, HoverHighlightMixin):
             # Помечаем, что экземпляр уже инициализирован
             self._is_initialized = True
             
-            logger.debug(f"Стартовая позиция инициализирована с id={self.id}")
+            logger.debug("Стартовая позиция инициализирована с id=%s", self.id)
         
         # Обновляем позицию при каждом вызове
         self.setPos(pos)
@@ -104,25 +103,9 @@ class StartPosition(QGraphicsItem, HoverHighlightMixin):
         
         return path
     
-    def set_highlight(self, enabled):
-        """
-        Включает или выключает подсветку стартовой позиции.
-        :param enabled: Если True, стартовая позиция выделяется прямоугольником.
-        """
-        if enabled:
-            # Создаем прямоугольник для выделения
-            if not self.highlight_rect:
-                size = 24  # Удвоенный half_size
-                self.highlight_rect = QGraphicsRectItem(-12, -12, size, size, self)
-                self.highlight_rect.setPen(QPen(Qt.GlobalColor.blue, 2))
-                self.highlight_rect.setBrush(QBrush(Qt.GlobalColor.transparent))
-                
-            # Показываем выделение
-            self.highlight_rect.show()
-            
-        elif hasattr(self, 'highlight_rect') and self.highlight_rect:
-            # Скрываем прямоугольник выделения
-            self.highlight_rect.hide()
+    def selection_pen(self):
+        """Перо обводки выделения стартовой позиции."""
+        return paint_cache.pen(Qt.GlobalColor.blue, 2)
     
     @property
     def id(self):
@@ -0,0 +1,154 @@
+from PyQt6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+from PyQt6.QtGui import QPainter, QPainterPath, QPixmap, QTransform
+from PyQt6.QtCore import Qt, QRectF, QPointF
+from collections import OrderedDict
+from math import ceil, floor
+import logging
+import weakref
+
+logger = logging.getLogger(__name__)
+
+
+class StaticLayerItem(QGraphicsItem):
+    """
+    Запеченный слой неподвижных объектов (стен и регионов) для режима наблюдателя.
+
+    Объекты рисуются в плитки QPixmap размером TILE_SIZE x TILE_SIZE пикселей,
+    которые кэшируются по масштабу, devicePixelRatio и номеру плитки. Кэш
+    сбрасывается целиком, когда меняется ревизия сцены (revision()), и частично
+    через invalidate_rect. При прокрутке и перерисовке поля копируются только
+    видимые плитки, а сами объекты сцены скрыты и не обходятся Qt.
+
+    Args:
+        items_in_rect: Связанный метод (QRectF) -> список объектов для запекания
+            в прямоугольнике сцены в порядке отрисовки
+        revision: Связанный метод () -> номер ревизии объектов сцены
+
+    Слой хранит слабые ссылки на методы, чтобы не образовывать цикл ссылок
+    с владельцем (FieldWidget), который иначе удалялся бы сборщиком мусора
+    в произвольный момент вместе со своей сценой.
+    """
+
+    TILE_SIZE = 256  # сторона плитки в пикселях
+    MAX_TILES = 160  # наибольшее количество плиток в кэше (~40 МБ при devicePixelRatio 1)
+
+    def __init__(self, items_in_rect, revision):
+        super().__init__()
+        self._items_in_rect_ref = weakref.WeakMethod(items_in_rect)
+        self._revision_ref = weakref.WeakMethod(revision)
+        self._baked_revision = None
+        self._bounds = QRectF()
+        # (масштаб, devicePixelRatio, столбец, строка) -> QPixmap; порядок - давность использования
+        self._tiles = OrderedDict()
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption, True)
+        self.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+        self.setAcceptHoverEvents(False)
+
+    def set_bounds(self, rect):
+        """Задает область сцены, которую покрывает слой."""
+        self.prepareGeometryChange()
+        self._bounds = QRectF(rect)
+        self.invalidate()
+
+    def _items_in_rect(self, rect):
+        items_in_rect = self._items_in_rect_ref()
+        return items_in_rect(rect) if items_in_rect is not None else []
+
+    def _revision(self):
+        revision = self._revision_ref()
+        return revision() if revision is not None else None
+
+    def boundingRect(self):
+        return self._bounds
+
+    def shape(self):
+        # Пустая форма: слой не перехватывает itemAt и события мыши
+        return QPainterPath()
+
+    def tile_count(self):
+        """Количество закэшированных плиток."""
+        return len(self._tiles)
+
+    def invalidate(self):
+        """Сбрасывает все плитки и запрашивает перерисовку слоя."""
+        self._tiles.clear()
+        self.update()
+
+    def invalidate_rect(self, rect):
+        """Сбрасывает плитки, пересекающие прямоугольник сцены rect, для всех масштабов."""
+        for key in [key for key in self._tiles if self._tile_rect(key[0], key[2], key[3]).intersects(rect)]:
+            del self._tiles[key]
+        self.update(rect)
+
+    def paint(self, painter, option, widget=None):
+        transform = painter.worldTransform()
+        exposed = option.exposedRect
+        scale = transform.m11()
+        if transform.isRotating() or scale <= 0 or abs(transform.m22() - scale) > 1e-9:
+            # Плитки рассчитаны на масштаб без поворота - рисуем объекты напрямую
+            for item in self._items_in_rect(exposed):
+                self._paint_tree(painter, item, transform, QStyleOptionGraphicsItem())
+            return
+
+        revision = self._revision()
+        if revision != self._baked_revision:
+            self._tiles.clear()
+            self._baked_revision = revision
+
+        dpr = painter.device().devicePixelRatioF()
+        step = self.TILE_SIZE / scale
+        columns = range(floor(exposed.left() / step), floor(exposed.right() / step) + 1)
+        rows = range(floor(exposed.top() / step), floor(exposed.bottom() / step) + 1)
+
+        painter.save()
+        painter.resetTransform()
+        for column in columns:
+            for row in rows:
+                tile = self._tile(scale, dpr, column, row, painter.renderHints())
+                # Плитки выравниваются по целым пикселям, чтобы копирование было без интерполяции
+                origin = transform.map(QPointF(column * step, row * step))
+                painter.drawPixmap(QPointF(round(origin.x()), round(origin.y())), tile)
+        painter.restore()
+
+    def _tile_rect(self, scale, column, row):
+        """Прямоугольник сцены, который покрывает плитка."""
+        step = self.TILE_SIZE / scale
+        return QRectF(column * step, row * step, step, step)
+
+    def _tile(self, scale, dpr, column, row, render_hints):
+        """Возвращает (и кэширует) плитку с запеченными объектами."""
+        key = (scale, dpr, column, row)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            return tile
+
+        size = int(ceil(self.TILE_SIZE * dpr))
+        tile = QPixmap(size, size)
+        tile.setDevicePixelRatio(dpr)
+        tile.fill(Qt.GlobalColor.transparent)
+
+        rect = self._tile_rect(scale, column, row)
+        base = QTransform().scale(scale, scale).translate(-rect.left(), -rect.top())
+        tile_painter = QPainter(tile)
+        tile_painter.setRenderHints(render_hints)
+        option = QStyleOptionGraphicsItem()
+        for item in self._items_in_rect(rect):
+            self._paint_tree(tile_painter, item, base, option)
+        tile_painter.end()
+
+        self._tiles[key] = tile
+        if len(self._tiles) > self.MAX_TILES:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def _paint_tree(self, painter, item, base, option):
+        """Рисует объект и его видимые дочерние элементы в системе координат base."""
+        painter.save()
+        painter.setTransform(item.sceneTransform() * base)
+        option.exposedRect = item.boundingRect()
+        item.paint(painter, option, None)
+        painter.restore()
+        for child in sorted(item.childItems(), key=lambda child: child.zValue()):
+            if child.isVisibleTo(item):
+                self._paint_tree(painter, child, base, option)
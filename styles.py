@@ -1,3 +1,54 @@
+import functools
+import re
+
+# Кэши сгенерированных стилей (по одному на функцию-генератор)
+_style_caches = []
+
+
+def _cached_style(builder):
+    """
+    Кэширует результат генератора стиля для каждой темы.
+    
+    Стили зависят только от темы и цветовых констант, поэтому строка
+    генерируется один раз, а при переключении темы берется из кэша.
+    """
+    cache = {}
+    _style_caches.append(cache)
+    
+    @functools.wraps(builder)
+    def wrapper(cls, is_dark_theme=True):
+        key = (cls, bool(is_dark_theme))
+        style = cache.get(key)
+        if style is None:
+            style = cache[key] = builder(cls, is_dark_theme)
+        return style
+    
+    return wrapper
+
+
+def _scope_style(style, scope, role=None):
+    """
+    Ограничивает правила стиля потомками виджета, выбранного селектором scope.
+    
+    Стили get_*_style рассчитаны на установку прямо на виджет; в общем стиле
+    приложения каждый их селектор предваряется scope, а при заданном role
+    тип в селекторе дополняется условием [styleRole="role"].
+    """
+    rules = []
+    for block in re.sub(r"/\*.*?\*/", "", style, flags=re.S).split("}"):
+        if "{" not in block:
+            continue
+        selectors, body = block.split("{", 1)
+        scoped = []
+        for selector in selectors.split(","):
+            selector = selector.strip()
+            type_name = re.match(r"[A-Za-z]*", selector).group()
+            role_filter = f'[styleRole="{role}"]' if role else ""
+            scoped.append(f"{scope} {type_name}{role_filter}{selector[len(type_name):]}")
+        rules.append(f"{', '.join(scoped)} {{{body}}}")
+    return "\n".join(rules)
+
+
 class AppStyles:
     #===============================
     # БАЗОВЫЕ ЦВЕТОВЫЕ КОНСТАНТЫ
@@ -33,6 +84,31 @@ class AppStyles:
     FLOAT_BUTTON_COLOR = "#252526" # Синий для плавающих кнопок
     CLOSE_BUTTON_COLOR = "#252526" # Красный для кнопки закрыть
     
+    # Имя объекта dock-виджета окна свойств в общем стиле приложения
+    PROPERTIES_DOCK_NAME = "propertiesDock"
+    
+    # Роли элементов главного окна (динамическое свойство styleRole) и генераторы их стилей
+    STYLE_ROLES = {
+        "coords": "get_coords_label_style",
+        "theme_switch": "get_theme_switch_style",
+        "checkbox": "get_checkbox_style",
+        "mode": "get_mode_button_style",
+        "tool": "get_tool_button_style",
+        "heading": "get_mode_label_style",
+        "accent": "get_accent_button_style",
+        "scale": "get_scale_button_style",
+        "scale_display": "get_scale_display_style",
+        "scene": "get_scene_style",
+    }
+    
+    # Роли элементов окна свойств: их правила действуют внутри PROPERTIES_DOCK_NAME
+    # и перекрывают общие правила окна свойств
+    PROPERTIES_STYLE_ROLES = {
+        "confirm": "get_confirm_button_style",
+        "cancel": "get_cancel_button_style",
+        "color_picker": "get_color_picker_style",
+    }
+    
     #===============================
     # ФУНКЦИИ ДЛЯ ПОЛУЧЕНИЯ ЦВЕТОВ
     #===============================
@@ -85,6 +161,12 @@ class AppStyles:
     # ФУНКЦИИ ДЛЯ ГЕНЕРАЦИИ СТИЛЕЙ
     #===============================
     
+    @classmethod
+    def clear_style_cache(cls):
+        """Сбрасывает кэш стилей (нужно после изменения цветовых констант)"""
+        for cache in _style_caches:
+            cache.clear()
+    
     @classmethod
     def _get_theme_colors(cls, is_dark_theme=True):
         """Возвращает словарь с цветами для текущей темы"""
@@ -122,6 +204,7 @@ class AppStyles:
             }
     
     @classmethod
+    @_cached_style
     def get_window_style(cls, is_dark_theme=True):
         """Генерирует стиль для основного окна приложения"""
         colors = cls._get_theme_colors(is_dark_theme)
@@ -281,6 +364,7 @@ class AppStyles:
         """
     
     @classmethod
+    @_cached_style
     def get_properties_style(cls, is_dark_theme=True):
         """Генерирует стиль для окна свойств"""
         colors = cls._get_theme_colors(is_dark_theme)
@@ -375,6 +459,7 @@ class AppStyles:
         """
     
     @classmethod
+    @_cached_style
     def get_coords_label_style(cls, is_dark_theme=True):
         """Генерирует стиль для метки координат"""
         colors = cls._get_theme_colors(is_dark_theme)
@@ -389,6 +474,7 @@ class AppStyles:
     """
     
     @classmethod
+    @_cached_style
     def get_checkbox_style(cls, is_dark_theme=True):
         """Генерирует стиль для чекбоксов"""
         colors = cls._get_theme_colors(is_dark_theme)
@@ -418,6 +504,7 @@ class AppStyles:
     """
     
     @classmethod
+    @_cached_style
     def get_dialog_style(cls, is_dark_theme=True):
         """Генерирует стиль для диалогов"""
         colors = cls._get_theme_colors(is_dark_theme)
@@ -433,6 +520,7 @@ class AppStyles:
     """
     
     @classmethod
+    @_cached_style
     def get_toggle_button_style(cls, is_dark_theme=True):
         """Генерирует стиль для кнопок переключения"""
         colors = cls._get_theme_colors(is_dark_theme)
@@ -451,6 +539,7 @@ class AppStyles:
     """
     
     @classmethod
+    @_cached_style
     def get_mode_button_style(cls, is_dark_theme=True):
         """Генерирует стиль для кнопок режимов"""
         colors = cls._get_theme_colors(is_dark_theme)
@@ -483,6 +572,7 @@ class AppStyles:
     """
     
     @classmethod
+    @_cached_style
     def get_tool_button_style(cls, is_dark_theme=True):
         """Генерирует стиль для кнопок инструментов"""
         colors = cls._get_theme_colors(is_dark_theme)
@@ -522,6 +612,7 @@ class AppStyles:
     """
     
     @classmethod
+    @_cached_style
     def get_accent_button_style(cls, is_dark_theme=True):
         """Генерирует стиль для акцентированных кнопок"""
         colors = cls._get_theme_colors(is_dark_theme)
@@ -546,6 +637,7 @@ class AppStyles:
     """
     
     @classmethod
+    @_cached_style
     def get_mode_label_style(cls, is_dark_theme=True):
         """Генерирует стиль для меток режимов"""
         colors = cls._get_theme_colors(is_dark_theme)
@@ -557,6 +649,7 @@ class AppStyles:
     """
     
     @classmethod
+    @_cached_style
     def get_scene_style(cls, is_dark_theme=True):
         """Генерирует стиль для сцены"""
         colors = cls._get_theme_colors(is_dark_theme)
@@ -568,6 +661,51 @@ class AppStyles:
     """
     
     @classmethod
+    def _get_round_button_style(cls, background):
+        """Генерирует стиль круглой кнопки редактируемого поля (см. FlatRoundButton)"""
+        return f"""
+            QPushButton {{
+                background-color: {background};
+                border-radius: 4px;
+                min-width: 24px;
+                min-height: 18px;
+                padding: 0px;
+                border: 0px solid white;
+            }}
+        """
+    
+    @classmethod
+    @_cached_style
+    def get_confirm_button_style(cls, is_dark_theme=True):
+        """Генерирует стиль кнопки подтверждения редактируемого поля"""
+        return cls._get_round_button_style(cls._get_theme_colors(is_dark_theme)['success'])
+    
+    @classmethod
+    @_cached_style
+    def get_cancel_button_style(cls, is_dark_theme=True):
+        """Генерирует стиль кнопки отмены редактируемого поля"""
+        return cls._get_round_button_style(cls._get_theme_colors(is_dark_theme)['error'])
+    
+    @classmethod
+    @_cached_style
+    def get_color_picker_style(cls, is_dark_theme=True):
+        """Генерирует стиль рамки кнопки выбора цвета (цвет фона задает сама кнопка)"""
+        colors = cls._get_theme_colors(is_dark_theme)
+        hover_border = "#BBBBBB" if is_dark_theme else "#555555"
+        return f"""
+            QPushButton {{
+                border: 1px solid {colors['border']};
+                border-radius: 4px;
+                min-width: 0px;
+                padding: 0px;
+            }}
+            QPushButton:hover {{
+                border: 2px solid {hover_border};
+            }}
+        """
+    
+    @classmethod
+    @_cached_style
     def get_theme_switch_style(cls, is_dark_theme=True):
         """Генерирует стиль для кнопки переключения темы"""
         colors = cls._get_theme_colors(is_dark_theme)
@@ -588,6 +726,7 @@ class AppStyles:
         """
         
     @classmethod
+    @_cached_style
     def get_scale_button_style(cls, is_dark_theme=True):
         """Генерирует стиль для кнопок масштабирования"""
         colors = cls._get_theme_colors(is_dark_theme)
@@ -622,6 +761,7 @@ class AppStyles:
         """
         
     @classmethod
+    @_cached_style
     def get_scale_display_style(cls, is_dark_theme=True):
         """Генерирует стиль для поля отображения текущего масштаба"""
         colors = cls._get_theme_colors(is_dark_theme)
@@ -641,6 +781,62 @@ class AppStyles:
             }}
         """
 
+    
+    @classmethod
+    @_cached_style
+    def get_theme_rules(cls, is_dark_theme=True):
+        """Генерирует правила общего стиля приложения для одной темы"""
+        colors = cls._get_theme_colors(is_dark_theme)
+        scope = f'QMainWindow[theme="{"dark" if is_dark_theme else "light"}"]'
+        
+        rules = [
+            # Само окно: остальные правила стиля окна действуют на его потомков
+            f"{scope} {{ background-color: {colors['background']}; color: {colors['text']}; }}",
+            _scope_style(cls.get_window_style(is_dark_theme), scope),
+            _scope_style(cls.get_properties_style(is_dark_theme), f"{scope} #{cls.PROPERTIES_DOCK_NAME}"),
+        ]
+        for role, builder in cls.STYLE_ROLES.items():
+            rules.append(_scope_style(getattr(cls, builder)(is_dark_theme), scope, role))
+        for role, builder in cls.PROPERTIES_STYLE_ROLES.items():
+            rules.append(_scope_style(getattr(cls, builder)(is_dark_theme),
+                                      f"{scope} #{cls.PROPERTIES_DOCK_NAME}", role))
+        return "\n".join(rules)
+    
+    @classmethod
+    def get_application_style(cls):
+        """
+        Генерирует общий стиль приложения (QApplication.setStyleSheet) для обеих тем.
+        
+        Правила выбираются динамическим свойством theme главного окна ("dark" или
+        "light"), элементы окна - свойством styleRole (см. STYLE_ROLES), окно
+        свойств - именем PROPERTIES_DOCK_NAME. Для смены темы достаточно сменить
+        свойство окна и один раз перепроверить стиль.
+        """
+        return cls.get_theme_rules(True) + "\n" + cls.get_theme_rules(False)
+    
+    @staticmethod
+    def apply_widget_style(widget, style, window_style=""):
+        """
+        Устанавливает собственный стиль виджета с учетом общего стиля окна.
+        
+        Внутри окна со свойством theme оформление по теме задает общий стиль
+        окна (get_application_style), и собственный стиль перекрыл бы его правила,
+        поэтому там устанавливается window_style - не зависящая от темы часть
+        (по умолчанию стиль снимается). Тот же стиль повторно не устанавливается:
+        каждая установка перепроверяет стиль виджета и всех его потомков.
+        
+        Args:
+            widget: Виджет
+            style: Полный стиль виджета вне главного окна
+            window_style: Стиль виджета внутри окна с общим стилем
+        """
+        owner = widget
+        while owner is not None and owner.property("theme") is None:
+            owner = owner.parentWidget()
+        if owner is not None:
+            style = window_style
+        if widget.styleSheet() != style:
+            widget.setStyleSheet(style)
 
 # Создание констант после определения класса
 #===============================
@@ -0,0 +1,120 @@
+import sys
+import os
+import io
+import json
+import shutil
+import tempfile
+import unittest
+
+# Добавляем корневую директорию в sys.path для импорта модулей проекта
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.batch_cli import iter_xml_files, process_file, run_batch, main
+from utils.scene_model import SceneModel, WallRecord, RegionRecord, RobotRecord
+from utils.xml_handler import XMLHandler
+
+
+class TestBatchCli(unittest.TestCase):
+    """Тесты пакетной обработки файлов сцен (без Qt)"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.model = SceneModel(1300, 1000)
+        self.model.set_wall(WallRecord("w1", 0, 0, 100, 0))
+        self.model.set_wall(WallRecord("w2", 100, 0, 100, 200))
+        self.model.set_region(RegionRecord("r1", 200, 200, 100, 50))
+        self.model.robot = RobotRecord(400, 400)
+        self.xml = XMLHandler().generate_model_xml(self.model)
+
+        self.write("scene1.xml", self.xml)
+        self.write(os.path.join("nested", "scene2.xml"), self.xml)
+        self.write("notes.txt", "не сцена")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def run_lines(self, command, jobs, output=None):
+        out = io.StringIO()
+        summary = run_batch(command, iter_xml_files(self.temp_dir), self.temp_dir, output, jobs, out)
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        return summary, sorted(results, key=lambda result: result["file"])
+
+    def test_iter_xml_files(self):
+        """Тестирование рекурсивного поиска XML-файлов"""
+        files = iter_xml_files(self.temp_dir)
+        self.assertEqual([os.path.relpath(path, self.temp_dir) for path in files],
+                         ["nested/scene2.xml".replace("/", os.sep), "scene1.xml"])
+
+    def test_validate_inline_and_parallel(self):
+        """Тестирование одинаковых результатов проверки без пула и в пуле процессов"""
+        for jobs in (1, 2):
+            summary, results = self.run_lines("validate", jobs)
+            self.assertEqual(summary["files"], 2)
+            self.assertEqual(summary["failed"], 0)
+            self.assertTrue(all(result["ok"] and result["issues"] == [] for result in results))
+            self.assertTrue(all("time_ms" in result for result in results))
+
+    def test_validate_reports_errors(self):
+        """Тестирование ошибки разбора, пропущенной стены и пересечения стены с роботом"""
+        broken = self.write("broken.xml", "<root><world>")
+        result = process_file("validate", broken)
+        self.assertFalse(result["ok"])
+        self.assertIn("error", result)
+
+        # Первая стена вне сцены и пропускается при разборе, вторая проходит через робота
+        invalid = self.xml.replace('begin="0:0" end="100:0"', 'begin="0:0" end="5000:0"')
+        invalid = invalid.replace('begin="100:0" end="100:200"', 'begin="380:420" end="500:420"')
+        result = process_file("validate", self.write("invalid.xml", invalid))
+        self.assertFalse(result["ok"])
+        self.assertEqual(len(result["skipped"]), 1)
+        self.assertEqual([issue["id"] for issue in result["issues"]], ["w2"])
+
+    def test_stats(self):
+        """Тестирование сводки по сцене"""
+        result = process_file("stats", os.path.join(self.temp_dir, "scene1.xml"))
+        self.assertTrue(result["ok"])
+        self.assertEqual((result["walls"], result["regions"]), (2, 1))
+        self.assertTrue(result["robot"])
+        self.assertFalse(result["start_position"])
+        self.assertAlmostEqual(result["wall_length"], 300.0)
+
+    def test_normalize_writes_to_output(self):
+        """Тестирование записи нормализованных файлов в отдельный каталог"""
+        source = self.write("scene1.xml", self.xml.replace("\n", "\n\n"))
+        output = os.path.join(self.temp_dir, "out")
+        summary, results = self.run_lines("normalize", 1, output)
+        self.assertEqual(summary["failed"], 0)
+        changed = {os.path.relpath(result["file"], self.temp_dir): result["changed"] for result in results}
+        self.assertTrue(changed["scene1.xml"])
+
+        # Оба файла содержат одну сцену и после нормализации совпадают
+        with open(os.path.join(output, "scene1.xml"), encoding="utf-8") as f:
+            normalized = f.read()
+        with open(os.path.join(output, "nested", "scene2.xml"), encoding="utf-8") as f:
+            self.assertEqual(f.read(), normalized)
+        with open(source, encoding="utf-8") as f:
+            self.assertNotEqual(f.read(), self.xml)
+
+    def test_main_exit_code(self):
+        """Тестирование кода возврата и строки сводки"""
+        stdout = sys.stdout
+        sys.stdout = io.StringIO()
+        try:
+            self.assertEqual(main(["validate", self.temp_dir, "--jobs", "1"]), 0)
+            self.write("broken.xml", "<root>")
+            self.assertEqual(main(["validate", self.temp_dir, "-j", "1"]), 1)
+            last_line = sys.stdout.getvalue().splitlines()[-1]
+        finally:
+            sys.stdout = stdout
+        self.assertEqual(json.loads(last_line)["summary"]["failed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
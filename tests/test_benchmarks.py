@@ -0,0 +1,151 @@
+import sys
+import os
+import json
+import tempfile
+import shutil
+import unittest
+
+# Добавляем корневую директорию в sys.path для импорта модулей проекта
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.harness import (
+    BenchmarkResult, MemoryResult, percentile, run_benchmark, save_baseline, load_baseline, find_regressions,
+    current_rss_bytes
+)
+from benchmarks.scene_generator import generate_scene_model, generate_scene_xml
+from benchmarks.scenarios import BenchmarkScene, SCENARIOS, MEMORY_SCENARIOS
+from utils.xml_handler import XMLHandler
+
+# Во сколько раз перемещение мыши над сценой из 10000 объектов может быть дороже,
+# чем над сценой из 100 (поиск объекта под курсором идет по пространственным индексам)
+MOUSE_MOVE_SCALING_LIMIT = 5
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    """Тесты измерения времени и сравнения с базовыми замерами (без Qt)"""
+
+    def test_statistics(self):
+        """Тестирование медианы и перцентиля"""
+        result = BenchmarkResult("scenario", [0.4, 0.1, 0.3, 0.2, 0.5])
+        self.assertAlmostEqual(result.median, 0.3)
+        self.assertAlmostEqual(result.p95, 0.48)
+        self.assertAlmostEqual(percentile([1.0], 95), 1.0)
+
+    def test_run_benchmark_excludes_warmup_and_setup(self):
+        """Тестирование того, что разогрев не входит в результат, а setup/teardown вызываются каждый раз"""
+        calls = []
+        result = run_benchmark("scenario", lambda: calls.append("run"),
+                               setup=lambda: calls.append("setup"),
+                               teardown=lambda: calls.append("teardown"),
+                               warmup=2, repeats=3)
+        self.assertEqual(len(result.samples), 3)
+        self.assertEqual(calls.count("run"), 5)
+        self.assertEqual(calls[:3], ["setup", "run", "teardown"])
+
+    def test_find_regressions(self):
+        """Тестирование обнаружения регрессии сверх допуска"""
+        baseline = {"fast/100": {"median": 0.1}, "slow/100": {"median": 0.1}, "tiny/100": {"median": 0.0001}}
+        results = [BenchmarkResult("fast/100", [0.11]), BenchmarkResult("slow/100", [0.2]),
+                   BenchmarkResult("tiny/100", [0.0005]), BenchmarkResult("new/100", [1.0])]
+        # Замеры памяти сохраняются, но не проверяются на регрессию
+        baseline["memory/100"] = {"shared": 100}
+        results.append(MemoryResult("memory/100", {"shared": 1000}))
+        regressions = find_regressions(results, baseline, tolerance=0.25)
+        self.assertEqual([name for name, _, _ in regressions], ["slow/100"])
+
+    def test_baseline_round_trip(self):
+        """Тестирование сохранения базовых замеров с сохранением остальных сценариев"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, "baselines.json")
+            self.assertEqual(load_baseline(path), {})
+            save_baseline(path, [BenchmarkResult("a/100", [0.2]), MemoryResult("m/100", {"shared": 10.0})],
+                          {"b/100": {"median": 0.5}})
+            baseline = load_baseline(path)
+            self.assertEqual(sorted(baseline), ["a/100", "b/100", "m/100"])
+            self.assertAlmostEqual(baseline["a/100"]["median"], 0.2)
+            self.assertEqual(baseline["m/100"], {"shared": 10.0})
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class TestSceneGenerator(unittest.TestCase):
+    """Тесты генератора синтетических сцен (без Qt)"""
+
+    def test_generated_scene_is_valid(self):
+        """Тестирование количества объектов и отсутствия нарушений границ"""
+        model = generate_scene_model(walls=900, regions=100, seed=1)
+        self.assertEqual(len(model.walls), 900)
+        self.assertEqual(len(model.regions), 100)
+        self.assertEqual(model.validate(), [])
+
+    def test_generated_xml_round_trip(self):
+        """Тестирование того, что XML сгенерированной сцены разбирается без потерь"""
+        model = XMLHandler().parse_scene_model(generate_scene_xml(walls=50, regions=10, seed=2))
+        self.assertEqual(len(model.walls), 50)
+        self.assertEqual(len(model.regions), 10)
+        self.assertIsNotNone(model.robot)
+        self.assertIsNotNone(model.start_position)
+
+
+class TestBenchmarkScenarios(unittest.TestCase):
+    """Проверка того, что все сценарии выполняются на маленькой сцене"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        # Сценарии работают с настоящим роботом; некоторые тестовые модули
+        # подменяют FieldWidget.init_robot при импорте
+        from field_widget import FieldWidget
+        if FieldWidget.init_robot.__qualname__ != "FieldWidget.init_robot":
+            self.skipTest("FieldWidget.init_robot подменен другим тестовым модулем")
+
+    def test_all_scenarios_run(self):
+        """Тестирование выполнения каждого сценария"""
+        scene = BenchmarkScene(walls=40, regions=10)
+        try:
+            for name, (factory, needs_loaded_scene) in SCENARIOS.items():
+                if needs_loaded_scene:
+                    scene.load()
+                    self.assertEqual(len(scene.field_widget.walls), 40, name)
+                    self.assertIsNotNone(scene.field_widget.robot_model, name)
+                setup, run, teardown = factory(scene)
+                result = run_benchmark(name, run, setup, teardown, warmup=0, repeats=1)
+                self.assertEqual(len(result.samples), 1)
+        finally:
+            scene.close()
+
+    def test_wall_memory_scenario(self):
+        """Тестирование того, что общие графические ресурсы расходуют меньше памяти, чем копии у каждой стены"""
+        scene = BenchmarkScene(walls=40, regions=10)
+        try:
+            values = MEMORY_SCENARIOS["wall_memory"](scene)
+        finally:
+            scene.close()
+        if current_rss_bytes() is None:
+            self.assertEqual(values, {})
+            return
+        self.assertLess(values["shared"], values["per_wall"])
+
+    def test_mouse_move_cost_does_not_grow_with_scene(self):
+        """Тестирование того, что стоимость перемещения мыши не растет с числом объектов"""
+        costs = {}
+        for size in (100, 10000):
+            scene = BenchmarkScene(walls=size - size // 10, regions=size // 10)
+            try:
+                scene.load()
+                for name in ("hover", "hover_edit", "drag"):
+                    setup, run, teardown = SCENARIOS[name][0](scene)
+                    costs[name, size] = run_benchmark(name, run, setup, teardown, warmup=1, repeats=3).median
+            finally:
+                scene.close()
+        for name in ("hover", "hover_edit", "drag"):
+            self.assertLess(costs[name, 10000], costs[name, 100] * MOUSE_MOVE_SCALING_LIMIT, name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Добавляем корневую директорию в sys.path для импорта модулей проекта
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import config
+
+
+class TestConfigPersistence(unittest.TestCase):
+    """Тесты отложенного атомарного сохранения конфигурации во временный файл"""
+
+    def setUp(self):
+        config.flush()
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.temp_dir, "app_config.json")
+        self.saved_config = json.loads(json.dumps(config.get_all()))
+        config.CONFIG_FILE = self.config_file
+        config.SAVE_DELAY = 60  # таймер не должен срабатывать во время теста
+
+    def tearDown(self):
+        config.flush()
+        del config.CONFIG_FILE
+        del config.SAVE_DELAY
+        config._config.clear()
+        config._config.update(self.saved_config)
+        shutil.rmtree(self.temp_dir)
+
+    def test_set_is_deferred(self):
+        """Тестирование того, что set не пишет файл сразу, а flush пишет"""
+        config.set("grid", "size", 25)
+        self.assertTrue(config.is_dirty())
+        self.assertFalse(os.path.exists(self.config_file))
+
+        self.assertTrue(config.flush())
+        self.assertFalse(config.is_dirty())
+        with open(self.config_file, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["grid"]["size"], 25)
+
+    def test_update_writes_once(self):
+        """Тестирование пакетного обновления: несколько изменений - одна запись"""
+        with patch.object(config, "_save_config", wraps=config._save_config) as save:
+            config.update({"appearance": {"theme": "dark", "theme_name": "Темный стиль"},
+                           "grid": {"size": 40}})
+            config.set("grid", "snap_to_grid", False)
+            config.flush()
+            config.flush()
+        self.assertEqual(save.call_count, 1)
+        self.assertEqual(config.get("grid", "size"), 40)
+
+    def test_unchanged_value_not_dirty(self):
+        """Тестирование того, что установка прежнего значения не требует записи"""
+        config.set("grid", "size", config.get("grid", "size"))
+        self.assertFalse(config.is_dirty())
+
+    def test_failed_write_keeps_file(self):
+        """Тестирование атомарности: ошибка записи не портит существующий файл"""
+        config.set("grid", "size", 30)
+        config.flush()
+
+        config.set("grid", "size", 35)
+        with patch("config.os.replace", side_effect=OSError("disk full")):
+            self.assertFalse(config.flush())
+        self.assertTrue(config.is_dirty())
+        with open(self.config_file, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["grid"]["size"], 30)
+        self.assertEqual(os.listdir(self.temp_dir), ["app_config.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,9 @@
 import sys
 import os
 import unittest
-from PyQt6.QtCore import Qt, QPointF, QRectF
-from PyQt6.QtWidgets import QApplication, QGraphicsScene, QMessageBox
+from PyQt6.QtCore import Qt, QPointF, QRectF, QEvent
+from PyQt6.QtWidgets import QApplication, QGraphicsScene, QGraphicsView, QMessageBox
+from PyQt6.QtGui import QMouseEvent, QPainter
 from PyQt6.QtTest import QTest
 import logging
 from unittest.mock import patch, MagicMock
@@ -52,6 +53,10 @@ class TestFieldWidget(unittest.TestCase):
                     
                 def boundingRect(self):
                     return self.boundingRect_value
+                
+                def isVisible(self):
+                    # Заглушка не добавлена на сцену
+                    return False
                     
                 def setPos(self, x, y=None):
                     if isinstance(x, QPointF):
@@ -103,6 +108,27 @@ class TestFieldWidget(unittest.TestCase):
         self.assertIsNotNone(self.field_widget.robot_model)
         self.assertEqual(self.field_widget.robot_model.pos(), QPointF(0, 0))
     
+    def test_grid_modes(self):
+        """Тест режимов отрисовки сетки"""
+        # По умолчанию сетка рисуется в drawBackground и не создает элементов сцены
+        self.assertEqual(self.field_widget.grid_mode, FieldWidget.GRID_MODE_BACKGROUND)
+        self.assertEqual(len(self.field_widget.grid_layer.childItems()), 0)
+        
+        # Отрисовка фона кэширует одну плитку для текущего масштаба
+        self.field_widget.resize(400, 300)
+        self.field_widget.grab()
+        self.assertEqual([key[0] for key in self.field_widget._grid_tile_cache], [50])
+        
+        # Режим элементов создает по линии на каждый шаг сетки
+        self.field_widget.set_grid_mode(FieldWidget.GRID_MODE_ITEMS)
+        self.assertEqual(len(self.field_widget.grid_layer.childItems()), 1300 // 50 + 800 // 50)
+        
+        self.field_widget.set_grid_mode(FieldWidget.GRID_MODE_BACKGROUND)
+        self.assertEqual(len(self.field_widget.grid_layer.childItems()), 0)
+        
+        with self.assertRaises(ValueError):
+            self.field_widget.set_grid_mode("unknown")
+    
     def test_add_wall(self):
         """Тест добавления стены"""
         # Начальное количество стен
@@ -121,6 +147,431 @@ class TestFieldWidget(unittest.TestCase):
         self.assertEqual(wall.line().p1(), start)
         self.assertEqual(wall.line().p2(), end)
     
+    def test_wall_index_follows_walls(self):
+        """Тест синхронизации пространственного индекса стен со сценой"""
+        wall = self.field_widget.add_wall(QPointF(100, 100), QPointF(200, 100))
+        self.assertIn(wall, self.field_widget.wall_index)
+        self.assertTrue(self.field_widget.robot_intersects_walls(QPointF(120, 80)))
+        self.assertFalse(self.field_widget.robot_intersects_walls(QPointF(-200, -200)))
+        
+        # После перемещения стены индекс должен указывать на новое положение
+        wall.setLine(-250, -200, -150, -200)
+        self.assertFalse(self.field_widget.robot_intersects_walls(QPointF(120, 80)))
+        self.assertTrue(self.field_widget.robot_intersects_walls(QPointF(-200, -220)))
+        
+        # Удаленная стена не должна оставаться в индексе
+        self.field_widget.delete_wall(wall)
+        self.assertNotIn(wall, self.field_widget.wall_index)
+        self.assertFalse(self.field_widget.robot_intersects_walls(QPointF(-200, -220)))
+    
+    def test_rejected_objects_do_not_touch_id_registries(self):
+        """Тест проверки границ без создания временных объектов"""
+        wall_count = len(self.field_widget.wall_ids)
+        next_wall_id = self.field_widget.wall_ids.next_number
+        region_count = len(self.field_widget.region_ids)
+        
+        # Стена и регион за пределами сцены отклоняются до создания объектов
+        self.assertIsNone(self.field_widget.add_wall(QPointF(0, 0), QPointF(5000, 0)))
+        self.assertIsNone(self.field_widget.add_region(QRectF(600, 0, 200, 200)))
+        
+        self.assertEqual(len(self.field_widget.wall_ids), wall_count)
+        self.assertEqual(self.field_widget.wall_ids.next_number, next_wall_id)
+        self.assertEqual(len(self.field_widget.region_ids), region_count)
+    
+    def test_load_scene(self):
+        """Тест пакетной загрузки сцены"""
+        loaded = []
+        self.field_widget.scene_loaded.connect(loaded.append)
+        selected = []
+        self.field_widget.item_selected.connect(selected.append)
+        
+        data = {
+            "walls": [
+                {"id": 900, "begin": (100, 100), "end": (200, 100)},
+                {"id": 900, "begin": (100, 200), "end": (200, 200)},  # повторяющийся ID
+                {"id": 901, "begin": (0, 0), "end": (5000, 0)},  # за пределами сцены
+                {"id": 902, "begin": (-10, 25), "end": (60, 25)},  # пересекает робота
+            ],
+            "regions": [
+                {"id": 900, "rect": QRectF(-300, -300, 100, 50), "color": None},
+                {"id": 901, "rect": QRectF(600, 0, 200, 200), "color": None},  # за пределами сцены
+            ],
+            "robot": None,
+            "start_position": None,
+        }
+        summary = self.field_widget.load_scene(data, clear=False)
+        
+        self.assertEqual(summary, {"walls": 2, "regions": 1, "robot": False, "start_position": False})
+        self.assertEqual(loaded, [summary])
+        self.assertEqual(selected, [])
+        
+        walls = self.field_widget.walls[-2:]
+        self.assertEqual(walls[0].id, "w900")
+        self.assertNotEqual(walls[1].id, "w900")
+        self.assertGreater(self.field_widget.wall_ids.next_number, 900)
+        self.assertTrue(all(wall in self.field_widget.wall_index for wall in walls))
+        self.assertEqual(self.field_widget.regions[-1].id, "r900")
+        self.assertEqual(self.field_widget.scene().itemIndexMethod(), QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+    
+    def test_load_scene_chunked(self):
+        """Тест порционной загрузки сцены по таймеру"""
+        loaded = []
+        self.field_widget.scene_loaded.connect(loaded.append)
+        progress = []
+        self.field_widget.scene_load_progress.connect(lambda done, total: progress.append((done, total)))
+        
+        data = {
+            "walls": [{"id": 1000 + i, "begin": (-600, -350 + i), "end": (-500, -350 + i)} for i in range(300)],
+            "regions": [{"id": 1000, "rect": QRectF(-300, -300, 100, 50), "color": None}],
+            "robot": None,
+            "start_position": None,
+        }
+        walls_before = len(self.field_widget.walls)
+        total = self.field_widget.load_scene_chunked(data, clear=False, time_slice_ms=0)
+        
+        self.assertEqual(total, 301)
+        self.assertTrue(self.field_widget.is_loading_scene())
+        self.assertEqual(self.field_widget.scene().itemIndexMethod(), QGraphicsScene.ItemIndexMethod.NoIndex)
+        
+        while self.field_widget.is_loading_scene():
+            app.processEvents()
+        
+        # Нулевая длительность порции - по одному пакету за тик таймера
+        self.assertGreater(len(progress), 1)
+        self.assertEqual(progress[-1], (301, 301))
+        self.assertEqual(loaded, [{"walls": 300, "regions": 1, "robot": False, "start_position": False}])
+        self.assertEqual(len(self.field_widget.walls), walls_before + 300)
+        self.assertEqual(self.field_widget.scene().itemIndexMethod(), QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+    
+    def test_cancel_scene_load(self):
+        """Тест отмены порционной загрузки сцены"""
+        cancelled = []
+        self.field_widget.scene_load_cancelled.connect(cancelled.append)
+        loaded = []
+        self.field_widget.scene_loaded.connect(loaded.append)
+        
+        data = {
+            "walls": [{"id": 2000 + i, "begin": (-600, -350 + i), "end": (-500, -350 + i)} for i in range(300)],
+            "regions": [],
+            "robot": None,
+            "start_position": None,
+        }
+        walls_before = len(self.field_widget.walls)
+        self.field_widget.load_scene_chunked(data, clear=False, time_slice_ms=0)
+        app.processEvents()
+        
+        self.assertTrue(self.field_widget.cancel_scene_load())
+        self.assertFalse(self.field_widget.is_loading_scene())
+        self.assertFalse(self.field_widget.cancel_scene_load())
+        
+        # Уже вставленные стены остаются на сцене, сигнал завершения не испускается
+        self.assertEqual(len(cancelled), 1)
+        self.assertEqual(cancelled[0]["walls"], len(self.field_widget.walls) - walls_before)
+        self.assertLess(cancelled[0]["walls"], 300)
+        app.processEvents()
+        self.assertEqual(loaded, [])
+        self.assertEqual(self.field_widget.scene().itemIndexMethod(), QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+
+    def test_scene_load_failure(self):
+        """Тест прерывания порционной загрузки при ошибке создания объекта"""
+        failed = []
+        self.field_widget.scene_load_failed.connect(failed.append)
+        loaded = []
+        self.field_widget.scene_loaded.connect(loaded.append)
+
+        data = {
+            "walls": [{"id": 3000, "begin": (-600, -350), "end": (-500, -350)}],
+            "regions": [{"id": 3000, "rect": "не прямоугольник", "color": None}],
+            "robot": None,
+            "start_position": None,
+        }
+        self.field_widget.load_scene_chunked(data, clear=False, time_slice_ms=0)
+        while self.field_widget.is_loading_scene():
+            app.processEvents()
+
+        self.assertEqual(len(failed), 1)
+        self.assertEqual(loaded, [])
+        self.assertEqual(self.field_widget.scene().itemIndexMethod(), QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+        self.assertTrue(self.field_widget.viewport().updatesEnabled())
+
+    def test_scene_model_mirrors_items(self):
+        """Тест синхронизации модели сцены с объектами виджета"""
+        model = self.field_widget.scene_model
+        wall = self.field_widget.add_wall(QPointF(100, 100), QPointF(200, 100))
+        region = self.field_widget.add_region(QRectF(-300, -300, 100, 50))
+        
+        self.assertEqual((model.walls[wall.id].x2, model.walls[wall.id].y2), (200, 100))
+        self.assertEqual(model.regions[region.id].rect, (-300, -300, 100, 50))
+        
+        # Перемещение конца стены и региона отражается в модели
+        with wall.updating():
+            wall.setLine(100, 100, 250, 150)
+        self.assertEqual((model.walls[wall.id].x2, model.walls[wall.id].y2), (250, 150))
+        self.field_widget.selected_item = region
+        self.field_widget.update_region_position(-200, -200)
+        self.assertEqual((model.regions[region.id].x, model.regions[region.id].y), (-200, -200))
+        
+        self.field_widget.delete_wall(wall)
+        self.assertNotIn(wall.id, model.walls)
+    
+    def test_hover_tracks_single_item(self):
+        """Тест отслеживания наведения без перебора всех объектов сцены"""
+        first = self.field_widget.add_wall(QPointF(100, 100), QPointF(200, 100))
+        second = self.field_widget.add_wall(QPointF(100, 200), QPointF(200, 200))
+        self.field_widget.deselect_item()
+        
+        with patch.object(self.field_widget.objects_layer, 'childItems', side_effect=AssertionError):
+            self.field_widget.handle_hover_for_item(first, QPointF(150, 100))
+            self.assertTrue(first._is_hovered)
+            
+            self.field_widget.handle_hover_for_item(second, QPointF(150, 200))
+            self.assertFalse(first._is_hovered)
+            self.assertTrue(second._is_hovered)
+            
+            self.field_widget.handle_hover_for_item(None, QPointF(0, 300))
+            self.assertFalse(second._is_hovered)
+    
+    def test_item_at_uses_spatial_indexes(self):
+        """Тест поиска объекта под курсором по пространственным индексам без обхода сцены"""
+        region = self.field_widget.add_region(QRectF(100, 50, 200, 100))
+        wall = self.field_widget.add_wall(QPointF(100, 100), QPointF(300, 100))
+        self.field_widget.deselect_item()
+        
+        with patch.object(self.field_widget.scene(), 'itemAt', side_effect=AssertionError):
+            # Стена лежит выше региона
+            self.assertIs(self.field_widget._item_at(QPointF(200, 100)), wall)
+            self.assertIs(self.field_widget._item_at(QPointF(200, 130)), region)
+            self.assertIsNone(self.field_widget._item_at(QPointF(-300, -300)))
+            
+            # Индекс регионов следует за перемещением
+            self.field_widget.selected_item = region
+            self.field_widget.update_region_position(-300, -300)
+            self.field_widget.deselect_item()
+            self.assertIs(self.field_widget._item_at(QPointF(-250, -250)), region)
+            self.assertIs(self.field_widget._item_at(QPointF(200, 100)), wall)
+            self.assertIsNone(self.field_widget._item_at(QPointF(200, 130)))
+            
+            # Удаленные объекты не находятся
+            self.field_widget.delete_wall(wall)
+            self.field_widget.delete_region(region)
+            self.assertIsNone(self.field_widget._item_at(QPointF(200, 100)))
+            self.assertIsNone(self.field_widget._item_at(QPointF(-250, -250)))
+    
+    def test_static_layer_observer_mode(self):
+        """Тест запеченного слоя стен и регионов в режиме наблюдателя"""
+        wall = self.field_widget.add_wall(QPointF(100, 100), QPointF(200, 100))
+        self.field_widget.deselect_item()
+        layer = self.field_widget.static_layer
+        self.assertTrue(layer.isVisible())
+        self.assertFalse(wall.isVisible())
+        
+        # Плитки рисуются один раз и затем копируются без обхода стен
+        self.field_widget.resize(400, 300)
+        self.field_widget.grab()
+        self.assertGreater(layer.tile_count(), 0)
+        with patch.object(type(wall), 'paint', side_effect=AssertionError):
+            self.field_widget.grab()
+        
+        # Скрытая стена находится под курсором, выделенная рисуется сама
+        self.assertIs(self.field_widget._item_at(QPointF(150, 100)), wall)
+        self.field_widget.select_item(wall)
+        self.assertTrue(wall.isVisible())
+        self.field_widget.deselect_item()
+        self.assertFalse(wall.isVisible())
+        
+        # Вне режима наблюдателя объекты рисуются как обычно
+        self.field_widget.set_edit_mode(True)
+        self.assertFalse(layer.isVisible())
+        self.assertTrue(wall.isVisible())
+        self.assertEqual(layer.tile_count(), 0)
+        self.field_widget.set_edit_mode(False)
+        self.field_widget.set_static_layer_enabled(False)
+        self.assertTrue(wall.isVisible())
+    
+    def test_adaptive_rendering(self):
+        """Тест упрощенной отрисовки во время прокрутки и возврата полного качества"""
+        antialiasing = QPainter.RenderHint.Antialiasing
+        self.field_widget._note_interaction()
+        self.assertTrue(self.field_widget.is_interacting())
+        self.assertFalse(self.field_widget.renderHints() & antialiasing)
+        self.assertTrue(self.field_widget.optimizationFlags() & QGraphicsView.OptimizationFlag.DontSavePainterState)
+        self.assertTrue(self.field_widget._interaction_timer.isActive())
+        
+        self.field_widget.finish_interaction()
+        self.assertFalse(self.field_widget.is_interacting())
+        self.assertTrue(self.field_widget.renderHints() & antialiasing)
+        self.assertFalse(self.field_widget.optimizationFlags() & QGraphicsView.OptimizationFlag.DontSavePainterState)
+        
+        # Без адаптивной отрисовки качество не меняется
+        self.field_widget.set_adaptive_rendering(False)
+        self.field_widget._note_interaction()
+        self.assertFalse(self.field_widget.is_interacting())
+        self.assertTrue(self.field_widget.renderHints() & antialiasing)
+    
+    def test_shared_highlight_overlays(self):
+        """Тест общих обводок наведения и выделения, переносимых между объектами"""
+        self.field_widget.set_edit_mode(True)
+        region = self.field_widget.add_region(QRectF(100, 100, 50, 50))
+        wall = self.field_widget.add_wall(QPointF(300, 100), QPointF(400, 100))
+        self.field_widget.deselect_item()
+        hover = self.field_widget.hover_overlay
+        selection = self.field_widget.selection_overlay
+        
+        # Собственных элементов подсветки у региона нет
+        self.assertEqual(region.childItems(), [])
+        
+        self.field_widget.handle_hover_for_item(region, QPointF(120, 120))
+        self.assertIs(hover.target(), region)
+        self.assertTrue(hover.isVisible())
+        
+        # Выделение скрывает обводку наведения и показывает обводку выделения
+        self.field_widget.select_item(region)
+        self.assertIsNone(hover.target())
+        self.assertIs(selection.target(), region)
+        self.assertEqual(region.childItems(), [selection])
+        
+        # Облегченная стена рисует выделение сама
+        if wall.paints_own_highlight:
+            self.field_widget.select_item(wall)
+            self.assertIsNone(selection.target())
+            self.assertTrue(wall._selected)
+        
+        # Удаление объекта снимает с него обводки
+        self.field_widget.select_item(region)
+        self.field_widget._remove_region(region)
+        self.assertIsNone(selection.target())
+        self.assertIsNone(selection.scene())
+    
+    def test_mouse_moves_coalesced(self):
+        """Тест объединения перемещений мыши: обрабатывается только последняя позиция"""
+        processed = []
+        with patch.object(self.field_widget, '_process_mouse_move', side_effect=processed.append):
+            for x in (10, 20, 30):
+                event = QMouseEvent(QEvent.Type.MouseMove, QPointF(x, 40), QPointF(x, 40),
+                                    Qt.MouseButton.NoButton, Qt.MouseButton.NoButton,
+                                    Qt.KeyboardModifier.NoModifier)
+                self.field_widget.mouseMoveEvent(event)
+            self.assertEqual(processed, [])
+            
+            self.field_widget.flush_pending_mouse_move()
+            self.field_widget.flush_pending_mouse_move()
+            
+        self.assertEqual(len(processed), 1)
+        self.assertEqual(processed[0].x(), 30)
+
+    def test_undo_redo(self):
+        """Тест отмены и повтора добавления, изменения, переименования и удаления объектов"""
+        model = self.field_widget.scene_model
+        wall = self.field_widget.add_wall(QPointF(100, 100), QPointF(200, 100))
+        original_id = wall.id
+        self.field_widget.update_wall_point2(250, 100)
+        self.field_widget.update_wall_id("w500")
+        self.field_widget.delete_wall(wall)
+        self.assertEqual(self.field_widget.walls, [])
+
+        self.assertTrue(self.field_widget.undo())
+        restored = self.field_widget.walls[0]
+        self.assertEqual(restored.id, "w500")
+        self.assertEqual(restored.line().x2(), 250)
+        self.assertTrue(self.field_widget.undo())
+        self.assertEqual(restored.id, original_id)
+        self.assertNotIn("w500", model.walls)
+        self.assertTrue(self.field_widget.undo())
+        self.assertEqual(restored.line().x2(), 200)
+        self.assertEqual(model.walls[restored.id].x2, 200)
+        self.assertTrue(self.field_widget.undo())
+        self.assertEqual(self.field_widget.walls, [])
+        self.assertFalse(self.field_widget.undo())
+
+        for _ in range(4):
+            self.assertTrue(self.field_widget.redo())
+        self.assertEqual(self.field_widget.walls, [])
+        self.assertEqual(len(model.walls), 0)
+
+        # Отмена изменения размера возвращает прежние размеры
+        region = self.field_widget.add_region(QRectF(-300, -300, 100, 50))
+        self.field_widget.update_region_size(150, 80)
+        self.field_widget.update_region_color("#8000ff00")
+        self.field_widget.undo()
+        self.field_widget.undo()
+        self.assertEqual(len(self.field_widget.regions), 1)
+        record = model.regions[region.id]
+        self.assertEqual((record.x, record.y, record.width, record.height), (-300, -300, 100, 50))
+        self.assertEqual(record.color, region.color)
+
+    def test_region_resize_in_place(self):
+        """Тест изменения размера региона без пересоздания объекта"""
+        model = self.field_widget.scene_model
+        region = self.field_widget.add_region(QRectF(-300, -300, 100, 50))
+        self.field_widget.select_item(region)
+        next_region_id = self.field_widget.region_ids.next_number
+        emitted = []
+        self.field_widget.item_selected.connect(emitted.append)
+        
+        for width in range(110, 200, 10):
+            self.field_widget.update_region_size(width, 80)
+        
+        self.assertIs(self.field_widget.selected_item, region)
+        self.assertEqual(self.field_widget.regions, [region])
+        self.assertEqual(self.field_widget.region_ids.next_number, next_region_id)
+        self.assertEqual(emitted, [])
+        self.assertEqual(region.mapRectToScene(region.path().boundingRect()), QRectF(-300, -300, 190, 80))
+        record = model.regions[region.id]
+        self.assertEqual((record.x, record.y, record.width, record.height), (-300, -300, 190, 80))
+        
+        # Выход за границы сцены не меняет регион
+        with patch('field_widget.QMessageBox.warning'):
+            self.field_widget.update_region_size(100000, 80)
+        self.assertEqual(region.mapRectToScene(region.path().boundingRect()), QRectF(-300, -300, 190, 80))
+    
+    def test_drag_is_one_undo_command(self):
+        """Тест записи перетаскивания стены одной командой"""
+        wall = self.field_widget.add_wall(QPointF(100, 100), QPointF(200, 100))
+        self.field_widget.set_edit_mode(True)
+        self.field_widget.resize(800, 600)
+        commands = len(self.field_widget.undo_stack)
+
+        def mouse_event(event_type, scene_pos, buttons):
+            view_pos = QPointF(self.field_widget.mapFromScene(scene_pos))
+            return QMouseEvent(event_type, view_pos, view_pos, Qt.MouseButton.LeftButton, buttons,
+                               Qt.KeyboardModifier.NoModifier)
+
+        self.field_widget.mousePressEvent(mouse_event(QEvent.Type.MouseButtonPress, QPointF(150, 100),
+                                                      Qt.MouseButton.LeftButton))
+        self.assertIs(self.field_widget.dragging_item, wall)
+        for y in (150, 200, 250):
+            self.field_widget._process_mouse_move(self.field_widget.mapFromScene(QPointF(150, y)))
+        self.field_widget.mouseReleaseEvent(mouse_event(QEvent.Type.MouseButtonRelease, QPointF(150, 250),
+                                                        Qt.MouseButton.NoButton))
+        self.assertEqual(wall.line().y1(), 250)
+        self.assertEqual(len(self.field_widget.undo_stack), commands + 1)
+
+        self.field_widget.undo()
+        self.assertEqual(wall.line().y1(), 100)
+
+    def test_bulk_undo_single_scene_update(self):
+        """Тест отмены массового удаления стен одним обновлением сцены"""
+        walls_data = [{"id": i, "begin": (-600 + i * 5, -400), "end": (-600 + i * 5, -300)} for i in range(1, 201)]
+        self.field_widget.load_scene({"walls": walls_data, "regions": [], "robot": None, "start_position": None},
+                                     clear=False)
+        self.assertFalse(self.field_widget.undo_stack.can_undo())
+
+        with self.field_widget.undo_stack.group("Удаление стен"):
+            for wall in self.field_widget.walls[:]:
+                self.field_widget.delete_wall(wall)
+        self.assertEqual(len(self.field_widget.undo_stack), 1)
+
+        resume = self.field_widget._resume_scene_index
+        with patch.object(self.field_widget, '_resume_scene_index', side_effect=resume) as resumed:
+            self.assertTrue(self.field_widget.undo())
+        self.assertEqual(resumed.call_count, 1)
+        self.assertEqual(len(self.field_widget.walls), 200)
+        self.assertEqual(len(self.field_widget.scene_model.walls), 200)
+        self.assertEqual(len(self.field_widget.wall_index), 200)
+
+        self.field_widget.redo()
+        self.assertEqual(self.field_widget.walls, [])
+
     def test_add_region(self):
         """Тест добавления региона"""
         # Начальное количество регионов
@@ -267,8 +718,8 @@ class TestFieldWidget(unittest.TestCase):
         # Проверяем, что ID стены обновился
         self.assertTrue(result)
         self.assertEqual(wall.id, new_id)
-        self.assertNotIn(old_id, Wall._existing_ids)
-        self.assertIn(new_id, Wall._existing_ids)
+        self.assertNotIn(old_id, self.field_widget.wall_ids)
+        self.assertIn(new_id, self.field_widget.wall_ids)
         
         # Создаем еще одну стену
         self.field_widget.add_wall(QPointF(300, 300), QPointF(400, 400))
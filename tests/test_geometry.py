@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+
+# Добавляем корневую директорию в sys.path для импорта модулей проекта
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.geometry import (
+    Rect,
+    robot_rect,
+    segment_within_bounds,
+    rect_within_bounds,
+    robot_within_bounds,
+    start_position_within_bounds,
+    segments_intersect,
+    segment_intersects_rect,
+    thick_segment_intersects_rect,
+)
+
+
+class TestGeometry(unittest.TestCase):
+    """Тесты геометрического ядра проверок сцены"""
+
+    def test_bounds(self):
+        """Тестирование проверок нахождения объектов в пределах сцены."""
+        self.assertTrue(segment_within_bounds(-650, -400, 650, 400, 1300, 800))
+        self.assertFalse(segment_within_bounds(0, 0, 651, 0, 1300, 800))
+
+        self.assertTrue(rect_within_bounds(Rect(-650, -400, 1300, 800), 1300, 800))
+        self.assertFalse(rect_within_bounds(Rect(600, 0, 100, 100), 1300, 800))
+
+        # Робот 50x50 должен целиком помещаться в сцену
+        self.assertTrue(robot_within_bounds(600, 350, 1300, 800))
+        self.assertFalse(robot_within_bounds(601, 350, 1300, 800))
+
+        # Стартовая позиция должна отстоять от границы на 25 пикселей
+        self.assertTrue(start_position_within_bounds(625, -375, 1300, 800))
+        self.assertFalse(start_position_within_bounds(626, 0, 1300, 800))
+
+    def test_segments_intersect(self):
+        """Тестирование пересечения отрезков."""
+        self.assertTrue(segments_intersect(0, 0, 10, 10, 0, 10, 10, 0))
+        # Касание концами считается пересечением
+        self.assertTrue(segments_intersect(0, 0, 10, 0, 10, 0, 10, 10))
+        self.assertFalse(segments_intersect(0, 0, 10, 0, 0, 5, 10, 5))
+        self.assertFalse(segments_intersect(0, 0, 1, 1, 5, 0, 5, 10))
+
+    def test_segment_intersects_rect(self):
+        """Тестирование пересечения отрезка с прямоугольником."""
+        rect = robot_rect(0, 0)
+        self.assertTrue(segment_intersects_rect(-10, 25, 60, 25, rect))
+        # Отрезок целиком внутри прямоугольника
+        self.assertTrue(segment_intersects_rect(10, 10, 20, 20, rect))
+        self.assertFalse(segment_intersects_rect(-10, -10, -10, 60, rect))
+
+    def test_thick_segment_intersects_rect(self):
+        """Тестирование учета толщины стены."""
+        rect = robot_rect(0, 0)
+        self.assertFalse(segment_intersects_rect(-10, 54, 60, 54, rect))
+        self.assertTrue(thick_segment_intersects_rect(-10, 54, 60, 54, rect, 10))
+        self.assertFalse(thick_segment_intersects_rect(-10, 56, 60, 56, rect, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
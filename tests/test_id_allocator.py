@@ -0,0 +1,74 @@
+import sys
+import os
+import unittest
+
+# Добавляем корневую директорию в sys.path для импорта модулей проекта
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.id_allocator import IdAllocator
+
+
+class TestIdAllocator(unittest.TestCase):
+    """Тесты распределителя ID (без Qt)"""
+
+    def setUp(self):
+        self.ids = IdAllocator("w")
+
+    def test_allocate_and_release(self):
+        """Тестирование выдачи и освобождения ID"""
+        self.assertEqual([self.ids.allocate() for _ in range(3)], ["w1", "w2", "w3"])
+        self.ids.release("w2")
+        self.assertNotIn("w2", self.ids)
+        self.assertEqual(len(self.ids), 2)
+        # Освобожденный номер повторно не выдается
+        self.assertEqual(self.ids.allocate(), "w4")
+
+    def test_acquire(self):
+        """Тестирование занятия заданных ID"""
+        self.assertEqual(self.ids.acquire(7), "w7")
+        self.assertEqual(self.ids.acquire("8"), "w8")
+        self.assertEqual(self.ids.acquire("custom"), "custom")
+        self.assertEqual(self.ids.next_number, 9)
+
+        # Занятые и некорректные ID заменяются новыми
+        self.assertEqual(self.ids.acquire("w7"), "w9")
+        self.assertEqual(self.ids.acquire(0), "w10")
+        self.assertEqual(self.ids.acquire(""), "w11")
+
+    def test_rename(self):
+        """Тестирование замены ID"""
+        self.ids.acquire("w1")
+        self.ids.acquire("w2")
+        self.assertFalse(self.ids.rename("w1", "w2"))
+        self.assertTrue(self.ids.rename("w1", "w50"))
+        self.assertNotIn("w1", self.ids)
+        self.assertIn("w50", self.ids)
+        self.assertEqual(self.ids.allocate(), "w51")
+
+    def test_reserve_many(self):
+        """Тестирование пакетного резервирования ID при загрузке"""
+        self.ids.acquire("w2")
+        reserved = self.ids.reserve_many([900, 900, 2, None, -1, 5])
+        self.assertEqual(reserved[0], "w900")
+        self.assertEqual(reserved[5], "w5")
+        self.assertEqual(len(set(reserved)), 6)
+        self.assertNotIn("w2", reserved)
+        self.assertGreater(self.ids.next_number, 900)
+
+        # Зарезервированные ID выдаются объектам без замены
+        self.assertEqual([self.ids.acquire(item_id) for item_id in reserved], reserved)
+        self.assertEqual(len(self.ids), 7)
+        self.assertNotEqual(self.ids.acquire("w900"), "w900")
+
+    def test_independent_allocators(self):
+        """Тестирование того, что распределители разных сцен не влияют друг на друга"""
+        other = IdAllocator("w")
+        self.ids.reserve_many(range(1, 1001))
+        self.assertEqual(other.allocate(), "w1")
+        self.ids.clear()
+        self.assertEqual(len(self.ids), 0)
+        self.assertEqual(self.ids.allocate(), "w1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import sys
+import os
+import unittest
+from PyQt6.QtCore import QPointF
+from PyQt6.QtWidgets import QApplication, QGraphicsItem
+
+# Добавляем корневую директорию в sys.path для импорта модулей проекта
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import item_cache
+from wall import Wall
+from region import Region
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication([])
+
+
+class TestItemCache(unittest.TestCase):
+    """Тесты режимов кэширования отрисовки объектов сцены"""
+
+    def setUp(self):
+        self.saved_modes = item_cache.modes()
+        item_cache.configure(**item_cache.DEFAULT_MODES)
+
+    def tearDown(self):
+        item_cache.configure(**self.saved_modes)
+
+    def test_configure(self):
+        """Тестирование настройки режимов"""
+        item_cache.configure(walls="item", regions=None)
+        self.assertEqual(item_cache.modes()["walls"], "item")
+        self.assertEqual(item_cache.modes()["regions"], item_cache.DEFAULT_MODES["regions"])
+        with self.assertRaises(ValueError):
+            item_cache.configure(grid="device")
+        with self.assertRaises(ValueError):
+            item_cache.configure(walls="pixmap")
+
+    def test_wall_cache_mode(self):
+        """Тестирование режима кэширования стены в обоих режимах отрисовки"""
+        lightweight = Wall(QPointF(0, 0), QPointF(100, 0), render_mode=Wall.RENDER_MODE_LIGHTWEIGHT)
+        items = Wall(QPointF(0, 0), QPointF(100, 0), render_mode=Wall.RENDER_MODE_ITEMS)
+        self.assertEqual(lightweight.cacheMode(), QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        self.assertEqual(items.brick_rect.cacheMode(), QGraphicsItem.CacheMode.DeviceCoordinateCache)
+
+        item_cache.configure(walls="none")
+        lightweight.apply_cache_mode()
+        self.assertEqual(lightweight.cacheMode(), QGraphicsItem.CacheMode.NoCache)
+        lightweight.release_id()
+        items.release_id()
+
+    def test_item_coordinate_cache_scale(self):
+        """Тестирование разрешения кэша в координатах объекта"""
+        item_cache.configure(regions="item")
+        region = Region([QPointF(0, 0), QPointF(100, 0), QPointF(100, 50), QPointF(0, 50)])
+        self.assertEqual(region.cacheMode(), QGraphicsItem.CacheMode.ItemCoordinateCache)
+        item_cache.apply(region, "regions", scale=2.0)
+        self.assertEqual(region.cacheMode(), QGraphicsItem.CacheMode.ItemCoordinateCache)
+        region.release_id()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import sys
+import os
+import unittest
+from unittest.mock import patch
+from PyQt6.QtCore import QPointF
+from PyQt6.QtGui import QImage, QPainter, QColor
+from PyQt6.QtWidgets import QApplication, QStyleOptionGraphicsItem
+
+# Добавляем корневую директорию в sys.path для импорта модулей проекта
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import level_of_detail
+from wall import Wall, LightweightWall
+from region import Region
+
+app = QApplication.instance()
+if app is None:
+    app = QApplication([])
+
+
+class TestLevelOfDetail(unittest.TestCase):
+    """Тесты упрощенной отрисовки при мелком масштабе"""
+
+    def setUp(self):
+        self.saved_thresholds = level_of_detail.thresholds()
+        level_of_detail.configure(**level_of_detail.DEFAULT_THRESHOLDS)
+        self.image = QImage(200, 200, QImage.Format.Format_ARGB32)
+        self.image.fill(QColor("white"))
+        self.painter = QPainter(self.image)
+
+    def tearDown(self):
+        if self.painter.isActive():
+            self.painter.end()
+        level_of_detail.configure(**self.saved_thresholds)
+
+    def test_configure(self):
+        """Тестирование настройки порогов"""
+        level_of_detail.configure(walls=0.3, regions=None)
+        self.assertEqual(level_of_detail.thresholds()["walls"], 0.3)
+        self.assertEqual(level_of_detail.thresholds()["regions"], level_of_detail.DEFAULT_THRESHOLDS["regions"])
+        with self.assertRaises(ValueError):
+            level_of_detail.configure(grid=0.5)
+        with self.assertRaises(ValueError):
+            level_of_detail.configure(walls=-1)
+
+    def test_simplified(self):
+        """Тестирование выбора упрощенной отрисовки по масштабу painter"""
+        self.assertFalse(level_of_detail.simplified(self.painter, "walls"))
+        self.painter.scale(0.5, 0.5)
+        self.assertEqual(level_of_detail.level(self.painter), 0.5)
+        self.assertTrue(level_of_detail.simplified(self.painter, "walls"))
+
+        # Порог 0 отключает упрощение
+        level_of_detail.configure(walls=0)
+        self.assertFalse(level_of_detail.simplified(self.painter, "walls"))
+
+    def test_wall_low_detail(self):
+        """Тестирование отрисовки стены без паттерна и маркеров при мелком масштабе"""
+        wall = Wall(QPointF(20, 100), QPointF(180, 100), render_mode=Wall.RENDER_MODE_LIGHTWEIGHT)
+        option = QStyleOptionGraphicsItem()
+        with patch.object(LightweightWall, "_paint_markers") as paint_markers:
+            wall.paint(self.painter, option)
+            self.assertEqual(paint_markers.call_count, 1)
+
+            self.painter.scale(0.5, 0.5)
+            wall.paint(self.painter, option)
+            self.assertEqual(paint_markers.call_count, 1)
+
+        # Тело стены закрашено сплошным цветом кирпича
+        self.painter.end()
+        self.assertEqual(self.image.pixelColor(50, 50), QColor(wall.brick_color))
+        wall.release_id()
+
+    def test_region_low_detail(self):
+        """Тестирование отрисовки региона прямоугольником при мелком масштабе"""
+        region = Region([QPointF(0, 0), QPointF(100, 0), QPointF(100, 100), QPointF(0, 100)],
+                        color="#ff0000ff")
+        self.painter.scale(0.5, 0.5)
+        region.paint(self.painter, QStyleOptionGraphicsItem())
+        self.painter.end()
+        self.assertEqual(self.image.pixelColor(25, 25), QColor("#0000ff"))
+        self.assertEqual(self.image.pixelColor(75, 75), QColor("white"))
+        region.release_id()
+
+
+if __name__ == "__main__":
+    unittest.main()
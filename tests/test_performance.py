@@ -2,7 +2,8 @@ import unittest
 import time
 import logging
 from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QCheckBox, QLineEdit
-from PyQt6.QtCore import Qt, QTimer, QPointF
+from PyQt6.QtCore import Qt, QTimer, QPointF, QLineF, QObject, QEvent
+from collections import Counter
 import sys
 import os
 import gc
@@ -17,15 +18,46 @@ from properties.robot_properties_widget import RobotPropertiesWidget
 from properties.wall_properties_widget import WallPropertiesWidget
 from properties.region_properties_widget import RegionPropertiesWidget
 from utils.xml_handler import XMLHandler
+from utils import paint_cache
+from wall import Wall
+from benchmarks.harness import current_rss_bytes
 
 # Счетчик вызовов set_theme
 set_theme_calls = 0
 
+# Допустимое время одного переключения темы (секунды): грубый потолок с запасом
+# для медленных CI-машин (~56 мс на переключение в offscreen-режиме); число
+# проходов перепроверки стиля проверяет test_theme_toggle_applies_style_once
+THEME_TOGGLE_TIME_BUDGET = 0.5
+
+# Допустимый прирост резидентной памяти на одну стену (байты): ~4,6 КБ измерено
+WALL_MEMORY_BUDGET = 8 * 1024
+
+
 # Настраиваем логирование
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+class StyleChangeCounter(QObject):
+    """
+    Фильтр событий приложения, считающий события StyleChange.
+    
+    События делятся на пришедшие во время установки стиля (applying=True)
+    и вне ее - последние означают отдельный проход перепроверки стиля.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.applying = False
+        self.counts = Counter()
+    
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.StyleChange and isinstance(obj, QWidget):
+            self.counts[self.applying] += 1
+        return False
+
+
 class TestPerformance(unittest.TestCase):
     """Тесты производительности для различных операций приложения"""
     
@@ -96,6 +128,41 @@ class TestPerformance(unittest.TestCase):
         # Выходим из приложения после всех тестов
         pass
     
+    def test_theme_toggle_applies_style_once(self):
+        """Переключение темы - одна установка стиля окна и один проход перепроверки стиля"""
+        original_set_style_sheet = QWidget.setStyleSheet
+        styled_widgets = []
+        
+        def counting_set_style_sheet(widget, style):
+            styled_widgets.append(widget)
+            counter.applying = True
+            try:
+                original_set_style_sheet(widget, style)
+            finally:
+                counter.applying = False
+        
+        counter = StyleChangeCounter()
+        QApplication.instance().installEventFilter(counter)
+        QWidget.setStyleSheet = counting_set_style_sheet
+        try:
+            for _ in range(2):
+                styled_widgets.clear()
+                counter.counts.clear()
+                self.main_window.toggle_theme()
+                QApplication.processEvents()
+                
+                # Стиль устанавливается только главному окну, остальные виджеты
+                # оформляют правила общего стиля окна
+                self.assertEqual(len(styled_widgets), 1)
+                self.assertIs(styled_widgets[0], self.main_window)
+                
+                # Виджеты перепроверяют стиль только в этой установке
+                self.assertGreater(counter.counts[True], 0)
+                self.assertEqual(counter.counts[False], 0)
+        finally:
+            QWidget.setStyleSheet = original_set_style_sheet
+            QApplication.instance().removeEventFilter(counter)
+    
     def test_theme_toggle_performance(self):
         """Тест производительности переключения темы"""
         # Прогрев - переключаем тему несколько раз перед измерением
@@ -108,20 +175,20 @@ class TestPerformance(unittest.TestCase):
         set_theme_calls = 0
         
         # Измеряем время переключения с темной на светлую тему
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.main_window.toggle_theme()  # Переключаем на светлую тему
         QApplication.processEvents()
-        dark_to_light_time = time.time() - start_time
+        dark_to_light_time = time.perf_counter() - start_time
         dark_to_light_calls = set_theme_calls
         
         # Сбрасываем счетчик перед следующим измерением
         set_theme_calls = 0
         
         # Измеряем время переключения со светлой на темную тему
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.main_window.toggle_theme()  # Переключаем обратно на темную тему
         QApplication.processEvents()
-        light_to_dark_time = time.time() - start_time
+        light_to_dark_time = time.perf_counter() - start_time
         light_to_dark_calls = set_theme_calls
         
         # Логируем результаты
@@ -131,43 +198,47 @@ class TestPerformance(unittest.TestCase):
         logger.info(f"Количество вызовов set_theme при переключении со светлой на темную: {light_to_dark_calls}")
         logger.info(f"Среднее время переключения темы: {(dark_to_light_time + light_to_dark_time) / 2:.6f} секунд")
         
-        # Альтернативный подход для сравнения - измеряем без рекурсивного обхода
-        # Временно заменяем метод _apply_theme_recursively на заглушку
-        original_recursive_method = self.main_window._apply_theme_recursively
+        # Тема меняется одним проходом перепроверки стиля, поэтому переключение должно укладываться в бюджет
+        self.assertLess(dark_to_light_time, THEME_TOGGLE_TIME_BUDGET)
+        self.assertLess(light_to_dark_time, THEME_TOGGLE_TIME_BUDGET)
         
-        def dummy_recursive_method(widget, is_dark_theme):
+        # Альтернативный подход для сравнения - измеряем без вызовов set_theme
+        # Временно заменяем метод _apply_theme_to_widgets на заглушку
+        original_widgets_method = self.main_window._apply_theme_to_widgets
+        
+        def dummy_widgets_method(is_dark_theme):
             pass  # Ничего не делаем
         
         # Подменяем метод на заглушку
-        self.main_window._apply_theme_recursively = dummy_recursive_method
+        self.main_window._apply_theme_to_widgets = dummy_widgets_method
         
-        # Измеряем время переключения с темной на светлую тему без рекурсивного обхода
-        start_time = time.time()
+        # Измеряем время переключения с темной на светлую тему без вызовов set_theme
+        start_time = time.perf_counter()
         self.main_window.toggle_theme()  # Переключаем на светлую тему
         QApplication.processEvents()
-        dark_to_light_no_recursion_time = time.time() - start_time
+        dark_to_light_no_hooks_time = time.perf_counter() - start_time
         
-        # Измеряем время переключения со светлой на темную тему без рекурсивного обхода
-        start_time = time.time()
+        # Измеряем время переключения со светлой на темную тему без вызовов set_theme
+        start_time = time.perf_counter()
         self.main_window.toggle_theme()  # Переключаем обратно на темную тему
         QApplication.processEvents()
-        light_to_dark_no_recursion_time = time.time() - start_time
+        light_to_dark_no_hooks_time = time.perf_counter() - start_time
         
         # Возвращаем оригинальный метод
-        self.main_window._apply_theme_recursively = original_recursive_method
+        self.main_window._apply_theme_to_widgets = original_widgets_method
         
-        # Логируем результаты без рекурсивного обхода
-        logger.info(f"Время переключения с темной на светлую тему без рекурсии: {dark_to_light_no_recursion_time:.6f} секунд")
-        logger.info(f"Время переключения со светлой на темную тему без рекурсии: {light_to_dark_no_recursion_time:.6f} секунд")
-        logger.info(f"Среднее время переключения темы без рекурсии: {(dark_to_light_no_recursion_time + light_to_dark_no_recursion_time) / 2:.6f} секунд")
+        # Логируем результаты без вызовов set_theme
+        logger.info(f"Время переключения с темной на светлую тему без set_theme: {dark_to_light_no_hooks_time:.6f} секунд")
+        logger.info(f"Время переключения со светлой на темную тему без set_theme: {light_to_dark_no_hooks_time:.6f} секунд")
+        logger.info(f"Среднее время переключения темы без set_theme: {(dark_to_light_no_hooks_time + light_to_dark_no_hooks_time) / 2:.6f} секунд")
         
-        # Вычисляем, сколько времени занимает рекурсивный обход
-        recursion_overhead = ((dark_to_light_time + light_to_dark_time) / 2) - ((dark_to_light_no_recursion_time + light_to_dark_no_recursion_time) / 2)
-        logger.info(f"Дополнительное время, затрачиваемое на рекурсивный обход: {recursion_overhead:.6f} секунд")
+        # Вычисляем, сколько времени занимают вызовы set_theme
+        hooks_overhead = ((dark_to_light_time + light_to_dark_time) / 2) - ((dark_to_light_no_hooks_time + light_to_dark_no_hooks_time) / 2)
+        logger.info(f"Дополнительное время, затрачиваемое на вызовы set_theme: {hooks_overhead:.6f} секунд")
         
-        # Выводим процентное соотношение времени, затрачиваемого на рекурсивный обход
-        percentage_overhead = (recursion_overhead / ((dark_to_light_time + light_to_dark_time) / 2)) * 100 if ((dark_to_light_time + light_to_dark_time) / 2) > 0 else 0
-        logger.info(f"Процент времени, затрачиваемого на рекурсивный обход: {percentage_overhead:.2f}%")
+        # Выводим процентное соотношение времени, затрачиваемого на вызовы set_theme
+        percentage_overhead = (hooks_overhead / ((dark_to_light_time + light_to_dark_time) / 2)) * 100 if ((dark_to_light_time + light_to_dark_time) / 2) > 0 else 0
+        logger.info(f"Процент времени, затрачиваемого на вызовы set_theme: {percentage_overhead:.2f}%")
     
     def test_complex_ui_theme_toggle_performance(self):
         """Тест производительности переключения темы с большим количеством виджетов"""
@@ -239,20 +310,20 @@ class TestPerformance(unittest.TestCase):
         set_theme_calls = 0
         
         # Измеряем время переключения с темной на светлую тему с большим количеством виджетов
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.main_window.toggle_theme()  # Переключаем на светлую тему
         QApplication.processEvents()
-        dark_to_light_complex_time = time.time() - start_time
+        dark_to_light_complex_time = time.perf_counter() - start_time
         dark_to_light_complex_calls = set_theme_calls
         
         # Сбрасываем счетчик перед следующим измерением
         set_theme_calls = 0
         
         # Измеряем время переключения со светлой на темную тему с большим количеством виджетов
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.main_window.toggle_theme()  # Переключаем обратно на темную тему
         QApplication.processEvents()
-        light_to_dark_complex_time = time.time() - start_time
+        light_to_dark_complex_time = time.perf_counter() - start_time
         light_to_dark_complex_calls = set_theme_calls
         
         # Логируем результаты
@@ -279,10 +350,10 @@ class TestPerformance(unittest.TestCase):
             end_point = QPointF(i * 20 - 100, i * 20 - 100)
             
             # Измеряем время создания стены
-            start_time = time.time()
+            start_time = time.perf_counter()
             wall = self.main_window.field_widget.add_wall(start_point, end_point)
             QApplication.processEvents()
-            wall_creation_times.append(time.time() - start_time)
+            wall_creation_times.append(time.perf_counter() - start_time)
         
         # Измеряем время создания региона
         num_regions = 10  # Количество регионов для создания
@@ -298,10 +369,10 @@ class TestPerformance(unittest.TestCase):
             ]
             
             # Измеряем время создания региона
-            start_time = time.time()
+            start_time = time.perf_counter()
             region = self.main_window.field_widget.add_region(points)
             QApplication.processEvents()
-            region_creation_times.append(time.time() - start_time)
+            region_creation_times.append(time.perf_counter() - start_time)
         
         # Измеряем время удаления стен
         wall_deletion_times = []
@@ -313,10 +384,10 @@ class TestPerformance(unittest.TestCase):
             QApplication.processEvents()
             
             # Измеряем время удаления стены
-            start_time = time.time()
+            start_time = time.perf_counter()
             self.main_window.field_widget.delete_selected_item()
             QApplication.processEvents()
-            wall_deletion_times.append(time.time() - start_time)
+            wall_deletion_times.append(time.perf_counter() - start_time)
         
         # Измеряем время удаления регионов
         region_deletion_times = []
@@ -328,10 +399,10 @@ class TestPerformance(unittest.TestCase):
             QApplication.processEvents()
             
             # Измеряем время удаления региона
-            start_time = time.time()
+            start_time = time.perf_counter()
             self.main_window.field_widget.delete_selected_item()
             QApplication.processEvents()
-            region_deletion_times.append(time.time() - start_time)
+            region_deletion_times.append(time.perf_counter() - start_time)
         
         # Логируем результаты
         avg_wall_creation_time = sum(wall_creation_times) / len(wall_creation_times) if wall_creation_times else 0
@@ -360,25 +431,25 @@ class TestPerformance(unittest.TestCase):
         QApplication.processEvents()
         
         # Время переключения в режим рисования
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.main_window.field_widget.set_edit_mode(False)
         self.main_window.field_widget.set_drawing_mode("wall")
         QApplication.processEvents()
-        edit_to_draw_time = time.time() - start_time
+        edit_to_draw_time = time.perf_counter() - start_time
         
         # Время переключения в режим наблюдения
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.main_window.field_widget.set_edit_mode(False)
         self.main_window.field_widget.set_drawing_mode(None)
         QApplication.processEvents()
-        draw_to_observe_time = time.time() - start_time
+        draw_to_observe_time = time.perf_counter() - start_time
         
         # Время переключения в режим редактирования
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.main_window.field_widget.set_edit_mode(True)
         self.main_window.field_widget.set_drawing_mode(None)
         QApplication.processEvents()
-        observe_to_edit_time = time.time() - start_time
+        observe_to_edit_time = time.perf_counter() - start_time
         
         # Логируем результаты
         logger.info(f"Время переключения из режима редактирования в режим рисования: {edit_to_draw_time:.6f} секунд")
@@ -393,24 +464,24 @@ class TestPerformance(unittest.TestCase):
         # Измеряем время увеличения масштаба
         zoom_in_times = []
         for _ in range(5):
-            start_time = time.time()
+            start_time = time.perf_counter()
             self.main_window.field_widget.zoomIn()
             QApplication.processEvents()
-            zoom_in_times.append(time.time() - start_time)
+            zoom_in_times.append(time.perf_counter() - start_time)
         
         # Измеряем время уменьшения масштаба
         zoom_out_times = []
         for _ in range(5):
-            start_time = time.time()
+            start_time = time.perf_counter()
             self.main_window.field_widget.zoomOut()
             QApplication.processEvents()
-            zoom_out_times.append(time.time() - start_time)
+            zoom_out_times.append(time.perf_counter() - start_time)
         
         # Измеряем время сброса масштаба
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.main_window.field_widget.resetScale()
         QApplication.processEvents()
-        reset_zoom_time = time.time() - start_time
+        reset_zoom_time = time.perf_counter() - start_time
         
         # Логируем результаты
         avg_zoom_in_time = sum(zoom_in_times) / len(zoom_in_times)
@@ -450,24 +521,24 @@ class TestPerformance(unittest.TestCase):
         scene_height = self.main_window.scene_height
         
         # Используем только стены и регионы для генерации XML, чтобы избежать проблем с direction робота
-        start_time = time.time()
+        start_time = time.perf_counter()
         xml_handler = XMLHandler(scene_width=scene_width, scene_height=scene_height)
         formatted_xml = xml_handler.generate_xml(
             walls=self.main_window.field_widget.walls,
             regions=self.main_window.field_widget.regions,
             robot_model=None  # Не используем робота в тесте
         )
-        xml_generation_time = time.time() - start_time
+        xml_generation_time = time.perf_counter() - start_time
         
         # Измеряем повторную генерацию XML для большей точности
-        start_time = time.time()
+        start_time = time.perf_counter()
         xml_handler = XMLHandler(scene_width=scene_width, scene_height=scene_height)
         formatted_xml = xml_handler.generate_xml(
             walls=self.main_window.field_widget.walls,
             regions=self.main_window.field_widget.regions,
             robot_model=None  # Не используем робота в тесте
         )
-        xml_generation_time_2 = time.time() - start_time
+        xml_generation_time_2 = time.perf_counter() - start_time
         
         # Измеряем время генерации XML для больших сцен (добавляем еще элементов)
         for i in range(20):
@@ -486,14 +557,14 @@ class TestPerformance(unittest.TestCase):
         
         QApplication.processEvents()
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         xml_handler = XMLHandler(scene_width=scene_width, scene_height=scene_height)
         formatted_xml = xml_handler.generate_xml(
             walls=self.main_window.field_widget.walls,
             regions=self.main_window.field_widget.regions,
             robot_model=None  # Не используем робота в тесте
         )
-        xml_generation_time_large = time.time() - start_time
+        xml_generation_time_large = time.perf_counter() - start_time
         
         # Логируем результаты
         logger.info(f"Время генерации XML (малая сцена): {xml_generation_time:.6f} секунд")
@@ -503,6 +574,83 @@ class TestPerformance(unittest.TestCase):
         # Выводим размер сгенерированного XML
         logger.info(f"Размер сгенерированного XML: {len(formatted_xml)} байт")
 
+    def test_mouse_move_logging_overhead(self):
+        """Тест стоимости обработки перемещения мыши при отключенном и включенном отладочном логировании"""
+        field_widget = self.main_window.field_widget
+        field_widget.set_edit_mode(True)
+        wall = field_widget.add_wall(QPointF(100, 100), QPointF(300, 100))
+        QApplication.processEvents()
+        
+        # Перетаскиваем стену, как это делает mousePressEvent
+        field_widget.dragging_item = wall
+        field_widget.grab_point = QPointF(200, 100)
+        field_widget.initial_line = QLineF(wall.line())
+        view_positions = [field_widget.mapFromScene(QPointF(200 + i % 100, 100 + i % 50)) for i in range(500)]
+        
+        class CountingHandler(logging.Handler):
+            def __init__(self):
+                super().__init__(logging.DEBUG)
+                self.count = 0
+                
+            def emit(self, record):
+                self.format(record)
+                self.count += 1
+        
+        def measure(level):
+            handler = CountingHandler()
+            root = logging.getLogger()
+            old_level = root.level
+            root.addHandler(handler)
+            root.setLevel(level)
+            try:
+                start_time = time.perf_counter()
+                for view_pos in view_positions:
+                    field_widget._process_mouse_move(view_pos)
+                elapsed = (time.perf_counter() - start_time) / len(view_positions)
+            finally:
+                root.setLevel(old_level)
+                root.removeHandler(handler)
+            return elapsed, handler.count
+        
+        time_off, records_off = measure(logging.WARNING)
+        time_on, records_on = measure(logging.DEBUG)
+        field_widget.dragging_item = None
+        
+        logger.info(f"Обработка перемещения мыши без отладочного логирования: {time_off * 1e6:.1f} мкс")
+        logger.info(f"Обработка перемещения мыши с отладочным логированием: {time_on * 1e6:.1f} мкс "
+                    f"({records_on} записей)")
+        
+        # При отключенном логировании сообщения не создаются и не форматируются
+        self.assertEqual(records_off, 0)
+        self.assertGreater(records_on, 0)
+
+    def test_wall_memory_footprint(self):
+        """Тест расхода памяти на стену с общими паттернами, кистями и перьями"""
+        # Первые стены заполняют кэш графических ресурсов
+        walls = [Wall(QPointF(i, 0), QPointF(i + 40, 0)) for i in range(200)]
+        cache_stats = paint_cache.stats()
+        
+        num_walls = 2000
+        gc.collect()
+        rss_before = current_rss_bytes()
+        walls += [Wall(QPointF(i % 500, i // 500), QPointF(i % 500 + 40, i // 500)) for i in range(num_walls)]
+        rss_after = current_rss_bytes()
+        
+        logger.info(f"Кэш графических ресурсов: {paint_cache.stats()}")
+        
+        # Число паттернов, кистей и перьев не растет с числом стен одного вида
+        self.assertEqual(paint_cache.stats(), cache_stats)
+        # Все стены одного цвета разделяют один паттерн
+        self.assertEqual(len({wall.brick_pattern.cacheKey() for wall in walls}), 1)
+        
+        if rss_before is not None:
+            bytes_per_wall = (rss_after - rss_before) / num_walls
+            logger.info(f"Память на стену: {bytes_per_wall:.0f} байт")
+            self.assertLess(bytes_per_wall, WALL_MEMORY_BUDGET)
+        
+        for wall in walls:
+            wall.release_id()
+
 if __name__ == "__main__":
     # Запуск только одного теста для предотвращения ошибок с Qt
     import sys
@@ -533,8 +681,12 @@ if __name__ == "__main__":
             suite = unittest.TestSuite()
             suite.addTest(TestPerformance("test_xml_generation_performance"))
             unittest.TextTestRunner().run(suite)
+        elif test_name == "memory":
+            suite = unittest.TestSuite()
+            suite.addTest(TestPerformance("test_wall_memory_footprint"))
+            unittest.TextTestRunner().run(suite)
         else:
-            print("Укажите тип теста: simple, complex, elements, modes, zoom, xml")
+            print("Укажите тип теста: simple, complex, elements, modes, zoom, xml, memory")
     else:
-        print("Укажите тип теста: simple, complex, elements, modes, zoom, xml")
+        print("Укажите тип теста: simple, complex, elements, modes, zoom, xml, memory")
         print("Например: python tests/test_performance.py simple") 
\ No newline at end of file
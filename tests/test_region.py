@@ -9,6 +9,7 @@ sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 
 # Импортируем тестируемые модули
 from region import Region
+from highlight_overlay import HighlightOverlay
 
 class TestRegion(unittest.TestCase):
     """Тесты для класса Region"""
@@ -86,6 +87,23 @@ class TestRegion(unittest.TestCase):
         self.assertEqual(rect.width(), 150)
         self.assertEqual(rect.height(), 200)
     
+    def test_region_set_rect(self):
+        """Тест изменения геометрии региона на месте"""
+        # Регион с путем в абсолютных координатах, как при загрузке из XML
+        points = [QPointF(50, 60), QPointF(150, 60), QPointF(150, 110), QPointF(50, 110)]
+        region = Region(points)
+        region_id = region.id
+        overlay = HighlightOverlay(hover=True, z_value=15)
+        overlay.attach(region)
+        
+        region.set_rect(50, 60, 200, 80)
+        
+        self.assertEqual(region.id, region_id)
+        self.assertEqual(region.sceneBoundingRect(), QRectF(50, 60, 200, 80))
+        # Обводка, показанная на регионе, следует за его новой формой
+        self.assertEqual(overlay.mapRectToScene(overlay.outline_rect()), QRectF(50, 60, 200, 80))
+        overlay.detach()
+    
     def test_region_update_color(self):
         """Тест обновления цвета региона"""
         # Создаем регион с помощью списка точек
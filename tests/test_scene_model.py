@@ -0,0 +1,75 @@
+import sys
+import os
+import unittest
+
+# Добавляем корневую директорию в sys.path для импорта модулей проекта
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.scene_model import SceneModel, WallRecord, RegionRecord, RobotRecord, StartPositionRecord
+from utils.xml_handler import XMLHandler
+
+
+class TestSceneModel(unittest.TestCase):
+    """Тесты модели сцены без Qt (QApplication не создается)"""
+
+    def setUp(self):
+        self.model = SceneModel(1300, 1000)
+        self.model.set_wall(WallRecord("w1", 0, 100, 200, 100))
+        self.model.set_wall(WallRecord("w2", -100, -100, -100, 50.5))
+        self.model.set_region(RegionRecord("r1", 0, 0, 100, 50))
+        self.model.robot = RobotRecord(-300, -300, 90, "R1")
+        self.model.start_position = StartPositionRecord(-275, -275, 45)
+
+    def test_records_use_slots(self):
+        """Тестирование компактности записей (без __dict__)."""
+        for record in (WallRecord("w1", 0, 0, 1, 1), RegionRecord("r1", 0, 0, 1, 1),
+                       RobotRecord(0, 0), StartPositionRecord(0, 0)):
+            self.assertFalse(hasattr(record, "__dict__"))
+
+    def test_rename_keeps_order(self):
+        """Тестирование смены ID с сохранением порядка объектов."""
+        self.model.rename_wall("w1", "w10")
+        self.assertEqual(list(self.model.walls), ["w10", "w2"])
+        self.assertEqual(self.model.walls["w10"].id, "w10")
+        self.model.rename_wall("w404", "w5")
+        self.assertEqual(list(self.model.walls), ["w10", "w2"])
+
+    def test_revision(self):
+        """Тестирование счетчика изменений стен и регионов."""
+        revision = self.model.revision
+        self.model.set_wall(WallRecord("w3", 0, 0, 10, 0))
+        self.model.remove_region("r1")
+        self.assertEqual(self.model.revision, revision + 2)
+        self.model.robot = RobotRecord(0, 0)
+        self.assertEqual(self.model.revision, revision + 2)
+        self.model.clear()
+        self.assertGreater(self.model.revision, revision + 2)
+
+    def test_validate(self):
+        """Тестирование проверки границ и пересечений."""
+        self.assertEqual(self.model.validate(), [])
+
+        self.model.set_wall(WallRecord("w3", 0, 0, 5000, 0))
+        self.model.set_wall(WallRecord("w4", -320, -280, -200, -280))
+        self.model.set_region(RegionRecord("r2", 600, 0, 100, 10))
+        self.assertEqual(self.model.validate(), [
+            ("w3", "стена выходит за границы сцены"),
+            ("w4", "стена пересекается с роботом"),
+            ("r2", "регион выходит за границы сцены"),
+        ])
+
+    def test_xml_round_trip(self):
+        """Тестирование записи и чтения модели через XML без Qt-сцены."""
+        handler = XMLHandler(self.model.scene_width, self.model.scene_height)
+        xml = handler.generate_model_xml(self.model)
+        parsed = XMLHandler().parse_scene_model(xml)
+
+        self.assertEqual((parsed.scene_width, parsed.scene_height), (1300, 1000))
+        self.assertEqual(list(parsed.walls.values()), list(self.model.walls.values()))
+        self.assertEqual(list(parsed.regions.values()), list(self.model.regions.values()))
+        self.assertEqual(parsed.robot, self.model.robot)
+        self.assertEqual(parsed.start_position, self.model.start_position)
+
+
+if __name__ == "__main__":
+    unittest.main()
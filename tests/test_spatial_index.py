@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+
+# Добавляем корневую директорию в sys.path для импорта модулей проекта
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.spatial_index import SegmentGridIndex
+
+
+class TestSegmentGridIndex(unittest.TestCase):
+    """Тесты пространственного индекса отрезков"""
+
+    def setUp(self):
+        self.index = SegmentGridIndex(cell_size=100)
+
+    def test_insert_and_query(self):
+        """Тестирование выборки отрезков по прямоугольнику."""
+        self.index.insert("a", 0, 0, 50, 0)
+        self.index.insert("b", 500, 500, 600, 600)
+        self.index.insert("c", -300, -10, 300, -10)
+
+        self.assertEqual(self.index.query_rect(10, -20, 40, 20), {"a", "c"})
+        self.assertEqual(self.index.query_rect(550, 550, 560, 560), {"b"})
+        self.assertEqual(self.index.query_rect(1000, 1000, 1100, 1100), set())
+        self.assertEqual(len(self.index), 3)
+
+    def test_padding(self):
+        """Тестирование расширения границ отрезка на половину толщины."""
+        self.index.insert("wall", 0, 0, 100, 0, padding=5)
+        self.assertEqual(self.index.query_rect(10, 4, 20, 20), {"wall"})
+        self.assertEqual(self.index.query_rect(10, 6, 20, 20), set())
+
+    def test_update_and_remove(self):
+        """Тестирование перемещения и удаления отрезков."""
+        self.index.insert("a", 0, 0, 50, 50)
+        self.index.update("a", 1000, 1000, 1050, 1050)
+        self.assertEqual(self.index.query_rect(0, 0, 50, 50), set())
+        self.assertEqual(self.index.query_rect(1000, 1000, 1010, 1010), {"a"})
+
+        self.assertTrue(self.index.remove("a"))
+        self.assertFalse(self.index.remove("a"))
+        self.assertNotIn("a", self.index)
+        self.assertEqual(self.index._cells, {})
+
+    def test_clear(self):
+        """Тестирование очистки индекса."""
+        self.index.insert("a", 0, 0, 50, 50)
+        self.index.clear()
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.query_rect(0, 0, 50, 50), set())
+
+    def test_invalid_cell_size(self):
+        """Тестирование проверки размера ячейки."""
+        with self.assertRaises(ValueError):
+            SegmentGridIndex(cell_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
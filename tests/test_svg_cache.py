@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch
+from PyQt6.QtCore import QPointF
+from PyQt6.QtWidgets import QApplication
+
+# Добавляем корневую директорию в sys.path для импорта модулей проекта
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import svg_cache
+from robot import Robot
+
+# Создаем экземпляр QApplication для тестов
+app = QApplication.instance()
+if app is None:
+    app = QApplication([])
+
+
+class TestSvgCache(unittest.TestCase):
+    """Тесты кэша SVG-ресурсов"""
+
+    def setUp(self):
+        svg_cache.clear()
+        Robot.reset_instance()
+
+    def tearDown(self):
+        Robot.reset_instance()
+
+    def test_pixmap_cached_by_size_and_ratio(self):
+        """Тестирование кэширования изображений по размеру и devicePixelRatio."""
+        first = svg_cache.pixmap(Robot.SVG_PATH, 50, 50)
+        self.assertIsNotNone(first)
+        self.assertIs(svg_cache.pixmap(Robot.SVG_PATH, 50, 50), first)
+
+        sharp = svg_cache.pixmap(Robot.SVG_PATH, 50, 50, 2.0)
+        self.assertEqual((sharp.width(), sharp.height()), (100, 100))
+        self.assertEqual(sharp.devicePixelRatio(), 2.0)
+        self.assertEqual(svg_cache.stats(), {"renderers": 1, "pixmaps": 2})
+
+    def test_path_independent_of_working_directory(self):
+        """Тестирование загрузки SVG при запуске из другого каталога."""
+        cwd = os.getcwd()
+        try:
+            os.chdir(os.path.dirname(os.path.abspath(__file__)))
+            self.assertIsNotNone(svg_cache.renderer(Robot.SVG_PATH))
+        finally:
+            os.chdir(cwd)
+
+    def test_missing_file(self):
+        """Тестирование однократной попытки загрузки отсутствующего файла."""
+        with patch('utils.svg_cache.QSvgRenderer', wraps=svg_cache.QSvgRenderer) as renderer_cls:
+            self.assertIsNone(svg_cache.pixmap("images/missing.svg", 50, 50))
+            self.assertIsNone(svg_cache.pixmap("images/missing.svg", 50, 50))
+            self.assertEqual(renderer_cls.call_count, 1)
+
+    def test_robot_render_scale(self):
+        """Тестирование перерисовки робота без изменения логического размера."""
+        robot = Robot(QPointF(0, 0))
+        bounds = robot.boundingRect()
+        robot.set_render_scale(2.0)
+        self.assertEqual(robot.pixmap().width(), 100)
+        self.assertEqual(robot.boundingRect(), bounds)
+
+        # Повторный масштаб берется из кэша без повторного разбора SVG
+        with patch('utils.svg_cache.QSvgRenderer') as renderer_cls:
+            robot.set_render_scale(1.0)
+            robot.set_render_scale(2.0)
+            renderer_cls.assert_not_called()
+        self.assertEqual(robot.pixmap().width(), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
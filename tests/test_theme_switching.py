@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from main_window import MainWindow
 from custom_widgets import EditableLineEdit, ColorPickerButton
+from styles import AppStyles
 import logging
 
 # Настройка логгера
@@ -33,8 +34,8 @@ class TestThemeSwitching(unittest.TestCase):
         self.main_window.close()
         
     @patch('custom_widgets.EditableLineEdit.set_theme')
-    def test_apply_theme_recursively_calls_set_theme_on_editable_line_edit(self, mock_set_theme):
-        """Проверяет, что метод _apply_theme_recursively вызывает set_theme у EditableLineEdit"""
+    def test_toggle_theme_calls_set_theme_on_editable_line_edit(self, mock_set_theme):
+        """Проверяет, что переключение темы вызывает set_theme у EditableLineEdit"""
         # Создаем экземпляр EditableLineEdit и добавляем его в главное окно
         editable = EditableLineEdit(self.main_window)
         self.main_window.layout().addWidget(editable)
@@ -47,8 +48,8 @@ class TestThemeSwitching(unittest.TestCase):
         mock_set_theme.assert_called_with(not initial_theme)
         
     @patch('custom_widgets.ColorPickerButton.set_theme')
-    def test_apply_theme_recursively_calls_set_theme_on_color_picker_button(self, mock_set_theme):
-        """Проверяет, что метод _apply_theme_recursively вызывает set_theme у ColorPickerButton"""
+    def test_toggle_theme_calls_set_theme_on_color_picker_button(self, mock_set_theme):
+        """Проверяет, что переключение темы вызывает set_theme у ColorPickerButton"""
         # Создаем экземпляр ColorPickerButton и добавляем его в главное окно
         color_button = ColorPickerButton(parent=self.main_window)
         self.main_window.layout().addWidget(color_button)
@@ -60,14 +61,19 @@ class TestThemeSwitching(unittest.TestCase):
         # Проверяем, что метод set_theme был вызван с правильным аргументом
         mock_set_theme.assert_called_with(not initial_theme)
         
-    @patch('main_window.MainWindow._apply_theme_recursively')
-    def test_toggle_theme_calls_apply_theme_recursively(self, mock_apply_recursively):
-        """Проверяет, что метод toggle_theme вызывает _apply_theme_recursively"""
-        # Переключаем тему в главном окне
+    def test_toggle_theme_switches_window_theme_property(self):
+        """Проверяет, что toggle_theme переключает свойство theme окна, а не стили виджетов"""
+        initial_theme = self.main_window.is_dark_theme
         self.main_window.toggle_theme()
         
-        # Проверяем, что метод _apply_theme_recursively был вызван
-        mock_apply_recursively.assert_called()
+        expected = "light" if initial_theme else "dark"
+        self.assertEqual(self.main_window.property("theme"), expected)
+        self.assertEqual(self.main_window.styleSheet(), AppStyles.get_application_style())
+        
+        # Элементы окна оформляет общий стиль, собственных стилей у них нет
+        for widget in (self.main_window.coords_label, self.main_window.theme_switch,
+                       self.main_window.observer_button, self.main_window.properties_dock):
+            self.assertEqual(widget.styleSheet(), "")
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -150,6 +150,29 @@ class TestUIInteractions(unittest.TestCase):
         self.assertLessEqual(abs(wall.line().y1() - (initial_line.y1() + delta_y)), 10)
         self.assertLessEqual(abs(wall.line().y2() - (initial_line.y2() + delta_y)), 10)
     
+    def test_wall_marker_drag_in_edit_mode(self):
+        """Тест перетаскивания конца облегченной стены за маркер"""
+        self.window.set_mode("edit")
+        field_widget = self.window.field_widget
+        
+        wall = Wall(QPointF(100, 100), QPointF(300, 100), render_mode=Wall.RENDER_MODE_LIGHTWEIGHT)
+        field_widget.scene().addItem(wall)
+        field_widget.select_item(wall)
+        
+        # Нажимаем на маркер конца стены и перетаскиваем его
+        view_pos = field_widget.mapFromScene(QPointF(300, 100))
+        QTest.mousePress(field_widget.viewport(), Qt.MouseButton.LeftButton, pos=view_pos)
+        self.assertEqual(field_widget.selected_marker, (wall, "end"))
+        
+        drag_pos = field_widget.mapFromScene(QPointF(300, 200))
+        QTest.mouseMove(field_widget.viewport(), pos=drag_pos)
+        QTest.mouseRelease(field_widget.viewport(), Qt.MouseButton.LeftButton, pos=drag_pos)
+        
+        # Начало стены осталось на месте, конец переместился
+        self.assertEqual(wall.line().p1(), QPointF(100, 100))
+        self.assertLessEqual(abs(wall.line().y2() - 200), 10)
+        self.assertIsNone(field_widget.selected_marker)
+    
     def test_region_drag_in_edit_mode(self):
         """Тест перетаскивания региона в режиме редактирования"""
         # Переключаемся в режим редактирования
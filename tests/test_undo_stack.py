@@ -0,0 +1,118 @@
+import sys
+import os
+import unittest
+
+# Добавляем корневую директорию в sys.path для импорта модулей проекта
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.undo_stack import UndoStack, StateChange, RenameChange, MERGE_INTERVAL
+
+
+class RecordingTarget:
+    """Цель команд, которая хранит состояния объектов в словаре."""
+
+    def __init__(self):
+        self.states = {}
+        self.calls = 0
+
+    def apply_item_state(self, kind, item_id, state):
+        self.calls += 1
+        if state is None:
+            self.states.pop((kind, item_id), None)
+        else:
+            self.states[(kind, item_id)] = state
+
+    def apply_item_rename(self, kind, old_id, new_id):
+        self.calls += 1
+        self.states[(kind, new_id)] = self.states.pop((kind, old_id))
+
+
+class TestUndoStack(unittest.TestCase):
+    """Тесты стека отмены (без Qt)"""
+
+    def setUp(self):
+        self.target = RecordingTarget()
+        self.stack = UndoStack()
+
+    def test_undo_redo(self):
+        """Тестирование отмены и повтора добавления, изменения и удаления"""
+        self.stack.push(StateChange("wall", "w1", None, (0, 0, 10, 0, 10)))
+        self.stack.push(StateChange("wall", "w1", (0, 0, 10, 0, 10), (0, 0, 20, 0, 10)))
+        self.stack.push(StateChange("wall", "w1", (0, 0, 20, 0, 10), None))
+        self.assertEqual(len(self.stack), 3)
+
+        self.stack.undo(self.target)
+        self.assertEqual(self.target.states, {("wall", "w1"): (0, 0, 20, 0, 10)})
+        self.stack.undo(self.target)
+        self.stack.undo(self.target)
+        self.assertEqual(self.target.states, {})
+        self.assertFalse(self.stack.can_undo())
+        self.assertIsNone(self.stack.undo(self.target))
+
+        self.stack.redo(self.target)
+        self.assertEqual(self.target.states, {("wall", "w1"): (0, 0, 10, 0, 10)})
+
+        # Новая команда удаляет историю повтора
+        self.stack.push(StateChange("wall", "w2", None, (0, 0, 0, 10, 10)))
+        self.assertFalse(self.stack.can_redo())
+
+    def test_merge_consecutive_edits(self):
+        """Тестирование объединения правок одного свойства"""
+        self.stack.push(StateChange("region", "r1", (0, 0, 10, 10, "c"), (0, 0, 20, 10, "c"), merge_key="size"))
+        self.stack.push(StateChange("region", "r1", (0, 0, 20, 10, "c"), (0, 0, 30, 10, "c"), merge_key="size"))
+        self.assertEqual(len(self.stack), 1)
+        self.assertEqual(self.stack.peek_undo().after, (0, 0, 30, 10, "c"))
+
+        # Другое свойство и правка после паузы записываются отдельно
+        self.stack.push(StateChange("region", "r1", (0, 0, 30, 10, "c"), (0, 0, 30, 10, "d"), merge_key="color"))
+        later = StateChange("region", "r1", (0, 0, 30, 10, "d"), (0, 0, 40, 10, "d"), merge_key="color")
+        later.timestamp += MERGE_INTERVAL * 2
+        self.stack.push(later)
+        self.assertEqual(len(self.stack), 3)
+
+        # Правка, вернувшая исходное значение, удаляет команду
+        self.stack.push(StateChange("region", "r1", (0, 0, 40, 10, "d"), (0, 0, 30, 10, "d"), merge_key="color"))
+        self.assertEqual(len(self.stack), 2)
+
+    def test_empty_commands_are_skipped(self):
+        """Тестирование того, что команды без изменений не записываются"""
+        self.stack.push(StateChange("robot", None, (0, 0, 0, ""), (0, 0, 0, "")))
+        self.stack.push(RenameChange("wall", "w1", "w1"))
+        self.assertFalse(self.stack.can_undo())
+
+    def test_limit(self):
+        """Тестирование отбрасывания старых команд сверх лимита"""
+        stack = UndoStack(limit=3)
+        for i in range(5):
+            stack.push(StateChange("wall", f"w{i}", None, (i, 0, i, 10, 10)))
+        self.assertEqual(len(stack), 3)
+        self.assertEqual(stack.peek_undo().item_id, "w4")
+
+    def test_group(self):
+        """Тестирование отмены группы команд как одной"""
+        with self.stack.group("Удаление стен"):
+            for i in range(100):
+                self.stack.push(StateChange("wall", f"w{i}", None, (i, 0, i, 10, 10)))
+            self.stack.push(RenameChange("wall", "w0", "w1000"))
+        self.assertEqual(len(self.stack), 1)
+        self.assertEqual(len(self.stack.peek_undo()), 101)
+
+        self.assertIsNone(self.stack.redo(self.target))
+        # Состояние после выполнения группы: 100 стен, первая переименована
+        self.target.states = {("wall", f"w{i}"): (i, 0, i, 10, 10) for i in range(1, 100)}
+        self.target.states[("wall", "w1000")] = (0, 0, 0, 10, 10)
+
+        self.stack.undo(self.target)
+        self.assertEqual(self.target.states, {})
+        self.stack.redo(self.target)
+        self.assertEqual(len(self.target.states), 100)
+        self.assertIn(("wall", "w1000"), self.target.states)
+
+    def test_command_memory_does_not_depend_on_scene_size(self):
+        """Тестирование того, что команда хранит только измененный объект"""
+        command = StateChange("wall", "w1", (0, 0, 10, 0, 10), (0, 0, 20, 0, 10))
+        self.assertFalse(hasattr(command, "__dict__"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import sys
 import os
 import unittest
-from PyQt6.QtCore import QPointF, QLineF
+from PyQt6.QtCore import QPointF, QLineF, QRectF
 from PyQt6.QtGui import QPen, QColor
 from PyQt6.QtWidgets import QApplication, QMessageBox
 from unittest.mock import patch
@@ -10,7 +10,8 @@ from unittest.mock import patch
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 
 # Импортируем класс стены
-from wall import Wall
+from wall import Wall, LightweightWall
+from utils.id_allocator import IdAllocator
 
 # Создаем экземпляр QApplication для тестов
 app = QApplication.instance()
@@ -68,6 +69,62 @@ class TestWall(unittest.TestCase):
         # Проверяем новую толщину
         self.assertEqual(wall.stroke_width, 5)
     
+    def test_wall_shares_paint_resources(self):
+        """Тест разделения паттернов, кистей и перьев между стенами"""
+        wall1 = Wall(QPointF(0, 0), QPointF(100, 100))
+        wall2 = Wall(QPointF(0, 50), QPointF(100, 50))
+        other_color = Wall(QPointF(0, 0), QPointF(50, 0), color="#00ff00")
+        
+        # Стены одного цвета используют один и тот же паттерн
+        self.assertEqual(wall1.brick_pattern.cacheKey(), wall2.brick_pattern.cacheKey())
+        self.assertEqual(wall1.brick_rect.brush().texture().cacheKey(), wall2.brick_rect.brush().texture().cacheKey())
+        self.assertNotEqual(wall1.brick_pattern.cacheKey(), other_color.brick_pattern.cacheKey())
+        
+        # Перо выделения зависит от толщины стены
+        self.assertIs(wall1.highlight_pen, wall2.highlight_pen)
+        wall2.set_stroke_width(5)
+        self.assertEqual(wall2.highlight_pen.widthF(), 10)
+        self.assertEqual(wall1.highlight_pen.widthF(), 15)
+    
+    def test_lightweight_wall(self):
+        """Тест облегченного режима отрисовки стены одним элементом"""
+        wall = Wall(QPointF(0, 0), QPointF(100, 0), render_mode=Wall.RENDER_MODE_LIGHTWEIGHT)
+        self.assertIsInstance(wall, LightweightWall)
+        
+        # Геометрия на Python переопределена только у облегченных стен:
+        # у стен режима items Qt считает границы и форму сам
+        items_wall = Wall(QPointF(0, 0), QPointF(100, 0), render_mode=Wall.RENDER_MODE_ITEMS)
+        self.assertIs(type(items_wall), Wall)
+        for name in ("boundingRect", "shape", "paint"):
+            self.assertNotIn(name, vars(Wall))
+            self.assertIn(name, vars(LightweightWall))
+        items_wall.release_id()
+        
+        # Нет дочерних элементов: тело, маркеры и обводки рисуются в paint()
+        self.assertEqual(wall.childItems(), [])
+        self.assertIsNone(wall.brick_rect)
+        
+        # Маркеры и тело различаются по геометрии
+        self.assertEqual(wall.marker_at(QPointF(1, 2)), "start")
+        self.assertEqual(wall.marker_at(QPointF(99, 0)), "end")
+        self.assertIsNone(wall.marker_at(QPointF(50, 0)))
+        self.assertTrue(wall.contains(QPointF(50, 4)))
+        self.assertFalse(wall.contains(QPointF(50, 8)))
+        
+        # Границы следуют за толщиной и положением стены
+        wall.set_stroke_width(20)
+        self.assertTrue(wall.contains(QPointF(50, 9)))
+        wall.setLine(0, 0, 0, 100)
+        self.assertTrue(wall.boundingRect().contains(QRectF(-10, 0, 20, 100)))
+        
+        # Выделение и подсветка не создают дочерних элементов
+        wall.set_highlight(True)
+        wall.set_hover_highlight(True)
+        self.assertEqual(wall.childItems(), [])
+        
+        with self.assertRaises(ValueError):
+            Wall(QPointF(0, 0), QPointF(1, 1), render_mode="unknown")
+    
     def test_wall_updating_context_manager(self):
         """Тест контекстного менеджера для обновления стены"""
         # Создаем стену
@@ -109,9 +166,27 @@ class TestWall(unittest.TestCase):
         self.assertTrue(wall3.id.startswith("w"))
         
         # Проверяем, что ID находятся в множестве существующих ID
-        self.assertIn(wall1.id, Wall._existing_ids)
-        self.assertIn(wall2.id, Wall._existing_ids)
-        self.assertIn(wall3.id, Wall._existing_ids)
+        self.assertIn(wall1.id, Wall.default_id_allocator)
+        self.assertIn(wall2.id, Wall.default_id_allocator)
+        self.assertIn(wall3.id, Wall.default_id_allocator)
+    
+    def test_wall_id_allocator(self):
+        """Тест ID стен разных сцен"""
+        scene_ids = IdAllocator("w")
+        other_scene_ids = IdAllocator("w")
+        wall1 = Wall(QPointF(0, 0), QPointF(100, 100), id_allocator=scene_ids)
+        wall2 = Wall(QPointF(0, 0), QPointF(100, 100), id_allocator=other_scene_ids)
+        
+        # Сцены нумеруют стены независимо
+        self.assertEqual(wall1.id, "w1")
+        self.assertEqual(wall2.id, "w1")
+        
+        # Занятый ID заменяется новым
+        wall3 = Wall(QPointF(0, 0), QPointF(100, 100), "w1", id_allocator=scene_ids)
+        self.assertEqual(wall3.id, "w2")
+        
+        wall1.release_id()
+        self.assertNotIn("w1", scene_ids)
     
     def test_wall_set_id(self):
         """Тест установки ID стены"""
@@ -127,8 +202,8 @@ class TestWall(unittest.TestCase):
         
         self.assertTrue(result)
         self.assertEqual(wall1.id, new_id)
-        self.assertNotIn(old_id1, Wall._existing_ids)
-        self.assertIn(new_id, Wall._existing_ids)
+        self.assertNotIn(old_id1, Wall.default_id_allocator)
+        self.assertIn(new_id, Wall.default_id_allocator)
         
         # Проверяем невозможность установки неуникального ID
         old_id2 = wall2.id
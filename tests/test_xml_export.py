@@ -0,0 +1,93 @@
+import io
+import sys
+import os
+import unittest
+from types import SimpleNamespace
+from PyQt6.QtCore import QPointF, QLineF, QRectF
+from PyQt6.QtGui import QPainterPath
+
+# Добавляем корневую директорию проекта в путь к модулям
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.xml_handler import XMLHandler, XMLValidationError
+
+
+def make_wall(wall_id, x1, y1, x2, y2):
+    """Создает заглушку стены с методом line()"""
+    return SimpleNamespace(id=wall_id, line=lambda: QLineF(x1, y1, x2, y2))
+
+
+def make_region(region_id, rect, color=None):
+    """Создает заглушку региона с методом path()"""
+    path = QPainterPath()
+    path.addRect(rect)
+    return SimpleNamespace(id=region_id, path=lambda: path, color=color)
+
+
+class TestXMLExport(unittest.TestCase):
+    """Тестирование потоковой генерации XML"""
+
+    def setUp(self):
+        self.handler = XMLHandler(scene_width=1300, scene_height=1000)
+        self.walls = [make_wall("w1", 0, 0, 100, 50.5), make_wall("w2", -10, -10, -10, 20)]
+        self.regions = [make_region("r1", QRectF(0, 0, 100, 50), "#800000ff")]
+        self.robot = SimpleNamespace(id="trikKitRobot", pos=lambda: QPointF(10, 20),
+                                     direction=90, name='R & "D"')
+        self.start_position = SimpleNamespace(id="startPosition", pos=lambda: QPointF(50.7, 20),
+                                              direction=lambda: 45.0)
+
+    def test_generate_xml_format(self):
+        """Тест формата вывода (совпадает с прежним выводом minidom)"""
+        xml = self.handler.generate_xml(self.walls, self.regions, self.robot, self.start_position)
+        self.assertEqual(xml, """<?xml version="1.0" ?>
+<root version="1.0">
+  <world width="1300" height="1000"/>
+  <walls>
+    <wall id="1" begin="0.0:0.0" end="100.0:50.5"/>
+    <wall id="2" begin="-10.0:-10.0" end="-10.0:20.0"/>
+  </walls>
+  <regions>
+    <region id="1" x="0.0" y="0.0" width="100.0" height="50.0" color="#800000ff"/>
+  </regions>
+  <robots>
+    <robot id="1" position="10.0:20.0" direction="90" name="R &amp; &quot;D&quot;">
+      <startPosition id="startPosition" x="50" y="20" direction="45"/>
+    </robot>
+  </robots>
+</root>
+""")
+
+    def test_write_xml_round_trip(self):
+        """Тест записи в файловый объект и обратного чтения"""
+        buffer = io.StringIO()
+        self.handler.write_xml(buffer, self.walls, self.regions, self.robot)
+        self.assertEqual(buffer.getvalue(), self.handler.generate_xml(self.walls, self.regions, self.robot))
+
+        scene_data = XMLHandler().parse_xml(buffer.getvalue())
+        self.assertEqual([wall["end"] for wall in scene_data["walls"]], [(100.0, 50.5), (-10.0, 20.0)])
+        self.assertEqual(scene_data["regions"][0]["rect"], QRectF(0, 0, 100, 50))
+        self.assertEqual(scene_data["robot"]["name"], 'R & "D"')
+
+    def test_invalid_objects_skipped(self):
+        """Тест пропуска объектов, не прошедших валидацию"""
+        walls = [make_wall("w1", 0, 0, 0, 0), make_wall("w2", 1e-7, 0, 10, 10), make_wall("w3", 0, 0, 5000, 0)]
+        regions = [make_region("r1", QRectF(600, 0, 100, 10))]
+        robot = SimpleNamespace(id="trikKitRobot", pos=lambda: QPointF(900, 0), direction=0, name="")
+
+        xml = self.handler.generate_xml(walls, regions, robot)
+        self.assertEqual(xml, """<?xml version="1.0" ?>
+<root version="1.0">
+  <world width="1300" height="1000"/>
+  <walls/>
+  <regions/>
+</root>
+""")
+
+    def test_invalid_id_raises(self):
+        """Тест ошибки при некорректном идентификаторе"""
+        with self.assertRaises(XMLValidationError):
+            self.handler.generate_xml([make_wall("wx", 0, 0, 10, 10)], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import tempfile
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+
+# Добавляем корневую директорию в sys.path для импорта модулей проекта
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.xml_parse_thread import XMLParseThread
+
+# Создаем экземпляр QApplication для тестов
+app = QApplication.instance()
+if app is None:
+    app = QApplication([])
+
+SCENE_XML = """<?xml version="1.0" ?>
+<root version="1.0">
+  <world width="1300" height="1000"/>
+  <walls>
+    <wall id="1" begin="0:0" end="100:0"/>
+  </walls>
+  <regions>
+    <region id="1" x="0" y="0" width="100" height="50" color="#800000ff"/>
+  </regions>
+  <robots>
+    <robot id="1" position="0:0" direction="0"/>
+  </robots>
+</root>
+"""
+
+
+class TestXMLParseThread(unittest.TestCase):
+    """Тесты фонового разбора XML-файлов"""
+
+    def setUp(self):
+        self.results = []
+        self.errors = []
+
+    def _write(self, content):
+        """Записывает XML во временный файл и возвращает путь к нему."""
+        handle, path = tempfile.mkstemp(suffix=".xml")
+        with os.fdopen(handle, "w", encoding="utf-8") as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def _run(self, path):
+        """Запускает разбор и ждет завершения потока."""
+        thread = XMLParseThread(path, 1300, 1000)
+        thread.parsed.connect(self.results.append)
+        thread.failed.connect(self.errors.append)
+        loop = QEventLoop()
+        thread.finished.connect(loop.quit)
+        QTimer.singleShot(5000, loop.quit)
+        thread.start()
+        loop.exec()
+        thread.wait()
+        # Доставляем сигналы, поставленные в очередь из потока
+        app.processEvents()
+
+    def test_parsed_in_background(self):
+        """Тестирование разбора корректного файла в потоке."""
+        self._run(self._write(SCENE_XML))
+        self.assertEqual(self.errors, [])
+        self.assertEqual(len(self.results), 1)
+        self.assertEqual(len(self.results[0]["walls"]), 1)
+        self.assertEqual(len(self.results[0]["regions"]), 1)
+
+    def test_invalid_file_reports_error(self):
+        """Тестирование сообщения об ошибке разбора."""
+        self._run(self._write("<root>"))
+        self.assertEqual(self.results, [])
+        self.assertEqual(len(self.errors), 1)
+
+    def test_non_utf8_file_reports_error(self):
+        """Тестирование сообщения об ошибке для файла не в кодировке UTF-8."""
+        handle, path = tempfile.mkstemp(suffix=".xml")
+        with os.fdopen(handle, "wb") as f:
+            f.write(b"\xff\xfe<root/>")
+        self.addCleanup(os.remove, path)
+        self._run(path)
+        self.assertEqual(self.results, [])
+        self.assertEqual(len(self.errors), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
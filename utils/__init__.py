@@ -10,7 +10,9 @@
 """
 
 from utils.signal_utils import SignalBlock, safe_emit, safe_connect, safe_disconnect
-from utils.logging_utils import setup_logger, log_exception, log_value_change
+from utils.logging_utils import (
+    setup_logger, configure_logging, parse_log_level, log_exception, log_value_change
+)
 from utils.exceptions import (
     ApplicationError, ValidationError, ResourceError, 
     ConfigError, EventError, handle_application_error
@@ -0,0 +1,212 @@
+"""
+Пакетная обработка файлов сцен без графического интерфейса.
+
+Запуск:
+    python -m gscene batch validate <путь> [--jobs N]
+    python -m gscene batch normalize <путь> --output <каталог> [--jobs N]
+    python -m gscene batch stats <путь> [--jobs N]
+
+Путь может быть файлом или каталогом (XML-файлы ищутся рекурсивно).
+Файлы обрабатываются параллельно в пуле процессов; результат по каждому
+файлу выводится отдельной строкой JSON сразу по готовности, последней
+строкой выводится сводка.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils.xml_handler import XMLHandler, XMLValidationError
+from utils.scene_model import SceneModel
+
+COMMANDS = ("validate", "normalize", "stats")
+
+
+def iter_xml_files(path):
+    """
+    Возвращает XML-файлы по пути в отсортированном порядке.
+
+    Args:
+        path: Путь к файлу или каталогу (каталог обходится рекурсивно)
+    """
+    if os.path.isfile(path):
+        return [path]
+    files = []
+    for directory, _, names in os.walk(path):
+        files.extend(os.path.join(directory, name) for name in names if name.lower().endswith(".xml"))
+    return sorted(files)
+
+
+def _parse_model(xml_content):
+    """
+    Разбирает XML в модель сцены.
+
+    Returns:
+        tuple: (SceneModel, список предупреждений о пропущенных объектах)
+    """
+    handler = XMLHandler()
+    data = handler.parse_xml(xml_content)
+    return SceneModel.from_scene_data(data), handler.skipped
+
+
+def _scene_stats(model):
+    """Возвращает сводку по модели сцены."""
+    wall_length = sum(math.hypot(wall.x2 - wall.x1, wall.y2 - wall.y1) for wall in model.walls.values())
+    return {
+        "scene_width": model.scene_width,
+        "scene_height": model.scene_height,
+        "walls": len(model.walls),
+        "regions": len(model.regions),
+        "robot": model.robot is not None,
+        "start_position": model.start_position is not None,
+        "wall_length": round(wall_length, 2),
+    }
+
+
+def _write_atomic(path, content):
+    """Записывает файл через временный файл, чтобы сбой не оставил его недописанным."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def process_file(command, path, root=None, output=None):
+    """
+    Обрабатывает один файл сцены.
+
+    Функция выполняется в процессе пула, поэтому принимает и возвращает
+    только простые значения.
+
+    Args:
+        command: 'validate', 'normalize' или 'stats'
+        path: Путь к XML-файлу
+        root: Каталог, относительно которого строится путь в output
+        output: Каталог для нормализованных файлов (только для normalize);
+            None - файлы не записываются, сообщается только, изменились бы они
+
+    Returns:
+        dict: Результат: file, ok, time_ms и поля, зависящие от команды
+    """
+    start = time.perf_counter()
+    result = {"file": path, "ok": True}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            xml_content = f.read()
+        model, warnings = _parse_model(xml_content)
+        if warnings:
+            result["skipped"] = warnings
+
+        if command == "validate":
+            issues = [{"id": item_id, "message": message} for item_id, message in model.validate()]
+            result["issues"] = issues
+            result["ok"] = not issues and not warnings
+        elif command == "normalize":
+            handler = XMLHandler(scene_width=model.scene_width, scene_height=model.scene_height)
+            normalized = handler.generate_model_xml(model)
+            result["changed"] = normalized != xml_content
+            if output is not None:
+                target = os.path.join(output, os.path.relpath(path, root or os.path.dirname(path)))
+                _write_atomic(target, normalized)
+                result["output"] = target
+        elif command == "stats":
+            result.update(_scene_stats(model))
+        else:
+            raise ValueError(f"Неизвестная команда: {command}")
+    except (XMLValidationError, OSError, UnicodeDecodeError) as e:
+        result["ok"] = False
+        result["error"] = str(e)
+    result["time_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return result
+
+
+def run_batch(command, paths, root=None, output=None, jobs=None, out=None):
+    """
+    Обрабатывает файлы и выводит результаты строками JSON по мере готовности.
+
+    Args:
+        command: 'validate', 'normalize' или 'stats'
+        paths: Пути к XML-файлам
+        root: Каталог, относительно которого строятся пути в output
+        output: Каталог для нормализованных файлов
+        jobs: Количество процессов (None - по числу ядер, 1 - без пула)
+        out: Поток вывода (по умолчанию sys.stdout)
+
+    Returns:
+        dict: Сводка: files, failed, time_ms
+    """
+    out = out or sys.stdout
+    start = time.perf_counter()
+    failed = 0
+
+    def emit(result):
+        nonlocal failed
+        if not result["ok"]:
+            failed += 1
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        out.flush()
+
+    if jobs == 1 or len(paths) <= 1:
+        for path in paths:
+            emit(process_file(command, path, root, output))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+            futures = [executor.submit(process_file, command, path, root, output) for path in paths]
+            for future in as_completed(futures):
+                emit(future.result())
+
+    return {
+        "files": len(paths),
+        "failed": failed,
+        "time_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def _init_worker():
+    """Отключает вывод предупреждений XMLHandler в консоль: они попадают в результат."""
+    xml_logger = logging.getLogger(XMLHandler.__module__)
+    if not xml_logger.handlers:
+        xml_logger.addHandler(logging.NullHandler())
+    xml_logger.propagate = False
+
+
+def main(argv=None):
+    """
+    Точка входа пакетной обработки (python -m gscene batch ...).
+
+    Returns:
+        int: 0, если все файлы обработаны успешно, иначе 1
+    """
+    parser = argparse.ArgumentParser(prog="gscene batch", description="Пакетная обработка файлов сцен")
+    parser.add_argument("command", choices=COMMANDS, help="validate - проверка, normalize - "
+                        "перезапись в каноническом формате, stats - сводка по сценам")
+    parser.add_argument("path", help="XML-файл или каталог со сценами")
+    parser.add_argument("--output", help="Каталог для нормализованных файлов (normalize); "
+                        "без него файлы не записываются")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Количество процессов (по умолчанию - по числу ядер)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        parser.error(f"Путь не найден: {args.path}")
+    root = args.path if os.path.isdir(args.path) else os.path.dirname(args.path)
+    if args.output is not None and os.path.abspath(args.output) == os.path.abspath(root):
+        parser.error("Каталог --output должен отличаться от исходного")
+
+    _init_worker()
+    summary = run_batch(args.command, iter_xml_files(args.path), root, args.output, args.jobs)
+    print(json.dumps({"summary": summary}, ensure_ascii=False))
+    return 1 if summary["failed"] else 0
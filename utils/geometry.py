@@ -0,0 +1,152 @@
+"""
+Геометрическое ядро проверок сцены.
+
+Модуль не зависит от Qt: все функции работают с числами и простыми
+кортежами, поэтому проверки границ и пересечений не создают временных
+QGraphicsItem и не трогают реестры ID стен и регионов.
+"""
+
+from typing import NamedTuple
+
+# Размер робота (квадрат со стороной ROBOT_SIZE пикселей)
+ROBOT_SIZE = 50
+# Толщина стены по умолчанию
+DEFAULT_WALL_WIDTH = 10
+# Отступ стартовой позиции от границы сцены
+START_POSITION_MARGIN = 25
+
+
+class Rect(NamedTuple):
+    """Прямоугольник, заданный левым верхним углом и размерами."""
+    x: float
+    y: float
+    width: float
+    height: float
+
+    @property
+    def left(self) -> float:
+        return self.x
+
+    @property
+    def top(self) -> float:
+        return self.y
+
+    @property
+    def right(self) -> float:
+        return self.x + self.width
+
+    @property
+    def bottom(self) -> float:
+        return self.y + self.height
+
+    def contains_point(self, px: float, py: float) -> bool:
+        """Проверяет, лежит ли точка внутри прямоугольника (включая границу)."""
+        return self.left <= px <= self.right and self.top <= py <= self.bottom
+
+    def inflated(self, margin: float) -> "Rect":
+        """Возвращает прямоугольник, расширенный на margin с каждой стороны."""
+        return Rect(self.x - margin, self.y - margin, self.width + 2 * margin, self.height + 2 * margin)
+
+
+def robot_rect(x: float, y: float) -> Rect:
+    """Возвращает прямоугольник робота по координатам его левого верхнего угла."""
+    return Rect(x, y, ROBOT_SIZE, ROBOT_SIZE)
+
+
+def point_within_bounds(x: float, y: float, scene_width: float, scene_height: float) -> bool:
+    """Проверяет, лежит ли точка в пределах сцены с центром в начале координат."""
+    return (-scene_width / 2 <= x <= scene_width / 2 and
+            -scene_height / 2 <= y <= scene_height / 2)
+
+
+def segment_within_bounds(x1: float, y1: float, x2: float, y2: float,
+                          scene_width: float, scene_height: float) -> bool:
+    """Проверяет, что оба конца отрезка (стены) лежат в пределах сцены."""
+    return (point_within_bounds(x1, y1, scene_width, scene_height) and
+            point_within_bounds(x2, y2, scene_width, scene_height))
+
+
+def rect_within_bounds(rect: Rect, scene_width: float, scene_height: float) -> bool:
+    """Проверяет, что прямоугольник целиком лежит в пределах сцены."""
+    return (point_within_bounds(rect.left, rect.top, scene_width, scene_height) and
+            point_within_bounds(rect.right, rect.bottom, scene_width, scene_height))
+
+
+def robot_within_bounds(x: float, y: float, scene_width: float, scene_height: float) -> bool:
+    """Проверяет, что робот с левым верхним углом в (x, y) целиком лежит в пределах сцены."""
+    return rect_within_bounds(robot_rect(x, y), scene_width, scene_height)
+
+
+def start_position_within_bounds(x: float, y: float, scene_width: float, scene_height: float) -> bool:
+    """Проверяет, что стартовая позиция лежит в пределах сцены с учетом отступа."""
+    margin = START_POSITION_MARGIN
+    return (-scene_width / 2 + margin <= x <= scene_width / 2 - margin and
+            -scene_height / 2 + margin <= y <= scene_height / 2 - margin)
+
+
+def segments_intersect(ax1: float, ay1: float, ax2: float, ay2: float,
+                       bx1: float, by1: float, bx2: float, by2: float) -> bool:
+    """
+    Проверяет пересечение двух отрезков.
+
+    Повторяет семантику QLineF.intersects с BoundedIntersection:
+    параллельные (в том числе совпадающие) отрезки не считаются пересекающимися,
+    касание концами считается пересечением.
+    """
+    ax, ay = ax2 - ax1, ay2 - ay1
+    bx, by = bx1 - bx2, by1 - by2
+    denominator = ay * bx - ax * by
+    if denominator == 0:
+        return False
+
+    cx, cy = ax1 - bx1, ay1 - by1
+    na = (by * cx - bx * cy) / denominator
+    if na < 0 or na > 1:
+        return False
+    nb = (ax * cy - ay * cx) / denominator
+    return 0 <= nb <= 1
+
+
+def segment_intersects_rect(x1: float, y1: float, x2: float, y2: float, rect: Rect) -> bool:
+    """
+    Проверяет, пересекает ли отрезок прямоугольник или лежит внутри него.
+
+    Args:
+        x1, y1, x2, y2: Координаты концов отрезка
+        rect: Прямоугольник
+
+    Returns:
+        bool: True, если отрезок пересекает прямоугольник
+    """
+    left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+    sides = (
+        (left, top, right, top),
+        (right, top, right, bottom),
+        (left, bottom, right, bottom),
+        (left, top, left, bottom),
+    )
+    for side in sides:
+        if segments_intersect(x1, y1, x2, y2, *side):
+            return True
+
+    return rect.contains_point(x1, y1) or rect.contains_point(x2, y2)
+
+
+def thick_segment_intersects_rect(x1: float, y1: float, x2: float, y2: float,
+                                  rect: Rect, thickness: float) -> bool:
+    """
+    Проверяет, пересекает ли отрезок заданной толщины прямоугольник.
+
+    Толщина учитывается расширением прямоугольника на половину толщины.
+
+    Args:
+        x1, y1, x2, y2: Координаты концов отрезка
+        rect: Прямоугольник
+        thickness: Толщина отрезка
+
+    Returns:
+        bool: True, если отрезок с учетом толщины пересекает прямоугольник
+    """
+    if segment_intersects_rect(x1, y1, x2, y2, rect):
+        return True
+    return segment_intersects_rect(x1, y1, x2, y2, rect.inflated(thickness / 2))
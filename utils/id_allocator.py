@@ -0,0 +1,161 @@
+"""
+Распределитель ID объектов сцены без зависимости от Qt.
+
+Каждая сцена (FieldWidget) владеет своими распределителями для стен и регионов,
+поэтому несколько сцен и пакетные задания в одном процессе не делят и не
+теряют ID друг друга.
+
+ID имеют вид '<префикс><номер>' (например, 'w12'). Распределитель хранит
+множество занятых ID и следующий номер (наибольший занятый номер + 1):
+выдача, занятие и освобождение ID выполняются за O(1). Освобожденные номера
+повторно не выдаются, чтобы ID удаленного объекта, который можно вернуть
+отменой, не достался новому объекту.
+"""
+
+import logging
+from typing import Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+ItemId = Union[str, int]
+
+
+class IdAllocator:
+    """
+    Распределитель ID одного типа объектов одной сцены.
+
+    Args:
+        prefix: Префикс ID ('w' для стен, 'r' для регионов)
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._used = set()
+        # ID, занятые пакетно (reserve_many), но еще не выданные объектам
+        self._reserved = set()
+        self._next = 1
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._used
+
+    def __len__(self) -> int:
+        return len(self._used)
+
+    @property
+    def next_number(self) -> int:
+        """Номер, который получит следующий сгенерированный ID."""
+        return self._next
+
+    def normalize(self, item_id: ItemId) -> Optional[str]:
+        """
+        Приводит ID к строковому виду: число n и строка 'n' дают '<префикс>n'.
+
+        Returns:
+            str: ID или None, если ID некорректен (пустой, номер не положительный)
+        """
+        if isinstance(item_id, bool) or not isinstance(item_id, (str, int)):
+            return None
+        if isinstance(item_id, int) or item_id.isdigit():
+            return f"{self.prefix}{int(item_id)}" if int(item_id) > 0 else None
+        if item_id == "" or self._number(item_id) == 0:
+            return None
+        return item_id
+
+    def allocate(self) -> str:
+        """Выдает новый ID со следующим номером."""
+        item_id = f"{self.prefix}{self._next}"
+        # Номера выше _next заняты только через _take, который сдвигает _next,
+        # поэтому цикл выполняется не более одного раза
+        while item_id in self._used:
+            self._next += 1
+            item_id = f"{self.prefix}{self._next}"
+        self._take(item_id)
+        return item_id
+
+    def acquire(self, item_id: Optional[ItemId] = None) -> str:
+        """
+        Занимает ID для нового объекта.
+
+        Зарезервированный через reserve_many ID выдается как есть. Если ID не
+        задан, занят или некорректен, выдается новый ID.
+        """
+        if item_id is None:
+            return self.allocate()
+        normalized = self.normalize(item_id)
+        if normalized is not None and normalized in self._reserved:
+            self._reserved.remove(normalized)
+            return normalized
+        if normalized is None:
+            logger.warning(f"Некорректный ID '{item_id}', будет сгенерирован новый")
+        elif normalized in self._used:
+            logger.warning(f"ID '{normalized}' уже используется, будет сгенерирован новый")
+        else:
+            self._take(normalized)
+            return normalized
+        return self.allocate()
+
+    def reserve_many(self, item_ids: Iterable[Optional[ItemId]]) -> List[str]:
+        """
+        Резервирует ID загружаемых объектов одним проходом.
+
+        Занятые, повторяющиеся и некорректные ID заменяются новыми, следующий
+        номер сдвигается за наибольший загруженный номер один раз. Возвращенные
+        ID затем выдаются объектам через acquire.
+
+        Returns:
+            list: ID в том же порядке
+        """
+        result = []
+        max_number = 0
+        for item_id in item_ids:
+            normalized = self.normalize(item_id) if item_id is not None else None
+            if normalized is None or normalized in self._used:
+                result.append(None)
+                continue
+            self._used.add(normalized)
+            result.append(normalized)
+            max_number = max(max_number, self._number(normalized) or 0)
+        self._next = max(self._next, max_number + 1)
+
+        result = [item_id if item_id is not None else self.allocate() for item_id in result]
+        self._reserved.update(result)
+        return result
+
+    def release(self, item_id: str):
+        """Освобождает ID удаленного объекта."""
+        self._used.discard(item_id)
+        self._reserved.discard(item_id)
+
+    def rename(self, old_id: str, new_id: str) -> bool:
+        """
+        Заменяет занятый ID old_id на new_id.
+
+        Returns:
+            bool: False, если new_id уже занят
+        """
+        if new_id == old_id:
+            return True
+        if new_id in self._used:
+            return False
+        self.release(old_id)
+        self._take(new_id)
+        return True
+
+    def clear(self):
+        """Освобождает все ID и начинает нумерацию заново."""
+        self._used.clear()
+        self._reserved.clear()
+        self._next = 1
+
+    def _take(self, item_id: str):
+        self._used.add(item_id)
+        number = self._number(item_id)
+        if number is not None and number >= self._next:
+            self._next = number + 1
+
+    def _number(self, item_id: str) -> Optional[int]:
+        """Номер ID вида '<префикс><номер>' или None для ID другого вида."""
+        digits = item_id[len(self.prefix):]
+        if item_id.startswith(self.prefix) and digits.isdigit():
+            return int(digits)
+        return None
@@ -0,0 +1,87 @@
+"""
+Режимы кэширования отрисовки объектов сцены (QGraphicsItem.CacheMode).
+
+Режим задается отдельно для каждого вида объектов:
+
+    walls          - тело стены (в режиме items - прямоугольник с кирпичным паттерном)
+    regions        - регионы
+    robot          - изображение робота
+    start_position - крест стартовой позиции
+
+Значения режимов:
+
+    none   - без кэша, объект рисуется при каждой перерисовке
+    device - DeviceCoordinateCache: кэш в координатах экрана, перерисовывается
+             при изменении объекта и при смене масштаба или поворота
+    item   - ItemCoordinateCache: кэш в координатах объекта с разрешением
+             boundingRect * scale; поворот не требует перерисовки, а при смене
+             масштаба кэш нужно применить заново с новым scale (см. apply)
+
+Qt сбрасывает кэш объекта при каждом update(), поэтому setLine, set_color,
+set_highlight и прочие методы, меняющие вид объекта через update() или
+setPen/setBrush, кэш не портят. Режимы общие для всех сцен процесса, как
+и пороги level_of_detail; они применяются к объектам при их создании.
+"""
+
+from math import ceil
+from typing import Dict
+
+from PyQt6.QtCore import QSize
+from PyQt6.QtWidgets import QGraphicsItem
+
+CACHE_MODES = {
+    "none": QGraphicsItem.CacheMode.NoCache,
+    "device": QGraphicsItem.CacheMode.DeviceCoordinateCache,
+    "item": QGraphicsItem.CacheMode.ItemCoordinateCache,
+}
+
+# Режимы по умолчанию. Регион - прямоугольник со сплошной заливкой: его отрисовка
+# не дороже копирования кэша того же размера, а кэш большого региона занимает много памяти
+DEFAULT_MODES = {
+    "walls": "device",
+    "regions": "none",
+    "robot": "item",
+    "start_position": "device",
+}
+
+_modes: Dict[str, str] = dict(DEFAULT_MODES)
+
+
+def configure(**modes: str):
+    """
+    Задает режимы кэширования (walls, regions, robot, start_position).
+
+    Raises:
+        ValueError: Неизвестный вид объектов или режим
+    """
+    for kind, mode in modes.items():
+        if kind not in DEFAULT_MODES:
+            raise ValueError(f"Неизвестный вид объектов для кэширования: {kind}")
+        if mode is None:
+            continue
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Неизвестный режим кэширования: {kind}={mode}")
+        _modes[kind] = mode
+
+
+def modes() -> Dict[str, str]:
+    """Возвращает копию текущих режимов."""
+    return dict(_modes)
+
+
+def apply(item: QGraphicsItem, kind: str, scale: float = 1.0):
+    """
+    Устанавливает объекту режим кэширования для вида kind.
+
+    Args:
+        item: Объект сцены
+        kind: Вид объекта (ключ DEFAULT_MODES)
+        scale: Отношение пикселей экрана к единицам объекта (масштаб с учетом
+            devicePixelRatio); используется только в режиме item
+    """
+    mode = CACHE_MODES[_modes[kind]]
+    if mode != QGraphicsItem.CacheMode.ItemCoordinateCache:
+        item.setCacheMode(mode)
+        return
+    rect = item.boundingRect()
+    item.setCacheMode(mode, QSize(max(1, ceil(rect.width() * scale)), max(1, ceil(rect.height() * scale))))
@@ -104,6 +104,12 @@ class AppShortcutsManager(ShortcutsManager):
         """
         Настраивает горячие клавиши для операций редактирования.
         """
+        # Отмена и повтор действий
+        self.register_from_config("undo", 
+                                 lambda: self.main_window.field_widget.undo())
+        self.register_from_config("redo", 
+                                 lambda: self.main_window.field_widget.redo())
+        
         # Удаление выбранного объекта
         self.register_from_config("delete", 
                                  lambda: self.main_window.field_widget.delete_selected_item())
@@ -70,6 +70,18 @@ DEFAULT_SHORTCUTS = {
     },
     
     # Редактирование
+    "undo": {
+        "key": "Ctrl+Z",
+        "display_name": "Отменить",
+        "description": "Отменить последнее действие",
+        "category": ShortcutCategory.EDIT
+    },
+    "redo": {
+        "key": "Ctrl+Shift+Z",
+        "display_name": "Повторить",
+        "description": "Повторить отмененное действие",
+        "category": ShortcutCategory.EDIT
+    },
     "delete": {
         "key": "Delete",
         "display_name": "Удалить",
@@ -0,0 +1,66 @@
+"""
+Уровень детализации (LOD) при отрисовке объектов сцены.
+
+Уровень детализации берется из QStyleOptionGraphicsItem.levelOfDetailFromTransform
+для текущего преобразования painter: 1.0 соответствует масштабу 1:1, 0.5 - уменьшению
+вдвое. Если уровень ниже порога, объекты рисуются упрощенно:
+
+    walls   - стена рисуется сплошной полосой без кирпичного паттерна
+    details - маркеры концов стен и обводки при наведении не рисуются
+    regions - регион рисуется прямоугольником без сглаживания
+
+Пороги общие для всех сцен процесса, как и кэш paint_cache; порог 0 отключает упрощение.
+"""
+
+from typing import Dict
+
+from PyQt6.QtWidgets import QGraphicsEllipseItem, QStyleOptionGraphicsItem
+
+# Пороги по умолчанию: при минимальном масштабе поля (0.5) включаются все упрощения
+DEFAULT_THRESHOLDS = {
+    "walls": 0.75,
+    "details": 0.75,
+    "regions": 0.75,
+}
+
+_thresholds: Dict[str, float] = dict(DEFAULT_THRESHOLDS)
+
+
+def configure(**thresholds: float):
+    """
+    Задает пороги уровня детализации (walls, details, regions).
+
+    Raises:
+        ValueError: Неизвестный порог или отрицательное значение
+    """
+    for name, value in thresholds.items():
+        if name not in DEFAULT_THRESHOLDS:
+            raise ValueError(f"Неизвестный порог уровня детализации: {name}")
+        if value is None:
+            continue
+        if value < 0:
+            raise ValueError(f"Порог уровня детализации не может быть отрицательным: {name}={value}")
+        _thresholds[name] = float(value)
+
+
+def thresholds() -> Dict[str, float]:
+    """Возвращает копию текущих порогов."""
+    return dict(_thresholds)
+
+
+def level(painter) -> float:
+    """Возвращает уровень детализации для текущего преобразования painter."""
+    return QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+
+
+def simplified(painter, kind: str) -> bool:
+    """Возвращает True, если объекты вида kind нужно рисовать упрощенно."""
+    return level(painter) < _thresholds[kind]
+
+
+class DetailEllipseItem(QGraphicsEllipseItem):
+    """Эллипс-деталь (маркер конца стены), который не рисуется при мелком масштабе."""
+
+    def paint(self, painter, option, widget=None):
+        if not simplified(painter, "details"):
+            super().paint(painter, option, widget)
@@ -6,49 +6,94 @@ import logging
 import os
 from datetime import datetime
 
-def setup_logger(name, log_dir='logs'):
+# Уровень логирования приложения по умолчанию
+DEFAULT_LOG_LEVEL = "WARNING"
+
+def setup_logger(name, log_dir='logs', level=logging.DEBUG, console_level=logging.INFO):
     """
     Настройка логгера с записью в файл и консоль.
     
+    Повторный вызов для того же логгера меняет только уровень и не добавляет
+    хендлеры заново.
+    
     Args:
-        name: Имя логгера
-        log_dir: Директория для лог-файлов
+        name: Имя логгера (None - корневой логгер)
+        log_dir: Директория для лог-файлов (None - без записи в файл)
+        level: Уровень логгера
+        console_level: Уровень вывода в консоль
         
     Returns:
         logging.Logger: Настроенный логгер
     """
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(level)
+    if logger.handlers:
+        return logger
     
-    # Создаем директорию для логов если её нет
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-        
     # Форматтер для логов
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
-    # Хендлер для файла
-    log_file = os.path.join(
-        log_dir, 
-        f'{name}_{datetime.now().strftime("%Y%m%d")}.log'
-    )
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(formatter)
+    if log_dir:
+        # Создаем директорию для логов если её нет
+        if not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+            
+        # Хендлер для файла
+        log_file = os.path.join(
+            log_dir, 
+            f'{name or "gscene"}_{datetime.now().strftime("%Y%m%d")}.log'
+        )
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(formatter)
+        logger.addHandler(file_handler)
     
     # Хендлер для консоли
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
+    console_handler.setLevel(console_level)
     console_handler.setFormatter(formatter)
-    
-    # Добавляем хендлеры к логгеру
-    logger.addHandler(file_handler)
     logger.addHandler(console_handler)
     
     return logger
 
+def parse_log_level(level):
+    """
+    Преобразует уровень логирования из конфигурации в число.
+    
+    Args:
+        level: Имя уровня ('DEBUG', 'info', ...) или число
+        
+    Returns:
+        int: Уровень логирования; для неизвестного имени - DEFAULT_LOG_LEVEL
+    """
+    if isinstance(level, int):
+        return level
+    value = getattr(logging, str(level).upper(), None)
+    if not isinstance(value, int):
+        return getattr(logging, DEFAULT_LOG_LEVEL)
+    return value
+
+def configure_logging(level=DEFAULT_LOG_LEVEL, log_dir=None):
+    """
+    Настройка логирования приложения через корневой логгер.
+    
+    Вызывается один раз при запуске приложения; модули только получают свои
+    логгеры через logging.getLogger(__name__) и не настраивают логирование
+    при импорте. Сообщения отключенных уровней не форматируются, поэтому
+    отладочные вызовы в обработчиках событий почти ничего не стоят.
+    
+    Args:
+        level: Уровень логирования (имя или число)
+        log_dir: Директория для лог-файла (None - только консоль)
+        
+    Returns:
+        logging.Logger: Корневой логгер
+    """
+    level = parse_log_level(level)
+    return setup_logger(None, log_dir, level=level, console_level=level)
+
 def log_exception(logger, e, context=""):
     """
     Логирование исключения с контекстом.
@@ -73,6 +118,6 @@ def log_value_change(logger, element_type, element_id, property_name, old_value,
         new_value: Новое значение
     """
     logger.debug(
-        f"Изменение свойства {property_name} для {element_type} {element_id}: "
-        f"{old_value} -> {new_value}"
+        "Изменение свойства %s для %s %s: %s -> %s",
+        property_name, element_type, element_id, old_value, new_value
     ) 
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Общий (flyweight) кэш графических ресурсов: паттернов, кистей и перьев.
+
+Объекты сцены одного вида (например, тысячи стен одного цвета и толщины)
+получают из кэша одни и те же QPixmap, QBrush и QPen вместо создания
+собственных копий. QPen и QBrush в Qt разделяются неявно, поэтому
+setPen/setBrush с кэшированным объектом не копирует данные.
+
+Возвращаемые объекты общие для всего процесса - их нельзя изменять
+на месте; для изменения нужно сделать копию (QPen(pen), QBrush(brush)).
+
+Кэш можно отключить (set_enabled(False)) - тогда каждый вызов создает
+новый объект, как если бы каждая стена хранила собственные копии
+(используется в замере памяти benchmarks).
+"""
+
+import logging
+from typing import Dict, Tuple, Union
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QBrush, QColor, QPainter, QPen, QPixmap
+
+logger = logging.getLogger(__name__)
+
+ColorLike = Union[str, QColor, Qt.GlobalColor]
+
+_patterns: Dict[Tuple, QPixmap] = {}
+_brushes: Dict[Tuple, QBrush] = {}
+_pens: Dict[Tuple, QPen] = {}
+_enabled = True
+
+
+def set_enabled(enabled: bool):
+    """Включает или отключает кэш (при отключенном каждый вызов создает новый объект)."""
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    """Возвращает True, если кэш включен."""
+    return _enabled
+
+
+def _cached(store: Dict, key: Tuple, factory):
+    """Возвращает объект из store по ключу, создавая его через factory при отсутствии."""
+    value = store.get(key) if _enabled else None
+    if value is None:
+        value = factory()
+        if _enabled:
+            store[key] = value
+    return value
+
+
+def _color_key(color: ColorLike) -> str:
+    """Возвращает нормализованный ключ цвета (#AARRGGBB)."""
+    return QColor(color).name(QColor.NameFormat.HexArgb)
+
+
+def render_brick_pattern(brick_color: ColorLike, mortar_color: ColorLike,
+                         brick_width: int = 10, brick_height: int = 5) -> QPixmap:
+    """
+    Рисует паттерн кирпичной кладки без использования кэша.
+
+    Args:
+        brick_color: Цвет кирпича
+        mortar_color: Цвет раствора между кирпичами
+        brick_width: Ширина кирпича
+        brick_height: Высота кирпича
+
+    Returns:
+        QPixmap: Паттерн размером два кирпича на два ряда
+    """
+    pattern = QPixmap(brick_width * 2, brick_height * 2)
+    pattern.fill(Qt.GlobalColor.transparent)
+
+    painter = QPainter(pattern)
+    painter.setBrush(QBrush(QColor(brick_color)))
+    painter.setPen(QPen(QColor(mortar_color), 2))
+
+    # Первый ряд кирпичей
+    painter.drawRect(0, 0, brick_width, brick_height)
+    painter.drawRect(brick_width, 0, brick_width, brick_height)
+
+    # Второй ряд кирпичей (со смещением)
+    painter.drawRect(brick_width // 2, brick_height, brick_width, brick_height)
+    painter.drawRect(brick_width // 2 + brick_width, brick_height, brick_width, brick_height)
+    painter.setPen(Qt.GlobalColor.transparent)
+    painter.drawRect(0, brick_height, brick_width // 2, brick_height)
+
+    painter.end()
+    return pattern
+
+
+def brick_pattern(brick_color: ColorLike, mortar_color: ColorLike,
+                  brick_width: int = 10, brick_height: int = 5) -> QPixmap:
+    """Возвращает общий паттерн кирпичной кладки для заданных цветов и размеров."""
+    key = (_color_key(brick_color), _color_key(mortar_color), brick_width, brick_height)
+
+    def create():
+        logger.debug(f"Создан паттерн кирпичной кладки {key}")
+        return render_brick_pattern(brick_color, mortar_color, brick_width, brick_height)
+    return _cached(_patterns, key, create)
+
+
+def brick_brush(brick_color: ColorLike, mortar_color: ColorLike,
+                brick_width: int = 10, brick_height: int = 5) -> QBrush:
+    """Возвращает общую кисть с паттерном кирпичной кладки."""
+    key = ("brick", _color_key(brick_color), _color_key(mortar_color), brick_width, brick_height)
+    return _cached(_brushes, key,
+                   lambda: QBrush(brick_pattern(brick_color, mortar_color, brick_width, brick_height)))
+
+
+def brush(color: ColorLike) -> QBrush:
+    """Возвращает общую сплошную кисть заданного цвета."""
+    key = ("solid", _color_key(color))
+    return _cached(_brushes, key, lambda: QBrush(QColor(color)))
+
+
+def pen(color: ColorLike, width: float = 1, style: Qt.PenStyle = Qt.PenStyle.SolidLine,
+        cap: Qt.PenCapStyle = Qt.PenCapStyle.SquareCap) -> QPen:
+    """Возвращает общее перо заданного цвета, толщины, стиля и формы концов."""
+    key = (_color_key(color), float(width), style, cap)
+
+    def create():
+        created = QPen(QColor(color), width)
+        created.setStyle(style)
+        created.setCapStyle(cap)
+        return created
+    return _cached(_pens, key, create)
+
+
+def stats() -> Dict[str, int]:
+    """Возвращает количество закэшированных паттернов, кистей и перьев."""
+    return {"patterns": len(_patterns), "brushes": len(_brushes), "pens": len(_pens)}
+
+
+def clear():
+    """Очищает кэш (например, в тестах)."""
+    _patterns.clear()
+    _brushes.clear()
+    _pens.clear()
@@ -0,0 +1,262 @@
+"""
+Модель сцены без зависимости от Qt.
+
+Стены, регионы, робот и стартовая позиция хранятся в компактных записях
+со __slots__, содержащих только числа и строки. Модель можно создавать,
+проверять, читать и записывать в XML без QApplication и MainWindow,
+а FieldWidget поддерживает её копию в актуальном состоянии
+(FieldWidget.scene_model) как представление своих графических объектов.
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from utils import geometry
+
+logger = logging.getLogger(__name__)
+
+# Цвет региона по умолчанию
+DEFAULT_REGION_COLOR = "#800000ff"
+
+
+class WallRecord:
+    """Стена: ID с префиксом 'w', координаты концов и толщина."""
+
+    __slots__ = ("id", "x1", "y1", "x2", "y2", "width")
+
+    def __init__(self, wall_id: str, x1: float, y1: float, x2: float, y2: float,
+                 width: float = geometry.DEFAULT_WALL_WIDTH):
+        self.id = wall_id
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+        self.width = width
+
+    def __eq__(self, other):
+        if not isinstance(other, WallRecord):
+            return NotImplemented
+        return ((self.id, self.x1, self.y1, self.x2, self.y2, self.width) ==
+                (other.id, other.x1, other.y1, other.x2, other.y2, other.width))
+
+    def __repr__(self):
+        return f"WallRecord({self.id!r}, {self.x1}, {self.y1}, {self.x2}, {self.y2}, width={self.width})"
+
+
+class RegionRecord:
+    """Прямоугольный регион: ID с префиксом 'r', положение и размеры в координатах сцены, цвет."""
+
+    __slots__ = ("id", "x", "y", "width", "height", "color")
+
+    def __init__(self, region_id: str, x: float, y: float, width: float, height: float,
+                 color: str = DEFAULT_REGION_COLOR):
+        self.id = region_id
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.color = color
+
+    @property
+    def rect(self) -> geometry.Rect:
+        return geometry.Rect(self.x, self.y, self.width, self.height)
+
+    def __eq__(self, other):
+        if not isinstance(other, RegionRecord):
+            return NotImplemented
+        return ((self.id, self.x, self.y, self.width, self.height, self.color) ==
+                (other.id, other.x, other.y, other.width, other.height, other.color))
+
+    def __repr__(self):
+        return (f"RegionRecord({self.id!r}, {self.x}, {self.y}, {self.width}, {self.height}, "
+                f"color={self.color!r})")
+
+
+class RobotRecord:
+    """Робот: левый верхний угол, направление в градусах и имя."""
+
+    __slots__ = ("x", "y", "direction", "name")
+
+    def __init__(self, x: float, y: float, direction: float = 0, name: str = ""):
+        self.x = x
+        self.y = y
+        self.direction = direction
+        self.name = name
+
+    def __eq__(self, other):
+        if not isinstance(other, RobotRecord):
+            return NotImplemented
+        return (self.x, self.y, self.direction, self.name) == (other.x, other.y, other.direction, other.name)
+
+    def __repr__(self):
+        return f"RobotRecord({self.x}, {self.y}, direction={self.direction}, name={self.name!r})"
+
+
+class StartPositionRecord:
+    """Стартовая позиция: координаты центра и направление в градусах."""
+
+    __slots__ = ("x", "y", "direction")
+
+    def __init__(self, x: float, y: float, direction: float = 0):
+        self.x = x
+        self.y = y
+        self.direction = direction
+
+    def __eq__(self, other):
+        if not isinstance(other, StartPositionRecord):
+            return NotImplemented
+        return (self.x, self.y, self.direction) == (other.x, other.y, other.direction)
+
+    def __repr__(self):
+        return f"StartPositionRecord({self.x}, {self.y}, direction={self.direction})"
+
+
+class SceneModel:
+    """
+    Состояние сцены: размеры, стены и регионы по ID, робот и стартовая позиция.
+
+    Стены и регионы хранятся в словарях, сохраняющих порядок добавления,
+    поэтому экспорт модели выдает объекты в том же порядке, что и сцена.
+    Счетчик revision увеличивается при каждом изменении стен и регионов,
+    по нему кэши отрисовки (например, запеченный слой поля) узнают об изменениях.
+    """
+
+    def __init__(self, scene_width: float = 1300, scene_height: float = 1000):
+        """
+        Args:
+            scene_width: Ширина сцены
+            scene_height: Высота сцены
+        """
+        self.scene_width = scene_width
+        self.scene_height = scene_height
+        self.walls: Dict[str, WallRecord] = {}
+        self.regions: Dict[str, RegionRecord] = {}
+        self.robot: Optional[RobotRecord] = None
+        self.start_position: Optional[StartPositionRecord] = None
+        self.revision = 0
+
+    def __len__(self) -> int:
+        return len(self.walls) + len(self.regions)
+
+    def clear(self):
+        """Удаляет все объекты, сохраняя размеры сцены."""
+        self.walls.clear()
+        self.regions.clear()
+        self.revision += 1
+        self.robot = None
+        self.start_position = None
+
+    def set_wall(self, record: WallRecord):
+        """Добавляет стену или заменяет стену с тем же ID."""
+        self.walls[record.id] = record
+        self.revision += 1
+
+    def remove_wall(self, wall_id: str) -> Optional[WallRecord]:
+        """Удаляет стену по ID и возвращает её запись (None, если стены нет)."""
+        self.revision += 1
+        return self.walls.pop(wall_id, None)
+
+    def rename_wall(self, old_id: str, new_id: str):
+        """Меняет ID стены, сохраняя её место в порядке объектов."""
+        self.walls = _renamed(self.walls, old_id, new_id)
+        self.revision += 1
+
+    def set_region(self, record: RegionRecord):
+        """Добавляет регион или заменяет регион с тем же ID."""
+        self.regions[record.id] = record
+        self.revision += 1
+
+    def remove_region(self, region_id: str) -> Optional[RegionRecord]:
+        """Удаляет регион по ID и возвращает его запись (None, если региона нет)."""
+        self.revision += 1
+        return self.regions.pop(region_id, None)
+
+    def rename_region(self, old_id: str, new_id: str):
+        """Меняет ID региона, сохраняя его место в порядке объектов."""
+        self.regions = _renamed(self.regions, old_id, new_id)
+        self.revision += 1
+
+    def validate(self) -> List[Tuple[str, str]]:
+        """
+        Проверяет объекты на выход за границы сцены и пересечение стен с роботом.
+
+        Returns:
+            list: Пары (ID объекта, описание проблемы); пустой список, если проблем нет
+        """
+        width, height = self.scene_width, self.scene_height
+        issues = []
+
+        robot_rect = None
+        if self.robot is not None:
+            if not geometry.robot_within_bounds(self.robot.x, self.robot.y, width, height):
+                issues.append(("robot", "робот выходит за границы сцены"))
+            robot_rect = geometry.robot_rect(self.robot.x, self.robot.y)
+
+        for wall in self.walls.values():
+            if not geometry.segment_within_bounds(wall.x1, wall.y1, wall.x2, wall.y2, width, height):
+                issues.append((wall.id, "стена выходит за границы сцены"))
+            if robot_rect is not None and geometry.thick_segment_intersects_rect(
+                    wall.x1, wall.y1, wall.x2, wall.y2, robot_rect, wall.width):
+                issues.append((wall.id, "стена пересекается с роботом"))
+
+        for region in self.regions.values():
+            if not geometry.rect_within_bounds(region.rect, width, height):
+                issues.append((region.id, "регион выходит за границы сцены"))
+
+        start = self.start_position
+        if start is not None and not geometry.start_position_within_bounds(start.x, start.y, width, height):
+            issues.append(("startPosition", "стартовая позиция выходит за границы сцены"))
+
+        return issues
+
+    @classmethod
+    def from_scene_data(cls, data) -> "SceneModel":
+        """
+        Создает модель из данных сцены в формате XMLHandler.parse_xml.
+
+        Прямоугольники регионов и позиция робота читаются через методы
+        x(), y(), width(), height(), поэтому подходят и QRectF/QPointF.
+
+        Args:
+            data: Словарь с ключами scene_width, scene_height, walls, regions, robot, start_position
+
+        Returns:
+            SceneModel: Новая модель
+        """
+        model = cls(data.get("scene_width", 1300), data.get("scene_height", 1000))
+
+        for wall_data in data.get("walls") or []:
+            (x1, y1), (x2, y2) = wall_data["begin"], wall_data["end"]
+            model.set_wall(WallRecord(f"w{wall_data['id']}", x1, y1, x2, y2))
+
+        for region_data in data.get("regions") or []:
+            rect = region_data["rect"]
+            model.set_region(RegionRecord(f"r{region_data['id']}", rect.x(), rect.y(),
+                                          rect.width(), rect.height(),
+                                          region_data.get("color") or DEFAULT_REGION_COLOR))
+
+        robot_data = data.get("robot")
+        if robot_data:
+            position = robot_data["position"]
+            model.robot = RobotRecord(position.x(), position.y(),
+                                      robot_data.get("direction", 0), robot_data.get("name", ""))
+
+        start_data = data.get("start_position")
+        if start_data:
+            model.start_position = StartPositionRecord(start_data["x"], start_data["y"],
+                                                       start_data.get("direction", 0))
+
+        return model
+
+
+def _renamed(records, old_id, new_id):
+    """Возвращает копию словаря записей, где old_id заменен на new_id с сохранением порядка."""
+    if old_id not in records:
+        return records
+    renamed = {}
+    for record_id, record in records.items():
+        if record_id == old_id:
+            record.id = new_id
+            record_id = new_id
+        renamed[record_id] = record
+    return renamed
@@ -0,0 +1,138 @@
+"""
+Пространственный индекс для отрезков (стен) на основе равномерной сетки.
+
+Индекс не зависит от Qt и хранит только ограничивающие прямоугольники
+отрезков, поэтому его можно использовать как в FieldWidget, так и
+в безголовых (headless) проверках сцены.
+"""
+
+from math import floor
+from typing import Any, Dict, Hashable, Iterable, List, Set, Tuple
+
+Cell = Tuple[int, int]
+Bounds = Tuple[float, float, float, float]
+
+
+class SegmentGridIndex:
+    """
+    Равномерная сетка ячеек, в каждой из которых хранятся объекты,
+    чьи ограничивающие прямоугольники её пересекают.
+
+    Запрос по прямоугольнику возвращает только кандидатов из затронутых
+    ячеек; точную проверку пересечения выполняет вызывающий код.
+    """
+
+    def __init__(self, cell_size: float = 100):
+        """
+        Args:
+            cell_size: Размер ячейки сетки в координатах сцены
+        """
+        if cell_size <= 0:
+            raise ValueError(f"Размер ячейки должен быть положительным: {cell_size}")
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, Set[Any]] = {}
+        self._item_cells: Dict[Any, List[Cell]] = {}
+        self._item_bounds: Dict[Any, Bounds] = {}
+
+    def __len__(self) -> int:
+        return len(self._item_cells)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._item_cells
+
+    def _cell_range(self, left: float, top: float, right: float, bottom: float):
+        """Возвращает диапазоны индексов ячеек, покрывающих прямоугольник."""
+        size = self.cell_size
+        return (
+            range(floor(left / size), floor(right / size) + 1),
+            range(floor(top / size), floor(bottom / size) + 1),
+        )
+
+    def insert(self, item: Hashable, x1: float, y1: float, x2: float, y2: float, padding: float = 0):
+        """
+        Добавляет отрезок в индекс.
+
+        Args:
+            item: Объект, связанный с отрезком (например, стена)
+            x1, y1, x2, y2: Координаты концов отрезка
+            padding: Расширение ограничивающего прямоугольника (половина толщины стены)
+        """
+        if item in self._item_cells:
+            self.remove(item)
+
+        bounds = (
+            min(x1, x2) - padding,
+            min(y1, y2) - padding,
+            max(x1, x2) + padding,
+            max(y1, y2) + padding,
+        )
+        xs, ys = self._cell_range(*bounds)
+        cells = [(cx, cy) for cx in xs for cy in ys]
+        for cell in cells:
+            bucket = self._cells.get(cell)
+            if bucket is None:
+                bucket = self._cells[cell] = set()
+            bucket.add(item)
+
+        self._item_cells[item] = cells
+        self._item_bounds[item] = bounds
+
+    def update(self, item: Hashable, x1: float, y1: float, x2: float, y2: float, padding: float = 0):
+        """Перемещает отрезок в индексе (эквивалентно remove + insert)."""
+        self.insert(item, x1, y1, x2, y2, padding)
+
+    def remove(self, item: Hashable) -> bool:
+        """
+        Удаляет объект из индекса.
+
+        Returns:
+            bool: True, если объект был в индексе
+        """
+        cells = self._item_cells.pop(item, None)
+        if cells is None:
+            return False
+        del self._item_bounds[item]
+        for cell in cells:
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(item)
+                if not bucket:
+                    del self._cells[cell]
+        return True
+
+    def clear(self):
+        """Очищает индекс."""
+        self._cells.clear()
+        self._item_cells.clear()
+        self._item_bounds.clear()
+
+    def query_rect(self, left: float, top: float, right: float, bottom: float) -> Set[Any]:
+        """
+        Возвращает объекты, ограничивающие прямоугольники которых
+        пересекают заданный прямоугольник.
+
+        Args:
+            left, top, right, bottom: Границы прямоугольника запроса
+
+        Returns:
+            set: Множество объектов-кандидатов
+        """
+        result = set()
+        xs, ys = self._cell_range(left, top, right, bottom)
+        cells = self._cells
+        for cx in xs:
+            for cy in ys:
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    result.update(bucket)
+
+        bounds = self._item_bounds
+        return {
+            item for item in result
+            if not (bounds[item][2] < left or bounds[item][0] > right or
+                    bounds[item][3] < top or bounds[item][1] > bottom)
+        }
+
+    def items(self) -> Iterable[Any]:
+        """Возвращает все объекты индекса."""
+        return self._item_cells.keys()
@@ -0,0 +1,106 @@
+"""
+Кэш SVG-ресурсов.
+
+SVG-файл разбирается один раз за процесс (один QSvgRenderer на файл),
+а растровые изображения хранятся по ключу (путь, размер, device pixel ratio).
+Пути разрешаются относительно корня проекта, а не текущего рабочего каталога,
+поэтому загрузка не зависит от того, откуда запущено приложение.
+
+Возвращаемые QPixmap общие для всего процесса - их нельзя изменять на месте.
+"""
+
+import logging
+import os
+from typing import Dict, Optional, Tuple
+
+from PyQt6.QtCore import QRectF, Qt
+from PyQt6.QtGui import QPainter, QPixmap
+from PyQt6.QtSvg import QSvgRenderer
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_renderers: Dict[str, Optional[QSvgRenderer]] = {}
+_pixmaps: Dict[Tuple[str, int, int, float], QPixmap] = {}
+
+
+def resource_path(path: str) -> str:
+    """Возвращает абсолютный путь к ресурсу относительно корня проекта."""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(PROJECT_ROOT, path)
+
+
+def renderer(path: str) -> Optional[QSvgRenderer]:
+    """
+    Возвращает общий рендерер SVG-файла, разбирая файл только при первом обращении.
+
+    Args:
+        path: Путь к SVG-файлу (абсолютный или относительно корня проекта)
+
+    Returns:
+        QSvgRenderer или None, если файл не удалось загрузить
+    """
+    full_path = resource_path(path)
+    if full_path not in _renderers:
+        svg_renderer = QSvgRenderer(full_path)
+        if svg_renderer.isValid():
+            logger.debug(f"SVG загружен: {full_path}")
+        else:
+            logger.warning(f"Не удалось загрузить SVG: {full_path}")
+            svg_renderer = None
+        # Неудачная загрузка тоже кэшируется, чтобы не обращаться к диску повторно
+        _renderers[full_path] = svg_renderer
+    return _renderers[full_path]
+
+
+def pixmap(path: str, width: int, height: int, device_pixel_ratio: float = 1.0) -> Optional[QPixmap]:
+    """
+    Возвращает растровое изображение SVG заданного логического размера.
+
+    Изображение рисуется в width * device_pixel_ratio на height * device_pixel_ratio
+    физических пикселей, а его devicePixelRatio устанавливается так, что
+    логический размер остается width x height.
+
+    Args:
+        path: Путь к SVG-файлу (абсолютный или относительно корня проекта)
+        width: Логическая ширина изображения
+        height: Логическая высота изображения
+        device_pixel_ratio: Отношение физических пикселей к логическим
+
+    Returns:
+        QPixmap или None, если SVG не удалось загрузить
+    """
+    device_pixel_ratio = round(float(device_pixel_ratio), 2)
+    key = (resource_path(path), width, height, device_pixel_ratio)
+    cached = _pixmaps.get(key)
+    if cached is not None:
+        return cached
+
+    svg_renderer = renderer(path)
+    if svg_renderer is None:
+        return None
+
+    result = QPixmap(max(1, round(width * device_pixel_ratio)), max(1, round(height * device_pixel_ratio)))
+    result.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(result)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    svg_renderer.render(painter, QRectF(0, 0, result.width(), result.height()))
+    painter.end()
+    result.setDevicePixelRatio(device_pixel_ratio)
+
+    _pixmaps[key] = result
+    logger.debug(f"Растеризован SVG {key}")
+    return result
+
+
+def stats() -> Dict[str, int]:
+    """Возвращает количество закэшированных рендереров и изображений."""
+    return {"renderers": len(_renderers), "pixmaps": len(_pixmaps)}
+
+
+def clear():
+    """Очищает кэш (например, в тестах)."""
+    _renderers.clear()
+    _pixmaps.clear()
@@ -0,0 +1,222 @@
+"""
+Стек отмены и повтора действий без зависимости от Qt.
+
+Команды хранят только изменения (дельты), а не снимки сцены: для каждого
+измененного объекта - его ID и кортежи состояния до и после изменения
+(координаты концов стены, прямоугольник и цвет региона, положение робота).
+Состояние None означает, что объекта нет, поэтому добавление и удаление
+записываются так же, как изменение. Память стека растет с размером правки,
+а не с размером сцены.
+
+Команды применяются к цели (FieldWidget) через два метода:
+    apply_item_state(kind, item_id, state) - приводит объект к состоянию state
+    apply_item_rename(kind, old_id, new_id) - меняет ID объекта
+"""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+# Максимальное количество команд в стеке по умолчанию
+DEFAULT_UNDO_LIMIT = 500
+# Правки одного свойства объекта, сделанные с меньшим интервалом (секунды),
+# объединяются в одну команду (например, прокрутка значения в поле ввода)
+MERGE_INTERVAL = 1.0
+
+
+class UndoCommand:
+    """Базовая команда стека отмены."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str = ""):
+        self.text = text
+
+    def undo(self, target):
+        raise NotImplementedError
+
+    def redo(self, target):
+        raise NotImplementedError
+
+    def merge(self, other: "UndoCommand") -> bool:
+        """Пытается поглотить следующую команду; возвращает True, если удалось."""
+        return False
+
+    def is_empty(self) -> bool:
+        """Возвращает True, если команда ничего не меняет."""
+        return False
+
+    def __len__(self) -> int:
+        """Количество изменяемых объектов."""
+        return 1
+
+
+class StateChange(UndoCommand):
+    """
+    Изменение состояния одного объекта.
+
+    Args:
+        kind: Тип объекта ('wall', 'region', 'robot', 'start_position')
+        item_id: ID объекта
+        before: Кортеж состояния до изменения (None - объекта не было)
+        after: Кортеж состояния после изменения (None - объект удален)
+        merge_key: Ключ объединения; команды с одинаковыми kind, item_id и merge_key,
+            записанные с интервалом меньше MERGE_INTERVAL, объединяются
+    """
+
+    __slots__ = ("kind", "item_id", "before", "after", "merge_key", "timestamp")
+
+    def __init__(self, kind: str, item_id: Optional[str], before: Optional[Tuple], after: Optional[Tuple],
+                 text: str = "", merge_key: Optional[str] = None):
+        super().__init__(text)
+        self.kind = kind
+        self.item_id = item_id
+        self.before = before
+        self.after = after
+        self.merge_key = merge_key
+        self.timestamp = time.monotonic()
+
+    def undo(self, target):
+        target.apply_item_state(self.kind, self.item_id, self.before)
+
+    def redo(self, target):
+        target.apply_item_state(self.kind, self.item_id, self.after)
+
+    def merge(self, other: UndoCommand) -> bool:
+        if (self.merge_key is None or not isinstance(other, StateChange)
+                or (other.kind, other.item_id, other.merge_key) != (self.kind, self.item_id, self.merge_key)
+                or other.timestamp - self.timestamp > MERGE_INTERVAL):
+            return False
+        self.after = other.after
+        self.timestamp = other.timestamp
+        return True
+
+    def is_empty(self) -> bool:
+        return self.before == self.after
+
+    def __repr__(self):
+        return f"StateChange({self.kind!r}, {self.item_id!r}, {self.before!r} -> {self.after!r})"
+
+
+class RenameChange(UndoCommand):
+    """Изменение ID объекта."""
+
+    __slots__ = ("kind", "old_id", "new_id")
+
+    def __init__(self, kind: str, old_id: str, new_id: str, text: str = ""):
+        super().__init__(text)
+        self.kind = kind
+        self.old_id = old_id
+        self.new_id = new_id
+
+    def undo(self, target):
+        target.apply_item_rename(self.kind, self.new_id, self.old_id)
+
+    def redo(self, target):
+        target.apply_item_rename(self.kind, self.old_id, self.new_id)
+
+    def is_empty(self) -> bool:
+        return self.old_id == self.new_id
+
+
+class CommandGroup(UndoCommand):
+    """Несколько команд, которые отменяются и повторяются как одна."""
+
+    __slots__ = ("commands",)
+
+    def __init__(self, text: str = "", commands: Optional[List[UndoCommand]] = None):
+        super().__init__(text)
+        self.commands = commands or []
+
+    def undo(self, target):
+        for command in reversed(self.commands):
+            command.undo(target)
+
+    def redo(self, target):
+        for command in self.commands:
+            command.redo(target)
+
+    def is_empty(self) -> bool:
+        return all(command.is_empty() for command in self.commands)
+
+    def __len__(self) -> int:
+        return sum(len(command) for command in self.commands)
+
+
+class UndoStack:
+    """
+    Стек отмены и повтора.
+
+    Новая команда удаляет историю повтора; при превышении limit
+    самые старые команды отбрасываются.
+    """
+
+    def __init__(self, limit: int = DEFAULT_UNDO_LIMIT):
+        self._undo = deque(maxlen=limit if limit > 0 else None)
+        self._redo = []
+        self._groups = []
+
+    def push(self, command: UndoCommand):
+        """Добавляет уже выполненную команду в стек."""
+        if command.is_empty():
+            return
+        if self._groups:
+            self._groups[-1].commands.append(command)
+            return
+        self._redo.clear()
+        if self._undo and self._undo[-1].merge(command):
+            if self._undo[-1].is_empty():
+                self._undo.pop()
+            return
+        self._undo.append(command)
+
+    @contextmanager
+    def group(self, text: str = ""):
+        """Объединяет все команды, добавленные внутри блока with, в одну."""
+        self._groups.append(CommandGroup(text))
+        try:
+            yield
+        finally:
+            group = self._groups.pop()
+            if group.commands:
+                self.push(group)
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def peek_undo(self) -> Optional[UndoCommand]:
+        """Возвращает команду, которая будет отменена следующей."""
+        return self._undo[-1] if self._undo else None
+
+    def peek_redo(self) -> Optional[UndoCommand]:
+        """Возвращает команду, которая будет повторена следующей."""
+        return self._redo[-1] if self._redo else None
+
+    def undo(self, target) -> Optional[UndoCommand]:
+        """Отменяет последнюю команду; возвращает ее или None, если отменять нечего."""
+        if not self._undo:
+            return None
+        command = self._undo.pop()
+        command.undo(target)
+        self._redo.append(command)
+        return command
+
+    def redo(self, target) -> Optional[UndoCommand]:
+        """Повторяет последнюю отмененную команду; возвращает ее или None."""
+        if not self._redo:
+            return None
+        command = self._redo.pop()
+        command.redo(target)
+        self._undo.append(command)
+        return command
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+
+    def __len__(self) -> int:
+        return len(self._undo)
@@ -4,21 +4,83 @@
 """
 
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
 import logging
 import re
 from PyQt6.QtCore import QRectF, QPointF, QLineF
+from utils.scene_model import SceneModel, WallRecord, RegionRecord, RobotRecord, StartPositionRecord
 
 # Настройка логгера
 logger = logging.getLogger(__name__)
 
 # Версия формата XML
 XML_FORMAT_VERSION = "1.0"
+# ID стартовой позиции (она всегда одна)
+START_POSITION_ID = "startPosition"
 
 class XMLValidationError(Exception):
     """Исключение, вызываемое при ошибке валидации XML"""
     pass
 
+
+def _escape_attribute(value):
+    """Экранирует значение атрибута так же, как minidom."""
+    return (str(value).replace("&", "&amp;").replace("<", "&lt;")
+            .replace("\"", "&quot;").replace(">", "&gt;"))
+
+
+def _format_attributes(attributes):
+    """Форматирует список пар (имя, значение) в строку атрибутов."""
+    return "".join(f' {name}="{_escape_attribute(value)}"' for name, value in attributes)
+
+
+def _start_tag(tag, attributes, level):
+    """Возвращает открывающий тег с отступом."""
+    return f"{'  ' * level}<{tag}{_format_attributes(attributes)}>\n"
+
+
+def _empty_tag(tag, attributes, level):
+    """Возвращает пустой элемент с отступом."""
+    return f"{'  ' * level}<{tag}{_format_attributes(attributes)}/>\n"
+
+
+def _end_tag(tag, level):
+    """Возвращает закрывающий тег с отступом."""
+    return f"{'  ' * level}</{tag}>\n"
+
+
+def _container(tag, children_attributes, child_tag, level):
+    """
+    Генерирует элемент-контейнер с пустыми дочерними элементами.
+    
+    Дочерние элементы, для которых вместо атрибутов передан None, пропускаются.
+    Контейнер без дочерних элементов записывается как <tag/>.
+    """
+    empty = True
+    for attributes in children_attributes:
+        if attributes is None:
+            continue
+        if empty:
+            yield _start_tag(tag, (), level)
+            empty = False
+        yield _empty_tag(child_tag, attributes, level + 1)
+    
+    if empty:
+        yield _empty_tag(tag, (), level)
+    else:
+        yield _end_tag(tag, level)
+
+
+def _line_coords(line):
+    """Возвращает координаты концов QLineF."""
+    return line.x1(), line.y1(), line.x2(), line.y2()
+
+
+def _region_record(region):
+    """Возвращает запись модели для региона сцены по ограничивающему прямоугольнику его контура."""
+    rect = region.path().boundingRect()
+    return RegionRecord(region.id, rect.x(), rect.y(), rect.width(), rect.height(), region.color)
+
+
 class XMLHandler:
     """
     Класс для обработки XML-файлов: экспорт, импорт и валидация.
@@ -44,6 +106,14 @@ class XMLHandler:
         # Словарь для хранения уникальных идентификаторов
         self.ids = {}
         
+        # Сообщения об объектах, пропущенных при последнем разборе XML
+        self.skipped = []
+        
+    def _skip(self, message):
+        """Запоминает и логирует объект, пропущенный при разборе"""
+        self.skipped.append(message)
+        logger.warning(message)
+        
     def _reset_ids(self):
         """Сбрасывает словарь идентификаторов"""
         self.ids = {}
@@ -198,7 +268,27 @@ class XMLHandler:
         try:
             x1, y1 = self._parse_coords(begin_coords)
             x2, y2 = self._parse_coords(end_coords)
+        except ValueError as e:
+            raise XMLValidationError(f"Ошибка при проверке стены: {e}")
+            
+        return self.validate_wall_values(x1, y1, x2, y2, id_str)
+    
+    def validate_wall_values(self, x1, y1, x2, y2, id_str):
+        """
+        Проверяет корректность числовых данных стены.
+        
+        Args:
+            x1, y1: Координаты начала стены
+            x2, y2: Координаты конца стены
+            id_str: Идентификатор стены
+            
+        Returns:
+            tuple: ((x1, y1), (x2, y2), id_int) - координаты и идентификатор
             
+        Raises:
+            XMLValidationError: Если данные некорректны
+        """
+        try:
             # Проверяем, что координаты в допустимом диапазоне
             self.validate_coordinates(x1, y1)
             self.validate_coordinates(x2, y2)
@@ -208,7 +298,7 @@ class XMLHandler:
             
             # Проверяем, что точки не совпадают
             if x1 == x2 and y1 == y2:
-                raise XMLValidationError(f"Начало и конец стены не могут совпадать: {begin_coords} and {end_coords}")
+                raise XMLValidationError(f"Начало и конец стены не могут совпадать: {x1}:{y1} and {x2}:{y2}")
                 
             return (x1, y1), (x2, y2), int(id_str)
             
@@ -238,7 +328,30 @@ class XMLHandler:
             y = float(y_str)
             width = float(width_str)
             height = float(height_str)
+        except ValueError as e:
+            raise XMLValidationError(f"Ошибка при проверке региона: {e}")
+            
+        return self.validate_region_values(x, y, width, height, id_str, color_str)
+    
+    def validate_region_values(self, x, y, width, height, id_str, color_str=None):
+        """
+        Проверяет корректность числовых данных региона.
+        
+        Args:
+            x: Координата X левого верхнего угла
+            y: Координата Y левого верхнего угла
+            width: Ширина региона
+            height: Высота региона
+            id_str: Идентификатор региона
+            color_str: Цвет региона (опционально)
+            
+        Returns:
+            tuple: (x, y, width, height, id_int, color) - параметры региона
             
+        Raises:
+            XMLValidationError: Если данные некорректны
+        """
+        try:
             # Проверяем, что координаты в допустимом диапазоне
             self.validate_coordinates(x, y)
             self.validate_coordinates(x + width, y + height)
@@ -329,124 +442,184 @@ class XMLHandler:
         Raises:
             XMLValidationError: Если данные не проходят валидацию
         """
-        self._reset_ids()  # Сбрасываем словарь идентификаторов
+        return "".join(self.iter_xml(walls, regions, robot_model, start_position))
+    
+    def write_xml(self, file, walls, regions, robot_model=None, start_position=None):
+        """
+        Записывает форматированный XML сцены в файловый объект по частям.
         
-        # Создаем корневой элемент
-        root = ET.Element("root")
-        root.set("version", XML_FORMAT_VERSION)
-        
-        # Добавляем элемент размера сцены
-        world = ET.SubElement(root, "world")
-        world.set("width", str(self.scene_width))
-        world.set("height", str(self.scene_height))
-        
-        # Добавляем элемент для стен
-        walls_element = ET.SubElement(root, "walls")
-        
-        # Добавляем каждую стену
-        for wall in walls:
-            wall_element = ET.SubElement(walls_element, "wall")
-            
-            # Получаем числовой ID стены (без префикса 'w')
-            wall_id = self.extract_numeric_id(wall.id, "wall")
-            
-            # Получаем координаты стены
-            line = wall.line()
-            
-            # Проверяем, что ID и координаты валидны
-            try:
-                (x1, y1), (x2, y2), _ = self.validate_wall(
-                    f"{line.x1()}:{line.y1()}", 
-                    f"{line.x2()}:{line.y2()}",
-                    str(wall_id)
-                )
-            except XMLValidationError as e:
-                logger.warning(f"Стена {wall.id} не прошла валидацию: {e}")
-                continue
-                
-            # Добавляем атрибуты стены
-            wall_element.set("id", str(wall_id))
-            wall_element.set("begin", f"{x1}:{y1}")
-            wall_element.set("end", f"{x2}:{y2}")
-        
-        # Добавляем элемент для регионов
-        regions_element = ET.SubElement(root, "regions")
-        
-        # Добавляем каждый регион
-        for region in regions:
-            region_element = ET.SubElement(regions_element, "region")
-            
-            # Получаем числовой ID региона (без префикса 'r')
-            region_id = self.extract_numeric_id(region.id, "region")
-            
-            # Получаем координаты и размеры региона
-            rect = region.path().boundingRect()
-            
-            # Проверяем, что ID и координаты валидны
-            try:
-                x, y, width, height, _, color = self.validate_region(
-                    str(rect.x()),
-                    str(rect.y()),
-                    str(rect.width()),
-                    str(rect.height()),
-                    str(region_id),
-                    region.color
-                )
-            except XMLValidationError as e:
-                logger.warning(f"Регион {region.id} не прошел валидацию: {e}")
-                continue
-                
-            # Добавляем атрибуты региона
-            region_element.set("id", str(region_id))
-            region_element.set("x", str(x))
-            region_element.set("y", str(y))
-            region_element.set("width", str(width))
-            region_element.set("height", str(height))
+        Args:
+            file: Текстовый файловый объект с методом write
+            walls: Список стен
+            regions: Список регионов
+            robot_model: Объект робота
+            start_position: Объект стартовой позиции
             
-            # Добавляем цвет, если он задан
-            if color:
-                region_element.set("color", color)
+        Raises:
+            XMLValidationError: Если данные не проходят валидацию
+        """
+        for chunk in self.iter_xml(walls, regions, robot_model, start_position):
+            file.write(chunk)
+    
+    def iter_xml(self, walls, regions, robot_model=None, start_position=None):
+        """
+        Генерирует форматированный XML сцены по частям, не строя дерево в памяти.
         
-        # Добавляем элемент для роботов (если есть)
-        if robot_model:
-            robots_element = ET.SubElement(root, "robots")
-            robot_element = ET.SubElement(robots_element, "robot")
+        Формат вывода совпадает с результатом minidom.toprettyxml(indent="  "):
+        отступ в два пробела, пустые элементы записываются как <tag/>.
+        Объекты, не прошедшие валидацию, пропускаются с предупреждением в логе.
+        
+        Args:
+            walls: Список стен
+            regions: Список регионов
+            robot_model: Объект робота
+            start_position: Объект стартовой позиции
             
-            # ID робота всегда 1
-            robot_id = 1
+        Yields:
+            str: Очередная часть XML
             
-            # Получаем позицию и направление робота
+        Raises:
+            XMLValidationError: Если идентификатор объекта имеет неверный формат
+        """
+        walls = (WallRecord(wall.id, *_line_coords(wall.line())) for wall in walls)
+        regions = (_region_record(region) for region in regions)
+        robot = None
+        if robot_model:
             robot_pos = robot_model.pos()
+            robot = RobotRecord(robot_pos.x(), robot_pos.y(), robot_model.direction,
+                                getattr(robot_model, "name", ""))
+        start = None
+        if start_position:
+            start_pos = start_position.pos()
+            start = StartPositionRecord(start_pos.x(), start_pos.y(), start_position.direction())
+            
+        yield from self._iter_records_xml(walls, regions, robot, start)
+        
+    def iter_model_xml(self, model):
+        """
+        Генерирует форматированный XML модели сцены по частям.
+        
+        Не требует Qt-объектов сцены. Размеры сцены и границы валидации
+        берутся из обработчика, поэтому его стоит создавать с размерами модели.
+        
+        Args:
+            model: Модель сцены (SceneModel)
             
-            # Проверяем, что координаты валидны
-            try:
-                x, y = self.validate_robot(f"{robot_pos.x()}:{robot_pos.y()}")
-            except XMLValidationError as e:
-                logger.warning(f"Робот {robot_model.id} не прошел валидацию: {e}")
-            else:
-                # Добавляем атрибуты робота
-                robot_element.set("id", str(robot_id))
-                robot_element.set("position", f"{x}:{y}")
-                robot_element.set("direction", str(robot_model.direction))
-                
-                # Добавляем имя робота, если оно задано
-                if hasattr(robot_model, 'name') and robot_model.name:
-                    robot_element.set("name", robot_model.name)
-                
-                # Добавляем стартовую позицию, если она есть
+        Yields:
+            str: Очередная часть XML
+            
+        Raises:
+            XMLValidationError: Если идентификатор объекта имеет неверный формат
+        """
+        yield from self._iter_records_xml(model.walls.values(), model.regions.values(),
+                                          model.robot, model.start_position)
+        
+    def generate_model_xml(self, model):
+        """
+        Генерирует XML модели сцены.
+        
+        Args:
+            model: Модель сцены (SceneModel)
+            
+        Returns:
+            str: Форматированный XML
+        """
+        return "".join(self.iter_model_xml(model))
+        
+    def _iter_records_xml(self, walls, regions, robot, start_position):
+        """Генерирует XML по записям модели сцены (см. iter_xml)."""
+        self._reset_ids()  # Сбрасываем словарь идентификаторов
+        
+        yield '<?xml version="1.0" ?>\n'
+        yield _start_tag("root", [("version", XML_FORMAT_VERSION)], 0)
+        yield _empty_tag("world", [("width", self.scene_width), ("height", self.scene_height)], 1)
+        
+        yield from _container("walls", map(self._wall_attributes, walls), "wall", 1)
+        yield from _container("regions", map(self._region_attributes, regions), "region", 1)
+        
+        # Добавляем элемент для роботов (если есть)
+        if robot:
+            robot_attributes = self._robot_attributes(robot)
+            if robot_attributes is not None:
+                yield _start_tag("robots", (), 1)
                 if start_position:
-                    start_pos_element = ET.SubElement(robot_element, "startPosition")
-                    start_pos_element.set("id", start_position.id)
-                    start_pos_element.set("x", str(int(start_position.pos().x())))
-                    start_pos_element.set("y", str(int(start_position.pos().y())))
-                    start_pos_element.set("direction", str(int(start_position.direction())))
+                    yield _start_tag("robot", robot_attributes, 2)
+                    yield _empty_tag("startPosition", [
+                        ("id", START_POSITION_ID),
+                        ("x", int(start_position.x)),
+                        ("y", int(start_position.y)),
+                        ("direction", int(start_position.direction)),
+                    ], 3)
+                    yield _end_tag("robot", 2)
+                else:
+                    yield _empty_tag("robot", robot_attributes, 2)
+                yield _end_tag("robots", 1)
+        
+        yield _end_tag("root", 0)
+    
+    def _check_representable(self, value):
+        """
+        Проверяет, что число записывается в формате координат "x:y" без экспоненты.
+        
+        Raises:
+            XMLValidationError: Если запись числа не будет прочитана при импорте
+        """
+        if value != 0 and not (1e-4 <= abs(value) < 1e16):
+            raise XMLValidationError(f"Некорректный формат координат: {value}")
+    
+    def _wall_attributes(self, wall):
+        """Возвращает атрибуты элемента стены или None, если стена не прошла валидацию."""
+        # Получаем числовой ID стены (без префикса 'w')
+        wall_id = self.extract_numeric_id(wall.id, "wall")
+        x1, y1, x2, y2 = wall.x1, wall.y1, wall.x2, wall.y2
+        
+        try:
+            for value in (x1, y1, x2, y2):
+                self._check_representable(value)
+            self.validate_wall_values(x1, y1, x2, y2, str(wall_id))
+        except XMLValidationError as e:
+            logger.warning(f"Стена {wall.id} не прошла валидацию: {e}")
+            return None
+            
+        return [("id", wall_id), ("begin", f"{x1}:{y1}"), ("end", f"{x2}:{y2}")]
+    
+    def _region_attributes(self, region):
+        """Возвращает атрибуты элемента региона или None, если регион не прошел валидацию."""
+        # Получаем числовой ID региона (без префикса 'r')
+        region_id = self.extract_numeric_id(region.id, "region")
         
-        # Преобразуем XML в строку с отступами
-        xml_str = ET.tostring(root, encoding='utf-8')
-        dom = minidom.parseString(xml_str)
-        formatted_xml = dom.toprettyxml(indent="  ")
+        try:
+            x, y, width, height, _, color = self.validate_region_values(
+                region.x, region.y, region.width, region.height, str(region_id), region.color
+            )
+        except XMLValidationError as e:
+            logger.warning(f"Регион {region.id} не прошел валидацию: {e}")
+            return None
+            
+        attributes = [("id", region_id), ("x", x), ("y", y), ("width", width), ("height", height)]
+        # Добавляем цвет, если он задан
+        if color:
+            attributes.append(("color", color))
+        return attributes
+    
+    def _robot_attributes(self, robot):
+        """Возвращает атрибуты элемента робота или None, если робот не прошел валидацию."""
+        x, y = robot.x, robot.y
         
-        return formatted_xml
+        try:
+            self._check_representable(x)
+            self._check_representable(y)
+            self.validate_coordinates(x, y)
+        except XMLValidationError as e:
+            logger.warning(f"Робот не прошел валидацию: {e}")
+            return None
+            
+        # ID робота всегда 1
+        attributes = [("id", 1), ("position", f"{x}:{y}"), ("direction", robot.direction)]
+        # Добавляем имя робота, если оно задано
+        if robot.name:
+            attributes.append(("name", robot.name))
+        return attributes
             
     def parse_xml(self, xml_content):
         """
@@ -483,6 +656,7 @@ class XMLHandler:
             
             # Сбрасываем словарь идентификаторов
             self._reset_ids()
+            self.skipped = []
             
             # Извлекаем данные о стенах
             walls_data = []
@@ -501,7 +675,7 @@ class XMLHandler:
                             "end": (x2, y2)
                         })
                     except XMLValidationError as e:
-                        logger.warning(f"Стена с ID {id_str} не прошла валидацию: {e}")
+                        self._skip(f"Стена с ID {id_str} не прошла валидацию: {e}")
             
             # Извлекаем данные о регионах
             regions_data = []
@@ -525,7 +699,7 @@ class XMLHandler:
                             "color": color
                         })
                     except XMLValidationError as e:
-                        logger.warning(f"Регион с ID {id_str} не прошел валидацию: {e}")
+                        self._skip(f"Регион с ID {id_str} не прошел валидацию: {e}")
             
             # Извлекаем данные о роботах
             robot_data = None
@@ -568,12 +742,12 @@ class XMLHandler:
                                     "direction": start_direction
                                 }
                             except XMLValidationError as e:
-                                logger.warning(f"Стартовая позиция не прошла валидацию: {e}")
+                                self._skip(f"Стартовая позиция не прошла валидацию: {e}")
                         
                     except XMLValidationError as e:
-                        logger.warning(f"Робот с ID {id_str} не прошел валидацию: {e}")
+                        self._skip(f"Робот с ID {id_str} не прошел валидацию: {e}")
                     except (ValueError, TypeError) as e:
-                        logger.warning(f"Ошибка при разборе данных робота с ID {id_str}: {e}")
+                        self._skip(f"Ошибка при разборе данных робота с ID {id_str}: {e}")
             
             return {
                 "scene_width": scene_width,
@@ -605,5 +779,22 @@ class XMLHandler:
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 return self.parse_xml(f.read())
-        except (IOError, FileNotFoundError) as e:
-            raise XMLValidationError(f"Ошибка при чтении файла: {e}") 
\ No newline at end of file
+        except OSError as e:
+            raise XMLValidationError(f"Ошибка при чтении файла: {e}")
+        except UnicodeDecodeError as e:
+            raise XMLValidationError(f"Файл не в кодировке UTF-8: {e}")
+            
+    def parse_scene_model(self, xml_content):
+        """
+        Парсит XML контент в модель сцены, не создавая объектов Qt-сцены.
+        
+        Args:
+            xml_content: Строка с XML контентом
+            
+        Returns:
+            SceneModel: Модель сцены
+            
+        Raises:
+            XMLValidationError: Если XML не проходит валидацию
+        """
+        return SceneModel.from_scene_data(self.parse_xml(xml_content))
@@ -0,0 +1,62 @@
+"""
+Фоновый разбор XML-файлов сцен.
+
+Чтение файла, разбор XML и валидация объектов выполняются в отдельном потоке,
+чтобы окно не зависало на больших файлах. Результат передается в поток
+интерфейса сигналом, а объекты на сцену добавляет FieldWidget.load_scene_chunked.
+"""
+
+import logging
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from utils.xml_handler import XMLHandler, XMLValidationError
+
+logger = logging.getLogger(__name__)
+
+
+class XMLParseThread(QThread):
+    """
+    Поток, читающий и разбирающий XML-файл сцены через XMLHandler.parse_xml.
+    
+    Сигналы:
+        parsed(dict): Данные сцены в формате XMLHandler.parse_xml
+        failed(str): Текст ошибки чтения или валидации
+    """
+    
+    parsed = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    
+    def __init__(self, file_path, scene_width, scene_height, parent=None):
+        """
+        Args:
+            file_path: Путь к XML-файлу
+            scene_width: Ширина сцены по умолчанию
+            scene_height: Высота сцены по умолчанию
+            parent: Родительский объект
+        """
+        super().__init__(parent)
+        self.file_path = file_path
+        self.scene_width = scene_width
+        self.scene_height = scene_height
+        
+    def run(self):
+        """Разбирает файл и испускает parsed или failed."""
+        try:
+            xml_handler = XMLHandler(scene_width=self.scene_width, scene_height=self.scene_height)
+            scene_data = xml_handler.load_from_file(self.file_path)
+        except XMLValidationError as e:
+            logger.error(f"Ошибка валидации XML: {e}")
+            self.failed.emit(str(e))
+            return
+        except Exception as e:
+            # Исключение, вышедшее из run(), PyQt6 превращает в аварийное завершение процесса
+            logger.error(f"Ошибка при разборе файла {self.file_path}: {e}", exc_info=True)
+            self.failed.emit(str(e))
+            return
+            
+        # Результат отмененного импорта никому не нужен
+        if self.isInterruptionRequested():
+            logger.debug(f"Разбор файла {self.file_path} отменен")
+            return
+        self.parsed.emit(scene_data)
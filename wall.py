@@ -1,18 +1,47 @@
-from PyQt6.QtWidgets import QGraphicsLineItem, QGraphicsEllipseItem, QGraphicsItem, QGraphicsRectItem
-from PyQt6.QtGui import QPixmap, QPainter, QPen, QBrush, QColor, QTransform
+from PyQt6.QtWidgets import QGraphicsLineItem, QGraphicsItem, QGraphicsRectItem
+from PyQt6.QtGui import QTransform, QPainterPath, QPolygonF
 from PyQt6.QtCore import Qt, QRectF, QLineF, QPointF
 from contextlib import contextmanager
 from hover_highlight import HoverHighlightMixin
+from utils import paint_cache, level_of_detail, item_cache
+from utils.id_allocator import IdAllocator
 import logging
 # Настройка логгера
-logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-class Wall(QGraphicsLineItem, HoverHighlightMixin):
-    _next_id = 1  # Счетчик для генерации уникальных ID
-    _existing_ids = set()  # Множество для хранения всех существующих ID
+class _BrickRectItem(QGraphicsRectItem):
+    """Тело стены в режиме items; при мелком масштабе заливается цветом кирпича без паттерна."""
+
+    def paint(self, painter, option, widget=None):
+        if not level_of_detail.simplified(painter, "walls"):
+            super().paint(painter, option, widget)
+            return
+        painter.fillRect(self.rect(), paint_cache.brush(self.parentItem().brick_color))
+
 
-    def __init__(self, p1, p2, wall_id=None, width=10, color="#ff0000", is_temp=False):
+class Wall(QGraphicsLineItem, HoverHighlightMixin):
+    # Распределитель ID для стен, созданных вне сцены (сцена передает свой)
+    default_id_allocator = IdAllocator("w")
+
+    # Параметры кирпичной кладки, общие для всех стен
+    brick_width = 10  # Ширина кирпича
+    brick_height = 5  # Высота кирпича
+    mortar_color = "#8b4513"  # Цвет раствора между кирпичами
+
+    # Режимы отрисовки стены
+    RENDER_MODE_ITEMS = "items"  # тело, маркеры и обводки - дочерние элементы сцены
+    RENDER_MODE_LIGHTWEIGHT = "lightweight"  # один элемент рисует всё сам в paint()
+    default_render_mode = RENDER_MODE_ITEMS
+
+    def __new__(cls, p1, p2, wall_id=None, width=10, color="#ff0000", render_mode=None, id_allocator=None):
+        # Облегченная стена создается как LightweightWall: Qt вызывает переопределенные на Python
+        # boundingRect и shape при каждом запросе геометрии (itemAt, индекс сцены), поэтому
+        # у стен режима items этих переопределений нет
+        if cls is Wall and (render_mode or Wall.default_render_mode) == Wall.RENDER_MODE_LIGHTWEIGHT:
+            cls = LightweightWall
+        return super().__new__(cls)
+
+    def __init__(self, p1, p2, wall_id=None, width=10, color="#ff0000", render_mode=None, id_allocator=None):
         """
         Инициализация стены.
         
@@ -22,40 +51,33 @@ class Wall(QGraphicsLineItem, HoverHighlightMixin):
             wall_id: Идентификатор стены (если None, будет сгенерирован)
             width: Толщина стены (по умолчанию 10)
             color: Цвет стены в HEX-формате
-            is_temp: Флаг, указывающий, является ли стена временной (для проверок)
+            render_mode: Режим отрисовки (RENDER_MODE_ITEMS или RENDER_MODE_LIGHTWEIGHT),
+                если None - используется Wall.default_render_mode
+            id_allocator: Распределитель ID сцены (если None - Wall.default_id_allocator)
         """
         super().__init__(p1.x(), p1.y(), p2.x(), p2.y())
         HoverHighlightMixin.__init__(self)
         
-        # Для временных стен не обновляем _existing_ids и не увеличиваем _next_id
-        self.is_temp = is_temp
-        
-        if wall_id:
-            self.id = wall_id
-            # Добавляем ID в множество только для не временных стен
-            if not is_temp:
-                Wall._existing_ids.add(self.id)
-        else:
-            if is_temp:
-                # Для временных стен генерируем ID, но не добавляем его в _existing_ids
-                self.id = f"temp_w{Wall._next_id}"
-            else:
-                # Для реальных стен генерируем ID и добавляем его в _existing_ids
-                self.id = f"w{Wall._next_id}"
-                Wall._next_id += 1
-                Wall._existing_ids.add(self.id)
-
-        self.highlight_rect = None  # Прямоугольник для выделения
+        # Занятый или некорректный wall_id заменяется новым
+        self.id_allocator = id_allocator if id_allocator is not None else Wall.default_id_allocator
+        self.id = self.id_allocator.acquire(wall_id)
+
+        self.render_mode = render_mode or Wall.default_render_mode
+        if self.render_mode not in (Wall.RENDER_MODE_ITEMS, Wall.RENDER_MODE_LIGHTWEIGHT):
+            raise ValueError(f"Неизвестный режим отрисовки стены: {self.render_mode}")
+        self.lightweight = self.render_mode == Wall.RENDER_MODE_LIGHTWEIGHT
+        # Облегченная стена рисует обводки выделения и наведения сама, без общих оверлеев
+        self.paints_own_highlight = self.lightweight
+        # Состояние выделения и подсветки для облегченного режима
+        self._selected = False
+        self._hover_visible = False
+
         self._updating = False  # Флаг для отслеживания состояния обновления
+        # Обработчик изменения геометрии (устанавливается сценой, например для пространственного индекса)
+        self.on_geometry_changed = None
 
         # Настройка внешнего вида стены
-        self.brick_width = 10  # Ширина кирпича
-        self.brick_height = 5  # Высота кирпича
-        self.brick_color = QColor(color)  # Цвет кирпича (кирпично-красный)
-        self.mortar_color = QColor("#8b4513")  # Цвет раствора между кирпичами
-
-        # Создаем паттерн для кирпичной стены
-        self.brick_pattern = self.create_brick_pattern()
+        self.brick_color = color  # Цвет кирпича (кирпично-красный)
 
         # Атрибуты стены
         self.stroke_color = "#ff000000"  # Цвет обводки (по умолчанию черный)
@@ -64,14 +86,22 @@ class Wall(QGraphicsLineItem, HoverHighlightMixin):
         # Инициализация подсветки при наведении должна происходить после установки атрибутов
         self.init_hover_highlight()
 
-        # Настройка пера
-        self.normal_pen = QPen(QColor(self.stroke_color), self.stroke_width)  # Паттерн для линии
-        self.highlight_pen = QPen(QColor("#00ff22")  , self.stroke_width+5)  # Контур при выделении
+        self.setZValue(10)
 
-        # Создаем прямоугольник с паттерном кирпичной стены
-        self.brick_rect = QGraphicsRectItem(self)
-        self.brick_rect.setBrush(QBrush(self.create_brick_pattern()))
-        self.brick_rect.setPen(QPen(Qt.GlobalColor.transparent))  # Прозрачная обводка
+        if self.lightweight:
+            # Тело, маркеры и обводки рисуются в paint(), дочерних элементов нет
+            self.brick_rect = None
+            self.start_marker = None
+            self.end_marker = None
+            self.setPen(self.normal_pen)
+            self.apply_cache_mode()
+            return
+
+        # Создаем прямоугольник с паттерном кирпичной стены (кисть общая для стен одного цвета)
+        self.brick_rect = _BrickRectItem(self)
+        self.brick_rect.setBrush(paint_cache.brick_brush(self.brick_color, self.mortar_color,
+                                                         self.brick_width, self.brick_height))
+        self.brick_rect.setPen(paint_cache.pen(Qt.GlobalColor.transparent))  # Прозрачная обводка
         self.brick_rect.setData(0, "its_wall")
         # Отключаем обработку событий мыши для прямоугольника
         
@@ -84,87 +114,67 @@ class Wall(QGraphicsLineItem, HoverHighlightMixin):
         self.setPen(self.normal_pen)
 
         # Добавляем маркеры на концах стены
-        self.start_marker = QGraphicsEllipseItem(p1.x() - self.stroke_width // 2 - 1, p1.y() - self.stroke_width // 2 - 1, self.stroke_width + 2, self.stroke_width + 2, self)
-        self.start_marker.setBrush(QBrush(Qt.GlobalColor.red))
+        self.start_marker = level_of_detail.DetailEllipseItem(p1.x() - self.stroke_width // 2 - 1, p1.y() - self.stroke_width // 2 - 1, self.stroke_width + 2, self.stroke_width + 2, self)
+        self.start_marker.setBrush(paint_cache.brush(Qt.GlobalColor.red))
         self.start_marker.setData(0, "wall_marker")
-        self.end_marker = QGraphicsEllipseItem(p2.x() - self.stroke_width // 2 - 1, p2.y() - self.stroke_width // 2 - 1, self.stroke_width + 2, self.stroke_width  + 2, self)
-        self.end_marker.setBrush(QBrush(Qt.GlobalColor.red))
+        self.end_marker = level_of_detail.DetailEllipseItem(p2.x() - self.stroke_width // 2 - 1, p2.y() - self.stroke_width // 2 - 1, self.stroke_width + 2, self.stroke_width  + 2, self)
+        self.end_marker.setBrush(paint_cache.brush(Qt.GlobalColor.red))
         self.end_marker.setData(0, "wall_marker") 
 
-        self.setZValue(10)
         self.brick_rect.setZValue(12)
+        self.apply_cache_mode()
+
+    def apply_cache_mode(self, scale=1.0):
+        """
+        Устанавливает режим кэширования стены (см. utils.item_cache).
+
+        Кэшируется элемент с кирпичным паттерном: сама стена в облегченном
+        режиме или прямоугольник brick_rect в режиме items.
+
+        Args:
+            scale: Масштаб представления с учетом devicePixelRatio
+        """
+        item_cache.apply(self if self.lightweight else self.brick_rect, "walls", scale)
+
+    @property
+    def normal_pen(self):
+        """Перо линии стены (общее для стен одной толщины)."""
+        return paint_cache.pen(self.stroke_color, self.stroke_width)
+
+    @property
+    def highlight_pen(self):
+        """Контур стены при выделении (общий для стен одной толщины)."""
+        return paint_cache.pen("#00ff22", self.stroke_width + 5)
+
+    @property
+    def brick_pattern(self):
+        """Паттерн кирпичной кладки стены (общий для стен одного цвета)."""
+        return self.create_brick_pattern()
 
-    # Переопределенный метод для стены с учетом её особенностей
-    def create_hover_highlight(self):
-        """Создает подсветку при наведении для стены."""
+    def highlight_outline(self):
+        """Обводка стены - прямоугольник тела, повернутый вдоль линии."""
         line = self.line()
-        length = line.length()
-        angle = line.angle()
-        
-        # Создаем прямоугольник для подсветки при наведении
-        hover_rect = QGraphicsRectItem(self)
-        
-        # Настраиваем перо с пунктирной линией синего цвета
-        pen = QPen(QColor("#3399FF"), 2)
-        pen.setStyle(Qt.PenStyle.DashLine)
-        hover_rect.setPen(pen)
-        hover_rect.setBrush(QBrush(Qt.BrushStyle.NoBrush))
-        
-        # Устанавливаем данные для идентификации объекта при кликах
-        hover_rect.setData(0, "hover_highlight")
-        
-        # Создаем прямоугольник, покрывающий линию
-        rect = QRectF(0, -self.stroke_width / 2, length, self.stroke_width)
-        hover_rect.setRect(rect)
-        
-        # Применяем поворот к прямоугольнику подсветки
         transform = QTransform()
         transform.translate(line.p1().x(), line.p1().y())
-        transform.rotate(-angle)
-        hover_rect.setTransform(transform)
-        hover_rect.setZValue(15)  # Между стеной и выделением
-        
-        # Отключаем обработку событий мыши для прямоугольника подсветки
-        hover_rect.setAcceptHoverEvents(False)
-        hover_rect.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, False)
-        hover_rect.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
-        hover_rect.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsPanel, False)
-        
-        # Скрываем прямоугольник по умолчанию
-        hover_rect.hide()
-        
-        return hover_rect
+        transform.rotate(-line.angle())
+        return QRectF(0, -self.stroke_width / 2, line.length(), self.stroke_width), transform
 
     def create_brick_pattern(self):
         """
-        Создает паттерн для кирпичной стены.
+        Возвращает паттерн для кирпичной стены.
+        
+        Паттерн берется из общего кэша и разделяется всеми стенами одного цвета.
         """
-        # Создаем изображение для паттерна
-        pattern = QPixmap(self.brick_width * 2, self.brick_height * 2)
-        pattern.fill(Qt.GlobalColor.transparent)
-
-        # Рисуем кирпичи
-        painter = QPainter(pattern)
-        painter.setBrush(QBrush(self.brick_color))
-        painter.setPen(QPen(self.mortar_color, 2))
-
-        # Первый ряд кирпичей
-        painter.drawRect(0, 0, self.brick_width, self.brick_height)
-        painter.drawRect(self.brick_width, 0, self.brick_width, self.brick_height)
-
-        # Второй ряд кирпичей (со смещением)
-        painter.drawRect(self.brick_width // 2, self.brick_height, self.brick_width, self.brick_height)
-        painter.drawRect(self.brick_width // 2 + self.brick_width, self.brick_height, self.brick_width, self.brick_height)
-        painter.setPen(Qt.GlobalColor.transparent)
-        painter.drawRect(0, self.brick_height, self.brick_width // 2, self.brick_height)   
-
-        painter.end()
-        return pattern
+        return paint_cache.brick_pattern(self.brick_color, self.mortar_color, self.brick_width, self.brick_height)
     
     def update_brick_rect(self):
         """
         Обновляет прямоугольник с паттерном в соответствии с линией.
         """
+        if self.lightweight:
+            self.update()
+            return
+
         line = self.line()
         length = line.length()
         angle = line.angle()
@@ -179,91 +189,46 @@ class Wall(QGraphicsLineItem, HoverHighlightMixin):
         transform.rotate(-angle)
         self.brick_rect.setTransform(transform)
         
-        # Обновляем подсветку при наведении, если она существует
-        if hasattr(self, 'hover_rect') and self.hover_rect:
-            rect = QRectF(0, -self.stroke_width / 2, length, self.stroke_width)
-            self.hover_rect.setRect(rect)
-            
-            # Применяем поворот к прямоугольнику подсветки
-            transform = QTransform()
-            transform.translate(line.p1().x(), line.p1().y())
-            transform.rotate(-angle)
-            self.hover_rect.setTransform(transform)
+        # Обводки оверлеев следуют за телом стены
+        self.refresh_highlight_overlays()
 
     def set_highlight(self, enabled):
         """
-        Включает или выключает подсветку региона.
-        :param enabled: Если True, регион выделяется жёлтым контуром.
+        Включает или выключает выделение стены.
+
+        В облегченном режиме выделение рисует сама стена; в режиме items обводку
+        показывает общий оверлей поля, а стена только выделяет маркеры концов.
+        :param enabled: Если True, стена выделена.
         """
-        # self.setPen(self.highlight_pen if enabled else self.normal_pen)
-
-        """Включает или выключает подсветку робота."""
-        if enabled:
-            line = self.line()
-            length = line.length()
-            angle = line.angle()
-            # Создаем прямоугольник для выделения
-            if not self.highlight_rect:           
-                self.highlight_rect = QGraphicsRectItem(self)
-                self.highlight_rect.setData(0, "its_wall")
-                self.highlight_rect.setPen(QPen(Qt.GlobalColor.green, 2))
-                self.highlight_rect.setBrush(QBrush(Qt.GlobalColor.transparent))
-            
-            # Создаем прямоугольник, покрывающий линию
-            rect = QRectF(0, -self.stroke_width / 2, length, self.stroke_width)
-            self.highlight_rect.setRect(rect)
-
-            # Применяем поворот к прямоугольнику выделения
-            transform = QTransform()
-            transform.translate(line.p1().x(), line.p1().y())
-            transform.rotate(-angle)
-            self.highlight_rect.setTransform(transform)
-            self.highlight_rect.setZValue(20)
-            self.highlight_rect.show()
-
-            self.start_marker.setBrush(QBrush(Qt.GlobalColor.red))
-            self.start_marker.setPen(QPen(Qt.GlobalColor.green,2))
-            self.start_marker.setZValue(40) 
-            self.end_marker.setBrush(QBrush(Qt.GlobalColor.red))
-            self.end_marker.setPen(QPen(Qt.GlobalColor.green,2))
-            self.end_marker.setZValue(40)  
-        else:
-            # Скрываем прямоугольник выделения
-            if self.highlight_rect:
-                self.highlight_rect.hide()
-                self.start_marker.setPen(QPen(Qt.GlobalColor.transparent))
-                self.end_marker.setPen(QPen(Qt.GlobalColor.transparent))
+        if self.lightweight:
+            self._selected = enabled
+            if enabled:
+                self._hover_visible = False
+            self.update()
+            return
+
+        outline = paint_cache.pen(Qt.GlobalColor.green if enabled else Qt.GlobalColor.transparent, 2)
+        for marker in (self.start_marker, self.end_marker):
+            marker.setPen(outline)
+            if enabled:
+                marker.setZValue(40)
 
     def update_appearance(self):
         """Обновляет внешний вид стены в зависимости от атрибутов."""
-        logger.debug(f"Updating appearance of wall with stroke width {self.stroke_width}")
-        pen = QPen(Qt.GlobalColor.black, self.stroke_width)
-        pen.setColor(Qt.GlobalColor.transparent)  # Прозрачный цвет (для пользовательского цвета)
-        self.setPen(pen)
+        logger.debug("Updating appearance of wall with stroke width %s", self.stroke_width)
+        # Прозрачное перо толщины стены (для пользовательского цвета), общее для стен одной толщины
+        self.setPen(paint_cache.pen(Qt.GlobalColor.transparent, self.stroke_width))
         # Обновляем прямоугольник с паттерном "кирпичная стена" в соответствии с линией
         self.update_brick_rect()
         
         # Всегда обновляем размеры маркеров при обновлении внешнего вида
         self.update_markers()
-        
-        if self.highlight_rect:
-            line = self.line()
-            length = line.length()
-            angle = line.angle()
-            
-            # Создаем прямоугольник, покрывающий линию
-            rect = QRectF(0, -self.stroke_width / 2, length, self.stroke_width)
-            self.highlight_rect.setRect(rect)
-
-            # Применяем поворот к прямоугольнику выделения
-            transform = QTransform()
-            transform.translate(line.p1().x(), line.p1().y())
-            transform.rotate(-angle)
-            self.highlight_rect.setTransform(transform)
-            self.highlight_rect.setZValue(20)
 
     def update_markers(self):
         """Обновляет размеры и позиции маркеров."""
+        if self.lightweight:
+            return
+
         line = self.line()
         marker_size = self.stroke_width + 2
         self.start_marker.setRect(
@@ -281,8 +246,53 @@ class Wall(QGraphicsLineItem, HoverHighlightMixin):
 
     def set_stroke_width(self, width):
         """Устанавливает ширину обводки стены."""
+        self.prepareGeometryChange()
         self.stroke_width = width
         self.update_appearance()
+        self.notify_geometry_changed()
+
+    def set_hover_highlight(self, enabled):
+        """Включает или выключает подсветку при наведении."""
+        if not self.lightweight:
+            super().set_hover_highlight(enabled)
+            return
+        # Выделенную стену при наведении не подсвечиваем
+        visible = enabled and not self._selected
+        if visible != self._hover_visible:
+            self._hover_visible = visible
+            self.update()
+
+    def marker_at(self, scene_pos):
+        """
+        Определяет, попадает ли точка в маркер конца стены.
+        
+        Args:
+            scene_pos: Точка в координатах сцены (QPointF)
+            
+        Returns:
+            str: "start" или "end", если точка попадает в маркер, иначе None
+        """
+        pos = self.mapFromScene(scene_pos)
+        line = self.line()
+        radius = (self.stroke_width + 2) / 2
+        if QLineF(pos, line.p1()).length() <= radius:
+            return "start"
+        if QLineF(pos, line.p2()).length() <= radius:
+            return "end"
+        return None
+
+    def _body_polygon(self):
+        """Возвращает прямоугольник тела стены, повернутый вдоль линии."""
+        line = self.line()
+        transform = QTransform()
+        transform.translate(line.p1().x(), line.p1().y())
+        transform.rotate(-line.angle())
+        return transform.map(QPolygonF(QRectF(0, -self.stroke_width / 2, line.length(), self.stroke_width)))
+
+    def notify_geometry_changed(self):
+        """Сообщает владельцу стены (сцене) об изменении её геометрии."""
+        if self.on_geometry_changed is not None:
+            self.on_geometry_changed(self)
 
     @contextmanager
     def updating(self):
@@ -297,57 +307,112 @@ class Wall(QGraphicsLineItem, HoverHighlightMixin):
         """Переопределенный метод установки линии с обновлением маркеров."""
         # Вызываем родительский метод для установки линии
         super().setLine(x1, y1, x2, y2)
-        logger.debug(f"Wall line set to: {x1, y1, x2, y2}")
+        logger.debug("Wall line set to: (%s, %s, %s, %s)", x1, y1, x2, y2)
         # Обновляем внешний вид стены вместе с маркерами
         self.update_appearance()
+        self.notify_geometry_changed()
 
     def set_id(self, new_id):
         """
         Устанавливает новый ID для стены, если он уникален.
         :param new_id: Новый ID.
         """
-        logger.debug(f"Attempting to set wall ID from '{self.id}' to '{new_id}'")
+        logger.debug("Attempting to set wall ID from '%s' to '%s'", self.id, new_id)
         
-        # Для временных стен всегда разрешаем изменение ID
-        if self.is_temp:
-            self.id = new_id
-            return True
-        
-        # Сначала проверяем, изменился ли ID
-        if new_id == self.id:
-            logger.debug(f"New ID is the same as current ID, no change needed")
-            return True
-            
-        # Затем проверяем уникальность среди существующих ID
-        if new_id in self._existing_ids:
+        if not self.id_allocator.rename(self.id, new_id):
             # Если ID уже занят, выводим сообщение в лог
             logger.warning(f"ID '{new_id}' already used by another wall")
             return False
-        else:
-            # Удаляем старый ID из множества и добавляем новый
-            logger.debug(f"Removing old ID '{self.id}' from existing_ids")
-            self._existing_ids.remove(self.id)
-            self.id = new_id
-            logger.debug(f"Adding new ID '{new_id}' to existing_ids")
-            self._existing_ids.add(self.id)
-            logger.debug(f"Wall ID successfully set to '{new_id}'")
-            return True
-
-    @classmethod
-    def cleanup_temp_id(cls, temp_id):
-        """Удаляет временный ID из множества существующих ID.
-        Этот метод должен вызываться явно после использования временной стены.
-        
-        Args:
-            temp_id: Временный ID стены для удаления
-        """
-        if temp_id in cls._existing_ids:
-            logger.debug(f"Удаляем временный ID {temp_id} из Wall._existing_ids")
-            cls._existing_ids.remove(temp_id)
-            return True
-        return False
+        self.id = new_id
+        logger.debug("Wall ID successfully set to '%s'", new_id)
+        return True
+
+    def release_id(self):
+        """Освобождает ID стены в распределителе (при удалении стены)."""
+        self.id_allocator.release(self.id)
 
     @property
     def wall_id(self):
         """Возвращает идентификатор стены (для совместимости с PropertiesWindow)"""
-        return self.id
\ No newline at end of file
+        return self.id
+
+
+class LightweightWall(Wall):
+    """
+    Стена в облегченном режиме (Wall.RENDER_MODE_LIGHTWEIGHT).
+
+    Создается через Wall(..., render_mode=Wall.RENDER_MODE_LIGHTWEIGHT).
+    Тело, маркеры и обводки рисует сама стена, без дочерних элементов,
+    поэтому геометрия и отрисовка переопределены только в этом подклассе.
+    """
+
+    def boundingRect(self):
+        """Ограничивающий прямоугольник с учетом тела, маркеров и обводок."""
+        line = self.line()
+        # Маркер (диаметр stroke_width + 2) и обводка выделения (2 px) выходят за тело стены
+        margin = (self.stroke_width + 2) / 2 + 2
+        return QRectF(line.p1(), line.p2()).normalized().adjusted(-margin, -margin, margin, margin)
+
+    def shape(self):
+        """Форма для попадания мыши: тело стены и маркеры на концах."""
+        line = self.line()
+        marker_size = self.stroke_width + 2
+        path = QPainterPath()
+        path.setFillRule(Qt.FillRule.WindingFill)
+        path.addPolygon(self._body_polygon())
+        path.closeSubpath()
+        path.addEllipse(line.p1(), marker_size / 2, marker_size / 2)
+        path.addEllipse(line.p2(), marker_size / 2, marker_size / 2)
+        return path
+
+    def paint(self, painter, option, widget=None):
+        """
+        Рисует тело, маркеры и обводки стены одним элементом.
+
+        При мелком масштабе (см. utils.level_of_detail) тело рисуется сплошной
+        полосой цвета кирпича, а маркеры и обводка при наведении пропускаются.
+        """
+        line = self.line()
+        flat = level_of_detail.simplified(painter, "walls")
+        details = not level_of_detail.simplified(painter, "details")
+        if flat and not self._selected:
+            # Сплошная полоса толщины стены: одна линия без поворота системы координат
+            painter.setPen(paint_cache.pen(self.brick_color, self.stroke_width, cap=Qt.PenCapStyle.FlatCap))
+            painter.drawLine(line)
+            if details:
+                self._paint_markers(painter, Qt.GlobalColor.transparent)
+            return
+
+        body = QRectF(0, -self.stroke_width / 2, line.length(), self.stroke_width)
+        painter.save()
+        painter.translate(line.p1())
+        painter.rotate(-line.angle())
+        painter.setPen(Qt.PenStyle.NoPen)
+        if flat:
+            painter.setBrush(paint_cache.brush(self.brick_color))
+        else:
+            painter.setBrush(paint_cache.brick_brush(self.brick_color, self.mortar_color,
+                                                     self.brick_width, self.brick_height))
+        painter.drawRect(body)
+
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        if self._selected:
+            painter.setPen(paint_cache.pen(Qt.GlobalColor.green, 2))
+            painter.drawRect(body)
+        elif self._hover_visible and details:
+            painter.setPen(paint_cache.pen("#3399FF", 2, Qt.PenStyle.DashLine))
+            painter.drawRect(body)
+        painter.restore()
+
+        # Маркеры поверх тела; у выделенной стены - с зеленым контуром
+        if details:
+            self._paint_markers(painter, Qt.GlobalColor.green if self._selected else Qt.GlobalColor.transparent)
+
+    def _paint_markers(self, painter, outline_color):
+        """Рисует маркеры на концах стены."""
+        line = self.line()
+        radius = (self.stroke_width + 2) / 2
+        painter.setPen(paint_cache.pen(outline_color, 2))
+        painter.setBrush(paint_cache.brush(Qt.GlobalColor.red))
+        painter.drawEllipse(line.p1(), radius, radius)
+        painter.drawEllipse(line.p2(), radius, radius)